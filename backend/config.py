@@ -48,6 +48,175 @@ DATABASE_URL = (
     f"{DB_CONNECTION_PARAMS['host']}:{DB_CONNECTION_PARAMS['port']}/{DB_CONNECTION_PARAMS['database']}"
 )
 
+# --- Database Connection Budget ---
+# Single place to cap Postgres connections: every uvicorn worker opens at most
+# DB_MAX_CONNECTIONS_PER_WORKER connections, so total = workers x this value
+# (keep it below the server's max_connections). The budget is split between the
+# psycopg2 pool in db/connection.py, the asyncpg pool in db/async_connection.py,
+# the SQLAlchemy engine in models/__init__.py and one LISTEN connection for
+# dashboard cache invalidation (db/cache.py).
+DB_MAX_CONNECTIONS_PER_WORKER = int(os.getenv("DB_MAX_CONNECTIONS_PER_WORKER", "24"))
+DB_SQLALCHEMY_POOL_SIZE = int(os.getenv("DB_SQLALCHEMY_POOL_SIZE", "4"))  # ORM sessions (assignment/case_history CRUD)
+DB_ASYNC_POOL_MAX_SIZE = int(os.getenv("DB_ASYNC_POOL_MAX_SIZE", "6"))  # asyncpg pool for hot read paths
+
+# --- Database Connection Pool (db/connection.py) ---
+# Process-wide bounded pool shared by every get_db_connection() caller. Its size is
+# what is left of the budget; DB_POOL_MAX_SIZE can lower it but never raise it past that.
+DB_POOL_MIN_SIZE = int(os.getenv("DB_POOL_MIN_SIZE", "2"))
+_DB_POOL_BUDGET = max(1, DB_MAX_CONNECTIONS_PER_WORKER - DB_SQLALCHEMY_POOL_SIZE - DB_ASYNC_POOL_MAX_SIZE - 1)
+DB_POOL_MAX_SIZE = max(1, min(int(os.getenv("DB_POOL_MAX_SIZE", str(_DB_POOL_BUDGET))), _DB_POOL_BUDGET))
+DB_POOL_CHECKOUT_TIMEOUT_SECONDS = float(os.getenv("DB_POOL_CHECKOUT_TIMEOUT_SECONDS", "30"))
+DB_POOL_MAX_LIFETIME_SECONDS = float(os.getenv("DB_POOL_MAX_LIFETIME_SECONDS", "1800"))  # Recycle connections after 30 min
+DB_POOL_HEALTH_CHECK_IDLE_SECONDS = float(os.getenv("DB_POOL_HEALTH_CHECK_IDLE_SECONDS", "30"))  # Ping connections idle longer than this
+
+# --- Native asyncio read path (db/async_connection.py) ---
+# CaseEntryMatcher read methods listed here run on the asyncpg pool instead of the
+# ThreadPoolExecutor. Set DB_ASYNC_READ_METHODS="" to route everything through the executor.
+DB_ASYNC_POOL_MIN_SIZE = int(os.getenv("DB_ASYNC_POOL_MIN_SIZE", "1"))
+# asyncpg has no maximum connection lifetime: connections are recycled after
+# DB_ASYNC_POOL_MAX_QUERIES queries, and closed once idle for DB_ASYNC_POOL_MAX_IDLE_SECONDS.
+DB_ASYNC_POOL_MAX_QUERIES = int(os.getenv("DB_ASYNC_POOL_MAX_QUERIES", "50000"))
+DB_ASYNC_POOL_MAX_IDLE_SECONDS = float(os.getenv("DB_ASYNC_POOL_MAX_IDLE_SECONDS", "300"))
+DB_ASYNC_READ_METHODS = {
+    name.strip() for name in os.getenv(
+        "DB_ASYNC_READ_METHODS",
+        "fetch_new_cases_list_paginated,fetch_combined_case_data_optimized,fetch_assigned_cases,fetch_case_risk_profile"
+    ).split(",") if name.strip()
+}
+
+# --- Dashboard cache (db/cache.py) ---
+# Per-worker LRU cache for dashboard aggregates, bounded by entry count and by the
+# approximate JSON size of the cached payloads. Case status and assignment writes
+# invalidate it in every worker through Postgres NOTIFY on DASHBOARD_CACHE_CHANNEL.
+DASHBOARD_CACHE_TTL_SECONDS = float(os.getenv("DASHBOARD_CACHE_TTL_SECONDS", "300"))
+DASHBOARD_CACHE_MAX_ENTRIES = int(os.getenv("DASHBOARD_CACHE_MAX_ENTRIES", "256"))
+DASHBOARD_CACHE_MAX_BYTES = int(os.getenv("DASHBOARD_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+DASHBOARD_CACHE_CHANNEL = os.getenv("DASHBOARD_CACHE_CHANNEL", "dashboard_cache_invalidate")
+
+# --- Dashboard rollups (services/dashboard_rollups.py) ---
+# Triggers on case_main/assignment append +1/-1 deltas; a background job folds them
+# into per-day/status/type/user rollup tables every DASHBOARD_ROLLUP_FOLD_SECONDS and
+# rebuilds the rollups from the base tables every DASHBOARD_ROLLUP_RECONCILE_SECONDS.
+# The triggers are installed once by scripts/migrate.py; until then the endpoints query
+# case_main directly. To switch off, set DASHBOARD_ROLLUPS_ENABLED="false" and run
+# scripts/migrate.py --drop dashboard_rollups.
+DASHBOARD_ROLLUPS_ENABLED = os.getenv("DASHBOARD_ROLLUPS_ENABLED", "true").lower() in ("1", "true", "yes")
+DASHBOARD_ROLLUP_FOLD_SECONDS = float(os.getenv("DASHBOARD_ROLLUP_FOLD_SECONDS", "5"))
+DASHBOARD_ROLLUP_RECONCILE_SECONDS = float(os.getenv("DASHBOARD_ROLLUP_RECONCILE_SECONDS", "3600"))
+
+# --- Fraud-pattern alerts (services/fraud_alerts.py) ---
+# Triggers on txn, customer and account_customer queue the accounts, beneficiaries and
+# mobiles a write touched; a background job recomputes just those into the 24h/7d/30d
+# alert tables every FRAUD_ALERT_REFRESH_SECONDS and rebuilds the tables from txn every
+# FRAUD_ALERT_RECONCILE_SECONDS, or sooner when a bulk load queues more than
+# FRAUD_ALERT_MAX_INCREMENTAL_KEYS keys at once.
+# The triggers are installed once by scripts/migrate.py; until then the endpoint queries
+# txn directly. To switch off, set FRAUD_ALERTS_ENABLED="false" and run
+# scripts/migrate.py --drop fraud_alerts.
+FRAUD_ALERTS_ENABLED = os.getenv("FRAUD_ALERTS_ENABLED", "true").lower() in ("1", "true", "yes")
+FRAUD_ALERT_REFRESH_SECONDS = float(os.getenv("FRAUD_ALERT_REFRESH_SECONDS", "5"))
+FRAUD_ALERT_RECONCILE_SECONDS = float(os.getenv("FRAUD_ALERT_RECONCILE_SECONDS", "3600"))
+FRAUD_ALERT_MAX_INCREMENTAL_KEYS = int(os.getenv("FRAUD_ALERT_MAX_INCREMENTAL_KEYS", "20000"))
+
+# --- Entity graph (services/entity_graph.py) ---
+# Adjacency lists of customers, accounts, mobiles and cases behind
+# /api/dashboard/network-data/neighbourhood. Triggers on txn, acc_bene,
+# account_customer, customer and case_main queue the keys a write touched; a
+# background job rebuilds their edges every ENTITY_GRAPH_REFRESH_SECONDS and the whole
+# index every ENTITY_GRAPH_RECONCILE_SECONDS (it scans all of txn, so daily by default),
+# or sooner when more than ENTITY_GRAPH_MAX_INCREMENTAL_KEYS keys are queued at once.
+# The triggers are installed once by scripts/migrate.py. To switch off, set
+# ENTITY_GRAPH_ENABLED="false" and run scripts/migrate.py --drop entity_graph.
+ENTITY_GRAPH_ENABLED = os.getenv("ENTITY_GRAPH_ENABLED", "true").lower() in ("1", "true", "yes")
+ENTITY_GRAPH_REFRESH_SECONDS = float(os.getenv("ENTITY_GRAPH_REFRESH_SECONDS", "5"))
+ENTITY_GRAPH_RECONCILE_SECONDS = float(os.getenv("ENTITY_GRAPH_RECONCILE_SECONDS", "86400"))
+ENTITY_GRAPH_MAX_INCREMENTAL_KEYS = int(os.getenv("ENTITY_GRAPH_MAX_INCREMENTAL_KEYS", "20000"))
+# Upper bounds for the hops/max_nodes query parameters of the neighbourhood endpoint
+ENTITY_GRAPH_MAX_HOPS = int(os.getenv("ENTITY_GRAPH_MAX_HOPS", "4"))
+ENTITY_GRAPH_MAX_NODES = int(os.getenv("ENTITY_GRAPH_MAX_NODES", "2000"))
+
+# --- Background maintenance executor (main.py) ---
+# The dashboard rollup, fraud alert and entity graph workers run their passes, full
+# rebuilds included, on this small thread pool of their own, so a rebuild never holds
+# threads of the request executor. One thread per worker keeps them from queueing
+# behind each other.
+MAINTENANCE_EXECUTOR_WORKERS = int(os.getenv("MAINTENANCE_EXECUTOR_WORKERS", "3"))
+
+# --- Dashboard queries (routers/dashboard.py) ---
+# Analytics endpoints run their independent queries concurrently on the executor,
+# each on its own pooled connection. At most this many run at once per worker, so
+# a few dashboard refreshes cannot take every executor thread and pool connection.
+DASHBOARD_QUERY_CONCURRENCY = int(os.getenv("DASHBOARD_QUERY_CONCURRENCY", "6"))
+
+# --- Banks v2 ingest ---
+# Resolve case-entry incidents with set-based queries and multi-row inserts instead of
+# one round of lookups per RRN. Set to "false" to fall back to the per-incident path.
+BANKS_V2_BATCH_INCIDENTS = os.getenv("BANKS_V2_BATCH_INCIDENTS", "true").lower() in ("1", "true", "yes")
+
+# Async case-entry jobs (services/banks_v2_jobs.py). Callers opt in per request with
+# ?mode=async; BANKS_V2_CASE_ENTRY_MODE="async" makes it the default.
+BANKS_V2_CASE_ENTRY_MODE = os.getenv("BANKS_V2_CASE_ENTRY_MODE", "sync").lower()  # 'sync' | 'async'
+BANKS_V2_JOB_POLL_SECONDS = float(os.getenv("BANKS_V2_JOB_POLL_SECONDS", "2"))
+BANKS_V2_JOB_STALE_SECONDS = float(os.getenv("BANKS_V2_JOB_STALE_SECONDS", "300"))  # Reclaim 'processing' jobs with no heartbeat for this long
+BANKS_V2_JOB_MAX_ATTEMPTS = int(os.getenv("BANKS_V2_JOB_MAX_ATTEMPTS", "3"))
+
+# --- Email attachment OCR (services/ocr_pool.py) ---
+# EasyOCR runs in a separate process pool so it never blocks the event loop. Each
+# OCR process loads the model once. At most OCR_POOL_MAX_PENDING images/PDF pages
+# are queued or running per API worker; an attachment that takes longer than
+# OCR_ATTACHMENT_TIMEOUT_SECONDS (including queueing) contributes no text.
+OCR_POOL_WORKERS = int(os.getenv("OCR_POOL_WORKERS", "2"))
+OCR_POOL_MAX_PENDING = int(os.getenv("OCR_POOL_MAX_PENDING", "16"))
+OCR_ATTACHMENT_TIMEOUT_SECONDS = float(os.getenv("OCR_ATTACHMENT_TIMEOUT_SECONDS", "120"))
+OCR_PDF_DPI = int(os.getenv("OCR_PDF_DPI", "200"))
+
+# PDFs: use PyMuPDF's embedded text layer and rasterize + OCR only the pages whose
+# text layer is missing or looks garbled (under OCR_TEXT_LAYER_MIN_CHARS usable
+# characters). Only the first OCR_PDF_MAX_PAGES pages of a PDF are read. OCR stops
+# early once extract_form_fields() has found every EMAIL_REQUIRED_FIELDS key
+# (set EMAIL_REQUIRED_FIELDS="" to always OCR everything).
+OCR_PDF_TEXT_LAYER_FIRST = os.getenv("OCR_PDF_TEXT_LAYER_FIRST", "true").lower() in ("1", "true", "yes")
+OCR_TEXT_LAYER_MIN_CHARS = int(os.getenv("OCR_TEXT_LAYER_MIN_CHARS", "40"))
+OCR_PDF_MAX_PAGES = int(os.getenv("OCR_PDF_MAX_PAGES", "20"))
+EMAIL_REQUIRED_FIELDS = [
+    f.strip() for f in os.getenv("EMAIL_REQUIRED_FIELDS", "ackNo,accountNumber,toAccount,transactionAmount").split(",") if f.strip()
+]
+
+# Content-addressed OCR result cache (services/ocr_cache.py), shared by the workers on
+# a host. Keyed by attachment hash + DPI + OCR engine version; least recently used
+# results are evicted beyond OCR_CACHE_MAX_BYTES. Set OCR_CACHE_ENABLED="false" to turn off.
+OCR_CACHE_ENABLED = os.getenv("OCR_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+OCR_CACHE_DIR = os.getenv("OCR_CACHE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "ocr_cache"))
+OCR_CACHE_MAX_BYTES = int(os.getenv("OCR_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+
+# --- Outbound HTTP (services/http_client.py) ---
+# One pooled client per API worker for Gmail/Graph calls; HTTP/2 when h2 is installed.
+HTTP_CLIENT_HTTP2 = os.getenv("HTTP_CLIENT_HTTP2", "true").lower() in ("1", "true", "yes")
+HTTP_CLIENT_MAX_CONNECTIONS = int(os.getenv("HTTP_CLIENT_MAX_CONNECTIONS", "50"))
+HTTP_CLIENT_MAX_KEEPALIVE = int(os.getenv("HTTP_CLIENT_MAX_KEEPALIVE", "20"))
+HTTP_CLIENT_TIMEOUT_SECONDS = float(os.getenv("HTTP_CLIENT_TIMEOUT_SECONDS", "30"))
+
+# Attachments of one message are downloaded EMAIL_ATTACHMENT_CONCURRENCY at a time.
+# Anything larger than EMAIL_ATTACHMENT_MAX_BYTES is skipped (checked against the
+# declared size and again while streaming), which bounds memory per message.
+EMAIL_ATTACHMENT_CONCURRENCY = int(os.getenv("EMAIL_ATTACHMENT_CONCURRENCY", "4"))
+EMAIL_ATTACHMENT_MAX_BYTES = int(os.getenv("EMAIL_ATTACHMENT_MAX_BYTES", str(20 * 1024 * 1024)))
+
+# --- Email webhook queue (services/email_jobs.py) ---
+# Gmail/Graph notifications are queued in Postgres and processed by
+# EMAIL_INGEST_WORKERS concurrent workers per uvicorn worker.
+EMAIL_INGEST_WORKERS = int(os.getenv("EMAIL_INGEST_WORKERS", "4"))
+EMAIL_INGEST_POLL_SECONDS = float(os.getenv("EMAIL_INGEST_POLL_SECONDS", "2"))
+EMAIL_INGEST_STALE_SECONDS = float(os.getenv("EMAIL_INGEST_STALE_SECONDS", "600"))  # Reclaim 'processing' jobs with no heartbeat for this long (workers beat every third of it)
+EMAIL_INGEST_MAX_ATTEMPTS = int(os.getenv("EMAIL_INGEST_MAX_ATTEMPTS", "5"))
+
+# --- Batch email case creation (/api/email/parse/create-cases/batch) ---
+# Up to EMAIL_BATCH_MAX_EMAILS emails per call; EMAIL_BATCH_PARSE_CONCURRENCY are
+# fetched/parsed at once and EMAIL_BATCH_CREATE_CONCURRENCY run VM/BM case creation at once.
+EMAIL_BATCH_MAX_EMAILS = int(os.getenv("EMAIL_BATCH_MAX_EMAILS", "500"))
+EMAIL_BATCH_PARSE_CONCURRENCY = int(os.getenv("EMAIL_BATCH_PARSE_CONCURRENCY", "8"))
+EMAIL_BATCH_CREATE_CONCURRENCY = int(os.getenv("EMAIL_BATCH_CREATE_CONCURRENCY", "4"))
+
 # --- Keycloak Configuration ---
 KEYCLOAK_CONFIG = {
     "server_url": "https://34.47.219.225:8443/",
@@ -79,3 +248,17 @@ FINANCE_DEPARTMENT_DELAY_THRESHOLD_DAYS = 10     # Days without action for Finan
 
 # Legacy setting (keeping for backward compatibility)
 DELAY_THRESHOLD_DAYS = 60  # Cases older than this many days with status 'new' are considered delayed
+
+# --- Fraud scoring model (services/fraud_model.py, services/anomaly.py, model_api.py) ---
+# Directory holding the .joblib artifacts written by train.py
+# (random_forest_model, scaler, feature_columns, label_encoder, isolation_forest_*).
+FRAUD_MODEL_DIR = os.getenv("FRAUD_MODEL_DIR", BASE_DIR)
+# Open the artifacts memory-mapped (joblib mmap_mode='r') so workers share them through the page cache
+FRAUD_MODEL_MMAP = os.getenv("FRAUD_MODEL_MMAP", "true").lower() in ("1", "true", "yes")
+# Largest number of customers accepted by one POST /predict/batch call
+PREDICT_BATCH_MAX_CUSTOMERS = int(os.getenv("PREDICT_BATCH_MAX_CUSTOMERS", "50000"))
+# In-process transaction classification (services/anomaly.py): concurrent requests are
+# scored together, flushing after FRAUD_MICROBATCH_MAX_SIZE transactions or
+# FRAUD_MICROBATCH_MAX_WAIT_MS, whichever comes first.
+FRAUD_MICROBATCH_MAX_SIZE = int(os.getenv("FRAUD_MICROBATCH_MAX_SIZE", "64"))
+FRAUD_MICROBATCH_MAX_WAIT_MS = float(os.getenv("FRAUD_MICROBATCH_MAX_WAIT_MS", "5"))
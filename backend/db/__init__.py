@@ -1,2 +1,2 @@
 # db/__init__.py
-from . import connection, matcher
+from . import connection, async_connection, matcher
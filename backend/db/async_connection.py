@@ -0,0 +1,130 @@
+# db/async_connection.py
+"""
+Native asyncio Postgres access (asyncpg) for hot read paths.
+
+Read methods in db/matcher.py describe their queries as a "query plan": a generator
+that yields (sql, params, fetch) steps written with psycopg2-style %s placeholders and
+receives the fetched rows back. The same plan can therefore be driven either
+synchronously on a pooled psycopg2 cursor (run_plan_sync, inside the executor) or
+natively on the event loop through the asyncpg pool (run_plan_async), without
+duplicating any SQL.
+"""
+import json
+import re
+from typing import Any, Dict, Generator, List, Optional, Tuple, Union
+
+import asyncpg
+
+from config import (
+    DB_CONNECTION_PARAMS,
+    DB_ASYNC_POOL_MIN_SIZE,
+    DB_ASYNC_POOL_MAX_IDLE_SECONDS,
+    DB_ASYNC_POOL_MAX_QUERIES,
+    DB_ASYNC_POOL_MAX_SIZE,
+    DB_ASYNC_READ_METHODS,
+    DB_POOL_CHECKOUT_TIMEOUT_SECONDS,
+)
+
+# A plan step: (sql with %s placeholders, params, "one" | "all")
+PlanStep = Tuple[str, Union[tuple, list], str]
+QueryPlan = Generator[PlanStep, Any, Any]
+
+_async_pool: Optional[asyncpg.Pool] = None
+
+_PLACEHOLDER_RE = re.compile(r"%%|%s")
+
+
+async def _init_connection(conn: asyncpg.Connection):
+    # Decode json/jsonb to Python objects like psycopg2 does
+    for json_type in ("json", "jsonb"):
+        await conn.set_type_codec(json_type, encoder=json.dumps, decoder=json.loads, schema="pg_catalog")
+
+
+async def init_async_pool() -> Optional[asyncpg.Pool]:
+    """Create the asyncpg pool for this worker (called from the app startup event)."""
+    global _async_pool
+    if _async_pool is not None:
+        return _async_pool
+    try:
+        _async_pool = await asyncpg.create_pool(
+            host=DB_CONNECTION_PARAMS["host"],
+            port=int(DB_CONNECTION_PARAMS["port"]),
+            user=DB_CONNECTION_PARAMS["user"],
+            password=DB_CONNECTION_PARAMS["password"],
+            database=DB_CONNECTION_PARAMS["database"],
+            min_size=DB_ASYNC_POOL_MIN_SIZE,
+            max_size=DB_ASYNC_POOL_MAX_SIZE,
+            max_queries=DB_ASYNC_POOL_MAX_QUERIES,
+            max_inactive_connection_lifetime=DB_ASYNC_POOL_MAX_IDLE_SECONDS,
+            init=_init_connection,
+        )
+        print(f"asyncpg pool initialized (max_size={DB_ASYNC_POOL_MAX_SIZE}).", flush=True)
+    except Exception as e:
+        # Read methods fall back to the executor path when the pool is unavailable
+        print(f"WARNING: Could not initialize asyncpg pool, using executor path for reads: {e}", flush=True)
+        _async_pool = None
+    return _async_pool
+
+
+async def close_async_pool():
+    global _async_pool
+    if _async_pool is not None:
+        await _async_pool.close()
+        _async_pool = None
+
+
+def get_async_pool() -> Optional[asyncpg.Pool]:
+    return _async_pool
+
+
+def use_async_path(method_name: str) -> bool:
+    """True when `method_name` is switched to the asyncpg path and the pool is up."""
+    return _async_pool is not None and method_name in DB_ASYNC_READ_METHODS
+
+
+def to_asyncpg_sql(sql: str) -> str:
+    """Rewrite psycopg2 %s placeholders as asyncpg $1..$n (and %% back to %)."""
+    counter = iter(range(1, 10_000))
+    return _PLACEHOLDER_RE.sub(lambda m: "%" if m.group() == "%%" else f"${next(counter)}", sql)
+
+
+def run_plan_sync(cur, plan: QueryPlan) -> Any:
+    """Drive a query plan on a psycopg2 RealDictCursor."""
+    try:
+        sql, params, fetch = next(plan)
+        while True:
+            try:
+                cur.execute(sql, params)
+                rows = cur.fetchone() if fetch == "one" else cur.fetchall()
+            except Exception as e:
+                # Let the plan handle query errors the way inline try/except blocks did
+                sql, params, fetch = plan.throw(e)
+                continue
+            sql, params, fetch = plan.send(rows)
+    except StopIteration as done:
+        return done.value
+
+
+async def run_plan_async(plan: QueryPlan) -> Any:
+    """Drive a query plan on a connection from the asyncpg pool."""
+    async with _async_pool.acquire(timeout=DB_POOL_CHECKOUT_TIMEOUT_SECONDS) as conn:
+        try:
+            sql, params, fetch = next(plan)
+            while True:
+                query = to_asyncpg_sql(sql)
+                try:
+                    if fetch == "one":
+                        record = await conn.fetchrow(query, *params)
+                        rows: Union[Dict[str, Any], List[Dict[str, Any]], None] = dict(record) if record is not None else None
+                    else:
+                        rows = [dict(record) for record in await conn.fetch(query, *params)]
+                except (asyncpg.exceptions.InterfaceError, asyncpg.exceptions.DataError):
+                    # Parameter binding problems (asyncpg re-raises codec failures as DataError)
+                    # are handled by the caller's fallback; psycopg2 adapts those values itself
+                    raise
+                except Exception as e:
+                    sql, params, fetch = plan.throw(e)
+                    continue
+                sql, params, fetch = plan.send(rows)
+        except StopIteration as done:
+            return done.value
@@ -0,0 +1,270 @@
+# db/cache.py
+"""
+Bounded in-process cache for dashboard aggregates, with cross-worker invalidation.
+
+BoundedTTLCache is an LRU cache capped both by entry count and by the approximate
+size (serialized JSON length) of what it holds, so many user/filter combinations
+cannot grow it without limit. Entries also expire after a TTL. get_or_compute()
+coalesces concurrent misses for the same key: one request runs the query, the
+others await its result.
+
+Each uvicorn worker has its own cache. Writes that change what the dashboards
+show (case status changes, assignment writes) call notify_dashboard_change() on
+their own cursor, which queues a Postgres NOTIFY on DASHBOARD_CACHE_CHANNEL. It is
+delivered only if that transaction commits, and every worker's listener
+(start_dashboard_cache_listener) then clears its cache. Postgres folds identical
+notifications within a transaction, so a bulk write sends one per reason.
+"""
+import asyncio
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+import asyncpg
+
+from config import (
+    DB_CONNECTION_PARAMS,
+    DASHBOARD_CACHE_CHANNEL,
+    DASHBOARD_CACHE_MAX_BYTES,
+    DASHBOARD_CACHE_MAX_ENTRIES,
+    DASHBOARD_CACHE_TTL_SECONDS,
+)
+
+_LISTENER_RETRY_SECONDS = 5
+_LISTENER_HEARTBEAT_SECONDS = 30
+
+
+def _approximate_size(value: Any) -> int:
+    try:
+        return len(json.dumps(value, default=str))
+    except (TypeError, ValueError):
+        return len(repr(value))
+
+
+class BoundedTTLCache:
+    """
+    Thread-safe LRU cache with a TTL, an entry cap and an approximate byte cap.
+
+    Invalidation bumps a generation counter, so a value computed from data read
+    before an invalidation is not stored after it.
+    """
+
+    def __init__(self, name: str, max_entries: int = DASHBOARD_CACHE_MAX_ENTRIES,
+                 max_bytes: int = DASHBOARD_CACHE_MAX_BYTES,
+                 ttl_seconds: float = DASHBOARD_CACHE_TTL_SECONDS):
+        self.name = name
+        self.max_entries = max(1, max_entries)
+        self.max_bytes = max(1, max_bytes)
+        self.ttl_seconds = ttl_seconds
+
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Tuple[Any, int, float]]" = OrderedDict()  # key -> (value, size, expires_at)
+        self._bytes = 0
+        self._generation = 0
+        self._inflight: Dict[str, asyncio.Future] = {}  # only touched on the event loop
+
+        self._hits = 0
+        self._misses = 0
+        self._coalesced = 0
+        self._evictions = 0
+        self._expirations = 0
+        self._invalidations = 0
+        self._oversized = 0
+
+    def _remove(self, key: str) -> None:
+        _, size, _ = self._entries.pop(key)
+        self._bytes -= size
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        """Return (found, value); a hit moves the key to the most-recently-used end."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return False, None
+            value, _, expires_at = entry
+            if time.monotonic() >= expires_at:
+                self._remove(key)
+                self._expirations += 1
+                self._misses += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return True, value
+
+    def set(self, key: str, value: Any, generation: Optional[int] = None) -> bool:
+        """
+        Store `value`, evicting least-recently-used entries to stay within the caps.
+        Skipped (returns False) if the cache was invalidated since `generation`, or
+        if the value alone is larger than max_bytes.
+        """
+        size = _approximate_size(value)
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return False
+            if size > self.max_bytes:
+                self._oversized += 1
+                return False
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (value, size, time.monotonic() + self.ttl_seconds)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self._evictions += 1
+            return True
+
+    def invalidate(self, prefix: Optional[str] = None) -> int:
+        """Drop every entry (or those whose key starts with `prefix`); returns how many."""
+        with self._lock:
+            self._generation += 1
+            self._invalidations += 1
+            if prefix is None:
+                dropped = len(self._entries)
+                self._entries.clear()
+                self._bytes = 0
+            else:
+                keys = [key for key in self._entries if key.startswith(prefix)]
+                for key in keys:
+                    self._remove(key)
+                dropped = len(keys)
+            return dropped
+
+    async def get_or_compute(self, key: str, compute: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Cached value for `key`, or the result of `compute()`. Concurrent callers that
+        miss on the same key share a single compute() call.
+        """
+        found, value = self.get(key)
+        if found:
+            return value
+
+        pending = self._inflight.get(key)
+        if pending is not None:
+            self._coalesced += 1
+            try:
+                return await asyncio.shield(pending)
+            except asyncio.CancelledError:
+                if not pending.cancelled():
+                    raise
+                # The request computing it went away; compute it here instead
+
+        with self._lock:
+            generation = self._generation
+        future = asyncio.get_running_loop().create_future()
+        # Waiters read the outcome; keep asyncio from warning when there are none
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self._inflight[key] = future
+        try:
+            value = await compute()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+        future.set_result(value)
+        self.set(key, value, generation=generation)
+        return value
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "name": self.name,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": round(self._hits / lookups, 4) if lookups else None,
+                "coalesced": self._coalesced,
+                "in_flight": len(self._inflight),
+                "evictions": self._evictions,
+                "expirations": self._expirations,
+                "invalidations": self._invalidations,
+                "oversized_skipped": self._oversized,
+                "listener_connected": _listener_connected,
+            }
+
+
+dashboard_cache = BoundedTTLCache("dashboard")
+
+
+# --- Invalidation ---
+
+_listener_task: Optional[asyncio.Task] = None
+_listener_connected = False
+
+
+def notify_dashboard_change(cur, reason: str) -> None:
+    """
+    Invalidate the dashboard cache in every worker once the cursor's transaction
+    commits. Call it next to the write, before commit.
+    """
+    cur.execute("SELECT pg_notify(%s, %s)", (DASHBOARD_CACHE_CHANNEL, reason))
+    if not _listener_connected:
+        # No notification will reach this worker; at least clear its own cache
+        dashboard_cache.invalidate()
+
+
+def _on_notification(connection, pid, channel, payload) -> None:
+    dashboard_cache.invalidate()
+
+
+async def _listen_forever() -> None:
+    global _listener_connected
+    while True:
+        conn = None
+        try:
+            conn = await asyncpg.connect(
+                host=DB_CONNECTION_PARAMS["host"],
+                port=int(DB_CONNECTION_PARAMS["port"]),
+                user=DB_CONNECTION_PARAMS["user"],
+                password=DB_CONNECTION_PARAMS["password"],
+                database=DB_CONNECTION_PARAMS["database"],
+            )
+            await conn.add_listener(DASHBOARD_CACHE_CHANNEL, _on_notification)
+            _listener_connected = True
+            # Anything cached before now may have missed a notification
+            dashboard_cache.invalidate()
+            print(f"Dashboard cache listening on '{DASHBOARD_CACHE_CHANNEL}'.", flush=True)
+            while not conn.is_closed():
+                await asyncio.sleep(_LISTENER_HEARTBEAT_SECONDS)
+                await conn.fetchval("SELECT 1", timeout=_LISTENER_HEARTBEAT_SECONDS)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"WARNING: Dashboard cache listener disconnected, retrying in {_LISTENER_RETRY_SECONDS}s: {e}", flush=True)
+        finally:
+            _listener_connected = False
+            if conn is not None and not conn.is_closed():
+                conn.terminate()
+        await asyncio.sleep(_LISTENER_RETRY_SECONDS)
+
+
+def start_dashboard_cache_listener() -> asyncio.Task:
+    """Start this worker's LISTEN loop (called from the app startup event)."""
+    global _listener_task
+    if _listener_task is None or _listener_task.done():
+        _listener_task = asyncio.create_task(_listen_forever())
+    return _listener_task
+
+
+async def stop_dashboard_cache_listener() -> None:
+    global _listener_task
+    if _listener_task is not None:
+        _listener_task.cancel()
+        try:
+            await _listener_task
+        except asyncio.CancelledError:
+            pass
+        _listener_task = None
@@ -1,24 +1,371 @@
-# db/connection.py
 import psycopg2
+import psycopg2.pool
+from psycopg2 import extensions
 from psycopg2.extras import RealDictCursor
-from typing import Generator
+from typing import Generator, Dict, Any, Optional
+from collections import deque
 import contextlib # FIX: ADD THIS IMPORT
+import os
+import sys
+import threading
+import time
+
+from config import ( # Correct absolute import
+    DB_CONNECTION_PARAMS,
+    DB_POOL_MIN_SIZE,
+    DB_POOL_MAX_SIZE,
+    DB_POOL_CHECKOUT_TIMEOUT_SECONDS,
+    DB_POOL_MAX_LIFETIME_SECONDS,
+    DB_POOL_HEALTH_CHECK_IDLE_SECONDS,
+)
+
+
+class PoolTimeoutError(psycopg2.pool.PoolError):
+    """Raised when no pooled connection becomes available within the checkout timeout."""
+    pass
+
+
+class BoundedConnectionPool:
+    """
+    Thread-safe, bounded psycopg2 connection pool.
+
+    - At most `max_size` connections are open at once; callers block (up to
+      `checkout_timeout` seconds) when all of them are checked out.
+    - Connections idle for longer than `health_check_idle` are pinged with
+      SELECT 1 before being handed out; dead ones are replaced transparently.
+    - Connections older than `max_lifetime` are closed and replaced on their
+      next checkout/return so server-side resources are recycled.
+    - Checkout wait times are recorded and exposed through stats().
+    """
+
+    def __init__(self, connect_params: Dict[str, Any], min_size: int = DB_POOL_MIN_SIZE,
+                 max_size: int = DB_POOL_MAX_SIZE,
+                 checkout_timeout: float = DB_POOL_CHECKOUT_TIMEOUT_SECONDS,
+                 max_lifetime: float = DB_POOL_MAX_LIFETIME_SECONDS,
+                 health_check_idle: float = DB_POOL_HEALTH_CHECK_IDLE_SECONDS):
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        self._connect_params = dict(connect_params)
+        self.min_size = max(0, min(min_size, max_size))
+        self.max_size = max_size
+        self.checkout_timeout = checkout_timeout
+        self.max_lifetime = max_lifetime
+        self.health_check_idle = health_check_idle
+
+        self._cond = threading.Condition()
+        self._idle = deque()  # (conn, created_at, last_used_at); right end = most recently used
+        self._created_at: Dict[int, float] = {}  # id(conn) -> creation time, for checked-out connections too
+        self._size = 0  # open connections (idle + checked out)
+        self._closed = False
+
+        self._metrics = {
+            "checkouts": 0,
+            "checkout_wait_total_seconds": 0.0,
+            "checkout_wait_max_seconds": 0.0,
+            "checkout_waits": 0,  # checkouts that had to block for a free slot
+            "checkout_timeouts": 0,
+            "connections_created": 0,
+            "connections_recycled": 0,
+            "connections_discarded": 0,  # failed health check / broken on return
+        }
+
+        for _ in range(self.min_size):
+            try:
+                conn = self._connect()
+            except psycopg2.Error as e:
+                print(f"WARNING: DB pool could not pre-open connection: {e}", flush=True)
+                break
+            with self._cond:
+                self._size += 1
+                self._idle.append((conn, self._created_at[id(conn)], time.monotonic()))
+
+    # --- internal helpers ---
+    def _connect(self):
+        conn = psycopg2.connect(**self._connect_params)
+        self._created_at[id(conn)] = time.monotonic()
+        with self._cond:
+            self._metrics["connections_created"] += 1
+        return conn
+
+    def _close_quietly(self, conn):
+        self._created_at.pop(id(conn), None)
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    def _drop(self, conn, metric: str):
+        """Close a connection and release its slot in the pool."""
+        self._close_quietly(conn)
+        with self._cond:
+            self._size -= 1
+            self._metrics[metric] += 1
+            self._cond.notify()
+
+    def _is_expired(self, created_at: float, now: float) -> bool:
+        return self.max_lifetime > 0 and (now - created_at) >= self.max_lifetime
+
+    @staticmethod
+    def _ping(conn) -> bool:
+        try:
+            with conn.cursor() as cur:
+                cur.execute("SELECT 1")
+                cur.fetchone()
+            conn.rollback()
+            return True
+        except Exception:
+            return False
+
+    # --- public API ---
+    def getconn(self, timeout: Optional[float] = None):
+        """Check out a healthy connection, blocking until one is free or the timeout expires."""
+        timeout = self.checkout_timeout if timeout is None else timeout
+        started = time.monotonic()
+        deadline = started + timeout
+        waited = False
+
+        while True:
+            conn = None
+            created_at = last_used = None
+            must_create = False
+            with self._cond:
+                while True:
+                    if self._closed:
+                        raise psycopg2.pool.PoolError("connection pool is closed")
+                    if self._idle:
+                        conn, created_at, last_used = self._idle.pop()
+                        break
+                    if self._size < self.max_size:
+                        self._size += 1  # reserve the slot before connecting outside the lock
+                        must_create = True
+                        break
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._metrics["checkout_timeouts"] += 1
+                        raise PoolTimeoutError(
+                            f"Timed out after {timeout:.1f}s waiting for a database connection "
+                            f"(pool max_size={self.max_size})"
+                        )
+                    waited = True
+                    self._cond.wait(remaining)
+
+            if must_create:
+                try:
+                    conn = self._connect()
+                except Exception:
+                    with self._cond:
+                        self._size -= 1
+                        self._cond.notify()
+                    raise
+            else:
+                now = time.monotonic()
+                if conn.closed or self._is_expired(created_at, now):
+                    self._drop(conn, "connections_recycled" if not conn.closed else "connections_discarded")
+                    continue
+                if (now - last_used) >= self.health_check_idle and not self._ping(conn):
+                    print("WARNING: DB pool discarded a connection that failed its health check", flush=True)
+                    self._drop(conn, "connections_discarded")
+                    continue
+
+            wait = time.monotonic() - started
+            with self._cond:
+                self._metrics["checkouts"] += 1
+                self._metrics["checkout_wait_total_seconds"] += wait
+                if wait > self._metrics["checkout_wait_max_seconds"]:
+                    self._metrics["checkout_wait_max_seconds"] = wait
+                if waited:
+                    self._metrics["checkout_waits"] += 1
+            return conn
+
+    def putconn(self, conn, discard: bool = False):
+        """Return a connection to the pool, rolling back any transaction the caller left open."""
+        if conn.closed or discard:
+            self._drop(conn, "connections_discarded")
+            return
+
+        try:
+            if conn.info.transaction_status != extensions.TRANSACTION_STATUS_IDLE:
+                conn.rollback()
+            if conn.autocommit:
+                conn.autocommit = False
+        except Exception:
+            self._drop(conn, "connections_discarded")
+            return
+
+        now = time.monotonic()
+        created_at = self._created_at.get(id(conn), now)
+        if self._is_expired(created_at, now):
+            self._drop(conn, "connections_recycled")
+            return
+
+        with self._cond:
+            if self._closed:
+                self._size -= 1
+                self._close_quietly(conn)
+                return
+            self._idle.append((conn, created_at, now))
+            self._cond.notify()
+
+    def closeall(self):
+        with self._cond:
+            self._closed = True
+            idle = list(self._idle)
+            self._idle.clear()
+            self._size -= len(idle)
+            self._cond.notify_all()
+        for conn, _, _ in idle:
+            self._close_quietly(conn)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            stats = dict(self._metrics)
+            stats.update({
+                "max_size": self.max_size,
+                "size": self._size,
+                "idle": len(self._idle),
+                "in_use": self._size - len(self._idle),
+            })
+        checkouts = stats["checkouts"]
+        stats["checkout_wait_avg_ms"] = round(stats["checkout_wait_total_seconds"] * 1000 / checkouts, 3) if checkouts else 0.0
+        stats["checkout_wait_max_ms"] = round(stats["checkout_wait_max_seconds"] * 1000, 3)
+        return stats
+
+
+# --- Process-wide pool ---
+# Created lazily and re-created after fork so each uvicorn worker owns its own sockets.
+# This is the single psycopg2 data-access layer: routers and services must check out
+# connections through get_db_connection() instead of calling psycopg2.connect().
+_pool: Optional[BoundedConnectionPool] = None
+_pool_pid: Optional[int] = None
+_pool_lock = threading.Lock()
+
+# Per-caller checkout accounting: caller -> counters
+_caller_stats: Dict[str, Dict[str, Any]] = {}
+_caller_stats_lock = threading.Lock()
+
+
+def get_pool() -> BoundedConnectionPool:
+    global _pool, _pool_pid
+    pid = os.getpid()
+    if _pool is not None and _pool_pid == pid:
+        return _pool
+    with _pool_lock:
+        if _pool is None or _pool_pid != pid:
+            _pool = BoundedConnectionPool(DB_CONNECTION_PARAMS)
+            _pool_pid = pid
+            with _caller_stats_lock:
+                _caller_stats.clear()
+        return _pool
+
+
+def close_pool():
+    """Close every idle pooled connection (called on application shutdown)."""
+    global _pool, _pool_pid
+    with _pool_lock:
+        if _pool is not None and _pool_pid == os.getpid():
+            _pool.closeall()
+        _pool = None
+        _pool_pid = None
+
+
+def _record_checkout(caller: str, wait: float):
+    with _caller_stats_lock:
+        stats = _caller_stats.setdefault(caller, {
+            "checkouts": 0, "in_use": 0, "peak_in_use": 0,
+            "wait_total_seconds": 0.0, "wait_max_seconds": 0.0, "hold_total_seconds": 0.0,
+            "errors": 0,
+        })
+        stats["checkouts"] += 1
+        stats["in_use"] += 1
+        stats["peak_in_use"] = max(stats["peak_in_use"], stats["in_use"])
+        stats["wait_total_seconds"] += wait
+        stats["wait_max_seconds"] = max(stats["wait_max_seconds"], wait)
+
+
+def _record_checkin(caller: str, held: float, failed: bool):
+    with _caller_stats_lock:
+        stats = _caller_stats.get(caller)
+        if stats is None:  # stats were reset after a fork while this connection was out
+            return
+        stats["in_use"] -= 1
+        stats["hold_total_seconds"] += held
+        if failed:
+            stats["errors"] += 1
+
+
+def _caller_module() -> str:
+    # Frame 0 is this helper, 1 the get_db_connection generator, 2 contextlib's __enter__,
+    # 3 the code executing the `with` statement.
+    try:
+        return sys._getframe(3).f_globals.get("__name__", "unknown")
+    except ValueError:
+        return "unknown"
+
+
+def get_pool_stats() -> Dict[str, Any]:
+    stats = get_pool().stats()
+    with _caller_stats_lock:
+        stats["callers"] = {caller: dict(values) for caller, values in _caller_stats.items()}
+    return stats
+
+
+def _apply_session_timeouts(conn, statement_timeout_ms: Optional[int], lock_timeout_ms: Optional[int]):
+    with conn.cursor() as cur:
+        if statement_timeout_ms is not None:
+            cur.execute("SET statement_timeout = %s", (int(statement_timeout_ms),))
+        if lock_timeout_ms is not None:
+            cur.execute("SET lock_timeout = %s", (int(lock_timeout_ms),))
+    conn.commit()
+
+
+def _reset_session_timeouts(conn):
+    if conn.info.transaction_status != extensions.TRANSACTION_STATUS_IDLE:
+        conn.rollback()
+    with conn.cursor() as cur:
+        cur.execute("RESET statement_timeout")
+        cur.execute("RESET lock_timeout")
+    if not conn.autocommit:
+        conn.commit()
 
-from config import DB_CONNECTION_PARAMS # Correct absolute import
 
 @contextlib.contextmanager # FIX: ADD THIS DECORATOR
-def get_db_connection() -> Generator[psycopg2.extensions.connection, None, None]:
+def get_db_connection(caller: Optional[str] = None,
+                      statement_timeout_ms: Optional[int] = None,
+                      lock_timeout_ms: Optional[int] = None) -> Generator[psycopg2.extensions.connection, None, None]:
     """
-    Establishes and yields a synchronous database connection.
-    Ensures the connection is closed after use.
+    Checks out and yields a synchronous database connection from the process-wide pool.
+    Ensures the connection is returned to the pool after use; any transaction left
+    open by the caller is rolled back, exactly as closing the connection used to do.
+
+    `caller` labels the checkout in get_pool_stats() (defaults to the calling module).
+    `statement_timeout_ms` / `lock_timeout_ms` apply only for this checkout and are
+    reset before the connection goes back to the pool.
     """
-    conn = None
+    caller = caller or _caller_module()
+    pool = get_pool()
+    started = time.monotonic()
+    conn = pool.getconn()
+    checked_out = time.monotonic()
+    _record_checkout(caller, checked_out - started)
+
+    discard = False
+    failed = False
+    has_session_timeouts = statement_timeout_ms is not None or lock_timeout_ms is not None
     try:
-        conn = psycopg2.connect(**DB_CONNECTION_PARAMS)
+        if has_session_timeouts:
+            _apply_session_timeouts(conn, statement_timeout_ms, lock_timeout_ms)
         yield conn
+    except BaseException:
+        failed = True
+        raise
     finally:
-        if conn:
-            conn.close()
+        if has_session_timeouts and not conn.closed:
+            try:
+                _reset_session_timeouts(conn)
+            except Exception:
+                discard = True  # never hand out a connection with someone else's timeouts
+        _record_checkin(caller, time.monotonic() - checked_out, failed)
+        pool.putconn(conn, discard=discard)
 
 @contextlib.contextmanager # FIX: ADD THIS DECORATOR
 def get_db_cursor(conn: psycopg2.extensions.connection) -> Generator[RealDictCursor, None, None]:
@@ -2,7 +2,7 @@
 import psycopg2
 from psycopg2.extras import RealDictCursor
 from datetime import date, datetime, time, timedelta # Added datetime, time for new table defaults
-from typing import Dict, Any, List, Optional, Union, Annotated
+from typing import Dict, Any, List, Optional, Set, Tuple, Union, Annotated
 import json
 import requests
 import asyncio
@@ -13,6 +13,16 @@ import re
 import asyncpg
 import os
 from .connection import get_db_connection, get_db_cursor
+from .async_connection import use_async_path, run_plan_async, run_plan_sync
+from .cache import notify_dashboard_change
+from .pagination import (
+    KEYSET_ORDER, KEYSET_PREDICATE, decode_cursor, encode_cursor, filter_fingerprint,
+    plan_row_estimate, total_count as keyset_total_count,
+)
+from .unit_of_work import (
+    open_unit_of_work, insert_case_main_row, insert_case_main_rows, insert_case_history_row, insert_case_log_row,
+    get_general_queue_user, insert_auto_assignment_row, insert_case_details_1_row, base_ack_no_for,
+)
 # Ensure all necessary models are imported from base_models.py
 from models.base_models import CaseEntryData, I4CData, TransactionData, BeneficiaryData, PotentialSuspectAccountData, CaseMainUpdateData, ECBCaseData, NewCustomerRequest
 from config import DB_CONNECTION_PARAMS
@@ -136,76 +146,7 @@ async def save_or_update_decision(executor: ThreadPoolExecutor, case_id: int, da
     def _sync_save_decision():
         with get_db_connection() as conn:
             with get_db_cursor(conn) as cur:
-                # FIX: Align with actual case_history schema (remarks, updated_by)
-                db_data_for_insert_update = {
-                    "remarks": data.get('comments'), # Map frontend 'comments' to DB 'remarks'
-                    "updated_by": data.get('assignedEmployee'), # Map frontend 'assignedEmployee' to DB 'updated_by'
-                    # REMOVED: "short_dn": data.get('riskScore'),
-                    # REMOVED: "long_dn": data.get('systemExplanation'),
-                    # REMOVED: "decision_type": data.get('decisionAction'),
-                    # REMOVED: "assigned_employee": data.get('assignedEmployee'), (this was in old decision table)
-                    # REMOVED: "audit_trail": data.get('auditTrail'), (this was in old decision table)
-                    # REMOVED: "system_recommendation": data.get('systemRecommendation'),
-                    # REMOVED: "system_explanation": data.get('systemExplanation')
-                }
-
-                filtered_db_data = {k: v if v != '' else None for k, v in db_data_for_insert_update.items()}
-                
-                db_columns_list = ["case_id"] # Always include case_id
-                db_values_list = [case_id]
-
-                for key, value in filtered_db_data.items():
-                    db_columns_list.append(key)
-                    db_values_list.append(value)
-
-                update_set_parts = [f"{col} = EXCLUDED.{col}" for col in db_columns_list if col != "case_id"]
-                update_set_parts.append("created_time = NOW()") # Update timestamp
-
-                insert_cols_str = ", ".join(db_columns_list)
-                insert_placeholders_str = ", ".join(["%s"] * len(db_columns_list))
-                update_set_str = ", ".join(update_set_parts)
-
-                # Since case_history is designed for audit trail (multiple entries per case_id),
-                # we should just INSERT a new record instead of trying to update
-                cur.execute(
-                    f"""
-                    INSERT INTO public.case_history ({insert_cols_str})
-                    VALUES ({insert_placeholders_str})
-                    RETURNING *;
-                    """,
-                    tuple(db_values_list)
-                )
-                
-                updated_decision_record = cur.fetchone()
-                
-                # Update case_main table status and closing_date if decision action indicates case closure
-                decision_action = data.get('decisionAction')
-                if decision_action:
-                    new_status = None
-                    should_set_closing_date = False
-                    
-                    if decision_action in ['Close Case', 'Closed', 'Approve', 'Reject']:
-                        new_status = 'Closed'
-                        should_set_closing_date = True
-                    elif decision_action == 'Mark as False Positive':
-                        new_status = 'False Positive'
-                        should_set_closing_date = True
-                    elif decision_action == 'Assigned':
-                        new_status = 'Assigned'
-                    
-                    if new_status:
-                        update_query = "UPDATE public.case_main SET status = %s"
-                        update_params = [new_status]
-                        
-                        if should_set_closing_date:
-                            update_query += ", closing_date = CURRENT_DATE"
-                        
-                        update_query += " WHERE case_id = %s"
-                        update_params.append(case_id)
-                        
-                        cur.execute(update_query, tuple(update_params))
-                        print(f"✅ Case {case_id} status updated to '{new_status}' in case_main table.", flush=True)
-                
+                updated_decision_record = insert_case_history_row(cur, case_id, data)
                 conn.commit()
                 print(f"✅ Decision record for case_id {case_id} saved/updated in case_history.", flush=True)
 
@@ -240,6 +181,30 @@ async def get_decision(executor: ThreadPoolExecutor, case_id: int) -> Optional[D
     return await _execute_sync_op_standalone(executor, _sync_get_decision)
 
 
+# Transaction check for many (vm_acc, bm_acc, from_date, to_date) windows at once:
+# the pairs are unnested in input order and each gets an EXISTS probe (stops at the
+# first matching txn row) instead of a COUNT(*) round trip. The dates go in as
+# timestamps so BETWEEN compares exactly as the per-pair query did.
+BULK_TXN_CHECK_SQL = """
+    SELECT p.vm_acc, p.bm_acc,
+           EXISTS (
+               SELECT 1 FROM public.txn t
+               WHERE t.acct_num = p.vm_acc AND t.bene_acct_num = p.bm_acc
+                 AND t.txn_date BETWEEN p.from_date AND p.to_date
+           ) AS has_txn
+    FROM unnest(%s::text[], %s::text[], %s::timestamp[], %s::timestamp[])
+         WITH ORDINALITY AS p(vm_acc, bm_acc, from_date, to_date, ord)
+    ORDER BY p.ord;
+"""
+
+
+def bulk_txn_check_params(vm_bm_pairs: List[Dict]) -> Tuple[list, list, list, list]:
+    """BULK_TXN_CHECK_SQL parameters (one array per column) for bulk_check_transactions pairs"""
+    return (
+        [pair['vm_acc'] for pair in vm_bm_pairs], [pair['bm_acc'] for pair in vm_bm_pairs],
+        [pair['from_date'] for pair in vm_bm_pairs], [pair['to_date'] for pair in vm_bm_pairs],
+    )
+
 
 # --- CaseEntryMatcher Class (Core logic for both old and new systems) ---
 class CaseEntryMatcher:
@@ -253,6 +218,27 @@ class CaseEntryMatcher:
     async def _execute_sync_db_op(self, func, *args, **kwargs):
         return await asyncio.get_running_loop().run_in_executor(self.executor, func, *args, **kwargs)
 
+    async def _run_read_plan(self, method_name: str, plan_factory):
+        """
+        Runs a read-only query plan (see db/async_connection.py). Methods switched on in
+        config.DB_ASYNC_READ_METHODS run natively on the asyncpg pool; everything else,
+        or any plan asyncpg cannot bind, runs on a pooled psycopg2 cursor in the executor.
+        """
+        if use_async_path(method_name):
+            try:
+                return await run_plan_async(plan_factory())
+            except (asyncpg.exceptions.InterfaceError, asyncpg.exceptions.DataError) as e:
+                # asyncpg is strict about parameter types (a str for an int or date, a Decimal
+                # for a float ...) and reports that as InterfaceError or DataError; reads are
+                # safe to retry on psycopg2, where a genuine data error surfaces the usual way
+                print(f"WARNING: {method_name} falling back to executor path: {e}", flush=True)
+
+        def _sync_run_plan():
+            with get_db_connection() as conn:
+                with get_db_cursor(conn) as cur:
+                    return run_plan_sync(cur, plan_factory())
+        return await self._execute_sync_db_op(_sync_run_plan)
+
     def _sync_check_transactions_for_ecb_creation(self, vm_acc_num: str, bm_acc_num: str, to_date: date, from_date: date) -> bool:
         """
         Synchronous helper to check for transfers from VM to BM account in the txn table.
@@ -290,26 +276,12 @@ class CaseEntryMatcher:
         def _sync_insert():
             with get_db_connection() as conn:
                 with get_db_cursor(conn) as cur:
-                    actual_short_dn = customer_full_name or "N/A"
-                    actual_long_dn = remarks_input or ""
-                    actual_decision_type = decision_input or "N/A"
-
                     try:
-                        cur.execute("""
-                            INSERT INTO public.case_main (
-                                case_type, source_ack_no, cust_id, acc_num, source_bene_accno,
-                                is_operational, status, creation_date, creation_time,
-                                short_dn, long_dn, decision_type, location, disputed_amount, created_by, email_body, email_summary
-                            )
-                            VALUES (%s, %s, %s, %s, %s, %s, %s, (NOW() AT TIME ZONE 'Asia/Kolkata')::date, (NOW() AT TIME ZONE 'Asia/Kolkata')::time, %s, %s, %s, %s, %s, %s, %s, %s)
-                            RETURNING case_id;
-                        """, (
-                            case_type, source_ack_no, cust_id, acc_num, source_bene_accno,
-                            is_operational, status,
-                            actual_short_dn, actual_long_dn, actual_decision_type,
-                            location, disputed_amount, created_by or "System", email_body, email_summary
-                        ))
-                        new_case_id = cur.fetchone()['case_id']
+                        new_case_id = insert_case_main_row(
+                            cur, case_type, source_ack_no, cust_id, acc_num, source_bene_accno,
+                            is_operational, status, decision_input, remarks_input, customer_full_name,
+                            location, disputed_amount, created_by, email_body, email_summary
+                        )
                         conn.commit()
                         return new_case_id
                     except psycopg2.Error as e:
@@ -367,30 +339,18 @@ class CaseEntryMatcher:
                 # Get first available risk officer
                 with get_db_connection() as conn:
                     with get_db_cursor(conn) as cur:
-                        cur.execute("""
-                            SELECT user_name 
-                            FROM user_table 
-                            WHERE user_type = 'risk_officer'
-                            ORDER BY user_name
-                            LIMIT 1
-                        """)
-                        result = cur.fetchone()
+                        assigned_user = get_general_queue_user(cur)
                         
-                        if not result:
+                        if not assigned_user:
                             print(f"ERROR: No risk officers available for case assignment", flush=True)
                             return None
                         
-                        assigned_user = result['user_name']
-                        
                         # Ensure assignment table columns exist
                         cur.execute("ALTER TABLE assignment ADD COLUMN IF NOT EXISTS is_active BOOLEAN DEFAULT TRUE")
                         cur.execute("ALTER TABLE assignment ADD COLUMN IF NOT EXISTS assignment_type VARCHAR(50) DEFAULT 'manual'")
                         
                         # Insert assignment record
-                        cur.execute("""
-                            INSERT INTO assignment (case_id, assigned_to, assigned_by, comment, is_active, assignment_type)
-                            VALUES (%s, %s, %s, %s, TRUE, 'auto')
-                        """, (case_id, assigned_user, "System", f"Auto-assigned {case_type} case to general queue"))
+                        insert_auto_assignment_row(cur, case_id, case_type, assigned_user)
                         
                         conn.commit()
                         print(f"✅ Case {case_id} successfully assigned to general queue: {assigned_user}", flush=True)
@@ -1235,17 +1195,7 @@ class CaseEntryMatcher:
             def _sync_insert():
                 with get_db_connection() as conn:
                     with get_db_cursor(conn) as cur:
-                        cur.execute("""
-                            INSERT INTO public.case_details_1 (
-                                cust_id, casetype, acc_no, match_flag, creation_timestamp
-                            )
-                            VALUES (%s, %s, %s, %s, NOW())
-                        """, (
-                            cust_id,
-                            case_type,
-                            acc_no,
-                            "ECB/ECBNT Match"
-                        ))
+                        insert_case_details_1_row(cur, cust_id, case_type, acc_no, "ECB/ECBNT Match")
                         conn.commit()
             await self._execute_sync_db_op(_sync_insert)
 
@@ -1627,82 +1577,88 @@ class CaseEntryMatcher:
         2. Finding matching beneficiary accounts in acc_bene table
         3. Checking for transactions between customer and beneficiary accounts
         4. Creating ECBNT (no transactions) or ECBT (with transactions) cases
+
+        Steps 1-3 are one query over all of the customer's accounts, and the cases go in
+        with multi-row inserts (case_main, case_logs, assignment, case_history,
+        case_details_1) in one transaction on one connection: either every ECB case
+        for the customer is created or none is.
         """
+        def _sync_find_pairs(cur):
+            # One row per (account, beneficiary); accounts without beneficiaries come back with NULLs
+            cur.execute("""
+                SELECT ac.acc_num AS cust_acct_num, ab.bene_acct_num, ab.bene_name,
+                       ab.bene_acct_num IS NOT NULL AND EXISTS (
+                           SELECT 1 FROM public.txn t
+                           WHERE t.acct_num = ac.acc_num AND t.bene_acct_num = ab.bene_acct_num
+                       ) AS has_transactions
+                FROM public.account_customer ac
+                LEFT JOIN public.acc_bene ab ON ab.cust_acct_num = ac.acc_num
+                WHERE ac.cust_id = %s
+            """, (cust_id,))
+            return cur.fetchall()
+
         try:
-            # Step 1: Get customer account numbers
-            customer_accounts = await self._get_customer_accounts(cust_id)
-            if not customer_accounts:
-                print(f"No accounts found for customer {cust_id}, skipping ECB case creation")
-                return {"ecb_cases_created": 0, "message": "No customer accounts found"}
+            # Pool checkout, queries and return all run on the executor
+            async with open_unit_of_work(self.executor, "ecb_cases_for_customer") as uow:
+                try:
+                    rows = await uow.run(_sync_find_pairs)
+                    if not rows:
+                        print(f"No accounts found for customer {cust_id}, skipping ECB case creation")
+                        return {"ecb_cases_created": 0, "message": "No customer accounts found"}
+
+                    cases, histories, details, ecb_cases_created = [], [], [], []
+                    for row in rows:
+                        if row['bene_acct_num'] is None:
+                            continue
+                        cust_acct_num, bene_acct_num = row['cust_acct_num'], row['bene_acct_num']
+                        bene_name, has_transactions = row['bene_name'], row['has_transactions']
+
+                        if has_transactions:
+                            case_type = 'ECBT'
+                            base_description = f"Existing Customer with Transaction to Beneficiary: Customer {cust_id} (Account: {cust_acct_num}) has transactions with Beneficiary {bene_name} (Account: {bene_acct_num})"
+                        else:
+                            case_type = 'ECBNT'
+                            base_description = f"Existing Customer with No Transaction to Beneficiary: Customer {cust_id} (Account: {cust_acct_num}) has beneficiary {bene_name} (Account: {bene_acct_num}) but no transactions"
 
-            ecb_cases_created = []
-            
-            for account in customer_accounts:
-                cust_acct_num = account['acc_num']
-                
-                # Step 2: Find matching beneficiary accounts
-                matching_beneficiaries = await self._find_matching_beneficiaries(cust_acct_num)
-                
-                for beneficiary in matching_beneficiaries:
-                    bene_acct_num = beneficiary['bene_acct_num']
-                    bene_name = beneficiary['bene_name']
-                    
-                    # Step 3: Check for transactions between customer and beneficiary
-                    has_transactions = await self._check_customer_beneficiary_transactions(cust_acct_num, bene_acct_num)
-                    
-                    # Step 4: Create appropriate case type
-                    if has_transactions:
-                        case_type = 'ECBT'
-                        base_description = f"Existing Customer with Transaction to Beneficiary: Customer {cust_id} (Account: {cust_acct_num}) has transactions with Beneficiary {bene_name} (Account: {bene_acct_num})"
-                    else:
-                        case_type = 'ECBNT'
-                        base_description = f"Existing Customer with No Transaction to Beneficiary: Customer {cust_id} (Account: {cust_acct_num}) has beneficiary {bene_name} (Account: {bene_acct_num}) but no transactions"
-                    
-                    # Add reverification flags data if available
-                    if reverification_data:
-                        reverification_info = f" | Mobile Number Match: {reverification_data.get('mobile_number')} | Reason: {reverification_data.get('reason_flagged')} | Sensitivity: {reverification_data.get('sensitivity_index')} | TSP: {reverification_data.get('tspname')} | Details: {reverification_data.get('distribution_details')}"
-                        case_description = base_description + reverification_info
-                    else:
-                        case_description = base_description
-                    
-                    # Create ECB case (removed duplicate check - allow multiple cases per customer/beneficiary)
-                    case_ack_no = f"{case_type}_{cust_id}_{uuid.uuid4().hex[:8].upper()}"
-                    
-                    new_case_main_id = await self.insert_into_case_main(
-                        case_type=case_type,
-                        source_ack_no=case_ack_no,
-                        cust_id=cust_id,
-                        acc_num=cust_acct_num,
-                        is_operational=False,  # Stage 2 case
-                        status='New',
-                        decision_input='Pending Review',
-                        remarks_input=case_description,
-                        customer_full_name=customer_full_name,
-                        location=None,
-                        disputed_amount=None,
-                        created_by=created_by_user or "System",
-                        email_body=email_body,
-                        email_summary=email_summary
-                    )
-                    
-                    if new_case_main_id:
-                        # Insert initial history
-                        initial_history_data = {
+                        # Add reverification flags data if available
+                        if reverification_data:
+                            reverification_info = f" | Mobile Number Match: {reverification_data.get('mobile_number')} | Reason: {reverification_data.get('reason_flagged')} | Sensitivity: {reverification_data.get('sensitivity_index')} | TSP: {reverification_data.get('tspname')} | Details: {reverification_data.get('distribution_details')}"
+                            case_description = base_description + reverification_info
+                            # For MM-triggered ECB cases, include mobile number match info
+                            mobile_short = (reverification_data.get('mobile_number') or '')[-4:]
+                            match_flag_text = f"{case_type}-MM-{mobile_short}-{bene_acct_num[-4:]}"
+                        else:
+                            case_description = base_description
+                            match_flag_text = f"{case_type}-{cust_acct_num[-4:]}-{bene_acct_num[-4:]}"
+
+                        # Create ECB case (removed duplicate check - allow multiple cases per customer/beneficiary)
+                        case_ack_no = f"{case_type}_{cust_id}_{uuid.uuid4().hex[:8].upper()}"
+                        cases.append(dict(
+                            case_type=case_type,
+                            source_ack_no=case_ack_no,
+                            cust_id=cust_id,
+                            acc_num=cust_acct_num,
+                            is_operational=False,  # Stage 2 case
+                            status='New',
+                            decision_input='Pending Review',
+                            remarks_input=case_description,
+                            customer_full_name=customer_full_name,
+                            location=None,
+                            disputed_amount=None,
+                            created_by=created_by_user or "System",
+                            email_body=email_body,
+                            email_summary=email_summary
+                        ))
+                        histories.append({
                             "remarks": f"{case_type} case created: Customer {cust_id} account {cust_acct_num} {'has' if has_transactions else 'no'} transactions with beneficiary {bene_name} account {bene_acct_num}",
                             "short_dn": case_type,
                             "long_dn": case_description,
                             "decision_type": "Automated Trigger",
                             "updated_by": created_by_user or "System"
-                        }
-                        await save_or_update_decision(self.executor, new_case_main_id, initial_history_data)
-                        
-                        # Insert into case_details_1 for ECB case tracking
-                        await self._insert_ecb_case_details(
-                            cust_id, cust_acct_num, bene_acct_num, bene_name, case_type, reverification_data
-                        )
-                        
+                        })
+                        # case_details_1 row for ECB case tracking
+                        details.append((cust_id, case_type, cust_acct_num, match_flag_text))
                         ecb_cases_created.append({
-                            "case_id": new_case_main_id,
                             "ack_no": case_ack_no,
                             "case_type": case_type,
                             "customer_id": cust_id,
@@ -1711,9 +1667,19 @@ class CaseEntryMatcher:
                             "beneficiary_name": bene_name,
                             "has_transactions": has_transactions
                         })
-                        
-                        print(f"✅ {case_type} case created: {case_ack_no} for customer {cust_id} account {cust_acct_num} and beneficiary {bene_acct_num}")
-            
+
+                    case_ids = await uow.create_cases(cases)
+                    await uow.add_history_rows(list(zip(case_ids, histories)))
+                    await uow.add_case_details_1_rows(details)
+                    await uow.commit()
+                except Exception:
+                    await uow.rollback()
+                    raise
+
+            ecb_cases_created = [{"case_id": case_id, **case} for case_id, case in zip(case_ids, ecb_cases_created)]
+            for case in ecb_cases_created:
+                print(f"✅ {case['case_type']} case created: {case['ack_no']} for customer {cust_id} account {case['customer_account']} and beneficiary {case['beneficiary_account']}")
+
             return {
                 "ecb_cases_created": len(ecb_cases_created),
                 "cases": ecb_cases_created,
@@ -1741,21 +1707,6 @@ class CaseEntryMatcher:
         accounts = await self._execute_sync_db_op(_sync_get_accounts)
         return [{"acc_num": acc['acc_num'], "acc_name": acc['acc_name'], "rel_type": acc['rel_type'], "instructions": acc['instructions']} for acc in accounts]
 
-    async def _find_matching_beneficiaries(self, cust_acct_num: str) -> List[Dict[str, Any]]:
-        """Find beneficiary accounts that match the customer account number"""
-        def _sync_find_beneficiaries():
-            with get_db_connection() as conn:
-                with get_db_cursor(conn) as cur:
-                    cur.execute("""
-                        SELECT bene_acct_num, bene_name, bene_bank_name, bene_status
-                        FROM public.acc_bene
-                        WHERE cust_acct_num = %s
-                    """, (cust_acct_num,))
-                    return cur.fetchall()
-        
-        beneficiaries = await self._execute_sync_db_op(_sync_find_beneficiaries)
-        return [{"bene_acct_num": ben['bene_acct_num'], "bene_name": ben['bene_name'], "bene_bank_name": ben['bene_bank_name'], "bene_status": ben['bene_status']} for ben in beneficiaries]
-
     async def _check_customer_beneficiary_transactions(self, cust_acct_num: str, bene_acct_num: str) -> bool:
         """Check if there are any transactions between customer and beneficiary accounts"""
         def _sync_check_transactions():
@@ -1787,42 +1738,6 @@ class CaseEntryMatcher:
         
         return await self._execute_sync_db_op(_sync_check)
 
-    async def _insert_ecb_case_details(self, cust_id: str, cust_acct_num: str, bene_acct_num: str, 
-                                     bene_name: str, case_type: str, reverification_data: Dict[str, Any] = None):
-        """Insert ECB case details into case_details_1 table"""
-        def _sync_insert():
-            with get_db_connection() as conn:
-                with get_db_cursor(conn) as cur:
-                    # Create match_flag for ECB cases
-                    if reverification_data:
-                        # For MM-triggered ECB cases, include mobile number match info
-                        mobile_short = reverification_data.get('mobile_number', '')[-4:]
-                        match_flag_text = f"{case_type}-MM-{mobile_short}-{bene_acct_num[-4:]}"
-                    else:
-                        # For regular ECB cases
-                        match_flag_text = f"{case_type}-{cust_acct_num[-4:]}-{bene_acct_num[-4:]}"
-                    
-                    cur.execute("""
-                        INSERT INTO public.case_details_1 (
-                            cust_id, casetype, mobile, email, pan, aadhar, acc_no,
-                            card, match_flag, creation_timestamp
-                        )
-                        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, NOW())
-                    """, (
-                        cust_id,
-                        case_type,
-                        None,  # mobile
-                        None,  # email
-                        None,  # pan
-                        None,  # aadhar
-                        cust_acct_num,  # acc_no
-                        None,  # card
-                        match_flag_text
-                    ))
-                    conn.commit()
-        
-        await self._execute_sync_db_op(_sync_insert)
-
     async def fetch_user_type(self, user_name: str) -> Optional[str]:
         """Cached version of fetch_user_type for better performance"""
         global USER_TYPE_CACHE
@@ -1911,6 +1826,8 @@ class CaseEntryMatcher:
 
                     cur.execute(sql_query, tuple(params))
                     updated_record = cur.fetchone()
+                    if updated_record and {"status", "assignedTo", "caseType", "isOperational"} & update_data.keys():
+                        notify_dashboard_change(cur, "case_status")
                     conn.commit()
                     return updated_record
         try:
@@ -2035,11 +1952,7 @@ class CaseEntryMatcher:
                             cm.location,
                             latest_assignment.assigned_to
                         FROM case_main cm
-                        LEFT JOIN case_entry_form cef ON (
-                            cef.ack_no = cm.source_ack_no 
-                            OR cef.ack_no = SPLIT_PART(cm.source_ack_no, '_', 1)
-                            OR cef.ack_no = SUBSTRING(cm.source_ack_no, 1, GREATEST(1, POSITION('_' IN cm.source_ack_no) - 1))
-                        )
+                        LEFT JOIN case_entry_form cef ON cef.ack_no = cm.base_ack_no
                         LEFT JOIN (
                             SELECT DISTINCT ON (case_id) 
                                 case_id, 
@@ -2144,11 +2057,7 @@ class CaseEntryMatcher:
                                     cm.location
                                 FROM case_main cm
                                 INNER JOIN assignment a ON cm.case_id = a.case_id AND a.assigned_to = %s
-                                LEFT JOIN case_entry_form cef ON (
-                                    cef.ack_no = cm.source_ack_no 
-                                    OR cef.ack_no = SPLIT_PART(cm.source_ack_no, '_', 1)
-                                    OR cef.ack_no = SUBSTRING(cm.source_ack_no, 1, GREATEST(1, POSITION('_' IN cm.source_ack_no) - 1))
-                                )
+                                LEFT JOIN case_entry_form cef ON cef.ack_no = cm.base_ack_no
                             """
                             params.insert(0, current_logged_in_username)
                         else:
@@ -2185,10 +2094,129 @@ class CaseEntryMatcher:
         """
         Fetch cases with server-side pagination, search, and sorting
         """
-        def _sync_fetch_new_cases_list_paginated():
-            with get_db_connection() as conn:
-                with get_db_cursor(conn) as cur:
-                    # Base query - simplified to avoid duplicates
+        def _new_cases_list_paginated_plan():
+            # Base query - simplified to avoid duplicates
+            base_query = """
+                SELECT DISTINCT
+                    cm.case_id,
+                    cm.case_type,
+                    cm.source_ack_no,
+                    cm.source_bene_accno,
+                    cm.acc_num,
+                    cm.cust_id,
+                    cm.creation_date,
+                    cm.creation_time,
+                    cm.is_operational,
+                    cm.status,
+                    cm.short_dn,
+                    cm.long_dn,
+                    cm.decision_type,
+                    cm.created_by,
+                    cm.disputed_amount,
+                    cm.location,
+                    latest_assignment.assigned_to
+                FROM case_main cm
+                LEFT JOIN case_entry_form cef ON cef.ack_no = cm.base_ack_no
+                LEFT JOIN (
+                    SELECT DISTINCT ON (case_id) 
+                        case_id, 
+                        assigned_to,
+                        assign_date,
+                        assign_time
+                    FROM assignment 
+                    WHERE COALESCE(is_active, TRUE) = TRUE
+                    ORDER BY case_id, assign_date DESC, assign_time DESC
+                ) latest_assignment ON latest_assignment.case_id = cm.case_id
+            """
+                    
+            count_query = """
+                SELECT COUNT(DISTINCT cm.case_id)
+                FROM case_main cm
+                LEFT JOIN case_entry_form cef ON cef.ack_no = cm.base_ack_no
+                LEFT JOIN (
+                    SELECT DISTINCT ON (case_id) 
+                        case_id, 
+                        assigned_to,
+                        assign_date,
+                        assign_time
+                    FROM assignment 
+                    WHERE COALESCE(is_active, TRUE) = TRUE
+                    ORDER BY case_id, assign_date DESC, assign_time DESC
+                ) latest_assignment ON latest_assignment.case_id = cm.case_id
+            """
+                    
+            where_clauses = []
+            params = []
+                    
+            # Add search filter across multiple fields
+            if search:
+                search_clause = """
+                    (
+                        cm.case_id::text ILIKE %s OR
+                        cm.source_ack_no ILIKE %s OR
+                        cm.case_type ILIKE %s OR
+                        cm.status ILIKE %s OR
+                        cm.created_by ILIKE %s OR
+                        latest_assignment.assigned_to ILIKE %s OR
+                        cm.location ILIKE %s OR
+                        cm.acc_num ILIKE %s OR
+                        cm.cust_id::text ILIKE %s
+                    )
+                """
+                where_clauses.append(search_clause)
+                search_param = f"%{search}%"
+                # Add search parameter 9 times for each field
+                params.extend([search_param] * 9)
+                    
+            # Role-based filtering (same logic as original method)
+            if current_logged_in_username and current_logged_in_user_type:
+                if current_logged_in_user_type in ('CRO', 'super_user'):
+                    pass  # CRO and super_user can see all cases
+                elif current_logged_in_user_type == 'risk_officer':
+                    # Risk officer filtering
+                    try:
+                        is_active_column = yield ("""
+                            SELECT 1 FROM information_schema.columns 
+                            WHERE table_schema = 'public' AND table_name = 'assignment' AND column_name = 'is_active'
+                        """, (), "one")
+                        has_is_active = is_active_column is not None
+                    except Exception:
+                        has_is_active = False
+
+                    if has_is_active:
+                        where_clauses.append("""
+                            (
+                                latest_assignment.assigned_to = %s
+                                OR
+                                latest_assignment.assigned_to IS NULL
+                            )
+                        """)
+                        params.append(current_logged_in_username)
+                    else:
+                        where_clauses.append("""
+                            (
+                                EXISTS (
+                                    SELECT 1 FROM assignment a2 
+                                    WHERE a2.case_id = cm.case_id 
+                                    AND a2.assigned_to = %s
+                                )
+                                OR
+                                NOT EXISTS (
+                                    SELECT 1 FROM assignment a3 
+                                    WHERE a3.case_id = cm.case_id
+                                )
+                            )
+                            AND
+                            NOT EXISTS (
+                                SELECT 1 FROM assignment a4
+                                WHERE a4.case_id = cm.case_id
+                                AND a4.assigned_by = %s
+                                AND a4.assigned_to != %s
+                            )
+                        """)
+                        params.extend([current_logged_in_username, current_logged_in_username, current_logged_in_username])
+                elif current_logged_in_user_type in ('others', 'supervisor'):
+                    # Others can only see cases assigned to them
                     base_query = """
                         SELECT DISTINCT
                             cm.case_id,
@@ -2205,35 +2233,263 @@ class CaseEntryMatcher:
                             cm.long_dn,
                             cm.decision_type,
                             cm.created_by,
+                            a.assigned_to,
+                            a.assigned_by,
                             cm.disputed_amount,
-                            cm.location,
-                            latest_assignment.assigned_to
+                            cm.location
                         FROM case_main cm
-                        LEFT JOIN case_entry_form cef ON (
-                            cef.ack_no = cm.source_ack_no 
-                            OR cef.ack_no = SPLIT_PART(cm.source_ack_no, '_', 1)
-                            OR cef.ack_no = SUBSTRING(cm.source_ack_no, 1, GREATEST(1, POSITION('_' IN cm.source_ack_no) - 1))
-                        )
-                        LEFT JOIN (
-                            SELECT DISTINCT ON (case_id) 
-                                case_id, 
-                                assigned_to,
-                                assign_date,
-                                assign_time
-                            FROM assignment 
-                            WHERE COALESCE(is_active, TRUE) = TRUE
-                            ORDER BY case_id, assign_date DESC, assign_time DESC
-                        ) latest_assignment ON latest_assignment.case_id = cm.case_id
+                        INNER JOIN assignment a ON cm.case_id = a.case_id AND a.assigned_to = %s
+                        LEFT JOIN case_entry_form cef ON cef.ack_no = cm.base_ack_no
                     """
-                    
                     count_query = """
                         SELECT COUNT(DISTINCT cm.case_id)
                         FROM case_main cm
-                        LEFT JOIN case_entry_form cef ON (
-                            cef.ack_no = cm.source_ack_no 
-                            OR cef.ack_no = SPLIT_PART(cm.source_ack_no, '_', 1)
-                            OR cef.ack_no = SUBSTRING(cm.source_ack_no, 1, GREATEST(1, POSITION('_' IN cm.source_ack_no) - 1))
-                        )
+                        INNER JOIN assignment a ON cm.case_id = a.case_id AND a.assigned_to = %s
+                        LEFT JOIN case_entry_form cef ON cef.ack_no = cm.base_ack_no
+                    """
+                    params.insert(0, current_logged_in_username)
+                else:
+                    where_clauses.append("FALSE")  # Unknown user type
+            else:
+                pass  # No user info, show all cases
+                    
+            # Add where clauses to both queries
+            where_clause = ""
+            if where_clauses:
+                where_clause = " WHERE " + " AND ".join(where_clauses)
+                    
+            # Add where clause to count query
+            count_query += where_clause
+                    
+            # Execute count query first
+            count_result = yield (count_query, params, "one")
+            total_count = list(count_result.values())[0] if count_result else 0
+                    
+            # Add ordering and pagination to main query
+            order_clause = "ORDER BY cm.creation_date DESC, cm.creation_time DESC"
+            if sort_column:
+                # Validate sort column to prevent SQL injection
+                valid_sort_columns = {
+                    'case_id', 'case_type', 'source_ack_no', 'status', 
+                    'creation_date', 'assigned_to', 'created_by', 'disputed_amount',
+                    'is_operational', 'location'
+                }
+                if sort_column in valid_sort_columns:
+                    sort_dir = "ASC" if sort_direction.lower() == "asc" else "DESC"
+                    if sort_column == 'assigned_to':
+                        order_clause = f"ORDER BY latest_assignment.assigned_to {sort_dir}, cm.creation_date DESC"
+                    else:
+                        order_clause = f"ORDER BY cm.{sort_column} {sort_dir}, cm.creation_date DESC"
+                    
+            base_query += where_clause + f"""
+                {order_clause}
+                LIMIT %s OFFSET %s
+            """
+            params.extend([limit, skip])
+                    
+            rows = yield (base_query, params, "all")
+                    
+            cases = [dict(row) for row in rows]
+            total_pages = (total_count + limit - 1) // limit  # Ceiling division
+                    
+            return {
+                "cases": cases,
+                "total_count": total_count,
+                "total_pages": total_pages
+            }
+        
+        return await self._run_read_plan("fetch_new_cases_list_paginated", _new_cases_list_paginated_plan)
+
+    async def fetch_new_cases_list_keyset(self, limit: int = 15,
+                                          cursor: Optional[str] = None,
+                                          search: Optional[str] = None,
+                                          current_logged_in_username: Optional[str] = None,
+                                          current_logged_in_user_type: Optional[str] = None
+                                          ) -> Dict[str, Any]:
+        """
+        Keyset-paginated variant of fetch_new_cases_list_paginated (see db/pagination.py).
+        Same search and role filtering, newest cases first; pass the returned
+        next_cursor back to get the following page. Raises InvalidCursorError for a
+        tampered cursor or one issued for other filters.
+        """
+        fingerprint = filter_fingerprint("new_case_list", search, current_logged_in_username, current_logged_in_user_type)
+        after = decode_cursor(cursor, fingerprint) if cursor else None
+
+        def _filters_plan():
+            # One row per case: the latest active assignment comes from a LATERAL
+            # lookup instead of DISTINCT ON over the whole assignment table, and the
+            # case_entry_form join (unused in the output) is left out, so no DISTINCT
+            # is needed and the planner can stop after limit + 1 rows of the
+            # (creation_date, creation_time, case_id) index.
+            from_clause = """
+                FROM case_main cm
+                LEFT JOIN LATERAL (
+                    SELECT assigned_to
+                    FROM assignment
+                    WHERE case_id = cm.case_id AND COALESCE(is_active, TRUE) = TRUE
+                    ORDER BY assign_date DESC, assign_time DESC
+                    LIMIT 1
+                ) latest_assignment ON TRUE
+            """
+            assignee = "latest_assignment.assigned_to"
+            select_extra = ""
+            where_clauses = []
+            params = []
+
+            if search:
+                where_clauses.append("""
+                    (
+                        cm.case_id::text ILIKE %s OR
+                        cm.source_ack_no ILIKE %s OR
+                        cm.case_type ILIKE %s OR
+                        cm.status ILIKE %s OR
+                        cm.created_by ILIKE %s OR
+                        latest_assignment.assigned_to ILIKE %s OR
+                        cm.location ILIKE %s OR
+                        cm.acc_num ILIKE %s OR
+                        cm.cust_id::text ILIKE %s
+                    )
+                """)
+                params.extend([f"%{search}%"] * 9)
+
+            # Role-based filtering (same rules as fetch_new_cases_list_paginated)
+            if current_logged_in_username and current_logged_in_user_type:
+                if current_logged_in_user_type in ('CRO', 'super_user'):
+                    pass
+                elif current_logged_in_user_type == 'risk_officer':
+                    try:
+                        is_active_column = yield ("""
+                            SELECT 1 FROM information_schema.columns 
+                            WHERE table_schema = 'public' AND table_name = 'assignment' AND column_name = 'is_active'
+                        """, (), "one")
+                        has_is_active = is_active_column is not None
+                    except Exception:
+                        has_is_active = False
+
+                    if has_is_active:
+                        where_clauses.append("(latest_assignment.assigned_to = %s OR latest_assignment.assigned_to IS NULL)")
+                        params.append(current_logged_in_username)
+                    else:
+                        where_clauses.append("""
+                            (
+                                EXISTS (
+                                    SELECT 1 FROM assignment a2 
+                                    WHERE a2.case_id = cm.case_id 
+                                    AND a2.assigned_to = %s
+                                )
+                                OR
+                                NOT EXISTS (
+                                    SELECT 1 FROM assignment a3 
+                                    WHERE a3.case_id = cm.case_id
+                                )
+                            )
+                            AND
+                            NOT EXISTS (
+                                SELECT 1 FROM assignment a4
+                                WHERE a4.case_id = cm.case_id
+                                AND a4.assigned_by = %s
+                                AND a4.assigned_to != %s
+                            )
+                        """)
+                        params.extend([current_logged_in_username] * 3)
+                elif current_logged_in_user_type in ('others', 'supervisor'):
+                    # Cases assigned to the user; assigned_to/assigned_by come from
+                    # their most recent assignment to this user
+                    from_clause += """
+                        JOIN LATERAL (
+                            SELECT assigned_to, assigned_by
+                            FROM assignment
+                            WHERE case_id = cm.case_id AND assigned_to = %s
+                            ORDER BY assign_date DESC, assign_time DESC
+                            LIMIT 1
+                        ) a ON TRUE
+                    """
+                    assignee = "a.assigned_to"  # their own assignment, as in the offset list
+                    select_extra = ", a.assigned_by"
+                    params.insert(0, current_logged_in_username)
+                else:
+                    where_clauses.append("FALSE")  # Unknown user type
+
+            return from_clause, assignee, select_extra, where_clauses, params
+
+        def _keyset_plan():
+            from_clause, assignee, select_extra, where_clauses, params = yield from _filters_plan()
+            where_clause = (" WHERE " + " AND ".join(where_clauses)) if where_clauses else ""
+
+            estimate_row = yield (f"EXPLAIN (FORMAT JSON) SELECT cm.case_id {from_clause} {where_clause}", params, "one")
+
+            page_clauses = where_clauses + ([KEYSET_PREDICATE] if after else [])
+            page_query = f"""
+                SELECT
+                    cm.case_id,
+                    cm.case_type,
+                    cm.source_ack_no,
+                    cm.source_bene_accno,
+                    cm.acc_num,
+                    cm.cust_id,
+                    cm.creation_date,
+                    cm.creation_time,
+                    cm.is_operational,
+                    cm.status,
+                    cm.short_dn,
+                    cm.long_dn,
+                    cm.decision_type,
+                    cm.created_by,
+                    cm.disputed_amount,
+                    cm.location,
+                    {assignee} AS assigned_to{select_extra}
+                {from_clause}
+                {(" WHERE " + " AND ".join(page_clauses)) if page_clauses else ""}
+                {KEYSET_ORDER}
+                LIMIT %s
+            """
+            rows = yield (page_query, params + (list(after) if after else []) + [limit + 1], "all")
+            return {
+                "cases": [dict(row) for row in rows[:limit]],
+                "has_more": len(rows) > limit,
+                "estimate": plan_row_estimate(estimate_row),
+            }
+
+        def _count_plan():
+            from_clause, _, _, where_clauses, params = yield from _filters_plan()
+            where_clause = (" WHERE " + " AND ".join(where_clauses)) if where_clauses else ""
+            row = yield (f"SELECT COUNT(*) AS total {from_clause} {where_clause}", params, "one")
+            return row["total"] if row else 0
+
+        page = await self._run_read_plan("fetch_new_cases_list_paginated", _keyset_plan)
+        cases = page["cases"]
+        total, is_estimate = keyset_total_count(
+            f"case_list_count:{fingerprint}",
+            lambda: self._run_read_plan("fetch_new_cases_list_paginated", _count_plan),
+            page["estimate"],
+            exact=len(cases) if after is None and not page["has_more"] else None,
+        )
+        return {
+            "cases": cases,
+            "next_cursor": encode_cursor(cases[-1], fingerprint) if page["has_more"] else None,
+            "has_more": page["has_more"],
+            "total_count": total,
+            "total_count_is_estimate": is_estimate,
+        }
+
+    # NEW METHOD: Fetch all case IDs for bulk operations
+    async def fetch_all_case_ids_for_bulk(self, search: Optional[str] = None,
+                                         current_logged_in_username: Optional[str] = None,
+                                         current_logged_in_user_type: Optional[str] = None
+                                         ) -> Dict[str, Any]:
+        """
+        Fetch all case IDs that match search criteria for bulk operations
+        """
+        def _sync_fetch_all_case_ids_for_bulk():
+            with get_db_connection() as conn:
+                with get_db_cursor(conn) as cur:
+                    # Base query - only select case_id and status
+                    base_query = """
+                        SELECT DISTINCT
+                            cm.case_id,
+                            cm.status
+                        FROM case_main cm
+                        LEFT JOIN case_entry_form cef ON cef.ack_no = cm.base_ack_no
                         LEFT JOIN (
                             SELECT DISTINCT ON (case_id) 
                                 case_id, 
@@ -2269,7 +2525,7 @@ class CaseEntryMatcher:
                         # Add search parameter 9 times for each field
                         params.extend([search_param] * 9)
                     
-                    # Role-based filtering (same logic as original method)
+                    # Role-based filtering (same logic as paginated method)
                     if current_logged_in_username and current_logged_in_user_type:
                         if current_logged_in_user_type in ('CRO', 'super_user'):
                             pass  # CRO and super_user can see all cases
@@ -2321,40 +2577,10 @@ class CaseEntryMatcher:
                             base_query = """
                                 SELECT DISTINCT
                                     cm.case_id,
-                                    cm.case_type,
-                                    cm.source_ack_no,
-                                    cm.source_bene_accno,
-                                    cm.acc_num,
-                                    cm.cust_id,
-                                    cm.creation_date,
-                                    cm.creation_time,
-                                    cm.is_operational,
-                                    cm.status,
-                                    cm.short_dn,
-                                    cm.long_dn,
-                                    cm.decision_type,
-                                    cm.created_by,
-                                    a.assigned_to,
-                                    a.assigned_by,
-                                    cm.disputed_amount,
-                                    cm.location
-                                FROM case_main cm
-                                INNER JOIN assignment a ON cm.case_id = a.case_id AND a.assigned_to = %s
-                                LEFT JOIN case_entry_form cef ON (
-                                    cef.ack_no = cm.source_ack_no 
-                                    OR cef.ack_no = SPLIT_PART(cm.source_ack_no, '_', 1)
-                                    OR cef.ack_no = SUBSTRING(cm.source_ack_no, 1, GREATEST(1, POSITION('_' IN cm.source_ack_no) - 1))
-                                )
-                            """
-                            count_query = """
-                                SELECT COUNT(DISTINCT cm.case_id)
+                                    cm.status
                                 FROM case_main cm
                                 INNER JOIN assignment a ON cm.case_id = a.case_id AND a.assigned_to = %s
-                                LEFT JOIN case_entry_form cef ON (
-                                    cef.ack_no = cm.source_ack_no 
-                                    OR cef.ack_no = SPLIT_PART(cm.source_ack_no, '_', 1)
-                                    OR cef.ack_no = SUBSTRING(cm.source_ack_no, 1, GREATEST(1, POSITION('_' IN cm.source_ack_no) - 1))
-                                )
+                                LEFT JOIN case_entry_form cef ON cef.ack_no = cm.base_ack_no
                             """
                             params.insert(0, current_logged_in_username)
                         else:
@@ -2362,200 +2588,27 @@ class CaseEntryMatcher:
                     else:
                         pass  # No user info, show all cases
                     
-                    # Add where clauses to both queries
-                    where_clause = ""
+                    # Add where clauses
                     if where_clauses:
-                        where_clause = " WHERE " + " AND ".join(where_clauses)
-                    
-                    # Add where clause to count query
-                    count_query += where_clause
-                    
-                    # Execute count query first
-                    cur.execute(count_query, params)
-                    count_result = cur.fetchone()
-                    total_count = list(count_result.values())[0] if count_result else 0
-                    
-                    # Add ordering and pagination to main query
-                    order_clause = "ORDER BY cm.creation_date DESC, cm.creation_time DESC"
-                    if sort_column:
-                        # Validate sort column to prevent SQL injection
-                        valid_sort_columns = {
-                            'case_id', 'case_type', 'source_ack_no', 'status', 
-                            'creation_date', 'assigned_to', 'created_by', 'disputed_amount',
-                            'is_operational', 'location'
-                        }
-                        if sort_column in valid_sort_columns:
-                            sort_dir = "ASC" if sort_direction.lower() == "asc" else "DESC"
-                            if sort_column == 'assigned_to':
-                                order_clause = f"ORDER BY latest_assignment.assigned_to {sort_dir}, cm.creation_date DESC"
-                            else:
-                                order_clause = f"ORDER BY cm.{sort_column} {sort_dir}, cm.creation_date DESC"
-                    
-                    base_query += where_clause + f"""
-                        {order_clause}
-                        LIMIT %s OFFSET %s
-                    """
-                    params.extend([limit, skip])
+                        base_query += " WHERE " + " AND ".join(where_clauses)
                     
+                    # Execute query
                     cur.execute(base_query, params)
                     rows = cur.fetchall()
                     
-                    cases = [dict(row) for row in rows]
-                    total_pages = (total_count + limit - 1) // limit  # Ceiling division
+                    case_ids = [row['case_id'] for row in rows if row['status'] != 'Closed']
+                    total_count = len(case_ids)
                     
                     return {
-                        "cases": cases,
-                        "total_count": total_count,
-                        "total_pages": total_pages
+                        "case_ids": case_ids,
+                        "total_count": total_count
                     }
         
-        return await self._execute_sync_db_op(_sync_fetch_new_cases_list_paginated)
+        return await self._execute_sync_db_op(_sync_fetch_all_case_ids_for_bulk)
 
-    # NEW METHOD: Fetch all case IDs for bulk operations
-    async def fetch_all_case_ids_for_bulk(self, search: Optional[str] = None,
-                                         current_logged_in_username: Optional[str] = None,
-                                         current_logged_in_user_type: Optional[str] = None
-                                         ) -> Dict[str, Any]:
-        """
-        Fetch all case IDs that match search criteria for bulk operations
-        """
-        def _sync_fetch_all_case_ids_for_bulk():
-            with get_db_connection() as conn:
-                with get_db_cursor(conn) as cur:
-                    # Base query - only select case_id and status
-                    base_query = """
-                        SELECT DISTINCT
-                            cm.case_id,
-                            cm.status
-                        FROM case_main cm
-                        LEFT JOIN case_entry_form cef ON (
-                            cef.ack_no = cm.source_ack_no 
-                            OR cef.ack_no = SPLIT_PART(cm.source_ack_no, '_', 1)
-                            OR cef.ack_no = SUBSTRING(cm.source_ack_no, 1, GREATEST(1, POSITION('_' IN cm.source_ack_no) - 1))
-                        )
-                        LEFT JOIN (
-                            SELECT DISTINCT ON (case_id) 
-                                case_id, 
-                                assigned_to,
-                                assign_date,
-                                assign_time
-                            FROM assignment 
-                            WHERE COALESCE(is_active, TRUE) = TRUE
-                            ORDER BY case_id, assign_date DESC, assign_time DESC
-                        ) latest_assignment ON latest_assignment.case_id = cm.case_id
-                    """
-                    
-                    where_clauses = []
-                    params = []
-                    
-                    # Add search filter across multiple fields
-                    if search:
-                        search_clause = """
-                            (
-                                cm.case_id::text ILIKE %s OR
-                                cm.source_ack_no ILIKE %s OR
-                                cm.case_type ILIKE %s OR
-                                cm.status ILIKE %s OR
-                                cm.created_by ILIKE %s OR
-                                latest_assignment.assigned_to ILIKE %s OR
-                                cm.location ILIKE %s OR
-                                cm.acc_num ILIKE %s OR
-                                cm.cust_id::text ILIKE %s
-                            )
-                        """
-                        where_clauses.append(search_clause)
-                        search_param = f"%{search}%"
-                        # Add search parameter 9 times for each field
-                        params.extend([search_param] * 9)
-                    
-                    # Role-based filtering (same logic as paginated method)
-                    if current_logged_in_username and current_logged_in_user_type:
-                        if current_logged_in_user_type in ('CRO', 'super_user'):
-                            pass  # CRO and super_user can see all cases
-                        elif current_logged_in_user_type == 'risk_officer':
-                            # Risk officer filtering
-                            try:
-                                cur.execute("""
-                                    SELECT 1 FROM information_schema.columns 
-                                    WHERE table_schema = 'public' AND table_name = 'assignment' AND column_name = 'is_active'
-                                """)
-                                has_is_active = cur.fetchone() is not None
-                            except Exception:
-                                has_is_active = False
-
-                            if has_is_active:
-                                where_clauses.append("""
-                                    (
-                                        latest_assignment.assigned_to = %s
-                                        OR
-                                        latest_assignment.assigned_to IS NULL
-                                    )
-                                """)
-                                params.append(current_logged_in_username)
-                            else:
-                                where_clauses.append("""
-                                    (
-                                        EXISTS (
-                                            SELECT 1 FROM assignment a2 
-                                            WHERE a2.case_id = cm.case_id 
-                                            AND a2.assigned_to = %s
-                                        )
-                                        OR
-                                        NOT EXISTS (
-                                            SELECT 1 FROM assignment a3 
-                                            WHERE a3.case_id = cm.case_id
-                                        )
-                                    )
-                                    AND
-                                    NOT EXISTS (
-                                        SELECT 1 FROM assignment a4
-                                        WHERE a4.case_id = cm.case_id
-                                        AND a4.assigned_by = %s
-                                        AND a4.assigned_to != %s
-                                    )
-                                """)
-                                params.extend([current_logged_in_username, current_logged_in_username, current_logged_in_username])
-                        elif current_logged_in_user_type in ('others', 'supervisor'):
-                            # Others can only see cases assigned to them
-                            base_query = """
-                                SELECT DISTINCT
-                                    cm.case_id,
-                                    cm.status
-                                FROM case_main cm
-                                INNER JOIN assignment a ON cm.case_id = a.case_id AND a.assigned_to = %s
-                                LEFT JOIN case_entry_form cef ON (
-                                    cef.ack_no = cm.source_ack_no 
-                                    OR cef.ack_no = SPLIT_PART(cm.source_ack_no, '_', 1)
-                                    OR cef.ack_no = SUBSTRING(cm.source_ack_no, 1, GREATEST(1, POSITION('_' IN cm.source_ack_no) - 1))
-                                )
-                            """
-                            params.insert(0, current_logged_in_username)
-                        else:
-                            where_clauses.append("FALSE")  # Unknown user type
-                    else:
-                        pass  # No user info, show all cases
-                    
-                    # Add where clauses
-                    if where_clauses:
-                        base_query += " WHERE " + " AND ".join(where_clauses)
-                    
-                    # Execute query
-                    cur.execute(base_query, params)
-                    rows = cur.fetchall()
-                    
-                    case_ids = [row['case_id'] for row in rows if row['status'] != 'Closed']
-                    total_count = len(case_ids)
-                    
-                    return {
-                        "case_ids": case_ids,
-                        "total_count": total_count
-                    }
-        
-        return await self._execute_sync_db_op(_sync_fetch_all_case_ids_for_bulk)
-
-    # NEW METHOD: Fetch detailed case info from new tables (for /api/new-case-details/{case_id})
-    async def fetch_new_case_details(self, case_id: int) -> Optional[Dict[str, Any]]:
-        def _sync_fetch_new_case_details():
+    # NEW METHOD: Fetch detailed case info from new tables (for /api/new-case-details/{case_id})
+    async def fetch_new_case_details(self, case_id: int) -> Optional[Dict[str, Any]]:
+        def _sync_fetch_new_case_details():
             with get_db_connection() as conn:
                 with get_db_cursor(conn) as cur:
                     sql_query = """
@@ -2583,204 +2636,194 @@ class CaseEntryMatcher:
     # OPTIMIZED METHOD: Fetch combined case data with fewer queries using JOINs
     async def fetch_combined_case_data_optimized(self, case_id: int) -> Optional[Dict[str, Any]]:
         """Optimized version using fewer database queries with JOINs"""
-        def _sync_fetch_combined_data_optimized():
-            with get_db_connection() as conn:
-                with get_db_cursor(conn) as cur:
-                    # Single query to get most data with JOINs
-                    main_query = """
-                        SELECT 
-                            -- Case main data
-                            cm.case_id, cm.case_type, cm.source_ack_no, cm.source_bene_accno,
-                            cm.acc_num, cm.cust_id, cm.creation_date, cm.creation_time, 
-                            cm.is_operational, cm.status, cm.short_dn, cm.long_dn, cm.decision_type,
-                            cm.created_by, cm.email_body, cm.email_summary,
+        def _combined_data_optimized_plan():
+            # Single query to get most data with JOINs
+            main_query = """
+                SELECT 
+                    -- Case main data
+                    cm.case_id, cm.case_type, cm.source_ack_no, cm.source_bene_accno,
+                    cm.acc_num, cm.cust_id, cm.creation_date, cm.creation_time, 
+                    cm.is_operational, cm.status, cm.short_dn, cm.long_dn, cm.decision_type,
+                    cm.created_by, cm.email_body, cm.email_summary, cm.base_ack_no,
                             
-                            -- Customer data
-                            c.fname, c.mname, c.lname, c.mobile, c.email, c.pan, c.nat_id, 
-                            c.dob, c.citizen, c.occupation, c.seg, c.cust_type, c.risk_prof, 
-                            c.kyc_status, c.cust_creation_date, c.rel_value,
+                    -- Customer data
+                    c.fname, c.mname, c.lname, c.mobile, c.email, c.pan, c.nat_id, 
+                    c.dob, c.citizen, c.occupation, c.seg, c.cust_type, c.risk_prof, 
+                    c.kyc_status, c.cust_creation_date, c.rel_value,
                             
-                            -- Account data
-                            a.acc_name, a.acc_type, a.acc_status, a.open_date, a.branch_code,
-                            a.currency, a.balance, a.prod_code, a.min_bal, a.od_limit, 
-                            a.credit_score, a.aqb, a.interest_rate, a.last_txn_date
+                    -- Account data
+                    a.acc_name, a.acc_type, a.acc_status, a.open_date, a.branch_code,
+                    a.currency, a.balance, a.prod_code, a.min_bal, a.od_limit, 
+                    a.credit_score, a.aqb, a.interest_rate, a.last_txn_date
                             
-                        FROM public.case_main cm
-                        LEFT JOIN customer c ON cm.cust_id = c.cust_id
-                        LEFT JOIN account a ON cm.acc_num = a.acc_num
-                        WHERE cm.case_id = %s
-                    """
-                    
-                    cur.execute(main_query, (case_id,))
-                    main_result = cur.fetchone()
-                    
-                    if not main_result:
-                        raise CaseNotFoundError(f"Case with ID {case_id} not found in case_main.")
-                    
-                    combined_case_data = dict(main_result)
-                    
-                    # Extract key values for additional queries
-                    source_ack_no_from_case_main = main_result.get('source_ack_no')
-                    main_acc_num = main_result.get('acc_num')
-                    source_bene_accno = main_result.get('source_bene_accno')
-                    
-                    # Calculate MOB if customer creation date is available
-                    if main_result.get('cust_creation_date'):
-                        today = date.today()
-                        creation_date = main_result.get('cust_creation_date')
-                        delta = today - creation_date
-                        combined_case_data['mob'] = round(delta.days / 30)
-                    else:
-                        combined_case_data['mob'] = None
-                    
-                    # Separate customer and account details for frontend compatibility
-                    customer_fields = ['fname', 'mname', 'lname', 'mobile', 'email', 'pan', 'nat_id', 
-                                     'dob', 'citizen', 'occupation', 'seg', 'cust_type', 'risk_prof', 
-                                     'kyc_status', 'cust_creation_date', 'rel_value', 'mob']
-                    
-                    account_fields = ['acc_name', 'acc_type', 'acc_status', 'open_date', 'branch_code',
-                                    'currency', 'balance', 'prod_code', 'min_bal', 'od_limit', 
-                                    'credit_score', 'aqb', 'interest_rate', 'last_txn_date']
-                    
-                    combined_case_data['customer_details'] = {k: main_result.get(k) for k in customer_fields if k in main_result}
-                    combined_case_data['account_details'] = {k: main_result.get(k) for k in account_fields if k in main_result}
-                    
-                    # Get I4C data (if needed)
-                    if source_ack_no_from_case_main:
-                        original_ack_no_for_i4c = source_ack_no_from_case_main
-                        case_type_suffixes = ['_VM', '_BM', '_ECBT', '_ECBNT', '_NAB', '_PSA', '_PMA', '_PVA', '_NAA']
-                        
-                        for suffix in case_type_suffixes:
-                            if source_ack_no_from_case_main.endswith(suffix):
-                                original_ack_no_for_i4c = source_ack_no_from_case_main[:-len(suffix)]
-                                break
-                        
-                        cur.execute("""
-                            SELECT ack_no, customer_name, sub_category, transaction_date, complaint_date, 
-                                   report_datetime, state, district, policestation, payment_mode, 
-                                   account_number, card_number, transaction_id, layers, transaction_amount, 
-                                   disputed_amount, action, to_bank, to_account, ifsc, to_transaction_id, 
-                                   to_amount, action_taken_date, to_upi_id
-                            FROM case_entry_form
-                            WHERE ack_no = %s
-                        """, (original_ack_no_for_i4c,))
+                FROM public.case_main cm
+                LEFT JOIN customer c ON cm.cust_id = c.cust_id
+                LEFT JOIN account a ON cm.acc_num = a.acc_num
+                WHERE cm.case_id = %s
+            """
+                    
+            main_result = yield (main_query, (case_id,), "one")
+                    
+            if not main_result:
+                raise CaseNotFoundError(f"Case with ID {case_id} not found in case_main.")
+                    
+            combined_case_data = dict(main_result)
+            base_ack_no = combined_case_data.pop('base_ack_no', None)
+                    
+            # Extract key values for additional queries
+            source_ack_no_from_case_main = main_result.get('source_ack_no')
+            main_acc_num = main_result.get('acc_num')
+            source_bene_accno = main_result.get('source_bene_accno')
+                    
+            # Calculate MOB if customer creation date is available
+            if main_result.get('cust_creation_date'):
+                today = date.today()
+                creation_date = main_result.get('cust_creation_date')
+                delta = today - creation_date
+                combined_case_data['mob'] = round(delta.days / 30)
+            else:
+                combined_case_data['mob'] = None
+                    
+            # Separate customer and account details for frontend compatibility
+            customer_fields = ['fname', 'mname', 'lname', 'mobile', 'email', 'pan', 'nat_id', 
+                             'dob', 'citizen', 'occupation', 'seg', 'cust_type', 'risk_prof', 
+                             'kyc_status', 'cust_creation_date', 'rel_value', 'mob']
+                    
+            account_fields = ['acc_name', 'acc_type', 'acc_status', 'open_date', 'branch_code',
+                            'currency', 'balance', 'prod_code', 'min_bal', 'od_limit', 
+                            'credit_score', 'aqb', 'interest_rate', 'last_txn_date']
+                    
+            combined_case_data['customer_details'] = {k: main_result.get(k) for k in customer_fields if k in main_result}
+            combined_case_data['account_details'] = {k: main_result.get(k) for k in account_fields if k in main_result}
+                    
+            # Get I4C data (if needed)
+            if source_ack_no_from_case_main:
+                original_ack_no_for_i4c = base_ack_no or source_ack_no_from_case_main
+                if not base_ack_no:
+                    # Row not backfilled yet: strip the case type suffix
+                    case_type_suffixes = ['_VM', '_BM', '_ECBT', '_ECBNT', '_NAB', '_PSA', '_PMA', '_PVA', '_NAA']
+                    for suffix in case_type_suffixes:
+                        if source_ack_no_from_case_main.endswith(suffix):
+                            original_ack_no_for_i4c = source_ack_no_from_case_main[:-len(suffix)]
+                            break
                         
-                        combined_case_data['i4c_data'] = cur.fetchone()
-                    
-                    # Get transactions, history, assignments, and documents in parallel-style queries
-                    # Transactions
-                    if main_acc_num or source_bene_accno:
-                        tx_acc_nums = [acc for acc in [main_acc_num, source_bene_accno] if acc]
-                        if tx_acc_nums:
-                            cur.execute("""
-                                SELECT acct_num, txn_date, txn_time, txn_type, amount, descr, 
-                                       txn_ref, currency, bene_name, bene_acct_num, pay_method, channel,
-                                       fee, exch_rate, pay_ref, auth_code, rrn
-                                FROM txn
-                                WHERE acct_num IN %s
-                                ORDER BY txn_date DESC, txn_time DESC
-                                LIMIT 100
-                            """, (tuple(tx_acc_nums),))
-                            transactions = cur.fetchall()
+                combined_case_data['i4c_data'] = yield ("""
+                    SELECT ack_no, customer_name, sub_category, transaction_date, complaint_date, 
+                           report_datetime, state, district, policestation, payment_mode, 
+                           account_number, card_number, transaction_id, layers, transaction_amount, 
+                           disputed_amount, action, to_bank, to_account, ifsc, to_transaction_id, 
+                           to_amount, action_taken_date, to_upi_id
+                    FROM case_entry_form
+                    WHERE ack_no = %s
+                """, (original_ack_no_for_i4c,), "one")
+                    
+            # Get transactions, history, assignments, and documents in parallel-style queries
+            # Transactions
+            if main_acc_num or source_bene_accno:
+                tx_acc_nums = [acc for acc in [main_acc_num, source_bene_accno] if acc]
+                if tx_acc_nums:
+                    transactions = yield ("""
+                        SELECT acct_num, txn_date, txn_time, txn_type, amount, descr, 
+                               txn_ref, currency, bene_name, bene_acct_num, pay_method, channel,
+                               fee, exch_rate, pay_ref, auth_code, rrn
+                        FROM txn
+                        WHERE acct_num = ANY(%s)
+                        ORDER BY txn_date DESC, txn_time DESC
+                        LIMIT 100
+                    """, (tx_acc_nums,), "all")
                             
-                            # Add bene match indicator
-                            for txn in transactions:
-                                txn['is_bene_match'] = (txn.get('bene_acct_num') == source_bene_accno)
+                    # Add bene match indicator
+                    for txn in transactions:
+                        txn['is_bene_match'] = (txn.get('bene_acct_num') == source_bene_accno)
                             
-                            combined_case_data['transactions'] = transactions
-                        else:
-                            combined_case_data['transactions'] = []
-                    else:
-                        combined_case_data['transactions'] = []
-                    
-                    # Case history
-                    cur.execute("""
-                        SELECT remarks, updated_by, created_time
-                        FROM public.case_history
-                        WHERE case_id = %s
-                        ORDER BY created_time DESC
-                    """, (case_id,))
-                    combined_case_data['decision_history'] = cur.fetchall()
-                    
-                    # Assignment history
-                    cur.execute("""
-                        SELECT assigned_to, assigned_by, assign_date, assign_time
-                        FROM public.assignment
-                        WHERE case_id = %s
-                        ORDER BY assign_date DESC, assign_time DESC
-                    """, (case_id,))
-                    combined_case_data['assignment_history'] = cur.fetchall()
-                    
-                    # Documents
-                    cur.execute("""
-                        SELECT id, document_type, original_filename, file_location, 
-                               uploaded_by, comment, uploaded_at, file_mime_type
-                        FROM public.case_documents
-                        WHERE case_id = %s
-                        ORDER BY uploaded_at DESC
-                    """, (case_id,))
-                    combined_case_data['uploaded_documents'] = cur.fetchall()
-                    
-                    # NEW: For MM, ECBNT, and ECBT cases, fetch reverification flags data
-                    case_type = main_result.get('case_type')
-                    mobile_number = main_result.get('mobile')
-                    print(f"DEBUG: fetch_combined_case_data_optimized - Case Type: {case_type}, Mobile: {mobile_number}", flush=True)
-                    
-                    if case_type in ['MM', 'ECBNT', 'ECBT'] and mobile_number:
-                        print(f"DEBUG: fetch_combined_case_data_optimized - Fetching reverification flags for mobile: {mobile_number} (type: {type(mobile_number)})", flush=True)
+                    combined_case_data['transactions'] = transactions
+                else:
+                    combined_case_data['transactions'] = []
+            else:
+                combined_case_data['transactions'] = []
+                    
+            # Case history
+            combined_case_data['decision_history'] = yield ("""
+                SELECT remarks, updated_by, created_time
+                FROM public.case_history
+                WHERE case_id = %s
+                ORDER BY created_time DESC
+            """, (case_id,), "all")
+                    
+            # Assignment history
+            combined_case_data['assignment_history'] = yield ("""
+                SELECT assigned_to, assigned_by, assign_date, assign_time
+                FROM public.assignment
+                WHERE case_id = %s
+                ORDER BY assign_date DESC, assign_time DESC
+            """, (case_id,), "all")
+                    
+            # Documents
+            combined_case_data['uploaded_documents'] = yield ("""
+                SELECT id, document_type, original_filename, file_location, 
+                       uploaded_by, comment, uploaded_at, file_mime_type
+                FROM public.case_documents
+                WHERE case_id = %s
+                ORDER BY uploaded_at DESC
+            """, (case_id,), "all")
+                    
+            # NEW: For MM, ECBNT, and ECBT cases, fetch reverification flags data
+            case_type = main_result.get('case_type')
+            mobile_number = main_result.get('mobile')
+            print(f"DEBUG: fetch_combined_case_data_optimized - Case Type: {case_type}, Mobile: {mobile_number}", flush=True)
+                    
+            if case_type in ['MM', 'ECBNT', 'ECBT'] and mobile_number:
+                print(f"DEBUG: fetch_combined_case_data_optimized - Fetching reverification flags for mobile: {mobile_number} (type: {type(mobile_number)})", flush=True)
                         
-                        # First, let's check what mobile numbers exist in reverification_flags table
-                        cur.execute("SELECT mobile_number FROM public.reverification_flags LIMIT 10")
-                        existing_mobiles = cur.fetchall()
-                        print(f"DEBUG: fetch_combined_case_data_optimized - Existing mobile numbers in reverification_flags: {[row['mobile_number'] for row in existing_mobiles]}", flush=True)
+                # First, let's check what mobile numbers exist in reverification_flags table
+                existing_mobiles = yield ("SELECT mobile_number FROM public.reverification_flags LIMIT 10", (), "all")
+                print(f"DEBUG: fetch_combined_case_data_optimized - Existing mobile numbers in reverification_flags: {[row['mobile_number'] for row in existing_mobiles]}", flush=True)
                         
-                        cur.execute("""
-                            SELECT 
-                                mobile_number,
-                                reason_flagged,
-                                flagged_date,
-                                lsacode,
-                                tspname,
-                                sensitivity_index,
-                                distribution_details
-                            FROM public.reverification_flags
-                            WHERE mobile_number = %s
-                        """, (mobile_number,))
+                reverification_data = yield ("""
+                    SELECT 
+                        mobile_number,
+                        reason_flagged,
+                        flagged_date,
+                        lsacode,
+                        tspname,
+                        sensitivity_index,
+                        distribution_details
+                    FROM public.reverification_flags
+                    WHERE mobile_number = %s
+                """, (mobile_number,), "one")
+                print(f"DEBUG: fetch_combined_case_data_optimized - Reverification data found: {reverification_data}", flush=True)
                         
-                        reverification_data = cur.fetchone()
-                        print(f"DEBUG: fetch_combined_case_data_optimized - Reverification data found: {reverification_data}", flush=True)
-                        
-                        if reverification_data:
-                            combined_case_data['reverification_flags'] = reverification_data
-                            print(f"DEBUG: fetch_combined_case_data_optimized - Added reverification flags to response", flush=True)
-                        else:
-                            combined_case_data['reverification_flags'] = {
-                                'mobile_number': 'N/A',
-                                'reason_flagged': 'N/A',
-                                'flagged_date': 'N/A',
-                                'lsacode': 'N/A',
-                                'tspname': 'N/A',
-                                'sensitivity_index': 'N/A',
-                                'distribution_details': 'N/A'
-                            }
-                            print(f"DEBUG: fetch_combined_case_data_optimized - No reverification data found, set to N/A", flush=True)
-                    else:
-                        # For non-mobile matching cases, set reverification fields to N/A
-                        combined_case_data['reverification_flags'] = {
-                            'mobile_number': 'N/A',
-                            'reason_flagged': 'N/A',
-                            'flagged_date': 'N/A',
-                            'lsacode': 'N/A',
-                            'tspname': 'N/A',
-                            'sensitivity_index': 'N/A',
-                            'distribution_details': 'N/A'
-                        }
-                        print(f"DEBUG: fetch_combined_case_data_optimized - Not a mobile matching case, set to N/A", flush=True)
+                if reverification_data:
+                    combined_case_data['reverification_flags'] = reverification_data
+                    print(f"DEBUG: fetch_combined_case_data_optimized - Added reverification flags to response", flush=True)
+                else:
+                    combined_case_data['reverification_flags'] = {
+                        'mobile_number': 'N/A',
+                        'reason_flagged': 'N/A',
+                        'flagged_date': 'N/A',
+                        'lsacode': 'N/A',
+                        'tspname': 'N/A',
+                        'sensitivity_index': 'N/A',
+                        'distribution_details': 'N/A'
+                    }
+                    print(f"DEBUG: fetch_combined_case_data_optimized - No reverification data found, set to N/A", flush=True)
+            else:
+                # For non-mobile matching cases, set reverification fields to N/A
+                combined_case_data['reverification_flags'] = {
+                    'mobile_number': 'N/A',
+                    'reason_flagged': 'N/A',
+                    'flagged_date': 'N/A',
+                    'lsacode': 'N/A',
+                    'tspname': 'N/A',
+                    'sensitivity_index': 'N/A',
+                    'distribution_details': 'N/A'
+                }
+                print(f"DEBUG: fetch_combined_case_data_optimized - Not a mobile matching case, set to N/A", flush=True)
                     
-                    return combined_case_data
+            return combined_case_data
 
         try:
-            return await self._execute_sync_db_op(_sync_fetch_combined_data_optimized)
+            return await self._run_read_plan("fetch_combined_case_data_optimized", _combined_data_optimized_plan)
         except CaseNotFoundError:
             raise
         except Exception as e:
@@ -2799,13 +2842,14 @@ class CaseEntryMatcher:
                         SELECT
                             case_id, case_type, source_ack_no, source_bene_accno,
                             acc_num, cust_id, creation_date, creation_time, is_operational, status,
-                            short_dn, long_dn, decision_type, created_by, email_body, email_summary
+                            short_dn, long_dn, decision_type, created_by, email_body, email_summary, base_ack_no
                         FROM public.case_main
                         WHERE case_id = %s
                     """, (case_id,))
                     case_main_data = cur.fetchone()
                     if not case_main_data:
                         raise CaseNotFoundError(f"Case with ID {case_id} not found in case_main.")
+                    base_ack_no = case_main_data.pop('base_ack_no', None)
                     combined_case_data.update(case_main_data)
 
                     source_ack_no_from_case_main = case_main_data.get('source_ack_no')
@@ -2819,9 +2863,9 @@ class CaseEntryMatcher:
                         # FIXED: Derive the original ACK No by stripping ALL case type suffixes
                         # Handle all possible case type suffixes: _VM, _BM, _ECBT, _ECBNT, _NAB, _PSA, _PMA, _PVA, etc.
                         case_type_suffixes = ['_VM', '_BM', '_ECBT', '_ECBNT', '_NAB', '_PSA', '_PMA', '_PVA', '_NAA']
-                        original_ack_no_for_i4c = source_ack_no_from_case_main
+                        original_ack_no_for_i4c = base_ack_no or source_ack_no_from_case_main
                         
-                        for suffix in case_type_suffixes:
+                        for suffix in case_type_suffixes if not base_ack_no else []:
                             if source_ack_no_from_case_main.endswith(suffix):
                                 original_ack_no_for_i4c = source_ack_no_from_case_main[:-len(suffix)]
                                 print(f"DEBUG: Combined Data - Found suffix '{suffix}', removing it", flush=True)
@@ -3201,79 +3245,74 @@ class CaseEntryMatcher:
 
     # UPDATED: fetch_case_risk_profile to correctly handle case_id (int) OR ack_no (str)
     async def fetch_case_risk_profile(self, case_id_or_ack_no: Union[int, str]) -> Dict[str, Optional[Dict[str, Any]]]:
-        def _sync_fetch_case_risk_profile():
-            with get_db_connection() as conn:
-                with get_db_cursor(conn) as cur:
-                    # FIX: Build WHERE clause dynamically based on input type
-                    case_main_select_query = """
-                        SELECT case_id, source_ack_no, cust_id, acc_num, source_bene_accno
-                        FROM public.case_main
-                    """
-                    query_params = []
-
-                    if isinstance(case_id_or_ack_no, int):
-                        case_main_select_query += " WHERE case_id = %s"
-                        query_params.append(case_id_or_ack_no)
-                    elif isinstance(case_id_or_ack_no, str):
-                        case_main_select_query += " WHERE source_ack_no = %s"
-                        query_params.append(case_id_or_ack_no)
-                    else:
-                        raise ValueError(f"Invalid type for case_id_or_ack_no: {type(case_id_or_ack_no)}. Expected int or str.")
+        def _case_risk_profile_plan():
+            # FIX: Build WHERE clause dynamically based on input type
+            case_main_select_query = """
+                SELECT case_id, source_ack_no, cust_id, acc_num, source_bene_accno
+                FROM public.case_main
+            """
+            query_params = []
+
+            if isinstance(case_id_or_ack_no, int):
+                case_main_select_query += " WHERE case_id = %s"
+                query_params.append(case_id_or_ack_no)
+            elif isinstance(case_id_or_ack_no, str):
+                case_main_select_query += " WHERE source_ack_no = %s"
+                query_params.append(case_id_or_ack_no)
+            else:
+                raise ValueError(f"Invalid type for case_id_or_ack_no: {type(case_id_or_ack_no)}. Expected int or str.")
 
 
-                    cur.execute(case_main_select_query, tuple(query_params)) # Execute with the dynamic query/params
-                    cm_data = cur.fetchone()
+            cm_data = yield (case_main_select_query, tuple(query_params), "one") # Execute with the dynamic query/params
 
-                    if not cm_data:
-                        raise CaseNotFoundError(f"Case {case_id_or_ack_no} not found in case_main.")
-                    
-                    case_id = cm_data.get('case_id') # Ensure we get the integer case_id for subsequent lookups
-                    primary_cust_id = cm_data.get('cust_id')
-                    primary_acc_num = cm_data.get('acc_num')
-                    beneficiary_acc_num = cm_data.get('source_bene_accno')
-
-                    # Nested helper function to get entity profile (customer + account)
-                    def get_entity_profile_sync(current_cur, cust_id: Optional[str], acc_num: Optional[str]):
-                        customer = None
-                        account = None
-
-                        if cust_id:
-                            current_cur.execute("""
-                                SELECT
-                                    c.cust_id, CONCAT_WS(' ', c.fname, c.mname, c.lname) AS full_name,
-                                    c.dob, c.nat_id, c.pan, c.citizen, c.occupation, c.seg, c.cust_type,
-                                    c.risk_prof, c.kyc_status, c.mobile, c.email
-                                FROM public.customer c
-                                WHERE c.cust_id = %s
-                            """, (cust_id,))
-                            customer = current_cur.fetchone()
-
-                        if acc_num:
-                            current_cur.execute("""
-                                SELECT
-                                    a.acc_num AS account_number, a.acc_name, a.acc_type, a.acc_status,
-                                    a.open_date, a.balance, a.last_txn_date, a.credit_score
-                                FROM public.account a
-                                WHERE a.acc_num = %s
-                            """, (acc_num,))
-                            account = current_cur.fetchone()
-
-                        if not customer and not account:
-                            return None
+            if not cm_data:
+                raise CaseNotFoundError(f"Case {case_id_or_ack_no} not found in case_main.")
+                    
+            case_id = cm_data.get('case_id') # Ensure we get the integer case_id for subsequent lookups
+            primary_cust_id = cm_data.get('cust_id')
+            primary_acc_num = cm_data.get('acc_num')
+            beneficiary_acc_num = cm_data.get('source_bene_accno')
+
+            # Nested helper function to get entity profile (customer + account)
+            def get_entity_profile_plan(cust_id: Optional[str], acc_num: Optional[str]):
+                customer = None
+                account = None
+
+                if cust_id:
+                    customer = yield ("""
+                        SELECT
+                            c.cust_id, CONCAT_WS(' ', c.fname, c.mname, c.lname) AS full_name,
+                            c.dob, c.nat_id, c.pan, c.citizen, c.occupation, c.seg, c.cust_type,
+                            c.risk_prof, c.kyc_status, c.mobile, c.email
+                        FROM public.customer c
+                        WHERE c.cust_id = %s
+                    """, (cust_id,), "one")
+
+                if acc_num:
+                    account = yield ("""
+                        SELECT
+                            a.acc_num AS account_number, a.acc_name, a.acc_type, a.acc_status,
+                            a.open_date, a.balance, a.last_txn_date, a.credit_score
+                        FROM public.account a
+                        WHERE a.acc_num = %s
+                    """, (acc_num,), "one")
+
+                if not customer and not account:
+                    return None
                         
-                        return {**(customer or {}), **(account or {})}
+                return {**(customer or {}), **(account or {})}
 
-                    # Fetch victim profile using primary customer/account from case_main
-                    victim_profile = get_entity_profile_sync(cur, primary_cust_id, primary_acc_num)
-                    # Fetch beneficiary profile using beneficiary account from case_main (source_bene_accno)
-                    beneficiary_profile = get_entity_profile_sync(cur, None, beneficiary_acc_num)
+            # Fetch victim profile using primary customer/account from case_main
+            victim_profile = yield from get_entity_profile_plan(primary_cust_id, primary_acc_num)
+            # Fetch beneficiary profile using beneficiary account from case_main (source_bene_accno)
+            beneficiary_profile = yield from get_entity_profile_plan(None, beneficiary_acc_num)
 
-                    return {
-                        "victim": victim_profile,
-                        "beneficiary": beneficiary_profile
-                    }
+            return {
+                "victim": victim_profile,
+                "beneficiary": beneficiary_profile
+            }
         try:
-            return await self._execute_sync_db_op(_sync_fetch_case_risk_profile)
+            return await self._run_read_plan("fetch_case_risk_profile", _case_risk_profile_plan)
         except CaseNotFoundError:
             raise
         except Exception as e:
@@ -3414,6 +3453,8 @@ class CaseEntryMatcher:
                                 (new_status, True, case_id)
                             )
                         rows_affected = cur.rowcount
+                        if rows_affected > 0:
+                            notify_dashboard_change(cur, "case_status")
                         conn.commit() 
                         if rows_affected > 0:
                             print(f"✅ Case {case_ack_no} in case_main updated to '{new_status}' and is_operational=TRUE. Rows affected: {rows_affected}", flush=True)
@@ -3709,85 +3750,177 @@ class CaseEntryMatcher:
         Fetch cases that have been assigned by a specific user (for review purposes)
         OPTIMIZED VERSION: Eliminates N+1 queries and expensive JOINs
         """
-        def _sync_fetch_assigned_cases():
-            with get_db_connection() as conn:
-                with get_db_cursor(conn) as cur:
-                    # OPTIMIZED: Single query with JOIN to get all assignment data at once
-                    # Removed expensive LEFT JOIN with case_entry_form (not used in results)
-                    base_query = """
-                        SELECT 
-                            cm.case_id,
-                            cm.case_type,
-                            cm.source_ack_no,
-                            cm.source_bene_accno,
-                            cm.acc_num,
-                            cm.cust_id,
-                            cm.creation_date,
-                            cm.creation_time,
-                            cm.is_operational,
-                            cm.status,
-                            cm.short_dn,
-                            cm.long_dn,
-                            cm.decision_type,
-                            cm.created_by,
-                            cm.disputed_amount,
-                            cm.location,
-                            -- Get all assigned users for this case in one go
-                            STRING_AGG(DISTINCT a.assigned_to, ', ' ORDER BY a.assigned_to) as assigned_to,
-                            MAX(a.assign_date) as assign_date,
-                            MAX(a.assign_time) as assign_time
-                        FROM case_main cm
-                        INNER JOIN assignment a ON cm.case_id = a.case_id
-                        WHERE COALESCE(a.assignment_type, 'manual') IN ('manual', 'template')
-                        AND COALESCE(a.is_active, TRUE) = TRUE
-                    """
-                    
-                    where_clauses = []
-                    params = []
-                    
-                    # Add search filter for source_ack_no
-                    if search_source_ack_no:
-                        where_clauses.append("cm.source_ack_no ILIKE %s")
-                        params.append(f"%{search_source_ack_no}%")
-                    
-                    # Add status filter
-                    if status_filter:
-                        where_clauses.append("cm.status = %s")
-                        params.append(status_filter)
-                    
-                    # Role-based filtering - show cases assigned by the current user
-                    if assigned_by_username:
-                        where_clauses.append("a.assigned_by = %s")
-                        params.append(assigned_by_username)
+        def _assigned_cases_plan():
+            # OPTIMIZED: Single query with JOIN to get all assignment data at once
+            # Removed expensive LEFT JOIN with case_entry_form (not used in results)
+            base_query = """
+                SELECT 
+                    cm.case_id,
+                    cm.case_type,
+                    cm.source_ack_no,
+                    cm.source_bene_accno,
+                    cm.acc_num,
+                    cm.cust_id,
+                    cm.creation_date,
+                    cm.creation_time,
+                    cm.is_operational,
+                    cm.status,
+                    cm.short_dn,
+                    cm.long_dn,
+                    cm.decision_type,
+                    cm.created_by,
+                    cm.disputed_amount,
+                    cm.location,
+                    -- Get all assigned users for this case in one go
+                    STRING_AGG(DISTINCT a.assigned_to, ', ' ORDER BY a.assigned_to) as assigned_to,
+                    MAX(a.assign_date) as assign_date,
+                    MAX(a.assign_time) as assign_time
+                FROM case_main cm
+                INNER JOIN assignment a ON cm.case_id = a.case_id
+                WHERE COALESCE(a.assignment_type, 'manual') IN ('manual', 'template')
+                AND COALESCE(a.is_active, TRUE) = TRUE
+            """
+                    
+            where_clauses = []
+            params = []
+                    
+            # Add search filter for source_ack_no
+            if search_source_ack_no:
+                where_clauses.append("cm.source_ack_no ILIKE %s")
+                params.append(f"%{search_source_ack_no}%")
+                    
+            # Add status filter
+            if status_filter:
+                where_clauses.append("cm.status = %s")
+                params.append(status_filter)
+                    
+            # Role-based filtering - show cases assigned by the current user
+            if assigned_by_username:
+                where_clauses.append("a.assigned_by = %s")
+                params.append(assigned_by_username)
                         
-                        # CRITICAL: Only show cases that haven't been routed back
-                        where_clauses.append("a.assigned_to != %s")
-                        params.append(assigned_by_username)
-                    
-                    # Combine where clauses
-                    if where_clauses:
-                        base_query += " AND " + " AND ".join(where_clauses)
-                    
-                    # Group by case fields and add ordering/pagination
-                    base_query += """
-                        GROUP BY cm.case_id, cm.case_type, cm.source_ack_no, cm.source_bene_accno,
-                                cm.acc_num, cm.cust_id, cm.creation_date, cm.creation_time,
-                                cm.is_operational, cm.status, cm.short_dn, cm.long_dn,
-                                cm.decision_type, cm.created_by, cm.disputed_amount, cm.location
-                        ORDER BY cm.creation_date DESC, cm.creation_time DESC
-                        LIMIT %s OFFSET %s
-                    """
-                    params.extend([limit, skip])
-                    
-                    cur.execute(base_query, params)
-                    rows = cur.fetchall()
-                    
-                    # Convert rows to list of dictionaries
-                    cases = [dict(row) for row in rows]
+                # CRITICAL: Only show cases that haven't been routed back
+                where_clauses.append("a.assigned_to != %s")
+                params.append(assigned_by_username)
+                    
+            # Combine where clauses
+            if where_clauses:
+                base_query += " AND " + " AND ".join(where_clauses)
+                    
+            # Group by case fields and add ordering/pagination
+            base_query += """
+                GROUP BY cm.case_id, cm.case_type, cm.source_ack_no, cm.source_bene_accno,
+                        cm.acc_num, cm.cust_id, cm.creation_date, cm.creation_time,
+                        cm.is_operational, cm.status, cm.short_dn, cm.long_dn,
+                        cm.decision_type, cm.created_by, cm.disputed_amount, cm.location
+                ORDER BY cm.creation_date DESC, cm.creation_time DESC
+                LIMIT %s OFFSET %s
+            """
+            params.extend([limit, skip])
+                    
+            rows = yield (base_query, params, "all")
+            
+            # Convert rows to list of dictionaries
+            cases = [dict(row) for row in rows]
                     
-                    return cases
+            return cases
         
-        return await self._execute_sync_db_op(_sync_fetch_assigned_cases)
+        return await self._run_read_plan("fetch_assigned_cases", _assigned_cases_plan)
+
+    async def fetch_assigned_cases_keyset(self, limit: int = 25,
+                                          cursor: Optional[str] = None,
+                                          search_source_ack_no: Optional[str] = None,
+                                          status_filter: Optional[str] = None,
+                                          assigned_by_username: Optional[str] = None
+                                          ) -> Dict[str, Any]:
+        """
+        Keyset-paginated variant of fetch_assigned_cases (see db/pagination.py), with
+        an estimated or background-counted total.
+        """
+        fingerprint = filter_fingerprint("assigned_cases", search_source_ack_no, status_filter, assigned_by_username)
+        after = decode_cursor(cursor, fingerprint) if cursor else None
+
+        from_clause = """
+            FROM case_main cm
+            INNER JOIN assignment a ON cm.case_id = a.case_id
+            WHERE COALESCE(a.assignment_type, 'manual') IN ('manual', 'template')
+            AND COALESCE(a.is_active, TRUE) = TRUE
+        """
+        where_clauses = []
+        params = []
+        if search_source_ack_no:
+            where_clauses.append("cm.source_ack_no ILIKE %s")
+            params.append(f"%{search_source_ack_no}%")
+        if status_filter:
+            where_clauses.append("cm.status = %s")
+            params.append(status_filter)
+        if assigned_by_username:
+            where_clauses.append("a.assigned_by = %s")
+            where_clauses.append("a.assigned_to != %s")  # not routed back to the reviewer
+            params.extend([assigned_by_username, assigned_by_username])
+        filter_clause = "".join(f" AND {clause}" for clause in where_clauses)
+
+        def _keyset_plan():
+            estimate_row = yield (
+                f"EXPLAIN (FORMAT JSON) SELECT cm.case_id {from_clause} {filter_clause} GROUP BY cm.case_id",
+                params, "one"
+            )
+            rows = yield (f"""
+                SELECT 
+                    cm.case_id,
+                    cm.case_type,
+                    cm.source_ack_no,
+                    cm.source_bene_accno,
+                    cm.acc_num,
+                    cm.cust_id,
+                    cm.creation_date,
+                    cm.creation_time,
+                    cm.is_operational,
+                    cm.status,
+                    cm.short_dn,
+                    cm.long_dn,
+                    cm.decision_type,
+                    cm.created_by,
+                    cm.disputed_amount,
+                    cm.location,
+                    STRING_AGG(DISTINCT a.assigned_to, ', ' ORDER BY a.assigned_to) as assigned_to,
+                    MAX(a.assign_date) as assign_date,
+                    MAX(a.assign_time) as assign_time
+                {from_clause}
+                {filter_clause}
+                {" AND " + KEYSET_PREDICATE if after else ""}
+                GROUP BY cm.case_id, cm.case_type, cm.source_ack_no, cm.source_bene_accno,
+                        cm.acc_num, cm.cust_id, cm.creation_date, cm.creation_time,
+                        cm.is_operational, cm.status, cm.short_dn, cm.long_dn,
+                        cm.decision_type, cm.created_by, cm.disputed_amount, cm.location
+                {KEYSET_ORDER}
+                LIMIT %s
+            """, params + (list(after) if after else []) + [limit + 1], "all")
+            return {
+                "cases": [dict(row) for row in rows[:limit]],
+                "has_more": len(rows) > limit,
+                "estimate": plan_row_estimate(estimate_row),
+            }
+
+        def _count_plan():
+            row = yield (f"SELECT COUNT(DISTINCT cm.case_id) AS total {from_clause} {filter_clause}", params, "one")
+            return row["total"] if row else 0
+
+        page = await self._run_read_plan("fetch_assigned_cases", _keyset_plan)
+        cases = page["cases"]
+        total, is_estimate = keyset_total_count(
+            f"case_list_count:{fingerprint}",
+            lambda: self._run_read_plan("fetch_assigned_cases", _count_plan),
+            page["estimate"],
+            exact=len(cases) if after is None and not page["has_more"] else None,
+        )
+        return {
+            "cases": cases,
+            "next_cursor": encode_cursor(cases[-1], fingerprint) if page["has_more"] else None,
+            "has_more": page["has_more"],
+            "total_count": total,
+            "total_count_is_estimate": is_estimate,
+        }
 
     # BULK PROCESSING OPTIMIZATIONS
     async def bulk_process_account_lookups(self, records: List[Dict]) -> Dict[str, str]:
@@ -3822,80 +3955,109 @@ class CaseEntryMatcher:
     async def bulk_insert_cases(self, case_data_list: List[Dict]) -> List[int]:
         """
         Bulk insert multiple cases in a single transaction for better performance.
+        One multi-row INSERT (insert_case_main_rows); the returned case_ids are in
+        the order of case_data_list. short_dn, long_dn, decision_type and created_by
+        are stored as given (None and '' included); only missing keys get defaults.
         """
         def _sync_bulk_insert():
             if not case_data_list:
                 return []
-                
-            with get_db_connection() as conn:
+
+            cases = [{
+                'case_type': case_data['case_type'], 'source_ack_no': case_data['source_ack_no'],
+                'cust_id': case_data.get('cust_id'), 'acc_num': case_data.get('acc_num'),
+                'source_bene_accno': case_data.get('source_bene_accno'),
+                'is_operational': case_data.get('is_operational', True),
+                'status': case_data.get('status', 'New'),
+                'customer_full_name': case_data.get('short_dn', 'N/A'),
+                'remarks_input': case_data.get('long_dn', ''),
+                'decision_input': case_data.get('decision_type', 'N/A'),
+                'location': case_data.get('location'), 'disputed_amount': case_data.get('disputed_amount'),
+                'created_by': case_data.get('created_by', 'System'),
+            } for case_data in case_data_list]
+
+            with get_db_connection(caller="bulk_insert_cases") as conn:
                 with get_db_cursor(conn) as cur:
-                    case_ids = []
                     try:
-                        for case_data in case_data_list:
-                            cur.execute("""
-                                INSERT INTO public.case_main (
-                                    case_type, source_ack_no, cust_id, acc_num, source_bene_accno,
-                                    is_operational, status, creation_date, creation_time,
-                                    short_dn, long_dn, decision_type, location, disputed_amount, created_by
-                                )
-                                VALUES (%s, %s, %s, %s, %s, %s, %s, 
-                                       (NOW() AT TIME ZONE 'Asia/Kolkata')::date, 
-                                       (NOW() AT TIME ZONE 'Asia/Kolkata')::time, 
-                                       %s, %s, %s, %s, %s, %s)
-                                RETURNING case_id;
-                            """, (
-                                case_data['case_type'], case_data['source_ack_no'], 
-                                case_data.get('cust_id'), case_data.get('acc_num'), 
-                                case_data.get('source_bene_accno'), case_data.get('is_operational', True),
-                                case_data.get('status', 'New'), case_data.get('short_dn', 'N/A'),
-                                case_data.get('long_dn', ''), case_data.get('decision_type', 'N/A'),
-                                case_data.get('location'), case_data.get('disputed_amount'),
-                                case_data.get('created_by', 'System')
-                            ))
-                            case_id = cur.fetchone()['case_id']
-                            case_ids.append(case_id)
-                        
+                        case_ids = insert_case_main_rows(cur, cases, apply_defaults=False)
                         conn.commit()
-                        print(f"✅ Bulk inserted {len(case_ids)} cases successfully")
+                        print(f"✅ Bulk inserted {len(case_ids)} cases successfully", flush=True)
                         return case_ids
                     except Exception as e:
                         conn.rollback()
-                        print(f"❌ Bulk insert failed: {e}")
+                        print(f"❌ Bulk insert failed: {e}", flush=True)
                         raise
-        
+
         return await self._execute_sync_db_op(_sync_bulk_insert)
-    
+
     async def bulk_check_transactions(self, vm_bm_pairs: List[Dict]) -> Dict[str, bool]:
         """
         Bulk check for transactions between victim and beneficiary accounts.
         Returns mapping of (vm_acc, bm_acc) -> has_transaction for ECB case creation.
+        All pairs go in one query (BULK_TXN_CHECK_SQL); a repeated pair keeps the
+        answer for its last date window, as the per-pair loop did.
         """
         def _sync_bulk_transaction_check():
             if not vm_bm_pairs:
                 return {}
-                
-            with get_db_connection() as conn:
+
+            with get_db_connection(caller="bulk_check_transactions") as conn:
                 with get_db_cursor(conn) as cur:
-                    results = {}
-                    for pair in vm_bm_pairs:
-                        vm_acc = pair['vm_acc']
-                        bm_acc = pair['bm_acc']
-                        from_date = pair['from_date']
-                        to_date = pair['to_date']
-                        
-                        cur.execute("""
-                            SELECT COUNT(*) FROM public.txn
-                            WHERE acct_num = %s AND bene_acct_num = %s
-                              AND txn_date BETWEEN %s AND %s;
-                        """, (vm_acc, bm_acc, from_date, to_date))
-                        
-                        count = cur.fetchone()['count']
-                        results[f"{vm_acc}_{bm_acc}"] = count > 0
-                    
-                    return results
-        
+                    cur.execute(BULK_TXN_CHECK_SQL, bulk_txn_check_params(vm_bm_pairs))
+                    return {f"{row['vm_acc']}_{row['bm_acc']}": row['has_txn'] for row in cur.fetchall()}
+
         return await self._execute_sync_db_op(_sync_bulk_transaction_check)
 
+    async def bulk_find_beneficiary_customers(self, bene_accounts: List[str]) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Customers who have added any of `bene_accounts` as a beneficiary, in one query.
+        Returns bene_acct_num -> [{"cust_id", "customer_account"}] (what
+        _create_ecb_cases_for_beneficiary looks up one account at a time).
+        """
+        def _sync_bulk_find():
+            if not bene_accounts:
+                return {}
+            with get_db_connection(caller="bulk_find_beneficiary_customers") as conn:
+                with get_db_cursor(conn) as cur:
+                    cur.execute("""
+                        SELECT DISTINCT ab.bene_acct_num, ac.cust_id, ac.acc_num AS customer_account
+                        FROM account_customer ac
+                        JOIN acc_bene ab ON ac.acc_num = ab.cust_acct_num
+                        WHERE ab.bene_acct_num = ANY(%s)
+                        ORDER BY ab.bene_acct_num, ac.cust_id, ac.acc_num
+                    """, (list(bene_accounts),))
+                    found: Dict[str, List[Dict[str, Any]]] = {}
+                    for row in cur.fetchall():
+                        found.setdefault(row['bene_acct_num'], []).append(
+                            {"cust_id": row['cust_id'], "customer_account": row['customer_account']}
+                        )
+                    return found
+
+        return await self._execute_sync_db_op(_sync_bulk_find)
+
+    async def bulk_check_customer_beneficiary_transactions(self, pairs: List[Tuple[str, str]]) -> Set[Tuple[str, str]]:
+        """
+        The (customer account, beneficiary account) pairs that have any transaction,
+        in one query (_check_customer_beneficiary_transactions for many pairs).
+        """
+        def _sync_bulk_check():
+            if not pairs:
+                return set()
+            cust_accounts, bene_accounts = zip(*pairs)
+            with get_db_connection(caller="bulk_check_customer_beneficiary_transactions") as conn:
+                with get_db_cursor(conn) as cur:
+                    cur.execute("""
+                        SELECT p.acct_num, p.bene_acct_num
+                        FROM unnest(%s::text[], %s::text[]) AS p(acct_num, bene_acct_num)
+                        WHERE EXISTS (
+                            SELECT 1 FROM public.txn t
+                            WHERE t.acct_num = p.acct_num AND t.bene_acct_num = p.bene_acct_num
+                        )
+                    """, (list(cust_accounts), list(bene_accounts)))
+                    return {(row['acct_num'], row['bene_acct_num']) for row in cur.fetchall()}
+
+        return await self._execute_sync_db_op(_sync_bulk_check)
+
 
 # --- DatabaseMatcher Class (Currently not used for new table logic, can be removed if desired) ---
 class DatabaseMatcher:
@@ -3907,15 +4069,9 @@ class DatabaseMatcher:
 
 def log_case_action(case_id: int, user_name: str, action: str, details: str = None):
     try:
-        with psycopg2.connect(**DB_CONNECTION_PARAMS) as conn:
+        with get_db_connection(caller="case_logs") as conn:
             with conn.cursor() as cur:
-                cur.execute(
-                    """
-                    INSERT INTO case_logs (case_id, user_name, action, details, created_at)
-                    VALUES (%s, %s, %s, %s, (NOW() AT TIME ZONE 'Asia/Kolkata'))
-                    """,
-                    (case_id, user_name, action, details)
-                )
+                insert_case_log_row(cur, case_id, user_name, action, details)
             conn.commit()
     except Exception as e:
         print(f"Error logging case action: {e}")
\ No newline at end of file
@@ -0,0 +1,113 @@
+# db/pagination.py
+"""
+Keyset (cursor) pagination helpers for the case lists.
+
+Keyset pages are ordered by (creation_date, creation_time, case_id) descending and
+each page continues strictly after the last row of the previous one, so page 500
+costs the same as page 1 and rows created meanwhile do not shift later pages. The
+continuation token handed to clients is opaque: URL-safe base64 of the last row's
+key plus a fingerprint of the filters it was issued for, so a token cannot be
+replayed against a different search.
+
+Exact totals are no longer computed per page. Callers report the planner's row
+estimate (EXPLAIN, planning only) and count exactly in the background; the exact
+figure is kept in the dashboard cache, which is already invalidated whenever case
+status or assignments change, and is served once available.
+"""
+import asyncio
+import base64
+import binascii
+import hashlib
+import json
+from datetime import date, time
+from typing import Any, Awaitable, Callable, Dict, Optional, Set, Tuple
+
+from .cache import dashboard_cache
+
+# A NULL creation_date/creation_time sorts as the newest value, like DESC NULLS FIRST in
+# the offset lists, and never turns the row comparison NULL (which would drop the row
+# from every page after the first). Cursors carry such keys as null.
+_NO_DATE = "'infinity'::date"
+_NO_TIME = "'24:00:00'::time"
+_KEYSET_KEY = f"COALESCE(cm.creation_date, {_NO_DATE}), COALESCE(cm.creation_time, {_NO_TIME}), cm.case_id"
+KEYSET_ORDER = (f"ORDER BY COALESCE(cm.creation_date, {_NO_DATE}) DESC, "
+                f"COALESCE(cm.creation_time, {_NO_TIME}) DESC, cm.case_id DESC")
+KEYSET_PREDICATE = f"({_KEYSET_KEY}) < (COALESCE(%s::date, {_NO_DATE}), COALESCE(%s::time, {_NO_TIME}), %s)"
+
+_count_tasks: Set[asyncio.Task] = set()
+
+
+class InvalidCursorError(ValueError):
+    pass
+
+
+def filter_fingerprint(*filters: Any) -> str:
+    return hashlib.md5(json.dumps(filters, default=str).encode()).hexdigest()[:12]
+
+
+def _iso(value: Optional[Any]) -> Optional[str]:
+    return value.isoformat() if value is not None else None
+
+
+def encode_cursor(row: Dict[str, Any], fingerprint: str) -> str:
+    payload = {
+        "k": [_iso(row["creation_date"]), _iso(row["creation_time"]), row["case_id"]],
+        "f": fingerprint,
+    }
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(token: str, fingerprint: str) -> Tuple[Optional[date], Optional[time], int]:
+    """(creation_date, creation_time, case_id) of the row the page continues after; None for a NULL key."""
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        payload = json.loads(raw)
+        creation_date, creation_time, case_id = payload["k"]
+        key = (
+            date.fromisoformat(creation_date) if creation_date is not None else None,
+            time.fromisoformat(creation_time) if creation_time is not None else None,
+            int(case_id),
+        )
+    except (binascii.Error, ValueError, TypeError, KeyError) as e:
+        raise InvalidCursorError(f"Malformed cursor: {e}")
+    if payload.get("f") != fingerprint:
+        raise InvalidCursorError("Cursor was issued for different filters")
+    return key
+
+
+def plan_row_estimate(explain_row: Optional[Dict[str, Any]]) -> int:
+    """Top-level 'Plan Rows' of an EXPLAIN (FORMAT JSON) result row."""
+    if not explain_row:
+        return 0
+    plan = next(iter(explain_row.values()))
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def total_count(count_key: str, count: Callable[[], Awaitable[int]], estimate: int,
+                exact: Optional[int] = None) -> Tuple[int, bool]:
+    """
+    (total, is_estimate) for a keyset page. `exact` is passed when the page itself
+    proves the total (a first page without more rows). Otherwise the cached exact
+    count is returned if there is one; if not, `estimate` is returned and `count()`
+    is started in the background (coalesced per key) to fill the cache.
+    """
+    if exact is not None:
+        dashboard_cache.set(count_key, exact)
+        return exact, False
+    found, cached = dashboard_cache.get(count_key)
+    if found:
+        return cached, False
+
+    task = asyncio.create_task(dashboard_cache.get_or_compute(count_key, count))
+    _count_tasks.add(task)
+    task.add_done_callback(_count_done)
+    return estimate, True
+
+
+def _count_done(task: asyncio.Task) -> None:
+    _count_tasks.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        print(f"WARNING: Background case list count failed: {task.exception()}", flush=True)
@@ -0,0 +1,55 @@
+# db/schema.py
+"""
+Bookkeeping for the versioned schema migrations in scripts/migrate.py.
+
+The trigger-maintained tables (dashboard rollups, fraud alerts, entity graph) are
+installed once by the migration script, not by each uvicorn worker at startup:
+CREATE/DROP TRIGGER locks the hot table it is attached to, so running it from
+every worker on every restart stalled live traffic and the workers raced each
+other. Applied versions are recorded in schema_migrations. At startup the
+services only check, with missing_triggers(), that their triggers are there.
+"""
+from typing import List, Sequence, Set, Tuple
+
+MIGRATIONS_TABLE = "schema_migrations"
+
+
+def ensure_migrations_table(cur) -> None:
+    cur.execute(f"""
+        CREATE TABLE IF NOT EXISTS {MIGRATIONS_TABLE} (
+            version VARCHAR(100) PRIMARY KEY,
+            applied_at TIMESTAMP NOT NULL DEFAULT NOW()
+        )
+    """)
+
+
+def applied_migrations(cur) -> Set[str]:
+    cur.execute("SELECT to_regclass(%s)", (MIGRATIONS_TABLE,))
+    if cur.fetchone()[0] is None:
+        return set()
+    cur.execute(f"SELECT version FROM {MIGRATIONS_TABLE}")
+    return {row[0] for row in cur.fetchall()}
+
+
+def record_migration(cur, version: str) -> None:
+    cur.execute(f"INSERT INTO {MIGRATIONS_TABLE} (version) VALUES (%s) ON CONFLICT (version) DO NOTHING", (version,))
+
+
+def forget_migration(cur, version: str) -> None:
+    cur.execute(f"DELETE FROM {MIGRATIONS_TABLE} WHERE version = %s", (version,))
+
+
+def missing_triggers(cur, triggers: Sequence[Tuple[str, str]]) -> List[str]:
+    """Names of the (trigger, table) pairs that are not installed (read-only catalog lookup)."""
+    if not triggers:
+        return []
+    names, tables = zip(*triggers)
+    cur.execute("""
+        SELECT w.name
+        FROM unnest(%s::text[], %s::text[]) AS w(name, tbl)
+        WHERE NOT EXISTS (
+            SELECT 1 FROM pg_trigger t
+            WHERE t.tgname = w.name AND t.tgrelid = to_regclass(w.tbl) AND NOT t.tgisinternal
+        )
+    """, (list(names), list(tables)))
+    return [row[0] for row in cur.fetchall()]
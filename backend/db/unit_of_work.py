@@ -0,0 +1,552 @@
+# db/unit_of_work.py
+"""
+Case creation on a single connection.
+
+The *_row helpers below hold the SQL behind CaseEntryMatcher.insert_into_case_main,
+save_or_update_decision, log_case_action and the automatic queue assignment; they
+take a cursor and never commit, so the matcher methods (one pooled connection and
+commit per call) and CaseUnitOfWork (many cases, one transaction) share the same
+statements.
+
+The *_rows helpers are their multi-row counterparts (one INSERT per table for a
+whole fan-out), for callers that create many cases at once.
+
+CaseUnitOfWork runs a whole fan-out - e.g. a banks v2 ack's VM, PSA and ECB cases
+with their history, case_details_1, case_logs and assignment rows - on one
+connection. Every case is wrapped in a SAVEPOINT: a case that fails leaves no
+partial rows behind, cases created before it are kept, and nothing becomes
+visible to other sessions until commit(). open_unit_of_work() checks the
+connection out of the pool for it without blocking the event loop.
+"""
+import asyncio
+import contextlib
+import functools
+import sys
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from psycopg2.extras import RealDictCursor, execute_values
+
+from models.base_models import ECBCaseData
+
+from .cache import notify_dashboard_change
+from .connection import get_db_connection
+
+
+# --- Row-level helpers (cursor in, no commit) ---
+
+def base_ack_no_for(source_ack_no: Optional[str]) -> Optional[str]:
+    """
+    The I4C ack a case belongs to: source_ack_no without its case type suffix
+    (e.g. '..._PSA'). Stored as case_main.base_ack_no, the case_entry_form join key.
+    Must agree with SPLIT_PART(source_ack_no, '_', 1) used by the backfill.
+    """
+    if source_ack_no is None:
+        return None
+    return source_ack_no.split('_', 1)[0]
+
+
+def _case_main_texts(customer_full_name, remarks_input, decision_input, created_by, apply_defaults: bool) -> Tuple:
+    """short_dn, long_dn, decision_type and created_by as stored: blanks become 'N/A', '', 'N/A' and 'System' unless apply_defaults is off."""
+    if not apply_defaults:
+        return customer_full_name, remarks_input, decision_input, created_by
+    return customer_full_name or "N/A", remarks_input or "", decision_input or "N/A", created_by or "System"
+
+
+def insert_case_main_row(cur, case_type: str, source_ack_no: str, cust_id: Optional[str] = None,
+                         acc_num: Optional[str] = None, source_bene_accno: Optional[str] = None,
+                         is_operational: bool = False, status: str = 'New',
+                         decision_input: Optional[str] = None,
+                         remarks_input: Optional[str] = None,
+                         customer_full_name: Optional[str] = None,
+                         location: Optional[str] = None,
+                         disputed_amount: Optional[float] = None,
+                         created_by: Optional[str] = None,
+                         email_body: Optional[str] = None,
+                         email_summary: Optional[str] = None,
+                         apply_defaults: bool = True) -> int:
+    actual_short_dn, actual_long_dn, actual_decision_type, actual_created_by = _case_main_texts(
+        customer_full_name, remarks_input, decision_input, created_by, apply_defaults
+    )
+
+    cur.execute("""
+        INSERT INTO public.case_main (
+            case_type, source_ack_no, cust_id, acc_num, source_bene_accno,
+            is_operational, status, creation_date, creation_time,
+            short_dn, long_dn, decision_type, location, disputed_amount, created_by, email_body, email_summary,
+            base_ack_no
+        )
+        VALUES (%s, %s, %s, %s, %s, %s, %s, (NOW() AT TIME ZONE 'Asia/Kolkata')::date, (NOW() AT TIME ZONE 'Asia/Kolkata')::time, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+        RETURNING case_id;
+    """, (
+        case_type, source_ack_no, cust_id, acc_num, source_bene_accno,
+        is_operational, status,
+        actual_short_dn, actual_long_dn, actual_decision_type,
+        location, disputed_amount, actual_created_by, email_body, email_summary,
+        base_ack_no_for(source_ack_no)
+    ))
+    return cur.fetchone()['case_id']
+
+
+def insert_case_history_row(cur, case_id: int, data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """case_history insert (+ case_main status change for closing decisions) used by save_or_update_decision."""
+    # FIX: Align with actual case_history schema (remarks, updated_by)
+    db_data_for_insert_update = {
+        "remarks": data.get('comments'),  # Map frontend 'comments' to DB 'remarks'
+        "updated_by": data.get('assignedEmployee'),  # Map frontend 'assignedEmployee' to DB 'updated_by'
+    }
+
+    filtered_db_data = {k: v if v != '' else None for k, v in db_data_for_insert_update.items()}
+
+    db_columns_list = ["case_id"]  # Always include case_id
+    db_values_list = [case_id]
+
+    for key, value in filtered_db_data.items():
+        db_columns_list.append(key)
+        db_values_list.append(value)
+
+    insert_cols_str = ", ".join(db_columns_list)
+    insert_placeholders_str = ", ".join(["%s"] * len(db_columns_list))
+
+    # Since case_history is designed for audit trail (multiple entries per case_id),
+    # we should just INSERT a new record instead of trying to update
+    cur.execute(
+        f"""
+        INSERT INTO public.case_history ({insert_cols_str})
+        VALUES ({insert_placeholders_str})
+        RETURNING *;
+        """,
+        tuple(db_values_list)
+    )
+
+    updated_decision_record = cur.fetchone()
+
+    # Update case_main table status and closing_date if decision action indicates case closure
+    decision_action = data.get('decisionAction')
+    if decision_action:
+        new_status = None
+        should_set_closing_date = False
+
+        if decision_action in ['Close Case', 'Closed', 'Approve', 'Reject']:
+            new_status = 'Closed'
+            should_set_closing_date = True
+        elif decision_action == 'Mark as False Positive':
+            new_status = 'False Positive'
+            should_set_closing_date = True
+        elif decision_action == 'Assigned':
+            new_status = 'Assigned'
+
+        if new_status:
+            update_query = "UPDATE public.case_main SET status = %s"
+            update_params = [new_status]
+
+            if should_set_closing_date:
+                update_query += ", closing_date = CURRENT_DATE"
+
+            update_query += " WHERE case_id = %s"
+            update_params.append(case_id)
+
+            cur.execute(update_query, tuple(update_params))
+            notify_dashboard_change(cur, "case_status")
+            print(f"✅ Case {case_id} status updated to '{new_status}' in case_main table.", flush=True)
+
+    return updated_decision_record
+
+
+def insert_case_log_row(cur, case_id: int, user_name: str, action: str, details: str = None):
+    cur.execute(
+        """
+        INSERT INTO case_logs (case_id, user_name, action, details, created_at)
+        VALUES (%s, %s, %s, %s, (NOW() AT TIME ZONE 'Asia/Kolkata'))
+        """,
+        (case_id, user_name, action, details)
+    )
+
+
+def get_general_queue_user(cur) -> Optional[str]:
+    """First risk officer: every auto-assigned case goes to this general queue."""
+    cur.execute("""
+        SELECT user_name
+        FROM user_table
+        WHERE user_type = 'risk_officer'
+        ORDER BY user_name
+        LIMIT 1
+    """)
+    result = cur.fetchone()
+    return result['user_name'] if result else None
+
+
+def insert_auto_assignment_row(cur, case_id: int, case_type: str, assigned_user: str):
+    cur.execute("""
+        INSERT INTO assignment (case_id, assigned_to, assigned_by, comment, is_active, assignment_type)
+        VALUES (%s, %s, %s, %s, TRUE, 'auto')
+    """, (case_id, assigned_user, "System", f"Auto-assigned {case_type} case to general queue"))
+    notify_dashboard_change(cur, "assignment")
+
+
+def insert_case_details_1_row(cur, cust_id, casetype: str, acc_no, match_flag: str):
+    cur.execute("""
+        INSERT INTO public.case_details_1 (
+            cust_id, casetype, acc_no, match_flag, creation_timestamp
+        )
+        VALUES (%s, %s, %s, %s, NOW())
+    """, (cust_id, casetype, acc_no, match_flag))
+
+
+# --- Multi-row helpers (cursor in, no commit) ---
+
+_CASE_MAIN_COLUMNS = """
+    case_id, case_type, source_ack_no, cust_id, acc_num, source_bene_accno,
+    is_operational, status, creation_date, creation_time,
+    short_dn, long_dn, decision_type, location, disputed_amount, created_by, email_body, email_summary,
+    base_ack_no
+"""
+_CASE_MAIN_TEMPLATE = (
+    "(%s, %s, %s, %s, %s, %s, %s, %s, (NOW() AT TIME ZONE 'Asia/Kolkata')::date, "
+    "(NOW() AT TIME ZONE 'Asia/Kolkata')::time, %s, %s, %s, %s, %s, %s, %s, %s, %s)"
+)
+
+
+def insert_case_main_rows(cur, cases: List[Dict[str, Any]], apply_defaults: bool = True) -> List[int]:
+    """
+    insert_case_main_row for many cases in one INSERT; each dict holds its keyword
+    arguments. Returns the new case_ids in input order: they are drawn from
+    case_main's sequence first and inserted explicitly, so nothing depends on the
+    order RETURNING hands rows back in. With apply_defaults=False the names,
+    remarks, decision and creator are stored exactly as given (None and '' too).
+    """
+    if not cases:
+        return []
+    cur.execute(
+        "SELECT nextval(pg_get_serial_sequence('public.case_main', 'case_id')) AS case_id "
+        "FROM generate_series(1, %s)",
+        (len(cases),)
+    )
+    case_ids = [row['case_id'] for row in cur.fetchall()]
+    if None in case_ids:
+        # case_main.case_id without a sequence: fall back to a RETURNING per row
+        return [insert_case_main_row(cur, **case, apply_defaults=apply_defaults) for case in cases]
+
+    rows = []
+    for case_id, case in zip(case_ids, cases):
+        short_dn, long_dn, decision_type, created_by = _case_main_texts(
+            case.get('customer_full_name'), case.get('remarks_input'), case.get('decision_input'),
+            case.get('created_by'), apply_defaults
+        )
+        rows.append((
+            case_id, case['case_type'], case['source_ack_no'], case.get('cust_id'), case.get('acc_num'),
+            case.get('source_bene_accno'), case.get('is_operational', False), case.get('status', 'New'),
+            short_dn, long_dn, decision_type, case.get('location'), case.get('disputed_amount'),
+            created_by, case.get('email_body'), case.get('email_summary'),
+            base_ack_no_for(case['source_ack_no'])
+        ))
+    execute_values(
+        cur,
+        f"INSERT INTO public.case_main ({_CASE_MAIN_COLUMNS}) OVERRIDING SYSTEM VALUE VALUES %s",
+        rows, template=_CASE_MAIN_TEMPLATE, page_size=len(rows)
+    )
+    return case_ids
+
+
+def insert_case_history_rows(cur, entries: List[Tuple[int, Dict[str, Any]]]):
+    """
+    insert_case_history_row for many (case_id, data) entries in one INSERT. Only the
+    history rows: a decisionAction (case_main status change) is not applied here.
+    """
+    if not entries:
+        return
+    rows = []
+    for case_id, data in entries:
+        remarks, updated_by = data.get('comments'), data.get('assignedEmployee')
+        rows.append((case_id, remarks if remarks != '' else None, updated_by if updated_by != '' else None))
+    execute_values(cur, "INSERT INTO public.case_history (case_id, remarks, updated_by) VALUES %s",
+                   rows, page_size=len(rows))
+
+
+def insert_case_log_rows(cur, entries: List[Tuple[int, str, str, Optional[str]]]):
+    """insert_case_log_row for many (case_id, user_name, action, details) entries in one INSERT."""
+    if not entries:
+        return
+    execute_values(
+        cur,
+        "INSERT INTO case_logs (case_id, user_name, action, details, created_at) VALUES %s",
+        entries, template="(%s, %s, %s, %s, (NOW() AT TIME ZONE 'Asia/Kolkata'))", page_size=len(entries)
+    )
+
+
+def insert_auto_assignment_rows(cur, cases: List[Tuple[int, str]], assigned_user: str):
+    """insert_auto_assignment_row for many (case_id, case_type) in one INSERT."""
+    if not cases:
+        return
+    execute_values(
+        cur,
+        "INSERT INTO assignment (case_id, assigned_to, assigned_by, comment, is_active, assignment_type) VALUES %s",
+        [(case_id, assigned_user, "System", f"Auto-assigned {case_type} case to general queue")
+         for case_id, case_type in cases],
+        template="(%s, %s, %s, %s, TRUE, 'auto')", page_size=len(cases)
+    )
+    notify_dashboard_change(cur, "assignment")
+
+
+def insert_case_details_1_rows(cur, entries: List[Tuple[Any, str, Any, str]]):
+    """insert_case_details_1_row for many (cust_id, casetype, acc_no, match_flag) entries in one INSERT."""
+    if not entries:
+        return
+    execute_values(
+        cur,
+        "INSERT INTO public.case_details_1 (cust_id, casetype, acc_no, match_flag, creation_timestamp) VALUES %s",
+        entries, template="(%s, %s, %s, %s, NOW())", page_size=len(entries)
+    )
+
+
+# --- Unit of work ---
+
+class CaseUnitOfWork:
+    """
+    Case creation fan-out on one connection and one transaction.
+
+    The connection is owned by the caller (checked out with get_db_connection), which
+    also decides when to commit(). Methods are coroutines that run the blocking
+    psycopg2 work on the executor, like CaseEntryMatcher does.
+    """
+
+    def __init__(self, executor: ThreadPoolExecutor, conn):
+        self.executor = executor
+        self.conn = conn
+        self.conn.autocommit = False
+        self.cur = conn.cursor(cursor_factory=RealDictCursor)
+        self._queue_user: Optional[str] = None
+        self._queue_user_loaded = False
+
+    async def _execute_sync_db_op(self, func, *args, **kwargs):
+        return await asyncio.get_running_loop().run_in_executor(self.executor, functools.partial(func, *args, **kwargs))
+
+    async def run(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """Run func(cur, *args, **kwargs) on the unit of work's cursor."""
+        return await self._execute_sync_db_op(func, self.cur, *args, **kwargs)
+
+    @contextlib.asynccontextmanager
+    async def savepoint(self):
+        """Everything inside the block is undone if it raises; the transaction stays usable."""
+        name = f"uow_{uuid.uuid4().hex[:12]}"
+        await self._execute_sync_db_op(self.cur.execute, f"SAVEPOINT {name}")
+        try:
+            yield
+        except BaseException:
+            await self._execute_sync_db_op(self.cur.execute, f"ROLLBACK TO SAVEPOINT {name}")
+            raise
+        await self._execute_sync_db_op(self.cur.execute, f"RELEASE SAVEPOINT {name}")
+
+    async def commit(self):
+        await self._execute_sync_db_op(self.conn.commit)
+
+    async def rollback(self):
+        await self._execute_sync_db_op(self.conn.rollback)
+
+    def close(self):
+        self.cur.close()
+
+    def _sync_assign(self, case_id: int, case_type: str) -> Optional[str]:
+        if not self._queue_user_loaded:
+            self._queue_user = get_general_queue_user(self.cur)
+            self._queue_user_loaded = True
+        if not self._queue_user:
+            print(f"ERROR: No risk officers available for case assignment", flush=True)
+            return None
+        insert_auto_assignment_row(self.cur, case_id, case_type, self._queue_user)
+        return self._queue_user
+
+    async def create_case(self, case_type: str, source_ack_no: str, created_by: Optional[str] = None, **case_fields) -> int:
+        """
+        Same effect as CaseEntryMatcher.insert_into_case_main: case_main row, case_logs
+        entry and general-queue assignment. As there, logging and assignment failures
+        do not fail the case (each has its own savepoint).
+        """
+        async with self.savepoint():
+            case_id = await self.run(
+                insert_case_main_row, case_type, source_ack_no, created_by=created_by, **case_fields
+            )
+
+            creator_name = created_by or "System"
+            try:
+                async with self.savepoint():
+                    await self.run(
+                        insert_case_log_row, case_id, creator_name, "case_created",
+                        f"Case created by {creator_name}. Type: {case_type}, ACK: {source_ack_no}"
+                    )
+            except Exception as log_error:
+                print(f"WARNING: Failed to log case creation for case {case_id}: {log_error}", flush=True)
+
+            try:
+                async with self.savepoint():
+                    assigned_user = await self._execute_sync_db_op(self._sync_assign, case_id, case_type)
+                if assigned_user:
+                    print(f"✅ Case {case_id} ({source_ack_no}) automatically assigned to general queue: {assigned_user}", flush=True)
+                else:
+                    print(f"⚠️ Case {case_id} ({source_ack_no}) created but auto-assignment failed", flush=True)
+            except Exception as assignment_error:
+                print(f"ERROR: Auto-assignment failed for case {case_id}: {assignment_error}", flush=True)
+        return case_id
+
+    def _sync_create_cases(self, cases: List[Dict[str, Any]]) -> List[int]:
+        case_ids = insert_case_main_rows(self.cur, cases)
+        try:
+            with self._sync_savepoint():
+                insert_case_log_rows(self.cur, [
+                    (case_id, case.get('created_by') or "System", "case_created",
+                     f"Case created by {case.get('created_by') or 'System'}. Type: {case['case_type']}, ACK: {case['source_ack_no']}")
+                    for case_id, case in zip(case_ids, cases)
+                ])
+        except Exception as log_error:
+            print(f"WARNING: Failed to log creation of {len(case_ids)} cases: {log_error}", flush=True)
+        try:
+            with self._sync_savepoint():
+                if not self._queue_user_loaded:
+                    self._queue_user = get_general_queue_user(self.cur)
+                    self._queue_user_loaded = True
+                if self._queue_user:
+                    insert_auto_assignment_rows(
+                        self.cur, [(case_id, case['case_type']) for case_id, case in zip(case_ids, cases)], self._queue_user
+                    )
+                    print(f"✅ {len(case_ids)} cases automatically assigned to general queue: {self._queue_user}", flush=True)
+                else:
+                    print(f"ERROR: No risk officers available for case assignment", flush=True)
+        except Exception as assignment_error:
+            print(f"ERROR: Auto-assignment failed for {len(case_ids)} cases: {assignment_error}", flush=True)
+        return case_ids
+
+    @contextlib.contextmanager
+    def _sync_savepoint(self):
+        name = f"uow_{uuid.uuid4().hex[:12]}"
+        self.cur.execute(f"SAVEPOINT {name}")
+        try:
+            yield
+        except BaseException:
+            self.cur.execute(f"ROLLBACK TO SAVEPOINT {name}")
+            raise
+        self.cur.execute(f"RELEASE SAVEPOINT {name}")
+
+    async def create_cases(self, cases: List[Dict[str, Any]]) -> List[int]:
+        """
+        create_case for many cases with multi-row inserts: case_main, then case_logs and
+        general-queue assignment rows (which, as in create_case, may fail without
+        failing the cases). `cases` holds create_case's keyword arguments; returns
+        the case_ids in input order.
+        """
+        if not cases:
+            return []
+        async with self.savepoint():
+            return await self._execute_sync_db_op(self._sync_create_cases, cases)
+
+    async def add_history_rows(self, entries: List[Tuple[int, Dict[str, Any]]]):
+        await self.run(insert_case_history_rows, entries)
+
+    async def add_case_details_1_rows(self, entries: List[Tuple[Any, str, Any, str]]):
+        await self.run(insert_case_details_1_rows, entries)
+
+    async def add_history(self, case_id: int, data: Dict[str, Any]):
+        return await self.run(insert_case_history_row, case_id, data)
+
+    async def add_case_details_1(self, cust_id, casetype: str, acc_no, match_flag: str):
+        await self.run(insert_case_details_1_row, cust_id, casetype, acc_no, match_flag)
+
+    @staticmethod
+    def _ecb_case_rows(ecb_data: ECBCaseData, created_by_user: Optional[str]) -> Tuple[Dict[str, Any], Dict[str, Any], Tuple[Any, str, Any, str]]:
+        """create_case arguments, case_history data and case_details_1 entry of an ECB case."""
+        case_type = 'ECBT' if ecb_data.hasTransaction else 'ECBNT'
+        case = dict(
+            case_type=case_type,
+            source_ack_no=f"{ecb_data.sourceAckNo}",
+            cust_id=ecb_data.customerId,
+            acc_num=ecb_data.customerAccountNumber or ecb_data.beneficiaryAccountNumber,
+            is_operational=False,
+            status='New',
+            decision_input='Pending Review',
+            remarks_input=ecb_data.remarks or f"Automated case for {case_type} - Customer Acct: {ecb_data.customerAccountNumber}, Beneficiary Account: {ecb_data.beneficiaryAccountNumber}.",
+            source_bene_accno=ecb_data.beneficiaryAccountNumber,
+            customer_full_name=None,
+            location=ecb_data.location,
+            disputed_amount=ecb_data.disputedAmount,
+            created_by=created_by_user or "System"
+        )
+        history = {
+            "remarks": ecb_data.remarks or f"{case_type} case generated.",
+            "short_dn": case_type,
+            "long_dn": f"Automated case created for {case_type} type.",
+            "decision_type": "Automated Trigger",
+            "updated_by": created_by_user or "System"
+        }
+        details = (
+            ecb_data.customerId, case_type,
+            ecb_data.customerAccountNumber or ecb_data.beneficiaryAccountNumber, "ECB/ECBNT Match"
+        )
+        return case, history, details
+
+    async def create_ecb_case(self, ecb_data: ECBCaseData, created_by_user: Optional[str] = "System") -> Dict[str, Any]:
+        """Same rows as CaseEntryMatcher.create_ecb_case, created atomically."""
+        case, history, details = self._ecb_case_rows(ecb_data, created_by_user)
+        async with self.savepoint():
+            new_case_main_id = await self.create_case(**case)
+            await self.add_history(new_case_main_id, history)
+            await self.add_case_details_1(*details)
+        return {
+            "ack_no": case['source_ack_no'],
+            "case_id": new_case_main_id,
+            "message": f"{case['case_type']} case created successfully."
+        }
+
+    async def create_ecb_cases(self, ecb_cases: List[ECBCaseData], created_by_user: Optional[str] = "System") -> List[Dict[str, Any]]:
+        """
+        create_ecb_case for many cases with multi-row inserts (create_cases, then one
+        case_history and one case_details_1 INSERT): all of them are created or none.
+        Results are in input order.
+        """
+        rows = [self._ecb_case_rows(ecb_data, created_by_user) for ecb_data in ecb_cases]
+        if not rows:
+            return []
+        async with self.savepoint():
+            case_ids = await self.create_cases([case for case, _, _ in rows])
+            await self.add_history_rows([(case_id, history) for case_id, (_, history, _) in zip(case_ids, rows)])
+            await self.add_case_details_1_rows([details for _, _, details in rows])
+        return [{
+            "ack_no": case['source_ack_no'],
+            "case_id": case_id,
+            "message": f"{case['case_type']} case created successfully."
+        } for case_id, (case, _, _) in zip(case_ids, rows)]
+
+
+@contextlib.asynccontextmanager
+async def open_unit_of_work(executor: ThreadPoolExecutor, caller: str,
+                            statement_timeout_ms: Optional[int] = None,
+                            lock_timeout_ms: Optional[int] = None):
+    """
+    get_db_connection() + CaseUnitOfWork for coroutines. Checking a connection out
+    of the pool can wait for a free one, so the checkout and the return run on the
+    executor like the unit of work's queries; anything not committed is rolled back
+    when the connection goes back to the pool. The timeouts are get_db_connection's.
+    """
+    loop = asyncio.get_running_loop()
+    checkout = get_db_connection(caller=caller, statement_timeout_ms=statement_timeout_ms,
+                                 lock_timeout_ms=lock_timeout_ms)
+    entering = loop.run_in_executor(executor, checkout.__enter__)
+    try:
+        conn = await asyncio.shield(entering)
+    except asyncio.CancelledError:
+        # The checkout still completes on its thread: hand that connection straight back
+        entering.add_done_callback(
+            lambda f: f.cancelled() or f.exception() or executor.submit(checkout.__exit__, None, None, None)
+        )
+        raise
+    exc_info = (None, None, None)
+    try:
+        uow = CaseUnitOfWork(executor, conn)
+        try:
+            yield uow
+        finally:
+            uow.close()
+    except BaseException:
+        exc_info = sys.exc_info()
+        raise
+    finally:
+        await loop.run_in_executor(executor, checkout.__exit__, *exc_info)
@@ -10,9 +10,12 @@ from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 
 from keycloak import KeycloakOpenID
-from config import KEYCLOAK_CONFIG
+from config import KEYCLOAK_CONFIG, MAINTENANCE_EXECUTOR_WORKERS
 
 from services.anomaly import AnomalyDetector
+from db.connection import close_pool, get_pool_stats
+from db.async_connection import init_async_pool, close_async_pool, get_async_pool
+from db.cache import dashboard_cache, start_dashboard_cache_listener, stop_dashboard_cache_listener
 
 from routers import (
     auth,
@@ -38,8 +41,14 @@ from routers import (
 from routers.dashboard import router as dashboard_analytics_router
 from routers import assignment_router, case_history_router
 from routers.match_suspect_customer import router as match_suspect_customer_router
-from routers.email_ingest import router as email_ingest_router
-from routers.banks_v2 import router as banks_v2_router
+from routers.email_ingest import router as email_ingest_router, start_email_ingest_worker
+from routers.banks_v2 import router as banks_v2_router, start_case_entry_job_worker
+from services.dashboard_rollups import start_rollup_worker
+from services.fraud_alerts import start_alert_worker
+from services.entity_graph import start_graph_worker
+from services.ocr_pool import shutdown_ocr_pool
+from services.http_client import get_http_client, close_http_client
+from services import ocr_cache
 from routers.pii_processor import router as pii_processor_router
 
 # Import all models to ensure they are registered
@@ -73,16 +82,32 @@ def initialize_executor_threadsafe():
     print("ThreadPoolExecutor initialized.")
     return thread_executor
 
+def initialize_maintenance_executor():
+    # Background maintenance (rollups, fraud alerts, entity graph) stays off the request executor
+    thread_executor = ThreadPoolExecutor(max_workers=MAINTENANCE_EXECUTOR_WORKERS, thread_name_prefix="maintenance")
+    print("Maintenance ThreadPoolExecutor initialized.")
+    return thread_executor
+
 def shutdown_executor_threadsafe(thread_executor: ThreadPoolExecutor):
     if thread_executor:
         print("Shutting down ThreadPoolExecutor...")
-        thread_executor.shutdown(wait=True)
+        thread_executor.shutdown(wait=True, cancel_futures=True)
         print("ThreadPoolExecutor shut down.")
 
 @app.on_event("startup")
 async def startup_event():
     app.state.executor = await asyncio.get_running_loop().run_in_executor(None, initialize_executor_threadsafe)
-    app.state.anomaly_detector = AnomalyDetector()
+    app.state.maintenance_executor = await asyncio.get_running_loop().run_in_executor(None, initialize_maintenance_executor)
+    # Loads the fraud model artifacts; blocking, so off the loop
+    app.state.anomaly_detector = await asyncio.get_running_loop().run_in_executor(None, AnomalyDetector)
+    await init_async_pool()
+    get_http_client()
+    start_dashboard_cache_listener()
+    app.state.banks_v2_job_worker = start_case_entry_job_worker(app.state.executor)
+    app.state.dashboard_rollup_worker = start_rollup_worker(app.state.maintenance_executor)
+    app.state.fraud_alert_worker = start_alert_worker(app.state.maintenance_executor)
+    app.state.entity_graph_worker = start_graph_worker(app.state.maintenance_executor)
+    app.state.email_ingest_worker = start_email_ingest_worker(app.state.executor)
     
     urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
     app.state.keycloak_openid = KeycloakOpenID(
@@ -96,8 +121,24 @@ async def startup_event():
 
 @app.on_event("shutdown")
 async def shutdown_event():
-    if hasattr(app.state, 'executor') and app.state.executor:
-        await asyncio.get_running_loop().run_in_executor(None, shutdown_executor_threadsafe, app.state.executor)
+    for worker_name in ('banks_v2_job_worker', 'dashboard_rollup_worker', 'fraud_alert_worker', 'entity_graph_worker',
+                        'email_ingest_worker'):
+        worker = getattr(app.state, worker_name, None)
+        if worker:
+            worker.cancel()
+            try:
+                await worker
+            except asyncio.CancelledError:
+                pass
+    for executor_name in ('executor', 'maintenance_executor'):
+        executor = getattr(app.state, executor_name, None)
+        if executor:
+            await asyncio.get_running_loop().run_in_executor(None, shutdown_executor_threadsafe, executor)
+    await stop_dashboard_cache_listener()
+    await close_http_client()
+    close_pool()
+    await close_async_pool()
+    shutdown_ocr_pool()
     print("FastAPI application shutdown complete.")
 
 
@@ -152,3 +193,25 @@ app.include_router(pii_processor_router, tags=["PII Processing"])
 @app.get("/")
 async def read_root():
     return {"message": "Welcome to UniteHub API!"}
+
+@app.get("/api/health/db-pool", tags=["Health"])
+async def db_pool_health():
+    # Pool occupancy and checkout-wait metrics for this worker process
+    stats = get_pool_stats()
+    async_pool = get_async_pool()
+    stats["async_pool"] = {
+        "size": async_pool.get_size(),
+        "idle": async_pool.get_idle_size(),
+        "max_size": async_pool.get_max_size(),
+    } if async_pool else None
+    return stats
+
+@app.get("/api/health/dashboard-cache", tags=["Health"])
+async def dashboard_cache_health():
+    # Size, hit/miss and invalidation counters of this worker's dashboard cache
+    return dashboard_cache.stats()
+
+@app.get("/api/health/ocr-cache", tags=["Health"])
+async def ocr_cache_health():
+    # Hit rate and size of the attachment OCR cache (counters are per worker)
+    return ocr_cache.stats()
@@ -1,11 +1,16 @@
 # model_api.py
 
+import asyncio
+import time
+
 from fastapi import FastAPI, HTTPException
 from pydantic import BaseModel, Field
 from typing import List, Any
 
 # Import the prediction function from your predict.py file
 from predict import make_prediction
+from services.fraud_model import get_scoring_engine
+from config import PREDICT_BATCH_MAX_CUSTOMERS
 
 # 1. --- Initialize a new, separate FastAPI app ---
 app = FastAPI()
@@ -58,6 +63,17 @@ class PredictionRequest(BaseModel):
     customer_details: ML_Customer
     transaction_details: List[ML_Transaction]
 
+class BatchPredictionRequest(BaseModel):
+    customers: List[ML_Customer]
+    # Transactions of all the customers above, linked by acct_num
+    transactions: List[ML_Transaction] = Field(default_factory=list)
+
+
+@app.on_event("startup")
+async def load_model():
+    # Load the artifacts once, before the first request instead of during it
+    await asyncio.get_running_loop().run_in_executor(None, get_scoring_engine)
+
 
 # 3. --- Create the API endpoint for prediction ---
 @app.post("/predict")
@@ -89,6 +105,45 @@ async def predict_endpoint(request: PredictionRequest):
         print(f"ERROR during prediction: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error during prediction: {str(e)}")
 
+@app.post("/predict/batch")
+async def predict_batch_endpoint(request: BatchPredictionRequest):
+    """
+    Scores many customers in one call: one feature matrix for the whole batch and
+    one pass through the models. Returns, in request order, each customer's label
+    and the probability of every class.
+    """
+    if len(request.customers) > PREDICT_BATCH_MAX_CUSTOMERS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"At most {PREDICT_BATCH_MAX_CUSTOMERS} customers per batch; got {len(request.customers)}."
+        )
+    try:
+        start = time.perf_counter()
+        customers = [c.dict() for c in request.customers]
+        transactions = [t.dict() for t in request.transactions]
+        engine = get_scoring_engine()
+        predictions = await asyncio.get_running_loop().run_in_executor(None, engine.score, customers, transactions)
+        elapsed_ms = round((time.perf_counter() - start) * 1000, 1)
+        print(f"Batch prediction: {len(predictions)} customers, {len(transactions)} transactions in {elapsed_ms} ms")
+        return {
+            "count": len(predictions),
+            "classes": engine.classes,
+            "predictions": [
+                {
+                    "customer_id": p["cust_id"],
+                    "acct_num": p["acct_num"],
+                    "model_prediction": p["prediction"],
+                    "probabilities": p["probabilities"],
+                }
+                for p in predictions
+            ],
+            "elapsed_ms": elapsed_ms,
+            "status": "completed"
+        }
+    except Exception as e:
+        print(f"ERROR during batch prediction: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error during batch prediction: {str(e)}")
+
 @app.get("/")
 def root():
     return {"message": "Model Prediction API is running"}
\ No newline at end of file
@@ -1,10 +1,24 @@
 from sqlalchemy import create_engine
 from sqlalchemy.orm import declarative_base, sessionmaker
-from config import DATABASE_URL
+from config import (
+    DATABASE_URL,
+    DB_SQLALCHEMY_POOL_SIZE,
+    DB_POOL_CHECKOUT_TIMEOUT_SECONDS,
+    DB_POOL_MAX_LIFETIME_SECONDS,
+)
 
 # Shared database configuration (now centralized in config.DATABASE_URL)
+# The engine's pool is the ORM's fixed share of DB_MAX_CONNECTIONS_PER_WORKER;
+# no overflow so it can never exceed its budget.
 Base = declarative_base()
-engine = create_engine(DATABASE_URL)
+engine = create_engine(
+    DATABASE_URL,
+    pool_size=DB_SQLALCHEMY_POOL_SIZE,
+    max_overflow=0,
+    pool_timeout=DB_POOL_CHECKOUT_TIMEOUT_SECONDS,
+    pool_recycle=int(DB_POOL_MAX_LIFETIME_SECONDS),
+    pool_pre_ping=True,
+)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 # Import all models to ensure they are registered with the Base
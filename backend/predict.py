@@ -0,0 +1,14 @@
+# predict.py
+"""
+Single-customer prediction for model_api's /predict, on the shared scoring engine
+(services/fraud_model.py), so the model artifacts are loaded once per process
+rather than per request.
+"""
+from typing import Any, Dict, List
+
+from services.fraud_model import get_scoring_engine
+
+
+def make_prediction(customer: Dict[str, Any], transactions: List[Dict[str, Any]]) -> str:
+    """Predicted account label (e.g. 'Normal' / 'Suspicious') for one customer."""
+    return get_scoring_engine().score([customer], transactions)[0]['prediction']
@@ -12,7 +12,8 @@ from jose import jwt, JWTError
 from keycloak.keycloak_openid import KeycloakOpenID
 
 from db.matcher import CaseEntryMatcher, save_or_update_decision, log_case_action # Also need save_or_update_decision here
-from config import DB_CONNECTION_PARAMS
+from db.connection import get_db_connection
+from db.cache import notify_dashboard_change
 
 router = APIRouter()
 
@@ -62,7 +63,6 @@ async def assign_case_api(
     Assign a case to an employee with optional comment and template
     """
     import psycopg2
-    from config import DB_CONNECTION_PARAMS
     import time
     
     try:
@@ -72,7 +72,7 @@ async def assign_case_api(
             raise HTTPException(status_code=404, detail=f"Case with ack_no {ack_no} not found.")
         
         # Update assignment table - allow multiple assignments per case
-        with psycopg2.connect(**DB_CONNECTION_PARAMS) as conn:
+        with get_db_connection(caller="assignment") as conn:
             with conn.cursor() as cur:
                 # Ensure columns exist
                 try:
@@ -91,13 +91,14 @@ async def assign_case_api(
                     """,
                     (case_id, assigned_to_employee, assigner_username, comment, 'template' if template_id else 'manual', template_id)
                 )
+                notify_dashboard_change(cur, "assignment")
             conn.commit()
         
         # Fetch template name once if template_id exists
         template_name = None
         if template_id:
             try:
-                with psycopg2.connect(**DB_CONNECTION_PARAMS) as conn:
+                with get_db_connection(caller="assignment") as conn:
                     with conn.cursor() as cur:
                         cur.execute("SELECT name FROM templates WHERE id = %s", (template_id,))
                         template_row = cur.fetchone()
@@ -161,7 +162,6 @@ async def send_back_case_api(
     Handles 'send back' from 'others' user: reassigns to previous risk_officer and logs the comment.
     """
     import psycopg2
-    from config import DB_CONNECTION_PARAMS
     try:
         # Get case_id from ack_no
         case_id = await matcher.get_case_id_from_ack_no(ack_no) if hasattr(matcher, 'get_case_id_from_ack_no') else None
@@ -171,7 +171,7 @@ async def send_back_case_api(
         previous_risk_officer = None
         user_department = None
         supervisor_username = None
-        with psycopg2.connect(**DB_CONNECTION_PARAMS) as conn:
+        with get_db_connection(caller="assignment") as conn:
             with conn.cursor() as cur:
                 # Identify assigning risk officer
                 cur.execute("SELECT assigned_by FROM assignment WHERE case_id = %s AND assigned_to = %s ORDER BY assign_date DESC, assign_time DESC LIMIT 1", (case_id, current_username))
@@ -292,6 +292,7 @@ async def send_back_case_api(
                     """,
                     (supervisor_username, appended_comment, case_id, current_username)
                 )
+                notify_dashboard_change(cur, "assignment")
             conn.commit()
 
         # Log the send back action and routing to supervisor (include reason text if available)
@@ -338,7 +339,7 @@ async def approve_department_changes_api(
         if not case_id:
             raise HTTPException(status_code=404, detail=f"Case with ack_no {ack_no} not found.")
 
-        with psycopg2.connect(**DB_CONNECTION_PARAMS) as conn:
+        with get_db_connection(caller="assignment") as conn:
             with conn.cursor() as cur:
                 # Determine supervisor's department
                 cur.execute("SELECT dept FROM user_table WHERE user_name = %s", (current_username,))
@@ -431,6 +432,7 @@ async def approve_department_changes_api(
                         """,
                         (previous_risk_officer, ' | Approved by supervisor and routed back', case_id, current_username)
                     )
+                    notify_dashboard_change(cur, "assignment")
                     # Mark the routed-back row inactive
                     try:
                         cur.execute(
@@ -477,7 +479,7 @@ async def reject_department_changes_api(
         if not case_id:
             raise HTTPException(status_code=404, detail=f"Case with ack_no {ack_no} not found.")
 
-        with psycopg2.connect(**DB_CONNECTION_PARAMS) as conn:
+        with get_db_connection(caller="assignment") as conn:
             with conn.cursor() as cur:
                 # Determine supervisor's department
                 cur.execute("SELECT dept FROM user_table WHERE user_name = %s", (current_username,))
@@ -595,6 +597,7 @@ async def reject_department_changes_api(
                         """,
                         (dept_employee_username, ' | Rejected by supervisor. Please revise and Send Back.', case_id, current_username)
                     )
+                    notify_dashboard_change(cur, "assignment")
             conn.commit()
 
         log_case_action(case_id, current_username, "reject_changes", f"Dept: {supervisor_dept}. Reason: {rejection_reason or 'N/A'}")
@@ -617,7 +620,6 @@ async def revoke_assignment_api(
     Revoke assignment from a specific employee
     """
     import psycopg2
-    from config import DB_CONNECTION_PARAMS
     
     try:
         # Get case_id from ack_no
@@ -626,7 +628,7 @@ async def revoke_assignment_api(
             raise HTTPException(status_code=404, detail=f"Case with ack_no {ack_no} not found.")
         
         # Check if the current user is the one who assigned the case
-        with psycopg2.connect(**DB_CONNECTION_PARAMS) as conn:
+        with get_db_connection(caller="assignment") as conn:
             with conn.cursor() as cur:
                 cur.execute(
                     "SELECT assigned_by FROM assignment WHERE case_id = %s AND assigned_to = %s",
@@ -676,7 +678,6 @@ async def get_case_logs(
     - Other users can access logs for cases they've been assigned to or have interacted with
     """
     import psycopg2
-    from config import DB_CONNECTION_PARAMS
     
     try:
         # Check if user is super_user
@@ -684,7 +685,7 @@ async def get_case_logs(
         
         # If not super_user, check if they have access to this case
         if user_type != 'super_user':
-            with psycopg2.connect(**DB_CONNECTION_PARAMS) as conn:
+            with get_db_connection(caller="assignment") as conn:
                 with conn.cursor() as cur:
                     # Check multiple access conditions
                     has_access = False
@@ -743,7 +744,7 @@ async def get_case_logs(
                     print(f"DEBUG: User {current_username} accessing case {case_id} logs - {access_reason}", flush=True)
         
         # Fetch case logs
-        with psycopg2.connect(**DB_CONNECTION_PARAMS) as conn:
+        with get_db_connection(caller="assignment") as conn:
             with conn.cursor() as cur:
                 cur.execute(
                     """
@@ -781,16 +782,16 @@ async def get_case_assignments(
     (which happens when cases are sent back to the original risk officer)
     """
     import psycopg2
-    from config import DB_CONNECTION_PARAMS
     
     try:
-        with psycopg2.connect(**DB_CONNECTION_PARAMS) as conn:
+        with get_db_connection(caller="assignment") as conn:
             with conn.cursor() as cur:
                 # Ensure template_id column exists
                 try:
                     cur.execute("ALTER TABLE assignment ADD COLUMN IF NOT EXISTS template_id INTEGER REFERENCES templates(id) ON DELETE SET NULL")
                 except Exception:
                     pass
+                conn.commit()  # keep the column; the pool rolls back on return
                 
                 cur.execute(
                     """
@@ -870,16 +871,16 @@ async def get_my_case_assignment(
     Get the current user's assignment for a specific case, including template information
     """
     import psycopg2
-    from config import DB_CONNECTION_PARAMS
     
     try:
-        with psycopg2.connect(**DB_CONNECTION_PARAMS) as conn:
+        with get_db_connection(caller="assignment") as conn:
             with conn.cursor() as cur:
                 # Ensure template_id column exists
                 try:
                     cur.execute("ALTER TABLE assignment ADD COLUMN IF NOT EXISTS template_id INTEGER")
                 except Exception:
                     pass
+                conn.commit()  # keep the column; the pool rolls back on return
                 
                 cur.execute(
                     """
@@ -937,10 +938,10 @@ async def bulk_close_cases_api(
         
         for case_id in case_ids:
             try:
-                # Check if case exists and get current status
-                with psycopg2.connect(**DB_CONNECTION_PARAMS) as conn:
+                # Check if case exists and get current status. The connection goes back to
+                # the pool before save_or_update_decision/log_case_action check out their own.
+                with get_db_connection(caller="assignment") as conn:
                     with conn.cursor() as cur:
-                        # First check if case exists and get current status
                         cur.execute(
                             """
                             SELECT status FROM case_main 
@@ -948,49 +949,47 @@ async def bulk_close_cases_api(
                             """,
                             (case_id,)
                         )
-                        
                         result = cur.fetchone()
-                        if not result:
-                            failed_cases.append({"case_id": case_id, "error": "Case not found"})
-                            continue
-                        
-                        current_status = result[0]
-                        
-                        # Check if case is already closed
-                        if current_status == 'Closed':
-                            failed_cases.append({"case_id": case_id, "error": "Case is already closed"})
-                            continue
-                        
-                        # Note: VM cases can be closed but not assigned, so no restriction here
-                        
-                        # Note: We don't update status here anymore - let save_or_update_decision handle it
-                        # The status will be updated when we call save_or_update_decision with "decisionAction": "Closed"
-                        
-                        # Insert closure decision
-                        decision_update_payload = {
-                            "closureLOV": closure_data.get("closureLOV", ""),
-                            "closureRemarks": closure_data.get("closureRemarks", ""),
-                            "confirmedMule": closure_data.get("confirmedMule", "No"),
-                            "fundsSaved": closure_data.get("fundsSaved"),
-                            "digitalBlocked": closure_data.get("digitalBlocked", "No"),
-                            "accountBlocked": closure_data.get("accountBlocked", "No"),
-                            "decisionAction": "Closed",
-                            "comments": f"Case closed by {current_username}",
-                            "auditTrail": f"{time.strftime('%Y-%m-%d %H:%M:%S', time.gmtime())} - Closed by {current_username}"
-                        }
-                        
-                        await save_or_update_decision(executor, case_id, decision_update_payload)
-                        
-                        # Log the closure action
-                        log_details = f"Case closed - Reason: {closure_data.get('closureLOV', 'N/A')}"
-                        if closure_data.get('closureRemarks'):
-                            log_details += f" - Remarks: {closure_data.get('closureRemarks')}"
-                        log_case_action(case_id, current_username, "close", log_details)
-                        
-                        closed_cases.append(case_id)
-                        
-                    conn.commit()
-                    
+
+                if not result:
+                    failed_cases.append({"case_id": case_id, "error": "Case not found"})
+                    continue
+
+                current_status = result[0]
+
+                # Check if case is already closed
+                if current_status == 'Closed':
+                    failed_cases.append({"case_id": case_id, "error": "Case is already closed"})
+                    continue
+
+                # Note: VM cases can be closed but not assigned, so no restriction here
+
+                # Note: We don't update status here anymore - let save_or_update_decision handle it
+                # The status will be updated when we call save_or_update_decision with "decisionAction": "Closed"
+
+                # Insert closure decision
+                decision_update_payload = {
+                    "closureLOV": closure_data.get("closureLOV", ""),
+                    "closureRemarks": closure_data.get("closureRemarks", ""),
+                    "confirmedMule": closure_data.get("confirmedMule", "No"),
+                    "fundsSaved": closure_data.get("fundsSaved"),
+                    "digitalBlocked": closure_data.get("digitalBlocked", "No"),
+                    "accountBlocked": closure_data.get("accountBlocked", "No"),
+                    "decisionAction": "Closed",
+                    "comments": f"Case closed by {current_username}",
+                    "auditTrail": f"{time.strftime('%Y-%m-%d %H:%M:%S', time.gmtime())} - Closed by {current_username}"
+                }
+
+                await save_or_update_decision(executor, case_id, decision_update_payload)
+
+                # Log the closure action
+                log_details = f"Case closed - Reason: {closure_data.get('closureLOV', 'N/A')}"
+                if closure_data.get('closureRemarks'):
+                    log_details += f" - Remarks: {closure_data.get('closureRemarks')}"
+                log_case_action(case_id, current_username, "close", log_details)
+
+                closed_cases.append(case_id)
+
             except Exception as e:
                 print(f"[DEBUG] Error closing case {case_id}: {e}", flush=True)
                 failed_cases.append({"case_id": case_id, "error": str(e)})
@@ -1066,7 +1065,7 @@ async def bulk_assign_cases_api(
                 ack_no = case_details["source_ack_no"]
                 
                 # Create assignment record
-                with psycopg2.connect(**DB_CONNECTION_PARAMS) as conn:
+                with get_db_connection(caller="assignment") as conn:
                     with conn.cursor() as cur:
                         cur.execute(
                             """
@@ -1075,6 +1074,7 @@ async def bulk_assign_cases_api(
                             """,
                             (case_id, assigned_to, current_username, comment)
                         )
+                        notify_dashboard_change(cur, "assignment")
                     conn.commit()
                 
                 # Log the assignment action
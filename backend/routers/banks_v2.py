@@ -1,16 +1,22 @@
 from fastapi import APIRouter, HTTPException, Request
 from typing import Dict, Any, List, Optional
 import uuid
+import asyncio
+import contextlib
+import functools
 import psycopg2
 import psycopg2.extras
 from datetime import datetime
 import time
 
 from models.banks_v2_models import CaseEntryV2
-from db.matcher import CaseEntryMatcher, save_or_update_decision
+from db.unit_of_work import CaseUnitOfWork, open_unit_of_work
 from models.base_models import ECBCaseData
-from config import DB_CONNECTION_PARAMS
+from db.connection import get_db_connection
+from db.cache import notify_dashboard_change
+from config import BANKS_V2_BATCH_INCIDENTS, BANKS_V2_CASE_ENTRY_MODE
 from services.audit_logger import store_failed_request
+from services.banks_v2_jobs import enqueue_job, save_checkpoint, get_job, run_job_worker
 
 router = APIRouter()
 
@@ -28,16 +34,23 @@ def build_ack_response(ack_no: str, success: bool, message: str) -> Dict[str, An
     }
 
 
+# Sane timeouts on the pooled connection to avoid request hangs under lock/contention
+_DB_TIMEOUTS = {"statement_timeout_ms": 10000, "lock_timeout_ms": 5000}
+
+
 def _get_db_conn():
-    # Add sane timeouts to avoid request hangs under lock/contention
-    return psycopg2.connect(
-        host=DB_CONNECTION_PARAMS["host"],
-        port=DB_CONNECTION_PARAMS["port"],
-        dbname=DB_CONNECTION_PARAMS["database"],
-        user=DB_CONNECTION_PARAMS["user"],
-        password=DB_CONNECTION_PARAMS["password"],
-        options='-c statement_timeout=10000 -c lock_timeout=5000'
-    )
+    return get_db_connection(caller="banks_v2", **_DB_TIMEOUTS)
+
+
+def _open_uow(executor):
+    """Unit of work on a banks_v2 connection; checkout, queries and return run on the executor."""
+    return open_unit_of_work(executor, "banks_v2", **_DB_TIMEOUTS)
+
+
+def _on_plain_cursor(cur, func, *args):
+    """func(plain cursor, *args) on cur's connection, for the helpers that read rows by position."""
+    with cur.connection.cursor() as plain:
+        return func(plain, *args)
 
 
 def _parse_date_yyyymmdd(s: str) -> str:
@@ -78,13 +91,793 @@ def _txn_table_exists(cur) -> bool:
     return cur.fetchone() is not None
 
 
+def _process_incidents_sequential(cur, case_id: int, incidents, has_txn_table: bool):
+    """
+    Original per-incident path: one round of lookups per RRN.
+    Returns (transactions, incident_validations, deferred_actions, rrn_to_txn_idx).
+    """
+    transactions: List[Dict[str, Any]] = []
+    incident_validations: List[Dict[str, Any]] = []
+    deferred_actions: List[Dict[str, Any]] = []
+    rrn_to_txn_idx: Dict[str, int] = {}
+    for inc in incidents:
+        rrn = inc.rrn
+        try:
+            # Initialize validation result for this incident
+            validation_result = {
+                "rrn": rrn,
+                "amount": str(inc.amount),
+                "transaction_date": inc.transaction_date,
+                "transaction_time": inc.transaction_time,
+                "disputed_amount": str(inc.disputed_amount),
+                "layer": inc.layer,
+                "validation_status": "pending",
+                "validation_message": "",
+                "matched_txn": None,
+                "error": None
+            }
+
+            # Check if RRN already exists in case_incidents table (for duplicate check)
+            cur.execute("SELECT case_id FROM public.case_incidents WHERE rrn = %s", (rrn,))
+            existing_rrn = cur.fetchone()
+
+            if existing_rrn:
+                # RRN already exists - mark as duplicate but STILL STORE IT
+                validation_result["validation_status"] = "duplicate"
+                validation_result["validation_message"] = "Duplicate RRN - already exists in system"
+                validation_result["error"] = f"RRN '{rrn}' already exists"
+                incident_validations.append(validation_result)
+
+                # Store in transactions response with error status
+                transactions.append({
+                    "rrn_transaction_id": rrn,
+                    "status_code": "16",
+                    "response_message": "Duplicate RRN"
+                })
+                continue  # Skip to next incident
+
+            # Insert incident (always store, even if validation fails later)
+            cur.execute(
+                """
+                INSERT INTO public.case_incidents (
+                    case_id, amount, rrn, transaction_date, transaction_time, disputed_amount, layer
+                ) VALUES (%s, %s, %s, %s, %s, %s, %s)
+                """,
+                (
+                    case_id,
+                    float(inc.amount),
+                    rrn,
+                    _parse_date_yyyymmdd(inc.transaction_date),
+                    _normalize_time(inc.transaction_time),
+                    float(inc.disputed_amount),
+                    int(inc.layer),
+                ),
+            )
+
+            # Now perform RRN validation and txn table lookup
+            if not _rrn_is_numeric_and_length(rrn):
+                validation_result["validation_status"] = "invalid_format"
+                validation_result["validation_message"] = "Invalid RRN format (must be 10-14 digits)"
+                validation_result["error"] = "Invalid RRN"
+                incident_validations.append(validation_result)
+                transactions.append({
+                    "rrn_transaction_id": rrn,
+                    "status_code": "02",
+                    "response_message": "Invalid RRN"
+                })
+                continue
+
+            if not _rrn_in_range(rrn):
+                validation_result["validation_status"] = "invalid_range"
+                validation_result["validation_message"] = "Invalid RRN range"
+                validation_result["error"] = "Invalid RRN range"
+                incident_validations.append(validation_result)
+                transactions.append({
+                    "rrn_transaction_id": rrn,
+                    "status_code": "03",
+                    "response_message": "Invalid RRN range"
+                })
+                continue
+
+            if not has_txn_table:
+                validation_result["validation_status"] = "pending"
+                validation_result["validation_message"] = "Transaction table not available"
+                incident_validations.append(validation_result)
+                transactions.append({
+                    "rrn_transaction_id": rrn,
+                    "status_code": "31",
+                    "response_message": "Pending"
+                })
+                continue
+
+            # Lookup RRN in txn table
+            cur.execute(
+                "SELECT id, acct_num, bene_acct_num, amount, txn_date, txn_time, channel, descr FROM public.txn WHERE rrn = %s",
+                (rrn,)
+            )
+            rows = cur.fetchall()
+            if len(rows) == 0:
+                validation_result["validation_status"] = "not_found"
+                validation_result["validation_message"] = "No transaction found in bank records"
+                validation_result["error"] = "Record not found"
+                incident_validations.append(validation_result)
+                transactions.append({
+                    "rrn_transaction_id": rrn,
+                    "status_code": "01",
+                    "response_message": "Record not found"
+                })
+            elif len(rows) > 1:
+                validation_result["validation_status"] = "multiple_found"
+                validation_result["validation_message"] = "Multiple transactions found for this RRN"
+                validation_result["error"] = "Multiple Records Found"
+                incident_validations.append(validation_result)
+                transactions.append({
+                    "rrn_transaction_id": rrn,
+                    "status_code": "15",
+                    "response_message": "Multiple Records Found"
+                })
+            else:
+                # SUCCESS - Found exactly 1 matching transaction
+                _id, acct_num, bene_acct_num, amount, txn_date, txn_time, channel, descr = rows[0]
+
+                # Store matched transaction details in validation result
+                validation_result["validation_status"] = "matched"
+                validation_result["validation_message"] = "Transaction found and matched successfully"
+                validation_result["matched_txn"] = {
+                    "txn_id": _id,
+                    "acct_num": acct_num,
+                    "bene_acct_num": bene_acct_num,
+                    "amount": str(amount),
+                    "txn_date": txn_date.strftime('%Y-%m-%d') if txn_date else None,
+                    "txn_time": str(txn_time) if txn_time else None,
+                    "channel": channel or "N/A",
+                    "descr": descr or "N/A",
+                    "rrn": rrn
+                }
+
+                # Resolve beneficiary cust_id for PSA
+                cur.execute("SELECT cust_id FROM public.account_customer WHERE acc_num = %s LIMIT 1", (bene_acct_num,))
+                row_b = cur.fetchone()
+                bene_cust_id = row_b[0] if row_b else None
+
+                # ECBT/ECBNT Logic (ECB Flow):
+                # Step 1: Check if bene_acct_num from txn matches bene_acct_num in acc_bene table
+                # FIX: Find ALL customers who have added this beneficiary (not just one)
+
+                # Query acc_bene and join with account_customer to get ALL valid customers
+                cur.execute("""
+                    SELECT ab.cust_acct_num, ab.bene_acct_num, ac.cust_id
+                    FROM public.acc_bene ab
+                    JOIN public.account_customer ac ON ab.cust_acct_num = ac.acc_num
+                    WHERE ab.bene_acct_num = %s
+                """, (bene_acct_num,))
+
+                acc_bene_rows = cur.fetchall()  # Get ALL customers with this beneficiary
+
+                # Add validation result to array
+                incident_validations.append(validation_result)
+
+                # Create ECB cases for ALL customers who have this beneficiary
+                if acc_bene_rows:
+                    for acc_bene_row in acc_bene_rows:
+                        ecb_cust_acct_num = acc_bene_row[0]  # cust_acct_num from acc_bene
+                        ecb_bene_acct_num = acc_bene_row[1]  # bene_acct_num from acc_bene
+                        ecb_cust_id = acc_bene_row[2]  # cust_id from account_customer
+
+                        # Step 2: Check if there's a transaction between this customer and beneficiary
+                        cur.execute("""
+                            SELECT 1 FROM public.txn 
+                            WHERE acct_num = %s AND bene_acct_num = %s 
+                            LIMIT 1
+                        """, (ecb_cust_acct_num, ecb_bene_acct_num))
+
+                        txn_exists = bool(cur.fetchone())
+
+                        # Create action for this specific customer
+                        action = {
+                            "rrn": rrn,
+                            "bene_cust_id": bene_cust_id,
+                            "bene_acc": bene_acct_num,
+                            "psa": bool(bene_cust_id),  # True if bene_acct_num matches account_customer.acc_num
+                            "ecbt": txn_exists,  # True if transaction found between this customer and beneficiary
+                            "ecbnt": not txn_exists,  # True if NO transaction found between this customer and beneficiary
+                            "ecb_cust_id": ecb_cust_id,  # Customer ID for ECB cases
+                            "ecb_cust_acct_num": ecb_cust_acct_num,  # Customer account number for ECB cases
+                            "ecb_bene_acct_num": ecb_bene_acct_num  # Beneficiary account number for ECB cases
+                        }
+                        print(f"[v2] 📋 Created action for customer {ecb_cust_id} (account: {ecb_cust_acct_num}): PSA={action['psa']}, ECBT={action['ecbt']}, ECBNT={action['ecbnt']}", flush=True)
+                        deferred_actions.append(action)
+                else:
+                    # No ECB match, but still need PSA action
+                    action = {
+                        "rrn": rrn,
+                        "bene_cust_id": bene_cust_id,
+                        "bene_acc": bene_acct_num,
+                        "psa": bool(bene_cust_id),  # True if bene_acct_num matches account_customer.acc_num
+                        "ecbt": False,
+                        "ecbnt": False,
+                        "ecb_cust_id": None,
+                        "ecb_cust_acct_num": None,
+                        "ecb_bene_acct_num": None
+                    }
+                    deferred_actions.append(action)
+
+                transactions.append({
+                    "rrn_transaction_id": rrn,
+                    "payee_account_number": bene_acct_num,
+                    "amount": str(amount),
+                    "transaction_datetime": f"{txn_date} {txn_time}",
+                    "root_account_number": acct_num,
+                    "root_rrn_transaction_id": rrn,
+                    "status_code": "00",
+                    "response_message": "SUCCESS"
+                })
+                rrn_to_txn_idx[rrn] = len(transactions) - 1
+        except psycopg2.errors.UniqueViolation:
+            # Should not occur due to ON CONFLICT DO NOTHING, but keep fallback
+            pass
+        except psycopg2.Error as db_err:
+            # Generic DB error for this incident (temporary: include reason for debugging)
+            transactions.append({
+                "rrn_transaction_id": rrn,
+                "status_code": "32",
+                "response_message": "Failure",
+                "error": str(db_err)
+            })
+
+    return transactions, incident_validations, deferred_actions, rrn_to_txn_idx
+
+
+def _new_validation_result(inc) -> Dict[str, Any]:
+    return {
+        "rrn": inc.rrn,
+        "amount": str(inc.amount),
+        "transaction_date": inc.transaction_date,
+        "transaction_time": inc.transaction_time,
+        "disputed_amount": str(inc.disputed_amount),
+        "layer": inc.layer,
+        "validation_status": "pending",
+        "validation_message": "",
+        "matched_txn": None,
+        "error": None
+    }
+
+
+def _process_incidents_batched(cur, case_id: int, incidents, has_txn_table: bool):
+    """
+    Set-based equivalent of _process_incidents_sequential.
+
+    Duplicate RRNs, txn rows, beneficiary customers, acc_bene links and
+    customer->beneficiary txn existence are each resolved with one query over
+    all incidents (= ANY / unnest), new incidents go in with a single multi-row
+    INSERT, and the results are then assembled in payload order so the response
+    is identical to the per-incident path.
+    Returns (transactions, incident_validations, deferred_actions, rrn_to_txn_idx).
+    """
+    transactions: List[Dict[str, Any]] = []
+    incident_validations: List[Dict[str, Any]] = []
+    deferred_actions: List[Dict[str, Any]] = []
+    rrn_to_txn_idx: Dict[str, int] = {}
+
+    try:
+        # 1. Duplicate check against existing incidents (and repeats within this payload,
+        #    which the per-incident path caught because the first copy was already inserted)
+        cur.execute(
+            "SELECT DISTINCT rrn FROM public.case_incidents WHERE rrn = ANY(%s)",
+            ([inc.rrn for inc in incidents],)
+        )
+        seen_rrns = {row[0] for row in cur.fetchall()}
+        is_duplicate: List[bool] = []
+        for inc in incidents:
+            is_duplicate.append(inc.rrn in seen_rrns)
+            seen_rrns.add(inc.rrn)
+
+        # 2. Insert every non-duplicate incident in one statement (stored even if validation fails)
+        new_incidents = [inc for inc, dup in zip(incidents, is_duplicate) if not dup]
+        if new_incidents:
+            psycopg2.extras.execute_values(
+                cur,
+                """
+                INSERT INTO public.case_incidents (
+                    case_id, amount, rrn, transaction_date, transaction_time, disputed_amount, layer
+                ) VALUES %s
+                """,
+                [
+                    (
+                        case_id,
+                        float(inc.amount),
+                        inc.rrn,
+                        _parse_date_yyyymmdd(inc.transaction_date),
+                        _normalize_time(inc.transaction_time),
+                        float(inc.disputed_amount),
+                        int(inc.layer),
+                    )
+                    for inc in new_incidents
+                ],
+                page_size=max(len(new_incidents), 1),
+            )
+
+        # 3. Lookup all well-formed RRNs in the txn table at once
+        lookup_rrns = [
+            inc.rrn for inc in new_incidents
+            if _rrn_is_numeric_and_length(inc.rrn) and _rrn_in_range(inc.rrn)
+        ] if has_txn_table else []
+        txn_rows_by_rrn: Dict[str, List[tuple]] = {}
+        if lookup_rrns:
+            cur.execute(
+                """
+                SELECT rrn, id, acct_num, bene_acct_num, amount, txn_date, txn_time, channel, descr
+                FROM public.txn WHERE rrn = ANY(%s)
+                """,
+                (lookup_rrns,)
+            )
+            for row in cur.fetchall():
+                txn_rows_by_rrn.setdefault(row[0], []).append(row[1:])
+
+        # 4. Beneficiary customers and acc_bene links for every matched beneficiary account
+        bene_accts = list({
+            rows[0][2] for rows in txn_rows_by_rrn.values()
+            if len(rows) == 1 and rows[0][2] is not None
+        })
+        bene_cust_by_acc: Dict[str, Any] = {}
+        acc_bene_by_bene: Dict[str, List[tuple]] = {}
+        if bene_accts:
+            cur.execute(
+                """
+                SELECT DISTINCT ON (acc_num) acc_num, cust_id
+                FROM public.account_customer WHERE acc_num = ANY(%s)
+                """,
+                (bene_accts,)
+            )
+            bene_cust_by_acc = {row[0]: row[1] for row in cur.fetchall()}
+
+            cur.execute("""
+                SELECT ab.cust_acct_num, ab.bene_acct_num, ac.cust_id
+                FROM public.acc_bene ab
+                JOIN public.account_customer ac ON ab.cust_acct_num = ac.acc_num
+                WHERE ab.bene_acct_num = ANY(%s)
+            """, (bene_accts,))
+            for row in cur.fetchall():
+                acc_bene_by_bene.setdefault(row[1], []).append(row)
+
+        # 5. Customer -> beneficiary transaction existence for every acc_bene pair (ECBT vs ECBNT)
+        pairs = list({(row[0], row[1]) for rows in acc_bene_by_bene.values() for row in rows})
+        pairs_with_txn = set()
+        if pairs:
+            cur.execute("""
+                SELECT p.cust_acct_num, p.bene_acct_num
+                FROM unnest(%s::text[], %s::text[]) AS p(cust_acct_num, bene_acct_num)
+                WHERE EXISTS (
+                    SELECT 1 FROM public.txn t
+                    WHERE t.acct_num = p.cust_acct_num AND t.bene_acct_num = p.bene_acct_num
+                )
+            """, ([pair[0] for pair in pairs], [pair[1] for pair in pairs]))
+            pairs_with_txn = {(row[0], row[1]) for row in cur.fetchall()}
+    except psycopg2.Error as db_err:
+        # Same per-incident failure entries the sequential path produces on DB errors
+        for inc in incidents:
+            transactions.append({
+                "rrn_transaction_id": inc.rrn,
+                "status_code": "32",
+                "response_message": "Failure",
+                "error": str(db_err)
+            })
+        return transactions, [], [], {}
+
+    # Assemble results in payload order
+    for inc, dup in zip(incidents, is_duplicate):
+        rrn = inc.rrn
+        validation_result = _new_validation_result(inc)
+
+        if dup:
+            validation_result["validation_status"] = "duplicate"
+            validation_result["validation_message"] = "Duplicate RRN - already exists in system"
+            validation_result["error"] = f"RRN '{rrn}' already exists"
+            incident_validations.append(validation_result)
+            transactions.append({
+                "rrn_transaction_id": rrn,
+                "status_code": "16",
+                "response_message": "Duplicate RRN"
+            })
+            continue
+
+        if not _rrn_is_numeric_and_length(rrn):
+            validation_result["validation_status"] = "invalid_format"
+            validation_result["validation_message"] = "Invalid RRN format (must be 10-14 digits)"
+            validation_result["error"] = "Invalid RRN"
+            incident_validations.append(validation_result)
+            transactions.append({
+                "rrn_transaction_id": rrn,
+                "status_code": "02",
+                "response_message": "Invalid RRN"
+            })
+            continue
+
+        if not _rrn_in_range(rrn):
+            validation_result["validation_status"] = "invalid_range"
+            validation_result["validation_message"] = "Invalid RRN range"
+            validation_result["error"] = "Invalid RRN range"
+            incident_validations.append(validation_result)
+            transactions.append({
+                "rrn_transaction_id": rrn,
+                "status_code": "03",
+                "response_message": "Invalid RRN range"
+            })
+            continue
+
+        if not has_txn_table:
+            validation_result["validation_status"] = "pending"
+            validation_result["validation_message"] = "Transaction table not available"
+            incident_validations.append(validation_result)
+            transactions.append({
+                "rrn_transaction_id": rrn,
+                "status_code": "31",
+                "response_message": "Pending"
+            })
+            continue
+
+        rows = txn_rows_by_rrn.get(rrn, [])
+        if len(rows) == 0:
+            validation_result["validation_status"] = "not_found"
+            validation_result["validation_message"] = "No transaction found in bank records"
+            validation_result["error"] = "Record not found"
+            incident_validations.append(validation_result)
+            transactions.append({
+                "rrn_transaction_id": rrn,
+                "status_code": "01",
+                "response_message": "Record not found"
+            })
+            continue
+        if len(rows) > 1:
+            validation_result["validation_status"] = "multiple_found"
+            validation_result["validation_message"] = "Multiple transactions found for this RRN"
+            validation_result["error"] = "Multiple Records Found"
+            incident_validations.append(validation_result)
+            transactions.append({
+                "rrn_transaction_id": rrn,
+                "status_code": "15",
+                "response_message": "Multiple Records Found"
+            })
+            continue
+
+        # SUCCESS - Found exactly 1 matching transaction
+        _id, acct_num, bene_acct_num, amount, txn_date, txn_time, channel, descr = rows[0]
+        validation_result["validation_status"] = "matched"
+        validation_result["validation_message"] = "Transaction found and matched successfully"
+        validation_result["matched_txn"] = {
+            "txn_id": _id,
+            "acct_num": acct_num,
+            "bene_acct_num": bene_acct_num,
+            "amount": str(amount),
+            "txn_date": txn_date.strftime('%Y-%m-%d') if txn_date else None,
+            "txn_time": str(txn_time) if txn_time else None,
+            "channel": channel or "N/A",
+            "descr": descr or "N/A",
+            "rrn": rrn
+        }
+        incident_validations.append(validation_result)
+
+        bene_cust_id = bene_cust_by_acc.get(bene_acct_num)
+        acc_bene_rows = acc_bene_by_bene.get(bene_acct_num, [])
+        if acc_bene_rows:
+            # One action per customer who has added this beneficiary
+            for ecb_cust_acct_num, ecb_bene_acct_num, ecb_cust_id in acc_bene_rows:
+                txn_exists = (ecb_cust_acct_num, ecb_bene_acct_num) in pairs_with_txn
+                action = {
+                    "rrn": rrn,
+                    "bene_cust_id": bene_cust_id,
+                    "bene_acc": bene_acct_num,
+                    "psa": bool(bene_cust_id),
+                    "ecbt": txn_exists,
+                    "ecbnt": not txn_exists,
+                    "ecb_cust_id": ecb_cust_id,
+                    "ecb_cust_acct_num": ecb_cust_acct_num,
+                    "ecb_bene_acct_num": ecb_bene_acct_num
+                }
+                print(f"[v2] 📋 Created action for customer {ecb_cust_id} (account: {ecb_cust_acct_num}): PSA={action['psa']}, ECBT={action['ecbt']}, ECBNT={action['ecbnt']}", flush=True)
+                deferred_actions.append(action)
+        else:
+            # No ECB match, but still need PSA action
+            deferred_actions.append({
+                "rrn": rrn,
+                "bene_cust_id": bene_cust_id,
+                "bene_acc": bene_acct_num,
+                "psa": bool(bene_cust_id),
+                "ecbt": False,
+                "ecbnt": False,
+                "ecb_cust_id": None,
+                "ecb_cust_acct_num": None,
+                "ecb_bene_acct_num": None
+            })
+
+        transactions.append({
+            "rrn_transaction_id": rrn,
+            "payee_account_number": bene_acct_num,
+            "amount": str(amount),
+            "transaction_datetime": f"{txn_date} {txn_time}",
+            "root_account_number": acct_num,
+            "root_rrn_transaction_id": rrn,
+            "status_code": "00",
+            "response_message": "SUCCESS"
+        })
+        rrn_to_txn_idx[rrn] = len(transactions) - 1
+
+    return transactions, incident_validations, deferred_actions, rrn_to_txn_idx
+
+
+def _insert_incident_validation_results(cur, case_id: int, validations: List[Dict[str, Any]]) -> None:
+    # Single multi-row INSERT of per-incident validation results linked to a case
+    if not validations:
+        return
+    psycopg2.extras.execute_values(
+        cur,
+        """
+        INSERT INTO public.incident_validation_results 
+        (case_id, rrn, validation_status, validation_message, matched_txn_data, error_message, created_at)
+        VALUES %s
+        """,
+        [
+            (
+                case_id,
+                val_result["rrn"],
+                val_result["validation_status"],
+                val_result["validation_message"],
+                psycopg2.extras.Json(val_result["matched_txn"]) if val_result["matched_txn"] else None,
+                val_result["error"]
+            )
+            for val_result in validations
+        ],
+        template="(%s, %s, %s, %s, %s, %s, NOW())",
+        page_size=len(validations),
+    )
+
+
+def _dedupe_deferred_actions(deferred_actions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    # Deduplicate actions to prevent duplicate source_ack_no errors
+    unique_actions = {}
+    for action in deferred_actions:
+        # Create unique key for ECBT/ECBNT actions
+        if action["ecb_cust_id"] and action["ecb_bene_acct_num"]:
+            key = f"{action['ecb_cust_id']}_{action['ecb_bene_acct_num']}"
+            if key not in unique_actions:
+                unique_actions[key] = action
+            else:
+                # Merge flags if duplicate found
+                existing = unique_actions[key]
+                existing["ecbt"] = existing["ecbt"] or action["ecbt"]
+                existing["ecbnt"] = existing["ecbnt"] or action["ecbnt"]
+                existing["psa"] = existing["psa"] or action["psa"]
+        else:
+            # For PSA-only actions, use RRN as key
+            key = f"psa_{action['rrn']}"
+            if key not in unique_actions:
+                unique_actions[key] = action
+    return list(unique_actions.values())
+
+
+def _new_phase2_state() -> Dict[str, Any]:
+    return {"actions_done": 0, "psa_case_id": None, "ecbt_case_ids": [], "ecbnt_case_ids": []}
+
+
+async def _run_deferred_actions(
+    uow: CaseUnitOfWork,
+    ack_no: str,
+    deferred_actions: List[Dict[str, Any]],
+    transactions: List[Dict[str, Any]],
+    rrn_to_txn_idx: Dict[str, int],
+    incident_validations: List[Dict[str, Any]],
+    state: Dict[str, Any],
+    on_progress=None,
+) -> Dict[str, Any]:
+    """
+    Phase 2 of case entry: create PSA/ECBT/ECBNT cases for the deferred actions and
+    record the case IDs on `transactions` (in place). Cases are created through `uow`,
+    each in its own savepoint; committing is up to the caller.
+
+    `state` (see _new_phase2_state) is updated after every action, so callers keep
+    partial results if an action fails. Actions before state["actions_done"] are
+    skipped, which is how the async job worker resumes an interrupted job;
+    `on_progress(state)` is awaited after each action so it can be checkpointed.
+    """
+    psa_case_id = state["psa_case_id"]  # Track if we create a PSA case
+    ecbt_case_ids = state["ecbt_case_ids"]  # Track all ECBT case IDs
+    ecbnt_case_ids = state["ecbnt_case_ids"]  # Track all ECBNT case IDs
+
+    deduplicated_actions = _dedupe_deferred_actions(deferred_actions)
+    print(f"[v2] 🚀 Phase 2: Processing {len(deduplicated_actions)} deduplicated actions (from {len(deferred_actions)} original) for PSA/ECBT/ECBNT case creation", flush=True)
+
+    for action_no, action in enumerate(deduplicated_actions):
+        if action_no < state["actions_done"]:
+            continue  # Already done before the job was interrupted
+        rrn = action["rrn"]
+        idx = rrn_to_txn_idx.get(rrn)
+        if idx is None:
+            state["actions_done"] = action_no + 1
+            continue
+        txn_entry = transactions[idx]
+
+        # PSA - Created if RRN found AND bene_acct_num matches account_customer.acc_num
+        if action["psa"] and not psa_case_id:  # Only create one PSA case
+            async with uow.savepoint():
+                new_psa_case_id = await uow.create_case(
+                    case_type="PSA",
+                    source_ack_no=f"{ack_no}_PSA",
+                    cust_id=action["bene_cust_id"],
+                    acc_num=action["bene_acc"],
+                    is_operational=True,
+                    status='New',
+                    decision_input='Pending Review',
+                    remarks_input=f"Automated PSA case from bank ingest for {ack_no}",
+                    source_bene_accno=action["bene_acc"],
+                    customer_full_name=None
+                )
+                await uow.add_history(new_psa_case_id, {"comments": "Initial PSA case created", "assignedEmployee": "jalaj"})
+                await uow.add_case_details_1(action["bene_cust_id"], "PSA", action["bene_acc"], "PSA Match")
+                # Store validation results for PSA case too (only matched incidents)
+                await uow.run(
+                    _insert_incident_validation_results, new_psa_case_id,
+                    [val_result for val_result in incident_validations if val_result["validation_status"] == "matched"]
+                )
+            psa_case_id = new_psa_case_id
+            state["psa_case_id"] = psa_case_id
+
+        # ECBT - Existing Customer Beneficiary with Transaction (can be multiple per RRN)
+        ecbt_case_id = None
+        if action["ecbt"] and action["ecb_cust_id"]:
+            print(f"[v2] 🔍 Creating ECBT case for customer {action['ecb_cust_id']} (account: {action['ecb_cust_acct_num']}) - HAS transaction with beneficiary {action['ecb_bene_acct_num']}", flush=True)
+            ecb_payload = ECBCaseData(
+                sourceAckNo=f"{ack_no}_ECBT_{action['ecb_cust_id']}_{action['ecb_bene_acct_num']}",  # Unique ACK per customer-beneficiary pair
+                customerId=action["ecb_cust_id"],
+                customerAccountNumber=action["ecb_cust_acct_num"],
+                beneficiaryAccountNumber=action["ecb_bene_acct_num"],
+                hasTransaction=True,
+                remarks=f"Automated ECBT case from bank ingest. RRN {rrn}. Customer: {action['ecb_cust_id']}, Account: {action['ecb_cust_acct_num']}, Beneficiary: {action['ecb_bene_acct_num']}",
+                location=None,
+                disputedAmount=None
+            )
+            ecbt_result = await uow.create_ecb_case(ecb_payload, created_by_user="System")
+            ecbt_case_id = (ecbt_result or {}).get("case_id")
+            if ecbt_case_id:
+                ecbt_case_ids.append(ecbt_case_id)
+                print(f"[v2] ✅ Created ECBT case {ecbt_case_id} for customer {action['ecb_cust_id']} (account: {action['ecb_cust_acct_num']})", flush=True)
+            else:
+                print(f"[v2] ❌ Failed to create ECBT case for customer {action['ecb_cust_id']}", flush=True)
+
+        # ECBNT - Existing Customer Beneficiary with No Transaction (can be multiple per RRN)
+        ecbnt_case_id = None
+        if action["ecbnt"] and action["ecb_cust_id"]:
+            print(f"[v2] 🔍 Creating ECBNT case for customer {action['ecb_cust_id']} (account: {action['ecb_cust_acct_num']}) - NO transaction with beneficiary {action['ecb_bene_acct_num']}", flush=True)
+            ecbn_payload = ECBCaseData(
+                sourceAckNo=f"{ack_no}_ECBNT_{action['ecb_cust_id']}_{action['ecb_bene_acct_num']}",  # Unique ACK per customer-beneficiary pair
+                customerId=action["ecb_cust_id"],
+                customerAccountNumber=action["ecb_cust_acct_num"],
+                beneficiaryAccountNumber=action["ecb_bene_acct_num"],
+                hasTransaction=False,
+                remarks=f"Automated ECBNT case from bank ingest. RRN {rrn}. Customer: {action['ecb_cust_id']}, Account: {action['ecb_cust_acct_num']}, Beneficiary: {action['ecb_bene_acct_num']}",
+                location=None,
+                disputedAmount=None
+            )
+            ecbnt_result = await uow.create_ecb_case(ecbn_payload, created_by_user="System")
+            ecbnt_case_id = (ecbnt_result or {}).get("case_id")
+            if ecbnt_case_id:
+                ecbnt_case_ids.append(ecbnt_case_id)
+                print(f"[v2] ✅ Created ECBNT case {ecbnt_case_id} for customer {action['ecb_cust_id']} (account: {action['ecb_cust_acct_num']})", flush=True)
+            else:
+                print(f"[v2] ❌ Failed to create ECBNT case for customer {action['ecb_cust_id']}", flush=True)
+
+        # Collect ECB case IDs for this RRN
+        if not hasattr(txn_entry, '_ecbt_cases'):
+            txn_entry["ecbt_case_ids"] = []
+            txn_entry["ecbnt_case_ids"] = []
+        if ecbt_case_id:
+            txn_entry["ecbt_case_ids"].append(ecbt_case_id)
+        if ecbnt_case_id:
+            txn_entry["ecbnt_case_ids"].append(ecbnt_case_id)
+        
+        # Keep backward compatibility with single case ID fields
+        if not txn_entry.get("psa_case_id"):
+            txn_entry["psa_case_id"] = psa_case_id
+        if ecbt_case_id and not txn_entry.get("ecbt_case_id"):
+            txn_entry["ecbt_case_id"] = ecbt_case_id  # First ECBT case for backward compatibility
+        if ecbnt_case_id and not txn_entry.get("ecbnt_case_id"):
+            txn_entry["ecbnt_case_id"] = ecbnt_case_id  # First ECBNT case for backward compatibility
+
+        state["actions_done"] = action_no + 1
+        if on_progress is not None:
+            await on_progress(state)
+
+    return state
+
+
+def _upsert_case_main_v2(cur, ack_no: str, payload: CaseEntryV2) -> Optional[int]:
+    """case_id of the case_main_v2 row for ack_no, inserting the envelope if it is new (no commit)."""
+    case_id = None
+    # First try to get existing record
+    cur.execute(
+        "SELECT case_id FROM public.case_main_v2 WHERE acknowledgement_no = %s",
+        (ack_no,)
+    )
+    row = cur.fetchone()
+    if row:
+        case_id = row[0]
+        print(f"[v2] Found existing case_main_v2 case_id={case_id}", flush=True)
+    else:
+        # Insert new record
+        cur.execute(
+            """
+            INSERT INTO public.case_main_v2 (
+                acknowledgement_no, sub_category, requestor, payer_bank, payer_bank_code,
+                mode_of_payment, payer_mobile_number, payer_account_number, state, district,
+                transaction_type, wallet
+            ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+            ON CONFLICT (acknowledgement_no) DO NOTHING
+            RETURNING case_id
+            """,
+            (
+                ack_no,
+                payload.sub_category,
+                payload.instrument.requestor,
+                payload.instrument.payer_bank,
+                payload.instrument.payer_bank_code,
+                payload.instrument.mode_of_payment,
+                payload.instrument.payer_mobile_number,
+                payload.instrument.payer_account_number,
+                payload.instrument.state,
+                payload.instrument.district,
+                payload.instrument.transaction_type,
+                payload.instrument.wallet,
+            ),
+        )
+        result = cur.fetchone()
+        if result:
+            case_id = result[0]
+            print(f"[v2] Inserted new case_main_v2 case_id={case_id}", flush=True)
+        else:
+            # Conflict occurred, fetch the existing record
+            cur.execute(
+                "SELECT case_id FROM public.case_main_v2 WHERE acknowledgement_no = %s",
+                (ack_no,)
+            )
+            row = cur.fetchone()
+            case_id = row[0] if row else None
+            print(f"[v2] Conflict resolved, found case_id={case_id}", flush=True)
+    return case_id
+
+
+def _find_victim_customer(cur, payer_account_number: str) -> Optional[str]:
+    cur.execute(
+        "SELECT cust_id FROM public.account_customer WHERE acc_num = %s LIMIT 1",
+        (payer_account_number,)
+    )
+    row = cur.fetchone()
+    return row[0] if row else None
+
+
+def _case_entry_response(ack_no: str, job_id: str, vm_case_id, state: Dict[str, Any], transactions: List[Dict[str, Any]]) -> Dict[str, Any]:
+    return {
+        "meta": {"response_code": "00", "response_message": "Success"},
+        "data": {
+            "acknowledgement_no": ack_no,
+            "job_id": job_id,
+            "vm_case_id": vm_case_id,  # VM case created immediately
+            "psa_case_id": state["psa_case_id"],
+            "ecbt_case_ids": state["ecbt_case_ids"],  # All ECBT case IDs
+            "ecbnt_case_ids": state["ecbnt_case_ids"]  # All ECBNT case IDs
+        },
+        "transactions": transactions
+    }
+
+
 @router.post("/api/v2/banks/case-entry", tags=["Bank Ingest v2"])
-async def banks_case_entry(payload: CaseEntryV2, request: Request) -> Dict[str, Any]:
+async def banks_case_entry(payload: CaseEntryV2, request: Request, mode: Optional[str] = None) -> Dict[str, Any]:
     # Phase 1: Structural validation is already performed by Pydantic.
+    # mode=async: Phase 2 (PSA/ECBT/ECBNT case creation) is queued as a job and the
+    # ack returns right away; poll /api/v2/banks/case-entry/jobs/{job_id} for the result.
     ack_no = payload.acknowledgement_no
     job_id = f"BANKS-{uuid.uuid4()}"
+    run_async = (mode or BANKS_V2_CASE_ENTRY_MODE).lower() == "async"
     t0 = time.perf_counter()
-    print(f"[v2] START banks_case_entry ack={ack_no} job={job_id}", flush=True)
+    print(f"[v2] START banks_case_entry ack={ack_no} job={job_id} mode={'async' if run_async else 'sync'}", flush=True)
 
     # Enforce incidents count (already in model, but double-safeguard)
     if not payload.incidents or len(payload.incidents) == 0:
@@ -103,81 +896,24 @@ async def banks_case_entry(payload: CaseEntryV2, request: Request) -> Dict[str,
     incident_validations: List[Dict[str, Any]] = []  # Store validation results per incident
     vm_case_id = None  # Will be created early if VM matches
 
+    # One pooled connection serves the whole request: phase 1 and (sync mode) phase 2
+    db_stack = contextlib.AsyncExitStack()
+    keep_conn = False
     try:
-        conn = _get_db_conn()
-        conn.autocommit = False
-        cur = conn.cursor()
+        # VM/PSA/ECB cases with their history, case_details_1 and validation rows go
+        # through one unit of work on this connection (savepoint per case); every query
+        # runs on the executor through uow.run
+        uow = await db_stack.enter_async_context(_open_uow(request.app.state.executor))
 
-        # Initialize matcher using app's executor for creating cases in public.case_main
-        matcher = CaseEntryMatcher(executor=request.app.state.executor)
-
-        # Upsert into case_main_v2 using a separate connection to avoid transaction conflicts
+        # Upsert into case_main_v2 and commit it straight away so the envelope is kept
+        # even if a later step fails
         t_upsert_0 = time.perf_counter()
-        case_id = None
-        
-        # Use a separate connection for the upsert to avoid transaction conflicts
-        upsert_conn = None
         try:
-            upsert_conn = _get_db_conn()
-            upsert_conn.autocommit = True  # Use autocommit for this operation
-            upsert_cur = upsert_conn.cursor()
-            
-            # First try to get existing record
-            upsert_cur.execute(
-                "SELECT case_id FROM public.case_main_v2 WHERE acknowledgement_no = %s",
-                (ack_no,)
-            )
-            row = upsert_cur.fetchone()
-            if row:
-                case_id = row[0]
-                print(f"[v2] Found existing case_main_v2 case_id={case_id}", flush=True)
-            else:
-                # Insert new record
-                upsert_cur.execute(
-                    """
-                    INSERT INTO public.case_main_v2 (
-                        acknowledgement_no, sub_category, requestor, payer_bank, payer_bank_code,
-                        mode_of_payment, payer_mobile_number, payer_account_number, state, district,
-                        transaction_type, wallet
-                    ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                    ON CONFLICT (acknowledgement_no) DO NOTHING
-                    RETURNING case_id
-                    """,
-                    (
-                        ack_no,
-                        payload.sub_category,
-                        payload.instrument.requestor,
-                        payload.instrument.payer_bank,
-                        payload.instrument.payer_bank_code,
-                        payload.instrument.mode_of_payment,
-                        payload.instrument.payer_mobile_number,
-                        payload.instrument.payer_account_number,
-                        payload.instrument.state,
-                        payload.instrument.district,
-                        payload.instrument.transaction_type,
-                        payload.instrument.wallet,
-                    ),
-                )
-                result = upsert_cur.fetchone()
-                if result:
-                    case_id = result[0]
-                    print(f"[v2] Inserted new case_main_v2 case_id={case_id}", flush=True)
-                else:
-                    # Conflict occurred, fetch the existing record
-                    upsert_cur.execute(
-                        "SELECT case_id FROM public.case_main_v2 WHERE acknowledgement_no = %s",
-                        (ack_no,)
-                    )
-                    row = upsert_cur.fetchone()
-                    case_id = row[0] if row else None
-                    print(f"[v2] Conflict resolved, found case_id={case_id}", flush=True)
-                    
+            case_id = await uow.run(_on_plain_cursor, _upsert_case_main_v2, ack_no, payload)
+            await uow.commit()
         except Exception as e:
             print(f"[v2] Error in upsert: {e}", flush=True)
             raise
-        finally:
-            if upsert_conn:
-                upsert_conn.close()
                 
         if case_id is None:
             raise psycopg2.Error("Failed to upsert case_main_v2")
@@ -187,13 +923,9 @@ async def banks_case_entry(payload: CaseEntryV2, request: Request) -> Dict[str,
         # PRIORITY CHECK: VM Match - Check if payer_account_number matches any customer
         # This happens BEFORE any RRN validation
         print(f"[v2] Checking VM match for payer_account: {payload.instrument.payer_account_number}", flush=True)
-        cur.execute(
-            "SELECT cust_id FROM public.account_customer WHERE acc_num = %s LIMIT 1",
-            (payload.instrument.payer_account_number,)
-        )
-        vm_row = cur.fetchone()
+        victim_cust_id = await uow.run(_find_victim_customer, payload.instrument.payer_account_number)
         
-        if not vm_row:
+        if victim_cust_id is None:
             # NO VM MATCH - Store data for audit BEFORE rolling back
             print(f"[v2] NO VM MATCH for payer_account: {payload.instrument.payer_account_number}", flush=True)
             
@@ -230,7 +962,8 @@ async def banks_case_entry(payload: CaseEntryV2, request: Request) -> Dict[str,
                 }
                 
                 # Store failed request for audit
-                store_failed_request(
+                await asyncio.get_running_loop().run_in_executor(request.app.state.executor, functools.partial(
+                    store_failed_request,
                     ack_no=ack_no,
                     raw_body=raw_body,
                     failure_reason=f"VM match failed for payer_account_number: {payload.instrument.payer_account_number}",
@@ -239,13 +972,12 @@ async def banks_case_entry(payload: CaseEntryV2, request: Request) -> Dict[str,
                         "payer_account_number": payload.instrument.payer_account_number,
                         "vm_check_result": "no_match"
                     }
-                )
+                ))
             except Exception as audit_err:
                 print(f"[AUDIT] Failed to store VM match failure: {audit_err}", flush=True)
             
             # Now rollback the main transaction
-            conn.rollback()
-            conn.close()
+            await uow.rollback()
             
             return {
                 "meta": {
@@ -260,297 +992,47 @@ async def banks_case_entry(payload: CaseEntryV2, request: Request) -> Dict[str,
             }
         
         # VM MATCH FOUND - Get customer ID and CREATE VM CASE IMMEDIATELY (before RRN validation)
-        victim_cust_id = vm_row[0]
         print(f"[v2] Victim Match Found! cust_id={victim_cust_id}", flush=True)
         
-        # Commit what we have so far before creating case
-        conn.commit()
-        
-        # Create VM case NOW
-        vm_case_id = await matcher.insert_into_case_main(
-            case_type="VM",
-            source_ack_no=f"{ack_no}_VM",
-            cust_id=victim_cust_id,
-            acc_num=payload.instrument.payer_account_number,
-            is_operational=True,
-            status='New',
-            decision_input='Pending Review',
-            remarks_input=f"Automated VM case from bank ingest for {ack_no}",
-            source_bene_accno=None,
-            customer_full_name=None
-        )
-        await save_or_update_decision(request.app.state.executor, vm_case_id, {"comments": "Initial VM case created", "assignedEmployee": "jalaj"})
-        with _get_db_conn() as c2:
-            with c2.cursor() as k:
-                k.execute("INSERT INTO public.case_details_1 (cust_id, casetype, acc_no, match_flag, creation_timestamp) VALUES (%s, %s, %s, %s, NOW())", (victim_cust_id, "VM", payload.instrument.payer_account_number, "VM Match"))
-                c2.commit()
+        # Create VM case NOW (commits together with the incidents and validation results)
+        async with uow.savepoint():
+            vm_case_id = await uow.create_case(
+                case_type="VM",
+                source_ack_no=f"{ack_no}_VM",
+                cust_id=victim_cust_id,
+                acc_num=payload.instrument.payer_account_number,
+                is_operational=True,
+                status='New',
+                decision_input='Pending Review',
+                remarks_input=f"Automated VM case from bank ingest for {ack_no}",
+                source_bene_accno=None,
+                customer_full_name=None
+            )
+            await uow.add_history(vm_case_id, {"comments": "Initial VM case created", "assignedEmployee": "jalaj"})
+            await uow.add_case_details_1(victim_cust_id, "VM", payload.instrument.payer_account_number, "VM Match")
         
         print(f"[v2] VM CASE CREATED! case_id={vm_case_id}", flush=True)
 
         # Prepare to insert each incident and validate RRNs
-        has_txn_table = _txn_table_exists(cur)
-        t_inc_total = 0.0
-        # Defer PSA/ECBT/ECBNT case creation until after all incidents processed
-        deferred_actions: List[Dict[str, Any]] = []
-        rrn_to_txn_idx: Dict[str, int] = {}
-        for inc in payload.incidents:
-            rrn = inc.rrn
-            try:
-                t_inc_0 = time.perf_counter()
-                
-                # Initialize validation result for this incident
-                validation_result = {
-                    "rrn": rrn,
-                    "amount": str(inc.amount),
-                    "transaction_date": inc.transaction_date,
-                    "transaction_time": inc.transaction_time,
-                    "disputed_amount": str(inc.disputed_amount),
-                    "layer": inc.layer,
-                    "validation_status": "pending",
-                    "validation_message": "",
-                    "matched_txn": None,
-                    "error": None
-                }
-                
-                # Check if RRN already exists in case_incidents table (for duplicate check)
-                cur.execute("SELECT case_id FROM public.case_incidents WHERE rrn = %s", (rrn,))
-                existing_rrn = cur.fetchone()
-                
-                if existing_rrn:
-                    # RRN already exists - mark as duplicate but STILL STORE IT
-                    validation_result["validation_status"] = "duplicate"
-                    validation_result["validation_message"] = "Duplicate RRN - already exists in system"
-                    validation_result["error"] = f"RRN '{rrn}' already exists"
-                    incident_validations.append(validation_result)
-                    
-                    # Store in transactions response with error status
-                    transactions.append({
-                        "rrn_transaction_id": rrn,
-                        "status_code": "16",
-                        "response_message": "Duplicate RRN"
-                    })
-                    t_inc_total += time.perf_counter()-t_inc_0
-                    continue  # Skip to next incident
-                
-                # Insert incident (always store, even if validation fails later)
-                cur.execute(
-                    """
-                    INSERT INTO public.case_incidents (
-                        case_id, amount, rrn, transaction_date, transaction_time, disputed_amount, layer
-                    ) VALUES (%s, %s, %s, %s, %s, %s, %s)
-                    """,
-                    (
-                        case_id,
-                        float(inc.amount),
-                        rrn,
-                        _parse_date_yyyymmdd(inc.transaction_date),
-                        _normalize_time(inc.transaction_time),
-                        float(inc.disputed_amount),
-                        int(inc.layer),
-                    ),
-                )
-
-                # Now perform RRN validation and txn table lookup
-                if not _rrn_is_numeric_and_length(rrn):
-                    validation_result["validation_status"] = "invalid_format"
-                    validation_result["validation_message"] = "Invalid RRN format (must be 10-14 digits)"
-                    validation_result["error"] = "Invalid RRN"
-                    incident_validations.append(validation_result)
-                    transactions.append({
-                        "rrn_transaction_id": rrn,
-                        "status_code": "02",
-                        "response_message": "Invalid RRN"
-                    })
-                    t_inc_total += time.perf_counter()-t_inc_0
-                    continue
-
-                if not _rrn_in_range(rrn):
-                    validation_result["validation_status"] = "invalid_range"
-                    validation_result["validation_message"] = "Invalid RRN range"
-                    validation_result["error"] = "Invalid RRN range"
-                    incident_validations.append(validation_result)
-                    transactions.append({
-                        "rrn_transaction_id": rrn,
-                        "status_code": "03",
-                        "response_message": "Invalid RRN range"
-                    })
-                    t_inc_total += time.perf_counter()-t_inc_0
-                    continue
-
-                if not has_txn_table:
-                    validation_result["validation_status"] = "pending"
-                    validation_result["validation_message"] = "Transaction table not available"
-                    incident_validations.append(validation_result)
-                    transactions.append({
-                        "rrn_transaction_id": rrn,
-                        "status_code": "31",
-                        "response_message": "Pending"
-                    })
-                    t_inc_total += time.perf_counter()-t_inc_0
-                    continue
-
-                # Lookup RRN in txn table
-                cur.execute(
-                    "SELECT id, acct_num, bene_acct_num, amount, txn_date, txn_time, channel, descr FROM public.txn WHERE rrn = %s",
-                    (rrn,)
-                )
-                rows = cur.fetchall()
-                if len(rows) == 0:
-                    validation_result["validation_status"] = "not_found"
-                    validation_result["validation_message"] = "No transaction found in bank records"
-                    validation_result["error"] = "Record not found"
-                    incident_validations.append(validation_result)
-                    transactions.append({
-                        "rrn_transaction_id": rrn,
-                        "status_code": "01",
-                        "response_message": "Record not found"
-                    })
-                    t_inc_total += time.perf_counter()-t_inc_0
-                elif len(rows) > 1:
-                    validation_result["validation_status"] = "multiple_found"
-                    validation_result["validation_message"] = "Multiple transactions found for this RRN"
-                    validation_result["error"] = "Multiple Records Found"
-                    incident_validations.append(validation_result)
-                    transactions.append({
-                        "rrn_transaction_id": rrn,
-                        "status_code": "15",
-                        "response_message": "Multiple Records Found"
-                    })
-                    t_inc_total += time.perf_counter()-t_inc_0
-                else:
-                    # SUCCESS - Found exactly 1 matching transaction
-                    _id, acct_num, bene_acct_num, amount, txn_date, txn_time, channel, descr = rows[0]
-                    
-                    # Store matched transaction details in validation result
-                    validation_result["validation_status"] = "matched"
-                    validation_result["validation_message"] = "Transaction found and matched successfully"
-                    validation_result["matched_txn"] = {
-                        "txn_id": _id,
-                        "acct_num": acct_num,
-                        "bene_acct_num": bene_acct_num,
-                        "amount": str(amount),
-                        "txn_date": txn_date.strftime('%Y-%m-%d') if txn_date else None,
-                        "txn_time": str(txn_time) if txn_time else None,
-                        "channel": channel or "N/A",
-                        "descr": descr or "N/A",
-                        "rrn": rrn
-                    }
-
-                    # Resolve beneficiary cust_id for PSA
-                    cur.execute("SELECT cust_id FROM public.account_customer WHERE acc_num = %s LIMIT 1", (bene_acct_num,))
-                    row_b = cur.fetchone()
-                    bene_cust_id = row_b[0] if row_b else None
-
-                    # ECBT/ECBNT Logic (ECB Flow):
-                    # Step 1: Check if bene_acct_num from txn matches bene_acct_num in acc_bene table
-                    # FIX: Find ALL customers who have added this beneficiary (not just one)
-                    
-                    # Query acc_bene and join with account_customer to get ALL valid customers
-                    cur.execute("""
-                        SELECT ab.cust_acct_num, ab.bene_acct_num, ac.cust_id
-                        FROM public.acc_bene ab
-                        JOIN public.account_customer ac ON ab.cust_acct_num = ac.acc_num
-                        WHERE ab.bene_acct_num = %s
-                    """, (bene_acct_num,))
-                    
-                    acc_bene_rows = cur.fetchall()  # Get ALL customers with this beneficiary
-                    
-                    # Add validation result to array
-                    incident_validations.append(validation_result)
-                    
-                    # Create ECB cases for ALL customers who have this beneficiary
-                    if acc_bene_rows:
-                        for acc_bene_row in acc_bene_rows:
-                            ecb_cust_acct_num = acc_bene_row[0]  # cust_acct_num from acc_bene
-                            ecb_bene_acct_num = acc_bene_row[1]  # bene_acct_num from acc_bene
-                            ecb_cust_id = acc_bene_row[2]  # cust_id from account_customer
-                            
-                            # Step 2: Check if there's a transaction between this customer and beneficiary
-                            cur.execute("""
-                                SELECT 1 FROM public.txn 
-                                WHERE acct_num = %s AND bene_acct_num = %s 
-                                LIMIT 1
-                            """, (ecb_cust_acct_num, ecb_bene_acct_num))
-                            
-                            txn_exists = bool(cur.fetchone())
-                            
-                            # Create action for this specific customer
-                            action = {
-                                "rrn": rrn,
-                                "bene_cust_id": bene_cust_id,
-                                "bene_acc": bene_acct_num,
-                                "psa": bool(bene_cust_id),  # True if bene_acct_num matches account_customer.acc_num
-                                "ecbt": txn_exists,  # True if transaction found between this customer and beneficiary
-                                "ecbnt": not txn_exists,  # True if NO transaction found between this customer and beneficiary
-                                "ecb_cust_id": ecb_cust_id,  # Customer ID for ECB cases
-                                "ecb_cust_acct_num": ecb_cust_acct_num,  # Customer account number for ECB cases
-                                "ecb_bene_acct_num": ecb_bene_acct_num  # Beneficiary account number for ECB cases
-                            }
-                            print(f"[v2] 📋 Created action for customer {ecb_cust_id} (account: {ecb_cust_acct_num}): PSA={action['psa']}, ECBT={action['ecbt']}, ECBNT={action['ecbnt']}", flush=True)
-                            deferred_actions.append(action)
-                    else:
-                        # No ECB match, but still need PSA action
-                        action = {
-                            "rrn": rrn,
-                            "bene_cust_id": bene_cust_id,
-                            "bene_acc": bene_acct_num,
-                            "psa": bool(bene_cust_id),  # True if bene_acct_num matches account_customer.acc_num
-                            "ecbt": False,
-                            "ecbnt": False,
-                            "ecb_cust_id": None,
-                            "ecb_cust_acct_num": None,
-                            "ecb_bene_acct_num": None
-                        }
-                        deferred_actions.append(action)
+        has_txn_table = await uow.run(_txn_table_exists)
+        t_inc_0 = time.perf_counter()
+        # PSA/ECBT/ECBNT case creation is deferred until after all incidents are processed
+        if BANKS_V2_BATCH_INCIDENTS:
+            inc_transactions, incident_validations, deferred_actions, rrn_to_txn_idx = await uow.run(
+                _on_plain_cursor, _process_incidents_batched, case_id, payload.incidents, has_txn_table
+            )
+        else:
+            inc_transactions, incident_validations, deferred_actions, rrn_to_txn_idx = await uow.run(
+                _on_plain_cursor, _process_incidents_sequential, case_id, payload.incidents, has_txn_table
+            )
+        transactions.extend(inc_transactions)
+        t_inc_total = time.perf_counter() - t_inc_0
 
-                    transactions.append({
-                        "rrn_transaction_id": rrn,
-                        "payee_account_number": bene_acct_num,
-                        "amount": str(amount),
-                        "transaction_datetime": f"{txn_date} {txn_time}",
-                        "root_account_number": acct_num,
-                        "root_rrn_transaction_id": rrn,
-                        "status_code": "00",
-                        "response_message": "SUCCESS"
-                    })
-                    rrn_to_txn_idx[rrn] = len(transactions) - 1
-                    t_inc_total += time.perf_counter()-t_inc_0
-            except psycopg2.errors.UniqueViolation:
-                # Should not occur due to ON CONFLICT DO NOTHING, but keep fallback
-                pass
-            except psycopg2.Error as db_err:
-                # Generic DB error for this incident (temporary: include reason for debugging)
-                transactions.append({
-                    "rrn_transaction_id": rrn,
-                    "status_code": "32",
-                    "response_message": "Failure",
-                    "error": str(db_err)
-                })
+        # Store incident validation results in database for frontend retrieval (linked to the VM case)
+        await uow.run(_insert_incident_validation_results, vm_case_id, incident_validations)
 
-        # Store incident validation results in database for frontend retrieval
-        # Create a simple JSON storage table if needed or link to VM case
-        validation_conn = _get_db_conn()
-        validation_cur = validation_conn.cursor()
-        
-        # Store validation results linked to the VM case
-        for val_result in incident_validations:
-            validation_cur.execute("""
-                INSERT INTO public.incident_validation_results 
-                (case_id, rrn, validation_status, validation_message, matched_txn_data, error_message, created_at)
-                VALUES (%s, %s, %s, %s, %s, %s, NOW())
-            """, (
-                vm_case_id,
-                val_result["rrn"],
-                val_result["validation_status"],
-                val_result["validation_message"],
-                psycopg2.extras.Json(val_result["matched_txn"]) if val_result["matched_txn"] else None,
-                val_result["error"]
-            ))
-        validation_conn.commit()
-        validation_cur.close()
-        validation_conn.close()
-        
-        conn.commit()
+        await uow.commit()
+        keep_conn = True
         print(f"[v2] Phase1 done (upsert+incidents+validation) dt={(time.perf_counter()-t0)*1000:.1f}ms inc_total={t_inc_total*1000:.1f}ms validations={len(incident_validations)}", flush=True)
     except HTTPException:
         raise
@@ -563,171 +1045,257 @@ async def banks_case_entry(payload: CaseEntryV2, request: Request) -> Dict[str,
         })
     finally:
         try:
-            if 'cur' in locals():
-                cur.close()
-            if 'conn' in locals():
-                conn.close()
+            if not keep_conn:
+                await db_stack.aclose()
         except Exception:
             pass
 
     # Phase 2: Create PSA/ECBT/ECBNT cases (VM already created in Phase 1)
     try:
-        matcher = CaseEntryMatcher(executor=request.app.state.executor)
-        psa_case_id = None  # Track if we create a PSA case
-        ecbt_case_ids = []  # Track all ECBT case IDs
-        ecbnt_case_ids = []  # Track all ECBNT case IDs
-        
-        # Deduplicate actions to prevent duplicate source_ack_no errors
-        unique_actions = {}
-        for action in deferred_actions:
-            # Create unique key for ECBT/ECBNT actions
-            if action["ecb_cust_id"] and action["ecb_bene_acct_num"]:
-                key = f"{action['ecb_cust_id']}_{action['ecb_bene_acct_num']}"
-                if key not in unique_actions:
-                    unique_actions[key] = action
-                else:
-                    # Merge flags if duplicate found
-                    existing = unique_actions[key]
-                    existing["ecbt"] = existing["ecbt"] or action["ecbt"]
-                    existing["ecbnt"] = existing["ecbnt"] or action["ecbnt"]
-                    existing["psa"] = existing["psa"] or action["psa"]
-            else:
-                # For PSA-only actions, use RRN as key
-                key = f"psa_{action['rrn']}"
-                if key not in unique_actions:
-                    unique_actions[key] = action
-        
-        deduplicated_actions = list(unique_actions.values())
-        print(f"[v2] 🚀 Phase 2: Processing {len(deduplicated_actions)} deduplicated actions (from {len(deferred_actions)} original) for PSA/ECBT/ECBNT case creation", flush=True)
-        
-        for action in deduplicated_actions:
-            rrn = action["rrn"]
-            idx = rrn_to_txn_idx.get(rrn)
-            if idx is None:
-                continue
-            txn_entry = transactions[idx]
-
-            # PSA - Created if RRN found AND bene_acct_num matches account_customer.acc_num
-            if action["psa"] and not psa_case_id:  # Only create one PSA case
-                psa_case_id = await matcher.insert_into_case_main(
-                    case_type="PSA",
-                    source_ack_no=f"{ack_no}_PSA",
-                    cust_id=action["bene_cust_id"],
-                    acc_num=action["bene_acc"],
-                    is_operational=True,
-                    status='New',
-                    decision_input='Pending Review',
-                    remarks_input=f"Automated PSA case from bank ingest for {ack_no}",
-                    source_bene_accno=action["bene_acc"],
-                    customer_full_name=None
-                )
-                await save_or_update_decision(request.app.state.executor, psa_case_id, {"comments": "Initial PSA case created", "assignedEmployee": "jalaj"})
-                with _get_db_conn() as c2:
-                    with c2.cursor() as k:
-                        k.execute("INSERT INTO public.case_details_1 (cust_id, casetype, acc_no, match_flag, creation_timestamp) VALUES (%s, %s, %s, %s, NOW())", (action["bene_cust_id"], "PSA", action["bene_acc"], "PSA Match"))
-                        c2.commit()
-                        
-                # Store validation results for PSA case too
-                psa_validation_conn = _get_db_conn()
-                psa_validation_cur = psa_validation_conn.cursor()
-                for val_result in incident_validations:
-                    if val_result["validation_status"] == "matched":  # Only matched incidents
-                        psa_validation_cur.execute("""
-                            INSERT INTO public.incident_validation_results 
-                            (case_id, rrn, validation_status, validation_message, matched_txn_data, error_message, created_at)
-                            VALUES (%s, %s, %s, %s, %s, %s, NOW())
-                        """, (
-                            psa_case_id,
-                            val_result["rrn"],
-                            val_result["validation_status"],
-                            val_result["validation_message"],
-                            psycopg2.extras.Json(val_result["matched_txn"]) if val_result["matched_txn"] else None,
-                            val_result["error"]
-                        ))
-                psa_validation_conn.commit()
-                psa_validation_cur.close()
-                psa_validation_conn.close()
-
-            # ECBT - Existing Customer Beneficiary with Transaction (can be multiple per RRN)
-            ecbt_case_id = None
-            if action["ecbt"] and action["ecb_cust_id"]:
-                print(f"[v2] 🔍 Creating ECBT case for customer {action['ecb_cust_id']} (account: {action['ecb_cust_acct_num']}) - HAS transaction with beneficiary {action['ecb_bene_acct_num']}", flush=True)
-                ecb_payload = ECBCaseData(
-                    sourceAckNo=f"{ack_no}_ECBT_{action['ecb_cust_id']}_{action['ecb_bene_acct_num']}",  # Unique ACK per customer-beneficiary pair
-                    customerId=action["ecb_cust_id"],
-                    customerAccountNumber=action["ecb_cust_acct_num"],
-                    beneficiaryAccountNumber=action["ecb_bene_acct_num"],
-                    hasTransaction=True,
-                    remarks=f"Automated ECBT case from bank ingest. RRN {rrn}. Customer: {action['ecb_cust_id']}, Account: {action['ecb_cust_acct_num']}, Beneficiary: {action['ecb_bene_acct_num']}",
-                    location=None,
-                    disputedAmount=None
-                )
-                ecbt_result = await matcher.create_ecb_case(ecb_payload, created_by_user="System")
-                ecbt_case_id = (ecbt_result or {}).get("case_id")
-                if ecbt_case_id:
-                    ecbt_case_ids.append(ecbt_case_id)
-                    print(f"[v2] ✅ Created ECBT case {ecbt_case_id} for customer {action['ecb_cust_id']} (account: {action['ecb_cust_acct_num']})", flush=True)
-                else:
-                    print(f"[v2] ❌ Failed to create ECBT case for customer {action['ecb_cust_id']}", flush=True)
-
-            # ECBNT - Existing Customer Beneficiary with No Transaction (can be multiple per RRN)
-            ecbnt_case_id = None
-            if action["ecbnt"] and action["ecb_cust_id"]:
-                print(f"[v2] 🔍 Creating ECBNT case for customer {action['ecb_cust_id']} (account: {action['ecb_cust_acct_num']}) - NO transaction with beneficiary {action['ecb_bene_acct_num']}", flush=True)
-                ecbn_payload = ECBCaseData(
-                    sourceAckNo=f"{ack_no}_ECBNT_{action['ecb_cust_id']}_{action['ecb_bene_acct_num']}",  # Unique ACK per customer-beneficiary pair
-                    customerId=action["ecb_cust_id"],
-                    customerAccountNumber=action["ecb_cust_acct_num"],
-                    beneficiaryAccountNumber=action["ecb_bene_acct_num"],
-                    hasTransaction=False,
-                    remarks=f"Automated ECBNT case from bank ingest. RRN {rrn}. Customer: {action['ecb_cust_id']}, Account: {action['ecb_cust_acct_num']}, Beneficiary: {action['ecb_bene_acct_num']}",
-                    location=None,
-                    disputedAmount=None
-                )
-                ecbnt_result = await matcher.create_ecb_case(ecbn_payload, created_by_user="System")
-                ecbnt_case_id = (ecbnt_result or {}).get("case_id")
-                if ecbnt_case_id:
-                    ecbnt_case_ids.append(ecbnt_case_id)
-                    print(f"[v2] ✅ Created ECBNT case {ecbnt_case_id} for customer {action['ecb_cust_id']} (account: {action['ecb_cust_acct_num']})", flush=True)
-                else:
-                    print(f"[v2] ❌ Failed to create ECBNT case for customer {action['ecb_cust_id']}", flush=True)
+        if run_async:
+            accepted = await _enqueue_case_entry_job(
+                request.app.state.executor, ack_no, job_id, vm_case_id,
+                deferred_actions, transactions, rrn_to_txn_idx, incident_validations
+            )
+            if accepted is not None:
+                print(f"[v2] END banks_case_entry ack={ack_no} job={job_id} queued phase2 total_dt={(time.perf_counter()-t0)*1000:.1f}ms", flush=True)
+                return accepted
 
-            # Collect ECB case IDs for this RRN
-            if not hasattr(txn_entry, '_ecbt_cases'):
-                txn_entry["ecbt_case_ids"] = []
-                txn_entry["ecbnt_case_ids"] = []
-            if ecbt_case_id:
-                txn_entry["ecbt_case_ids"].append(ecbt_case_id)
-            if ecbnt_case_id:
-                txn_entry["ecbnt_case_ids"].append(ecbnt_case_id)
-            
-            # Keep backward compatibility with single case ID fields
-            if not txn_entry.get("psa_case_id"):
-                txn_entry["psa_case_id"] = psa_case_id
-            if ecbt_case_id and not txn_entry.get("ecbt_case_id"):
-                txn_entry["ecbt_case_id"] = ecbt_case_id  # First ECBT case for backward compatibility
-            if ecbnt_case_id and not txn_entry.get("ecbnt_case_id"):
-                txn_entry["ecbnt_case_id"] = ecbnt_case_id  # First ECBNT case for backward compatibility
-    except Exception as e:
-        print(f"[v2] Phase2 warning: {e}", flush=True)
+        phase2_state = _new_phase2_state()
+        try:
+            await _run_deferred_actions(
+                uow, ack_no, deferred_actions, transactions,
+                rrn_to_txn_idx, incident_validations, phase2_state
+            )
+        except Exception as e:
+            # The failing case was rolled back to its savepoint; cases before it are kept
+            print(f"[v2] Phase2 warning: {e}", flush=True)
+        try:
+            await uow.commit()
+        except Exception as e:
+            print(f"[v2] Phase2 commit failed, no PSA/ECBT/ECBNT cases were created: {e}", flush=True)
+            phase2_state = _new_phase2_state()
+            for txn_entry in transactions:
+                for key in ("psa_case_id", "ecbt_case_id", "ecbnt_case_id", "ecbt_case_ids", "ecbnt_case_ids"):
+                    txn_entry.pop(key, None)
+    finally:
+        await db_stack.aclose()
 
     # Final combined response with ack and per-incident details
     print(f"[v2] END banks_case_entry ack={ack_no} job={job_id} total_dt={(time.perf_counter()-t0)*1000:.1f}ms", flush=True)
-    print(f"[v2] 📊 Case Creation Summary: VM={vm_case_id}, PSA={psa_case_id}, ECBT={len(ecbt_case_ids)} cases, ECBNT={len(ecbnt_case_ids)} cases", flush=True)
+    print(f"[v2] 📊 Case Creation Summary: VM={vm_case_id}, PSA={phase2_state['psa_case_id']}, ECBT={len(phase2_state['ecbt_case_ids'])} cases, ECBNT={len(phase2_state['ecbnt_case_ids'])} cases", flush=True)
+    return _case_entry_response(ack_no, job_id, vm_case_id, phase2_state, transactions)
+
+
+async def _enqueue_case_entry_job(
+    executor,
+    ack_no: str,
+    job_id: str,
+    vm_case_id,
+    deferred_actions: List[Dict[str, Any]],
+    transactions: List[Dict[str, Any]],
+    rrn_to_txn_idx: Dict[str, int],
+    incident_validations: List[Dict[str, Any]],
+) -> Optional[Dict[str, Any]]:
+    """
+    Persist the Phase 2 envelope as a banks_v2_jobs row and build the immediate
+    "accepted" response. Returns None if the job could not be stored, in which
+    case the caller runs Phase 2 inline as in sync mode.
+    """
+    envelope = {
+        "vm_case_id": vm_case_id,
+        "deferred_actions": deferred_actions,
+        "transactions": transactions,
+        "rrn_to_txn_idx": rrn_to_txn_idx,
+        "incident_validations": incident_validations,
+    }
+    actions_total = len(_dedupe_deferred_actions(deferred_actions))
+    try:
+        await asyncio.get_running_loop().run_in_executor(
+            executor, enqueue_job, job_id, ack_no, envelope, actions_total
+        )
+    except Exception as e:
+        print(f"[v2] Could not queue job {job_id}, running phase 2 inline: {e}", flush=True)
+        return None
     return {
-        "meta": {"response_code": "00", "response_message": "Success"},
+        "meta": {"response_code": "00", "response_message": "Accepted"},
         "data": {
             "acknowledgement_no": ack_no,
             "job_id": job_id,
+            "status": "queued",
             "vm_case_id": vm_case_id,  # VM case created immediately
-            "psa_case_id": psa_case_id if 'psa_case_id' in locals() else None,
-            "ecbt_case_ids": ecbt_case_ids,  # All ECBT case IDs
-            "ecbnt_case_ids": ecbnt_case_ids  # All ECBNT case IDs
+            "status_url": f"/api/v2/banks/case-entry/jobs/{job_id}"
         },
         "transactions": transactions
     }
 
 
+async def _process_case_entry_job(executor, job: Dict[str, Any]) -> Dict[str, Any]:
+    """Run Phase 2 for a claimed job, resuming from its last checkpoint."""
+    job_id = job["job_id"]
+    ack_no = job["acknowledgement_no"]
+    envelope = job["envelope"]
+    checkpoint = job.get("checkpoint")
+
+    if checkpoint:
+        transactions = checkpoint.pop("transactions")
+        state = checkpoint
+        print(f"[v2-jobs] Resuming job {job_id} at action {state['actions_done']}", flush=True)
+    else:
+        transactions = envelope["transactions"]
+        state = _new_phase2_state()
+
+    async with _open_uow(executor) as uow:
+        async def _save_progress(current_state: Dict[str, Any]):
+            # The checkpoint commits atomically with the cases it records, so a retried
+            # job never re-creates a case
+            await uow.run(
+                save_checkpoint, job_id,
+                {**current_state, "transactions": transactions}, current_state["actions_done"]
+            )
+            await uow.commit()
+
+        await _run_deferred_actions(
+            uow, ack_no, envelope["deferred_actions"], transactions,
+            envelope["rrn_to_txn_idx"], envelope["incident_validations"], state,
+            on_progress=_save_progress
+        )
+    print(f"[v2-jobs] 📊 Case Creation Summary ack={ack_no}: VM={envelope['vm_case_id']}, PSA={state['psa_case_id']}, ECBT={len(state['ecbt_case_ids'])} cases, ECBNT={len(state['ecbnt_case_ids'])} cases", flush=True)
+    return _case_entry_response(ack_no, job_id, envelope["vm_case_id"], state, transactions)
+
+
+def start_case_entry_job_worker(executor) -> asyncio.Task:
+    """Start this process's background worker for queued case-entry jobs."""
+    return asyncio.create_task(
+        run_job_worker(executor, lambda job: _process_case_entry_job(executor, job))
+    )
+
+
+@router.get("/api/v2/banks/case-entry/jobs/{job_id}", tags=["Bank Ingest v2"])
+async def get_case_entry_job_status(job_id: str, request: Request) -> Dict[str, Any]:
+    """
+    Status of an async case-entry job. `result` carries the same body the sync
+    case-entry call returns once the job has completed.
+    """
+    try:
+        job = await asyncio.get_running_loop().run_in_executor(request.app.state.executor, get_job, job_id)
+    except Exception as e:
+        print(f"[v2] Error fetching job {job_id}: {e}", flush=True)
+        raise HTTPException(status_code=500, detail=f"Failed to fetch job status: {str(e)}")
+    if not job:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+
+    return {
+        "meta": {"response_code": "00", "response_message": "Success"},
+        "data": {
+            "job_id": job["job_id"],
+            "acknowledgement_no": job["acknowledgement_no"],
+            "status": job["status"],  # queued | processing | completed | failed
+            "progress": {
+                "actions_total": job["actions_total"],
+                "actions_done": job["actions_done"]
+            },
+            "attempts": job["attempts"],
+            "error": job["error"],
+            "created_at": job["created_at"],
+            "started_at": job["started_at"],
+            "completed_at": job["completed_at"],
+            "updated_at": job["updated_at"],
+            "result": job["result"]
+        }
+    }
+
+
+def _close_vm_case_for_response(cur, ack_no: str) -> Dict[str, Any]:
+    """
+    Mark the VM case of ack_no as Closed (no commit) and load what the bank response
+    is built from. `cur` must be a RealDictCursor.
+    """
+    # Get case_main_v2 data
+    cur.execute("""
+        SELECT case_id, acknowledgement_no
+        FROM public.case_main_v2
+        WHERE acknowledgement_no = %s
+    """, (ack_no,))
+
+    case_main_v2_data = cur.fetchone()
+    if not case_main_v2_data:
+        raise HTTPException(status_code=404, detail=f"Case {ack_no} not found")
+
+    v2_case_id = case_main_v2_data['case_id']
+
+    # Get VM case
+    cur.execute("""
+        SELECT case_id, status
+        FROM public.case_main
+        WHERE source_ack_no = %s
+    """, (f"{ack_no}_VM",))
+
+    vm_case = cur.fetchone()
+    if not vm_case:
+        raise HTTPException(status_code=404, detail=f"VM case not found for {ack_no}")
+
+    vm_case_id = vm_case['case_id']
+
+    # Mark VM case as Closed
+    cur.execute("""
+        UPDATE public.case_main
+        SET status = 'Closed'
+        WHERE case_id = %s
+    """, (vm_case_id,))
+    notify_dashboard_change(cur, "case_status")
+    print(f"[v2] VM case {vm_case_id} marked as Closed", flush=True)
+
+    # Get all validation results for this VM case
+    cur.execute("""
+        SELECT rrn, validation_status, validation_message, matched_txn_data, error_message
+        FROM public.incident_validation_results
+        WHERE case_id = %s
+        ORDER BY created_at
+    """, (vm_case_id,))
+
+    validations = cur.fetchall()
+
+    # Get incidents data
+    cur.execute("""
+        SELECT rrn, amount, disputed_amount, transaction_date, transaction_time
+        FROM public.case_incidents
+        WHERE case_id = %s
+    """, (v2_case_id,))
+
+    incidents = cur.fetchall()
+
+    # Get PSA case if exists
+    cur.execute("""
+        SELECT case_id FROM public.case_main WHERE source_ack_no = %s
+    """, (f"{ack_no}_PSA",))
+    psa_row = cur.fetchone()
+    psa_case_id = psa_row['case_id'] if psa_row else None
+
+    # Get ECBT cases if exist
+    cur.execute("""
+        SELECT case_id FROM public.case_main WHERE source_ack_no LIKE %s
+    """, (f"{ack_no}_ECBT%",))
+    ecbt_rows = cur.fetchall()
+    ecbt_case_ids = [row['case_id'] for row in ecbt_rows]
+
+    # Get ECBNT cases if exist
+    cur.execute("""
+        SELECT case_id FROM public.case_main WHERE source_ack_no LIKE %s
+    """, (f"{ack_no}_ECBNT%",))
+    ecbnt_rows = cur.fetchall()
+    ecbnt_case_ids = [row['case_id'] for row in ecbnt_rows]
+
+    return {
+        "vm_case_id": vm_case_id,
+        "validations": validations,
+        "incidents": incidents,
+        "psa_case_id": psa_case_id,
+        "ecbt_case_ids": ecbt_case_ids,
+        "ecbnt_case_ids": ecbnt_case_ids,
+    }
+
+
 @router.post("/api/v2/banks/case-entry/{ack_no}/respond", tags=["Bank Ingest v2"])
 async def banks_case_entry_respond(ack_no: str, request: Request) -> Dict[str, Any]:
     """
@@ -742,87 +1310,13 @@ async def banks_case_entry_respond(ack_no: str, request: Request) -> Dict[str, A
         
         print(f"[v2] Respond endpoint - received {len(manually_selected_txns)} manually selected transactions", flush=True)
         
-        conn = _get_db_conn()
-        cur = conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
-        
-        # Get case_main_v2 data
-        cur.execute("""
-            SELECT case_id, acknowledgement_no
-            FROM public.case_main_v2
-            WHERE acknowledgement_no = %s
-        """, (ack_no,))
-        
-        case_main_v2_data = cur.fetchone()
-        if not case_main_v2_data:
-            raise HTTPException(status_code=404, detail=f"Case {ack_no} not found")
-        
-        v2_case_id = case_main_v2_data['case_id']
-        
-        # Get VM case
-        cur.execute("""
-            SELECT case_id, status
-            FROM public.case_main
-            WHERE source_ack_no = %s
-        """, (f"{ack_no}_VM",))
-        
-        vm_case = cur.fetchone()
-        if not vm_case:
-            raise HTTPException(status_code=404, detail=f"VM case not found for {ack_no}")
-        
-        vm_case_id = vm_case['case_id']
-        
-        # Mark VM case as Closed
-        cur.execute("""
-            UPDATE public.case_main
-            SET status = 'Closed'
-            WHERE case_id = %s
-        """, (vm_case_id,))
-        conn.commit()
-        
-        print(f"[v2] VM case {vm_case_id} marked as Closed", flush=True)
-        
-        # Get all validation results for this VM case
-        cur.execute("""
-            SELECT rrn, validation_status, validation_message, matched_txn_data, error_message
-            FROM public.incident_validation_results
-            WHERE case_id = %s
-            ORDER BY created_at
-        """, (vm_case_id,))
-        
-        validations = cur.fetchall()
-        
-        # Get incidents data
-        cur.execute("""
-            SELECT rrn, amount, disputed_amount, transaction_date, transaction_time
-            FROM public.case_incidents
-            WHERE case_id = %s
-        """, (v2_case_id,))
-        
-        incidents = cur.fetchall()
-        
-        # Get PSA case if exists
-        cur.execute("""
-            SELECT case_id FROM public.case_main WHERE source_ack_no = %s
-        """, (f"{ack_no}_PSA",))
-        psa_row = cur.fetchone()
-        psa_case_id = psa_row['case_id'] if psa_row else None
-        
-        # Get ECBT cases if exist
-        cur.execute("""
-            SELECT case_id FROM public.case_main WHERE source_ack_no LIKE %s
-        """, (f"{ack_no}_ECBT%",))
-        ecbt_rows = cur.fetchall()
-        ecbt_case_ids = [row['case_id'] for row in ecbt_rows]
-        
-        # Get ECBNT cases if exist
-        cur.execute("""
-            SELECT case_id FROM public.case_main WHERE source_ack_no LIKE %s
-        """, (f"{ack_no}_ECBNT%",))
-        ecbnt_rows = cur.fetchall()
-        ecbnt_case_ids = [row['case_id'] for row in ecbnt_rows]
-        
-        cur.close()
-        conn.close()
+        async with _open_uow(request.app.state.executor) as uow:
+            case_data = await uow.run(_close_vm_case_for_response, ack_no)
+            await uow.commit()
+        vm_case_id = case_data["vm_case_id"]
+        validations, incidents = case_data["validations"], case_data["incidents"]
+        psa_case_id = case_data["psa_case_id"]
+        ecbt_case_ids, ecbnt_case_ids = case_data["ecbt_case_ids"], case_data["ecbnt_case_ids"]
         
         # Build detailed transaction response
         transactions = []
@@ -936,56 +1430,55 @@ async def get_banks_v2_case_data(ack_no: str) -> Dict[str, Any]:
     This endpoint fetches data from case_main_v2, case_incidents, and related tables.
     """
     try:
-        conn = _get_db_conn()
-        cur = conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
-        
-        # Get case_main_v2 data
-        cur.execute("""
-            SELECT 
-                case_id, acknowledgement_no, sub_category, requestor, 
-                payer_bank, payer_bank_code, mode_of_payment, 
-                payer_mobile_number, payer_account_number, state, district, 
-                transaction_type, wallet, created_at
-            FROM public.case_main_v2 
-            WHERE acknowledgement_no = %s
-        """, (ack_no,))
+        with _get_db_conn() as conn:
+            cur = conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
         
-        case_data = cur.fetchone()
-        if not case_data:
-            raise HTTPException(status_code=404, detail=f"Case {ack_no} not found in banks_v2 system")
-        
-        # Get incidents data
-        cur.execute("""
-            SELECT 
-                incident_id, amount, rrn, transaction_date, transaction_time, 
-                disputed_amount, layer
-            FROM public.case_incidents 
-            WHERE case_id = %s
-            ORDER BY incident_id
-        """, (case_data['case_id'],))
+            # Get case_main_v2 data
+            cur.execute("""
+                SELECT 
+                    case_id, acknowledgement_no, sub_category, requestor, 
+                    payer_bank, payer_bank_code, mode_of_payment, 
+                    payer_mobile_number, payer_account_number, state, district, 
+                    transaction_type, wallet, created_at
+                FROM public.case_main_v2 
+                WHERE acknowledgement_no = %s
+            """, (ack_no,))
+        
+            case_data = cur.fetchone()
+            if not case_data:
+                raise HTTPException(status_code=404, detail=f"Case {ack_no} not found in banks_v2 system")
+        
+            # Get incidents data
+            cur.execute("""
+                SELECT 
+                    incident_id, amount, rrn, transaction_date, transaction_time, 
+                    disputed_amount, layer
+                FROM public.case_incidents 
+                WHERE case_id = %s
+                ORDER BY incident_id
+            """, (case_data['case_id'],))
         
-        incidents = cur.fetchall()
+            incidents = cur.fetchall()
         
-        # Get card details if any
-        cur.execute("""
-            SELECT first6digit, last4digit, cardlength
-            FROM public.card_details_v2 
-            WHERE case_id = %s
-        """, (case_data['case_id'],))
+            # Get card details if any
+            cur.execute("""
+                SELECT first6digit, last4digit, cardlength
+                FROM public.card_details_v2 
+                WHERE case_id = %s
+            """, (case_data['case_id'],))
         
-        card_details = cur.fetchone()
+            card_details = cur.fetchone()
         
-        # Get UPI details if any
-        cur.execute("""
-            SELECT wallet
-            FROM public.upi_details_v2 
-            WHERE case_id = %s
-        """, (case_data['case_id'],))
+            # Get UPI details if any
+            cur.execute("""
+                SELECT wallet
+                FROM public.upi_details_v2 
+                WHERE case_id = %s
+            """, (case_data['case_id'],))
         
-        upi_details = cur.fetchone()
+            upi_details = cur.fetchone()
         
-        cur.close()
-        conn.close()
+            cur.close()
         
         # Format response to match frontend expectations
         response_data = {
@@ -1038,34 +1531,33 @@ async def get_banks_v2_transaction_details(ack_no: str) -> Dict[str, Any]:
     This endpoint fetches incident data and formats it for transaction display.
     """
     try:
-        conn = _get_db_conn()
-        cur = conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
+        with _get_db_conn() as conn:
+            cur = conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
         
-        # Get case_main_v2 data to get case_id
-        cur.execute("""
-            SELECT case_id, acknowledgement_no, sub_category, mode_of_payment
-            FROM public.case_main_v2 
-            WHERE acknowledgement_no = %s
-        """, (ack_no,))
+            # Get case_main_v2 data to get case_id
+            cur.execute("""
+                SELECT case_id, acknowledgement_no, sub_category, mode_of_payment
+                FROM public.case_main_v2 
+                WHERE acknowledgement_no = %s
+            """, (ack_no,))
         
-        case_data = cur.fetchone()
-        if not case_data:
-            raise HTTPException(status_code=404, detail=f"Case {ack_no} not found in banks_v2 system")
+            case_data = cur.fetchone()
+            if not case_data:
+                raise HTTPException(status_code=404, detail=f"Case {ack_no} not found in banks_v2 system")
         
-        # Get incidents data formatted for transaction display
-        cur.execute("""
-            SELECT 
-                incident_id, amount, rrn, transaction_date, transaction_time, 
-                disputed_amount, layer
-            FROM public.case_incidents 
-            WHERE case_id = %s
-            ORDER BY incident_id
-        """, (case_data['case_id'],))
+            # Get incidents data formatted for transaction display
+            cur.execute("""
+                SELECT 
+                    incident_id, amount, rrn, transaction_date, transaction_time, 
+                    disputed_amount, layer
+                FROM public.case_incidents 
+                WHERE case_id = %s
+                ORDER BY incident_id
+            """, (case_data['case_id'],))
         
-        incidents = cur.fetchall()
+            incidents = cur.fetchall()
         
-        cur.close()
-        conn.close()
+            cur.close()
         
         # Format response to match frontend transaction expectations
         transaction_details = []
@@ -1108,26 +1600,25 @@ async def get_victim_all_transactions(account_number: str) -> Dict[str, Any]:
     This is shown when there are unmatched RRNs and user needs to manually verify.
     """
     try:
-        conn = _get_db_conn()
-        cur = conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
+        with _get_db_conn() as conn:
+            cur = conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
         
-        # Fetch ALL transactions where victim is the payer - include all fields
-        cur.execute("""
-            SELECT 
-                id, txn_ref, txn_date, txn_time, txn_type, amount, currency,
-                acct_num, descr, fee, exch_rate, bene_name, bene_acct_num,
-                pay_ref, auth_code, fraud_type, merch_name, mcc, channel,
-                pay_method, rrn
-            FROM public.txn
-            WHERE acct_num = %s
-            ORDER BY txn_date DESC, txn_time DESC
-            LIMIT 100
-        """, (account_number,))
+            # Fetch ALL transactions where victim is the payer - include all fields
+            cur.execute("""
+                SELECT 
+                    id, txn_ref, txn_date, txn_time, txn_type, amount, currency,
+                    acct_num, descr, fee, exch_rate, bene_name, bene_acct_num,
+                    pay_ref, auth_code, fraud_type, merch_name, mcc, channel,
+                    pay_method, rrn
+                FROM public.txn
+                WHERE acct_num = %s
+                ORDER BY txn_date DESC, txn_time DESC
+                LIMIT 100
+            """, (account_number,))
         
-        transactions = cur.fetchall()
+            transactions = cur.fetchall()
         
-        cur.close()
-        conn.close()
+            cur.close()
         
         # Format transactions with all fields
         transaction_list = []
@@ -1178,23 +1669,22 @@ async def get_incident_validations(case_id: int) -> Dict[str, Any]:
     Returns both the raw I4C incidents and the matched/validated bank transactions.
     """
     try:
-        conn = _get_db_conn()
-        cur = conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
+        with _get_db_conn() as conn:
+            cur = conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
         
-        # Get all validation results for this case
-        cur.execute("""
-            SELECT 
-                id, case_id, rrn, validation_status, validation_message,
-                matched_txn_data, error_message, created_at
-            FROM public.incident_validation_results
-            WHERE case_id = %s
-            ORDER BY created_at
-        """, (case_id,))
+            # Get all validation results for this case
+            cur.execute("""
+                SELECT 
+                    id, case_id, rrn, validation_status, validation_message,
+                    matched_txn_data, error_message, created_at
+                FROM public.incident_validation_results
+                WHERE case_id = %s
+                ORDER BY created_at
+            """, (case_id,))
         
-        validations = cur.fetchall()
+            validations = cur.fetchall()
         
-        cur.close()
-        conn.close()
+            cur.close()
         
         # Format response
         validation_results = []
@@ -1231,155 +1721,154 @@ async def get_ecbt_transactions(case_id: int) -> Dict[str, Any]:
     This fetches actual bank transactions between the customer and the fraudulent beneficiary.
     """
     try:
-        conn = _get_db_conn()
-        cur = conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
-        
-        # First, get the case details to find ecb_cust_acct_num and ecb_bene_acct_num
-        # These are stored in the case_main table's source_ack_no and we need to look them up
-        cur.execute("""
-            SELECT source_ack_no, acc_num
-            FROM public.case_main
-            WHERE case_id = %s
-        """, (case_id,))
+        with _get_db_conn() as conn:
+            cur = conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
         
-        case_main_data = cur.fetchone()
-        if not case_main_data:
-            raise HTTPException(status_code=404, detail=f"Case {case_id} not found")
-        
-        source_ack_no = case_main_data['source_ack_no']
-        acc_num = case_main_data['acc_num']
-        
-        # For ECBT cases, we need to find the beneficiary account
-        # Extract base ack_no and get the original incident data
-        if source_ack_no and '_ECBT' in source_ack_no:
-            base_ack_no = source_ack_no.replace('_ECBT', '')
-            
-            # Get the case_main_v2 and incidents to find the beneficiary account
+            # First, get the case details to find ecb_cust_acct_num and ecb_bene_acct_num
+            # These are stored in the case_main table's source_ack_no and we need to look them up
             cur.execute("""
-                SELECT ci.rrn
-                FROM public.case_main_v2 cm2
-                JOIN public.case_incidents ci ON cm2.case_id = ci.case_id
-                WHERE cm2.acknowledgement_no = %s
-                LIMIT 1
-            """, (base_ack_no,))
+                SELECT source_ack_no, acc_num
+                FROM public.case_main
+                WHERE case_id = %s
+            """, (case_id,))
+        
+            case_main_data = cur.fetchone()
+            if not case_main_data:
+                raise HTTPException(status_code=404, detail=f"Case {case_id} not found")
+        
+            source_ack_no = case_main_data['source_ack_no']
+            acc_num = case_main_data['acc_num']
+        
+            # For ECBT cases, we need to find the beneficiary account
+            # Extract base ack_no and get the original incident data
+            if source_ack_no and '_ECBT' in source_ack_no:
+                base_ack_no = source_ack_no.replace('_ECBT', '')
             
-            incident_row = cur.fetchone()
-            if not incident_row:
-                # No banks_v2 data, return empty
-                return {
-                    "success": True,
-                    "data": {
-                        "case_id": case_id,
-                        "transactions": [],
-                        "total_value_at_risk": 0
+                # Get the case_main_v2 and incidents to find the beneficiary account
+                cur.execute("""
+                    SELECT ci.rrn
+                    FROM public.case_main_v2 cm2
+                    JOIN public.case_incidents ci ON cm2.case_id = ci.case_id
+                    WHERE cm2.acknowledgement_no = %s
+                    LIMIT 1
+                """, (base_ack_no,))
+            
+                incident_row = cur.fetchone()
+                if not incident_row:
+                    # No banks_v2 data, return empty
+                    return {
+                        "success": True,
+                        "data": {
+                            "case_id": case_id,
+                            "transactions": [],
+                            "total_value_at_risk": 0
+                        }
                     }
-                }
             
-            rrn = incident_row['rrn']
+                rrn = incident_row['rrn']
             
-            # Get the beneficiary account from txn table using the RRN
-            cur.execute("""
-                SELECT bene_acct_num
-                FROM public.txn
-                WHERE rrn = %s
-                LIMIT 1
-            """, (rrn,))
+                # Get the beneficiary account from txn table using the RRN
+                cur.execute("""
+                    SELECT bene_acct_num
+                    FROM public.txn
+                    WHERE rrn = %s
+                    LIMIT 1
+                """, (rrn,))
             
-            txn_row = cur.fetchone()
-            if not txn_row:
-                # RRN not found in txn table
-                return {
-                    "success": True,
-                    "data": {
-                        "case_id": case_id,
-                        "transactions": [],
-                        "total_value_at_risk": 0
+                txn_row = cur.fetchone()
+                if not txn_row:
+                    # RRN not found in txn table
+                    return {
+                        "success": True,
+                        "data": {
+                            "case_id": case_id,
+                            "transactions": [],
+                            "total_value_at_risk": 0
+                        }
                     }
-                }
             
-            bene_acct_num = txn_row['bene_acct_num']
+                bene_acct_num = txn_row['bene_acct_num']
             
-            # Find the customer account from acc_bene table (the account that has this beneficiary saved)
-            # This is the correct account for ECBT cases, not case_main.acc_num
-            cur.execute("""
-                SELECT cust_acct_num
-                FROM public.acc_bene
-                WHERE bene_acct_num = %s
-                LIMIT 1
-            """, (bene_acct_num,))
+                # Find the customer account from acc_bene table (the account that has this beneficiary saved)
+                # This is the correct account for ECBT cases, not case_main.acc_num
+                cur.execute("""
+                    SELECT cust_acct_num
+                    FROM public.acc_bene
+                    WHERE bene_acct_num = %s
+                    LIMIT 1
+                """, (bene_acct_num,))
             
-            acc_bene_row = cur.fetchone()
-            if not acc_bene_row:
-                # Beneficiary not in acc_bene table - shouldn't happen for ECBT cases
-                print(f"[v2] ECBT case {case_id} - beneficiary {bene_acct_num} not found in acc_bene table", flush=True)
-                return {
-                    "success": True,
-                    "data": {
-                        "case_id": case_id,
-                        "transactions": [],
-                        "total_value_at_risk": 0
+                acc_bene_row = cur.fetchone()
+                if not acc_bene_row:
+                    # Beneficiary not in acc_bene table - shouldn't happen for ECBT cases
+                    print(f"[v2] ECBT case {case_id} - beneficiary {bene_acct_num} not found in acc_bene table", flush=True)
+                    return {
+                        "success": True,
+                        "data": {
+                            "case_id": case_id,
+                            "transactions": [],
+                            "total_value_at_risk": 0
+                        }
                     }
-                }
             
-            cust_acct_num = acc_bene_row['cust_acct_num']
+                cust_acct_num = acc_bene_row['cust_acct_num']
             
-            # Now fetch ALL transactions between cust_acct_num (customer) and bene_acct_num (beneficiary)
-            cur.execute("""
-                SELECT 
-                    id, txn_date, txn_time, acct_num, bene_acct_num, 
-                    amount, channel, rrn, descr, txn_type, currency, 
-                    fee, exch_rate, bene_name, pay_ref, auth_code, pay_method
-                FROM public.txn
-                WHERE acct_num = %s AND bene_acct_num = %s
-                ORDER BY txn_date DESC, txn_time DESC
-            """, (cust_acct_num, bene_acct_num))
+                # Now fetch ALL transactions between cust_acct_num (customer) and bene_acct_num (beneficiary)
+                cur.execute("""
+                    SELECT 
+                        id, txn_date, txn_time, acct_num, bene_acct_num, 
+                        amount, channel, rrn, descr, txn_type, currency, 
+                        fee, exch_rate, bene_name, pay_ref, auth_code, pay_method
+                    FROM public.txn
+                    WHERE acct_num = %s AND bene_acct_num = %s
+                    ORDER BY txn_date DESC, txn_time DESC
+                """, (cust_acct_num, bene_acct_num))
             
-            transactions = cur.fetchall()
+                transactions = cur.fetchall()
             
-            print(f"[v2] ECBT case {case_id} - Found {len(transactions)} transactions between {cust_acct_num} and {bene_acct_num}", flush=True)
+                print(f"[v2] ECBT case {case_id} - Found {len(transactions)} transactions between {cust_acct_num} and {bene_acct_num}", flush=True)
             
-            cur.close()
-            conn.close()
+                cur.close()
             
-            # Format transactions for frontend - include ALL fields
-            transaction_details = []
-            for txn in transactions:
-                transaction_details.append({
-                    "txn_id": txn['id'],
-                    "txn_date": txn['txn_date'].strftime('%d-%m-%Y') if txn['txn_date'] else None,
-                    "txn_time": str(txn['txn_time']) if txn['txn_time'] else None,
-                    "acct_num": txn['acct_num'],
-                    "bene_acct_num": txn['bene_acct_num'],
-                    "amount": str(txn['amount']),
-                    "channel": txn['channel'] or "N/A",
-                    "txn_ref": txn['rrn'],
-                    "descr": txn['descr'] or "N/A",
-                    "txn_type": txn['txn_type'] or "N/A",
-                    "currency": txn['currency'] or "N/A",
-                    "fee": str(txn['fee']) if txn['fee'] else "N/A",
-                    "exch_rate": str(txn['exch_rate']) if txn['exch_rate'] else "N/A",
-                    "bene_name": txn['bene_name'] or "N/A",
-                    "pay_ref": txn['pay_ref'] or "N/A",
-                    "auth_code": txn['auth_code'] or "N/A",
-                    "pay_method": txn['pay_method'] or "N/A"
-                })
+                # Format transactions for frontend - include ALL fields
+                transaction_details = []
+                for txn in transactions:
+                    transaction_details.append({
+                        "txn_id": txn['id'],
+                        "txn_date": txn['txn_date'].strftime('%d-%m-%Y') if txn['txn_date'] else None,
+                        "txn_time": str(txn['txn_time']) if txn['txn_time'] else None,
+                        "acct_num": txn['acct_num'],
+                        "bene_acct_num": txn['bene_acct_num'],
+                        "amount": str(txn['amount']),
+                        "channel": txn['channel'] or "N/A",
+                        "txn_ref": txn['rrn'],
+                        "descr": txn['descr'] or "N/A",
+                        "txn_type": txn['txn_type'] or "N/A",
+                        "currency": txn['currency'] or "N/A",
+                        "fee": str(txn['fee']) if txn['fee'] else "N/A",
+                        "exch_rate": str(txn['exch_rate']) if txn['exch_rate'] else "N/A",
+                        "bene_name": txn['bene_name'] or "N/A",
+                        "pay_ref": txn['pay_ref'] or "N/A",
+                        "auth_code": txn['auth_code'] or "N/A",
+                        "pay_method": txn['pay_method'] or "N/A"
+                    })
             
-            return {
-                "success": True,
-                "data": {
-                    "case_id": case_id,
-                    "customer_account": cust_acct_num,
-                    "beneficiary_account": bene_acct_num,
-                    "transactions": transaction_details,
-                    "total_value_at_risk": sum(float(txn['amount']) for txn in transaction_details)
+                return {
+                    "success": True,
+                    "data": {
+                        "case_id": case_id,
+                        "customer_account": cust_acct_num,
+                        "beneficiary_account": bene_acct_num,
+                        "transactions": transaction_details,
+                        "total_value_at_risk": sum(float(txn['amount']) for txn in transaction_details)
+                    }
+                }
+            else:
+                # Not an ECBT case
+                return {
+                    "success": False,
+                    "error": "This endpoint is only for ECBT cases"
                 }
-            }
-        else:
-            # Not an ECBT case
-            return {
-                "success": False,
-                "error": "This endpoint is only for ECBT cases"
-            }
         
     except HTTPException:
         raise
@@ -1396,25 +1885,24 @@ async def get_transaction_by_rrn(rrn: str) -> Dict[str, Any]:
     Used for displaying complete transaction details in the UI.
     """
     try:
-        conn = _get_db_conn()
-        cur = conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
+        with _get_db_conn() as conn:
+            cur = conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
         
-        # Fetch ALL fields from txn table for this RRN
-        cur.execute("""
-            SELECT 
-                id, txn_ref, txn_date, txn_time, txn_type, amount, currency,
-                acct_num, descr, fee, exch_rate, bene_name, bene_acct_num,
-                pay_ref, auth_code, fraud_type, merch_name, mcc, channel,
-                pay_method, rrn
-            FROM public.txn
-            WHERE rrn = %s
-            LIMIT 1
-        """, (rrn,))
+            # Fetch ALL fields from txn table for this RRN
+            cur.execute("""
+                SELECT 
+                    id, txn_ref, txn_date, txn_time, txn_type, amount, currency,
+                    acct_num, descr, fee, exch_rate, bene_name, bene_acct_num,
+                    pay_ref, auth_code, fraud_type, merch_name, mcc, channel,
+                    pay_method, rrn
+                FROM public.txn
+                WHERE rrn = %s
+                LIMIT 1
+            """, (rrn,))
         
-        txn = cur.fetchone()
+            txn = cur.fetchone()
         
-        cur.close()
-        conn.close()
+            cur.close()
         
         if not txn:
             raise HTTPException(status_code=404, detail=f"Transaction with RRN {rrn} not found")
@@ -15,7 +15,8 @@ from fastapi.security import OAuth2PasswordBearer
 import traceback
 from jose import JWTError
 import psycopg2
-from config import DB_CONNECTION_PARAMS
+from db.connection import get_db_connection
+from db.cache import notify_dashboard_change
 
 router = APIRouter()
 
@@ -61,7 +62,7 @@ async def get_assignment_statistics(
     """
     try:
         # SIMPLIFIED: Direct database query instead of complex service
-        with psycopg2.connect(**DB_CONNECTION_PARAMS) as conn:
+        with get_db_connection(caller="case_assignment_router") as conn:
             with conn.cursor() as cur:
                 # Get risk officers
                 cur.execute("""
@@ -107,7 +108,7 @@ async def manually_assign_case(
     """
     try:
         # SIMPLIFIED: Direct assignment to general queue
-        with psycopg2.connect(**DB_CONNECTION_PARAMS) as conn:
+        with get_db_connection(caller="case_assignment_router") as conn:
             with conn.cursor() as cur:
                 # Get first available risk officer
                 cur.execute("""
@@ -136,6 +137,7 @@ async def manually_assign_case(
                     INSERT INTO assignment (case_id, assigned_to, assigned_by, comment, is_active, assignment_type)
                     VALUES (%s, %s, %s, %s, TRUE, 'manual')
                 """, (case_id, assigned_user, current_username, f"Manually assigned {case_type} case to general queue"))
+                notify_dashboard_change(cur, "assignment")
                 
                 conn.commit()
         
@@ -174,7 +176,7 @@ async def get_risk_officers(
     Get list of all risk officers available for assignment - simplified version
     """
     try:
-        with psycopg2.connect(**DB_CONNECTION_PARAMS) as conn:
+        with get_db_connection(caller="case_assignment_router") as conn:
             with conn.cursor() as cur:
                 cur.execute("""
                     SELECT user_name, dept 
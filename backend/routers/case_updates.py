@@ -11,7 +11,9 @@ from keycloak.keycloak_openid import KeycloakOpenID
 from concurrent.futures import ThreadPoolExecutor
 from fastapi.responses import FileResponse
 
+from db.connection import get_db_connection
 from db.matcher import CaseEntryMatcher, CaseNotFoundError, log_case_action # CaseEntryMatcher is where update_case_main_data resides
+from db.cache import notify_dashboard_change
 from models.base_models import CaseMainUpdateData, CaseActionLogResponse # Ensure this Pydantic model is imported
 
 router = APIRouter()
@@ -159,9 +161,8 @@ async def reopen_case_api(
             
             # Create assignment
             import psycopg2
-            from config import DB_CONNECTION_PARAMS
             
-            with psycopg2.connect(**DB_CONNECTION_PARAMS) as conn:
+            with get_db_connection(caller="case_updates") as conn:
                 with conn.cursor() as cur:
                     # Deactivate any existing assignments
                     cur.execute("""
@@ -175,6 +176,7 @@ async def reopen_case_api(
                         INSERT INTO assignment (case_id, assigned_to, assigned_by, comment, is_active, assignment_type)
                         VALUES (%s, %s, %s, %s, TRUE, 'auto')
                     """, (case_id, assigned_risk_officer, logged_in_username, f"Assigned during case reopen by {logged_in_username}"))
+                    notify_dashboard_change(cur, "assignment")
                     
                     conn.commit()
             
@@ -225,9 +227,8 @@ async def get_risk_officers(
         
         # Get risk officers from database
         import psycopg2
-        from config import DB_CONNECTION_PARAMS
         
-        with psycopg2.connect(**DB_CONNECTION_PARAMS) as conn:
+        with get_db_connection(caller="case_updates") as conn:
             with conn.cursor() as cur:
                 cur.execute("""
                     SELECT user_name, dept 
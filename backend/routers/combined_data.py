@@ -11,6 +11,7 @@ from jose import jwt, JWTError
 from keycloak.keycloak_openid import KeycloakOpenID
 from concurrent.futures import ThreadPoolExecutor
 
+from db.connection import get_db_connection
 from db.matcher import CaseEntryMatcher, CaseNotFoundError # CaseEntryMatcher is where fetch_combined_case_data resides
 
 router = APIRouter()
@@ -81,8 +82,7 @@ async def get_ecbnt_matching_bene(
     from psycopg2.extras import RealDictCursor
     try:
         # Connect to DB (reuse config if available)
-        from config import DB_CONNECTION_PARAMS
-        with psycopg2.connect(**DB_CONNECTION_PARAMS) as conn:
+        with get_db_connection(caller="combined_data") as conn:
             with conn.cursor(cursor_factory=RealDictCursor) as cur:
                 # 1. Get acc_num and source_bene_accno for the given case_id
                 cur.execute("SELECT acc_num, source_bene_accno FROM case_main WHERE case_id = %s", (case_id,))
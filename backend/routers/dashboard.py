@@ -174,12 +174,17 @@ async def get_case_list(
 
 
 from fastapi import APIRouter, Depends, HTTPException, Query, Request
-from typing import Dict, Any, List, Optional, Annotated
+from typing import Dict, Any, List, Optional, Annotated, Callable
 from datetime import datetime, timedelta, date
 import psycopg2
 import traceback
 from psycopg2.extras import RealDictCursor
-from config import DB_CONNECTION_PARAMS
+from db.connection import get_db_connection
+from db.cache import dashboard_cache
+from services.dashboard_rollups import rollups_ready
+from services.fraud_alerts import WINDOW_DAYS as ALERT_WINDOW_DAYS, alert_query, alerts_ready
+from services.entity_graph import NODE_TYPES as GRAPH_NODE_TYPES, graph_ready, neighbourhood
+from config import DASHBOARD_QUERY_CONCURRENCY, ENTITY_GRAPH_MAX_HOPS, ENTITY_GRAPH_MAX_NODES
 from keycloak.keycloak_openid import KeycloakOpenID
 from concurrent.futures import ThreadPoolExecutor
 from db.matcher import CaseEntryMatcher
@@ -192,34 +197,13 @@ import json
 router = APIRouter()
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
-# Simple in-memory cache for dashboard queries
-dashboard_cache = {}
-cache_ttl = 300  # 5 minutes cache TTL
-
+# Dashboard query cache (bounded LRU/TTL, invalidated on case status and assignment writes)
 def get_cache_key(endpoint: str, params: Dict = None) -> str:
-    """Generate cache key from endpoint and parameters"""
+    """Generate cache key from endpoint and parameters (prefixed by endpoint for targeted invalidation)"""
     cache_data = {"endpoint": endpoint}
     if params:
         cache_data.update(params)
-    return hashlib.md5(json.dumps(cache_data, sort_keys=True).encode()).hexdigest()
-
-def get_cached_data(cache_key: str) -> Optional[Dict]:
-    """Get data from cache if not expired"""
-    if cache_key in dashboard_cache:
-        cached_item = dashboard_cache[cache_key]
-        if datetime.now().timestamp() - cached_item["timestamp"] < cache_ttl:
-            return cached_item["data"]
-        else:
-            # Remove expired cache
-            del dashboard_cache[cache_key]
-    return None
-
-def set_cache_data(cache_key: str, data: Dict) -> None:
-    """Set data in cache with timestamp"""
-    dashboard_cache[cache_key] = {
-        "data": data,
-        "timestamp": datetime.now().timestamp()
-    }
+    return f"{endpoint}:" + hashlib.md5(json.dumps(cache_data, sort_keys=True).encode()).hexdigest()
 
 # --- Shared Dependencies (Same as other routers) ---
 def get_keycloak_openid_dependency(request: Request) -> KeycloakOpenID:
@@ -249,6 +233,51 @@ def get_executor_dependency(request: Request) -> ThreadPoolExecutor:
 def get_case_matcher_instance(executor: Annotated[ThreadPoolExecutor, Depends(get_executor_dependency)]) -> CaseEntryMatcher:
     return CaseEntryMatcher(executor=executor)
 
+# --- Off-loop query execution ---
+# psycopg2 calls block, so the handlers below never run them in the coroutine. A
+# query is a `cur -> result` callable; _run_queries runs each one on the executor
+# with its own pooled connection, all at the same time, so an endpoint returns when
+# its slowest query finishes instead of after the sum of them. At most
+# DASHBOARD_QUERY_CONCURRENCY queries run at once per worker.
+_query_slots: Optional[asyncio.Semaphore] = None
+
+def _rows(sql: str, params: Optional[tuple] = None) -> Callable:
+    """Query returning every row as a dict."""
+    def query(cur):
+        cur.execute(sql, params)
+        return [dict(row) for row in cur.fetchall()]
+    return query
+
+def _row(sql: str, params: Optional[tuple] = None) -> Callable:
+    """Query returning the first row as a dict (None if there is none)."""
+    def query(cur):
+        cur.execute(sql, params)
+        row = cur.fetchone()
+        return dict(row) if row else None
+    return query
+
+def _run_query_sync(query: Callable) -> Any:
+    with get_db_connection(caller="dashboard") as conn:
+        with conn.cursor(cursor_factory=RealDictCursor) as cur:
+            return query(cur)
+
+async def _run_queries(executor: ThreadPoolExecutor, **queries: Callable) -> Dict[str, Any]:
+    """Run independent queries concurrently; returns {name: result}."""
+    global _query_slots
+    if _query_slots is None:
+        _query_slots = asyncio.Semaphore(max(1, DASHBOARD_QUERY_CONCURRENCY))
+    loop = asyncio.get_running_loop()
+
+    async def _one(query: Callable) -> Any:
+        async with _query_slots:
+            return await loop.run_in_executor(executor, _run_query_sync, query)
+
+    results = await asyncio.gather(*(_one(query) for query in queries.values()))
+    return dict(zip(queries.keys(), results))
+
+async def _run_query(executor: ThreadPoolExecutor, query: Callable) -> Any:
+    return (await _run_queries(executor, result=query))["result"]
+
 @router.get("/api/dashboard/analytics")
 async def get_dashboard_analytics(
     current_username: Annotated[str, Depends(get_current_username)],
@@ -256,15 +285,9 @@ async def get_dashboard_analytics(
     executor: Annotated[ThreadPoolExecutor, Depends(get_executor_dependency)]
 ) -> Dict[str, Any]:
     """Get comprehensive dashboard analytics"""
-    
-    # Check cache first
-    cache_key = get_cache_key("dashboard_analytics")
-    cached_data = get_cached_data(cache_key)
-    if cached_data:
-        return cached_data
-    
-    try:
-        with psycopg2.connect(**DB_CONNECTION_PARAMS) as conn:
+
+    def _sync_dashboard_analytics() -> Dict[str, Any]:
+        with get_db_connection(caller="dashboard") as conn:
             with conn.cursor(cursor_factory=RealDictCursor) as cur:
                 
                 # Get total cases count and max case_id for verification
@@ -385,14 +408,215 @@ async def get_dashboard_analytics(
                         }
                     }
                 }
-                
-                # Cache the result
-                set_cache_data(cache_key, result)
                 return result
                 
+    try:
+        # Served from cache; concurrent misses share one computation
+        return await dashboard_cache.get_or_compute(
+            get_cache_key("dashboard_analytics"),
+            lambda: asyncio.get_running_loop().run_in_executor(executor, _sync_dashboard_analytics)
+        )
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch dashboard analytics: {str(e)}")
 
+# --- Rollup-backed aggregates (services/dashboard_rollups.py) ---
+# Same figures as the case_main queries in the endpoints below, read from the
+# per-day/status/user rollups: cost grows with days x users, not with cases.
+# Resolution times are whole days (closing_date - creation_date).
+
+def _performance_from_rollups(cur) -> Dict[str, Any]:
+    first_day_month = datetime.now().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    cur.execute("""
+        SELECT
+            SUM(resolution_days_sum) / NULLIF(SUM(resolved_count), 0) AS avg_resolution_days,
+            COALESCE(SUM(case_count) FILTER (WHERE status = 'Closed' AND creation_date >= %s), 0)::bigint AS monthly_closed,
+            COALESCE(SUM(case_count) FILTER (WHERE creation_date >= %s), 0)::bigint AS monthly_created
+        FROM dashboard_case_rollup_live
+    """, (first_day_month, first_day_month))
+    totals = cur.fetchone()
+    avg_resolution_days = float(totals['avg_resolution_days']) if totals['avg_resolution_days'] else 0
+    monthly_closed = totals['monthly_closed']
+    monthly_created = totals['monthly_created']
+    closure_rate = (monthly_closed / monthly_created * 100) if monthly_created > 0 else 0
+
+    cur.execute("""
+        SELECT 
+            assigned_to,
+            SUM(case_count)::bigint as cases_handled,
+            COALESCE(SUM(case_count) FILTER (WHERE status = 'Closed'), 0)::bigint as cases_closed
+        FROM dashboard_case_rollup_live
+        WHERE assigned_to IS NOT NULL
+        GROUP BY assigned_to
+        ORDER BY cases_closed DESC
+        LIMIT 5
+    """)
+    top_performers = [
+        {
+            'user': row['assigned_to'],
+            'cases_handled': row['cases_handled'],
+            'cases_closed': row['cases_closed'],
+            'success_rate': (row['cases_closed'] / row['cases_handled'] * 100) if row['cases_handled'] > 0 else 0
+        }
+        for row in cur.fetchall()
+    ]
+    return {
+        "avg_resolution_days": round(avg_resolution_days, 1),
+        "monthly_closed": monthly_closed,
+        "monthly_created": monthly_created,
+        "closure_rate": round(closure_rate, 1),
+        "top_performers": top_performers
+    }
+
+
+def _advanced_analytics_rollup_queries() -> Dict[str, Callable]:
+    """Section name -> query, for _run_queries."""
+    closed = "COALESCE(SUM(r.{count}) FILTER (WHERE r.status = 'Closed'), 0)"
+    avg_days = "CAST(SUM(r.resolution_days_sum) / NULLIF(SUM(r.resolved_count), 0) AS DECIMAL(10,1))"
+
+    return dict(
+        # Department Performance Analysis
+        department_performance=_rows(f"""
+            SELECT 
+                ut.dept,
+                SUM(r.assignment_count)::bigint as total_cases,
+                {closed.format(count="assignment_count")}::bigint as closed_cases,
+                COALESCE(SUM(r.assignment_count) FILTER (WHERE r.status = 'New'), 0)::bigint as new_cases,
+                COALESCE(SUM(r.assignment_count) FILTER (WHERE r.status = 'Assigned'), 0)::bigint as assigned_cases,
+                CAST({closed.format(count="assignment_count")}::numeric / NULLIF(SUM(r.assignment_count), 0) * 100 AS DECIMAL(10,2)) as closure_rate,
+                {avg_days} as avg_resolution_days
+            FROM dashboard_assignment_rollup_live r
+            JOIN user_table ut ON r.assigned_to = ut.user_name
+            WHERE ut.dept IS NOT NULL
+            GROUP BY ut.dept
+            ORDER BY total_cases DESC
+        """),
+
+        # User Workload Distribution
+        workload_distribution=_rows(f"""
+            SELECT 
+                r.assigned_to,
+                ut.dept,
+                SUM(r.assignment_count)::bigint as total_cases,
+                {closed.format(count="assignment_count")}::bigint as closed_cases,
+                COALESCE(SUM(r.assignment_count) FILTER (WHERE r.status IN ('New', 'Assigned')), 0)::bigint as active_cases,
+                CAST({closed.format(count="assignment_count")}::numeric / NULLIF(SUM(r.assignment_count), 0) * 100 AS DECIMAL(10,2)) as success_rate,
+                {avg_days} as avg_resolution_days
+            FROM dashboard_assignment_rollup_live r
+            LEFT JOIN user_table ut ON r.assigned_to = ut.user_name
+            GROUP BY r.assigned_to, ut.dept
+            HAVING SUM(r.assignment_count) > 0
+            ORDER BY active_cases DESC, success_rate DESC
+        """),
+
+        # Case Aging Analysis (open cases)
+        case_aging=_rows("""
+            WITH age_buckets AS (
+                SELECT 
+                    CASE 
+                        WHEN CURRENT_DATE - r.creation_date <= 1 THEN '0-1 days'
+                        WHEN CURRENT_DATE - r.creation_date <= 3 THEN '1-3 days'
+                        WHEN CURRENT_DATE - r.creation_date <= 7 THEN '3-7 days'
+                        WHEN CURRENT_DATE - r.creation_date <= 14 THEN '7-14 days'
+                        WHEN CURRENT_DATE - r.creation_date <= 30 THEN '14-30 days'
+                        ELSE '30+ days'
+                    END as age_bucket,
+                    CASE 
+                        WHEN CURRENT_DATE - r.creation_date <= 1 THEN 1
+                        WHEN CURRENT_DATE - r.creation_date <= 3 THEN 2
+                        WHEN CURRENT_DATE - r.creation_date <= 7 THEN 3
+                        WHEN CURRENT_DATE - r.creation_date <= 14 THEN 4
+                        WHEN CURRENT_DATE - r.creation_date <= 30 THEN 5
+                        ELSE 6
+                    END as sort_order,
+                    r.status,
+                    r.case_count
+                FROM dashboard_case_rollup_live r
+                WHERE r.status != 'Closed'
+            )
+            SELECT 
+                age_bucket,
+                SUM(case_count)::bigint as case_count,
+                COALESCE(SUM(case_count) FILTER (WHERE status = 'Closed'), 0)::bigint as closed_count,
+                CAST(
+                    COALESCE(SUM(case_count) FILTER (WHERE status = 'Closed'), 0)::numeric / 
+                    NULLIF(SUM(case_count), 0) * 100 AS DECIMAL(10,2)
+                ) as closure_rate
+            FROM age_buckets
+            GROUP BY age_bucket, sort_order
+            ORDER BY sort_order
+        """),
+
+        # Case Type Performance Analysis
+        case_type_performance=_rows(f"""
+            SELECT 
+                r.case_type,
+                SUM(r.case_count)::bigint as total_cases,
+                {closed.format(count="case_count")}::bigint as closed_cases,
+                CAST({closed.format(count="case_count")}::numeric / NULLIF(SUM(r.case_count), 0) * 100 AS DECIMAL(10,2)) as closure_rate,
+                {avg_days} as avg_resolution_days,
+                CAST(SUM(r.disputed_amount_sum) / NULLIF(SUM(r.disputed_amount_count), 0) AS DECIMAL(15,2)) as avg_disputed_amount
+            FROM dashboard_case_rollup_live r
+            GROUP BY r.case_type
+            ORDER BY total_cases DESC
+        """),
+
+        # Monthly Trends (last 12 months)
+        monthly_trends=_rows(f"""
+            SELECT 
+                DATE_TRUNC('month', r.creation_date) as month,
+                SUM(r.case_count)::bigint as cases_created,
+                {closed.format(count="case_count")}::bigint as cases_closed,
+                CAST({closed.format(count="case_count")}::numeric / NULLIF(SUM(r.case_count), 0) * 100 AS DECIMAL(10,2)) as closure_rate
+            FROM dashboard_case_rollup_live r
+            WHERE r.creation_date >= CURRENT_DATE - INTERVAL '12 months'
+            GROUP BY DATE_TRUNC('month', r.creation_date)
+            ORDER BY month DESC
+        """),
+
+        # Top Performing Users (last 30 days)
+        top_performers=_rows(f"""
+            SELECT 
+                r.assigned_to,
+                ut.dept,
+                SUM(r.assignment_count)::bigint as cases_handled,
+                {closed.format(count="assignment_count")}::bigint as cases_closed,
+                CAST({closed.format(count="assignment_count")}::numeric / NULLIF(SUM(r.assignment_count), 0) * 100 AS DECIMAL(10,2)) as success_rate,
+                {avg_days} as avg_resolution_days
+            FROM dashboard_assignment_rollup_live r
+            LEFT JOIN user_table ut ON r.assigned_to = ut.user_name
+            WHERE r.creation_date >= CURRENT_DATE - INTERVAL '30 days'
+            GROUP BY r.assigned_to, ut.dept
+            HAVING SUM(r.assignment_count) > 0
+            ORDER BY cases_closed DESC, success_rate DESC
+            LIMIT 10
+        """),
+    )
+
+
+def _real_time_counts_from_rollups(cur) -> Dict[str, Any]:
+    cur.execute("""
+        SELECT
+            COALESCE(SUM(case_count) FILTER (WHERE creation_date >= CURRENT_DATE - INTERVAL '24 hours'), 0)::bigint as cases_last_24h,
+            COALESCE(SUM(case_count) FILTER (WHERE closing_date >= CURRENT_DATE - INTERVAL '24 hours'), 0)::bigint as cases_closed_last_24h,
+            COALESCE(SUM(case_count) FILTER (WHERE status != 'Closed'), 0)::bigint as active_cases
+        FROM dashboard_case_rollup_live
+    """)
+    counts = dict(cur.fetchone())
+    cur.execute("""
+        SELECT 
+            assigned_to,
+            SUM(assignment_count)::bigint as active_cases,
+            COALESCE(SUM(assignment_count) FILTER (WHERE status = 'New'), 0)::bigint as new_cases,
+            COALESCE(SUM(assignment_count) FILTER (WHERE status = 'Assigned'), 0)::bigint as assigned_cases
+        FROM dashboard_assignment_rollup_live
+        WHERE status != 'Closed'
+        GROUP BY assigned_to
+        ORDER BY active_cases DESC
+    """)
+    counts["current_workload"] = [dict(row) for row in cur.fetchall()]
+    return counts
+
+
 @router.get("/api/dashboard/performance")
 async def get_performance_metrics(
     current_username: Annotated[str, Depends(get_current_username)],
@@ -401,72 +625,73 @@ async def get_performance_metrics(
 ) -> Dict[str, Any]:
     """Get performance metrics and KPIs"""
     try:
-        with psycopg2.connect(**DB_CONNECTION_PARAMS) as conn:
-            with conn.cursor(cursor_factory=RealDictCursor) as cur:
-                
-                # Calculate average case resolution time using closing_date
-                cur.execute("""
-                    SELECT 
-                        AVG(EXTRACT(EPOCH FROM (closing_date - creation_date))/86400) as avg_resolution_days
-                    FROM case_main 
-                    WHERE status = 'Closed' AND closing_date IS NOT NULL
-                """)
-                avg_resolution_result = cur.fetchone()
-                avg_resolution_days = float(avg_resolution_result['avg_resolution_days']) if avg_resolution_result['avg_resolution_days'] else 0
-                
-                # Get cases closed this month
-                first_day_month = datetime.now().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-                cur.execute("""
-                    SELECT COUNT(*) as count
-                    FROM case_main 
-                    WHERE status = 'Closed' AND creation_date >= %s
-                """, (first_day_month,))
-                monthly_closed = cur.fetchone()['count']
-                
-                # Get cases created this month
-                cur.execute("""
-                    SELECT COUNT(*) as count
-                    FROM case_main 
-                    WHERE creation_date >= %s
-                """, (first_day_month,))
-                monthly_created = cur.fetchone()['count']
-                
-                # Calculate closure rate
-                closure_rate = (monthly_closed / monthly_created * 100) if monthly_created > 0 else 0
-                
-                # Get top performing users
-                cur.execute("""
-                    SELECT 
-                        assigned_to,
-                        COUNT(*) as cases_handled,
-                        COUNT(CASE WHEN status = 'Closed' THEN 1 END) as cases_closed
-                    FROM case_main 
-                    WHERE assigned_to IS NOT NULL
-                    GROUP BY assigned_to
-                    ORDER BY cases_closed DESC
-                    LIMIT 5
-                """)
-                top_performers = [
-                    {
-                        'user': row['assigned_to'],
-                        'cases_handled': row['cases_handled'],
-                        'cases_closed': row['cases_closed'],
-                        'success_rate': (row['cases_closed'] / row['cases_handled'] * 100) if row['cases_handled'] > 0 else 0
-                    }
-                    for row in cur.fetchall()
-                ]
-                
-                return {
-                    "success": True,
-                    "data": {
-                        "avg_resolution_days": round(avg_resolution_days, 1),
-                        "monthly_closed": monthly_closed,
-                        "monthly_created": monthly_created,
-                        "closure_rate": round(closure_rate, 1),
-                        "top_performers": top_performers
-                    }
-                }
-                
+        if rollups_ready():
+            return {"success": True, "data": await _run_query(executor, _performance_from_rollups)}
+
+        first_day_month = datetime.now().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+        results = await _run_queries(
+            executor,
+            # Calculate average case resolution time using closing_date
+            avg_resolution=_row("""
+                SELECT 
+                    AVG(EXTRACT(EPOCH FROM (closing_date - creation_date))/86400) as avg_resolution_days
+                FROM case_main 
+                WHERE status = 'Closed' AND closing_date IS NOT NULL
+            """),
+            # Get cases closed this month
+            monthly_closed=_row("""
+                SELECT COUNT(*) as count
+                FROM case_main 
+                WHERE status = 'Closed' AND creation_date >= %s
+            """, (first_day_month,)),
+            # Get cases created this month
+            monthly_created=_row("""
+                SELECT COUNT(*) as count
+                FROM case_main 
+                WHERE creation_date >= %s
+            """, (first_day_month,)),
+            # Get top performing users
+            top_performers=_rows("""
+                SELECT 
+                    assigned_to,
+                    COUNT(*) as cases_handled,
+                    COUNT(CASE WHEN status = 'Closed' THEN 1 END) as cases_closed
+                FROM case_main 
+                WHERE assigned_to IS NOT NULL
+                GROUP BY assigned_to
+                ORDER BY cases_closed DESC
+                LIMIT 5
+            """),
+        )
+        avg_resolution_result = results["avg_resolution"]
+        avg_resolution_days = float(avg_resolution_result['avg_resolution_days']) if avg_resolution_result['avg_resolution_days'] else 0
+        monthly_closed = results["monthly_closed"]['count']
+        monthly_created = results["monthly_created"]['count']
+
+        # Calculate closure rate
+        closure_rate = (monthly_closed / monthly_created * 100) if monthly_created > 0 else 0
+
+        top_performers = [
+            {
+                'user': row['assigned_to'],
+                'cases_handled': row['cases_handled'],
+                'cases_closed': row['cases_closed'],
+                'success_rate': (row['cases_closed'] / row['cases_handled'] * 100) if row['cases_handled'] > 0 else 0
+            }
+            for row in results["top_performers"]
+        ]
+
+        return {
+            "success": True,
+            "data": {
+                "avg_resolution_days": round(avg_resolution_days, 1),
+                "monthly_closed": monthly_closed,
+                "monthly_created": monthly_created,
+                "closure_rate": round(closure_rate, 1),
+                "top_performers": top_performers
+            }
+        }
+
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch performance metrics: {str(e)}")
 
@@ -479,45 +704,42 @@ async def get_recent_activity(
 ) -> Dict[str, Any]:
     """Get recent case activities"""
     try:
-        with psycopg2.connect(**DB_CONNECTION_PARAMS) as conn:
-            with conn.cursor(cursor_factory=RealDictCursor) as cur:
-                
-                # Get recent cases with details
-                cur.execute("""
-                    SELECT 
-                        case_id,
-                        case_type,
-                        status,
-                        assigned_to,
-                        creation_date,
-                        disputed_amount,
-                        location,
-                        is_operational
-                    FROM case_main 
-                    ORDER BY creation_date DESC
-                    LIMIT %s
-                """, (limit,))
-                
-                recent_cases = []
-                for row in cur.fetchall():
-                    recent_cases.append({
-                        'case_id': row['case_id'],
-                        'case_type': row['case_type'],
-                        'status': row['status'],
-                        'assigned_to': row['assigned_to'],
-                        'creation_date': row['creation_date'].isoformat() if row['creation_date'] else None,
-                        'disputed_amount': float(row['disputed_amount']) if row['disputed_amount'] else None,
-                        'location': row['location'],
-                        'is_operational': row['is_operational']
-                    })
-                
-                return {
-                    "success": True,
-                    "data": {
-                        "recent_cases": recent_cases
-                    }
-                }
-                
+        # Get recent cases with details
+        rows = await _run_query(executor, _rows("""
+            SELECT 
+                case_id,
+                case_type,
+                status,
+                assigned_to,
+                creation_date,
+                disputed_amount,
+                location,
+                is_operational
+            FROM case_main 
+            ORDER BY creation_date DESC
+            LIMIT %s
+        """, (limit,)))
+
+        recent_cases = []
+        for row in rows:
+            recent_cases.append({
+                'case_id': row['case_id'],
+                'case_type': row['case_type'],
+                'status': row['status'],
+                'assigned_to': row['assigned_to'],
+                'creation_date': row['creation_date'].isoformat() if row['creation_date'] else None,
+                'disputed_amount': float(row['disputed_amount']) if row['disputed_amount'] else None,
+                'location': row['location'],
+                'is_operational': row['is_operational']
+            })
+
+        return {
+            "success": True,
+            "data": {
+                "recent_cases": recent_cases
+            }
+        }
+
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch recent activity: {str(e)}")
 
@@ -529,166 +751,161 @@ async def get_user_analytics(
     executor: Annotated[ThreadPoolExecutor, Depends(get_executor_dependency)]
 ) -> Dict[str, Any]:
     """Get analytics scoped to the logged-in user (assigned_to = current user)."""
-    try:
-        with psycopg2.connect(**DB_CONNECTION_PARAMS) as conn:
-            with conn.cursor(cursor_factory=RealDictCursor) as cur:
-                # Overview metrics for user
-                cur.execute(
-                    """
-                    SELECT COUNT(*) AS total
-                    FROM case_main cm
-                    INNER JOIN assignment a ON cm.case_id = a.case_id
-                    WHERE a.assigned_to = %s
-                    """,
-                    (current_username,)
-                )
-                total_cases = cur.fetchone()["total"]
-
-                cur.execute(
-                    """
-                    SELECT COUNT(*) AS open_count
-                    FROM case_main cm
-                    INNER JOIN assignment a ON cm.case_id = a.case_id
-                    WHERE a.assigned_to = %s AND cm.status <> 'Closed'
-                    """,
-                    (current_username,)
-                )
-                open_cases = cur.fetchone()["open_count"]
-
-                cur.execute(
-                    """
-                    SELECT COUNT(*) AS closed_count
-                    FROM case_main cm
-                    INNER JOIN assignment a ON cm.case_id = a.case_id
-                    WHERE a.assigned_to = %s AND cm.status = 'Closed'
-                    """,
-                    (current_username,)
-                )
-                closed_cases = cur.fetchone()["closed_count"]
 
-                # This month's created cases (assigned to user)
-                cur.execute(
-                    """
-                    SELECT COUNT(*) AS monthly_created
-                    FROM case_main cm
-                    INNER JOIN assignment a ON cm.case_id = a.case_id
-                    WHERE a.assigned_to = %s
-                      AND DATE_TRUNC('month', cm.creation_date) = DATE_TRUNC('month', CURRENT_DATE)
-                    """,
-                    (current_username,)
-                )
-                monthly_created = cur.fetchone()["monthly_created"]
-
-                # Status distribution for user
-                cur.execute(
-                    """
-                    SELECT cm.status, COUNT(*) AS count
-                    FROM case_main cm
-                    INNER JOIN assignment a ON cm.case_id = a.case_id
-                    WHERE a.assigned_to = %s
-                    GROUP BY cm.status
-                    """,
-                    (current_username,)
-                )
-                status_distribution = {row["status"]: row["count"] for row in cur.fetchall()}
-
-                # Daily activity (last 30 days) for user
-                cur.execute(
-                    """
-                    SELECT DATE(cm.creation_date) AS date, COUNT(*) AS count
-                    FROM case_main cm
-                    INNER JOIN assignment a ON cm.case_id = a.case_id
-                    WHERE a.assigned_to = %s
-                      AND cm.creation_date >= (CURRENT_DATE - INTERVAL '30 days')
-                    GROUP BY DATE(cm.creation_date)
-                    ORDER BY DATE(cm.creation_date) DESC
-                    """,
-                    (current_username,)
-                )
-                daily_activity = [
-                    {"date": row["date"].isoformat(), "count": row["count"]} for row in cur.fetchall()
-                ]
-
-                # Average resolution time for user's closed cases
-                cur.execute(
-                    """
-                    SELECT AVG(EXTRACT(EPOCH FROM (cm.closing_date - cm.creation_date))/86400) AS avg_days
-                    FROM case_main cm
-                    INNER JOIN assignment a ON cm.case_id = a.case_id
-                    WHERE a.assigned_to = %s AND cm.status = 'Closed' AND cm.closing_date IS NOT NULL
-                    """,
-                    (current_username,)
+    # Funds saved by latest action for cases assigned to user
+    def _funds_saved(cur) -> float:
+        try:
+            cur.execute(
+                """
+                WITH latest AS (
+                    SELECT DISTINCT ON (cad.case_id) cad.case_id, cad.action_data
+                    FROM case_action_details cad
+                    ORDER BY cad.case_id, cad.updated_at DESC
                 )
-                avg_days_row = cur.fetchone()
-                avg_resolution_days = float(avg_days_row["avg_days"]) if avg_days_row and avg_days_row["avg_days"] else 0.0
-
-                # Funds saved by latest action for cases assigned to user
-                try:
-                    cur.execute(
-                        """
-                        WITH latest AS (
-                            SELECT DISTINCT ON (cad.case_id) cad.case_id, cad.action_data
-                            FROM case_action_details cad
-                            ORDER BY cad.case_id, cad.updated_at DESC
-                        )
-                        SELECT COALESCE(SUM((NULLIF(latest.action_data->>'fundsSaved',''))::numeric), 0) AS total
-                        FROM latest
-                        INNER JOIN case_main cm ON cm.case_id = latest.case_id
-                        INNER JOIN assignment a ON a.case_id = cm.case_id AND a.assigned_to = %s
-                        """,
-                        (current_username,)
-                    )
-                    funds_saved_row = cur.fetchone()
-                    funds_saved_total = float(funds_saved_row["total"]) if funds_saved_row and funds_saved_row["total"] is not None else 0.0
-                except Exception:
-                    funds_saved_total = 0.0
+                SELECT COALESCE(SUM((NULLIF(latest.action_data->>'fundsSaved',''))::numeric), 0) AS total
+                FROM latest
+                INNER JOIN case_main cm ON cm.case_id = latest.case_id
+                INNER JOIN assignment a ON a.case_id = cm.case_id AND a.assigned_to = %s
+                """,
+                (current_username,)
+            )
+            funds_saved_row = cur.fetchone()
+            return float(funds_saved_row["total"]) if funds_saved_row and funds_saved_row["total"] is not None else 0.0
+        except Exception:
+            return 0.0
 
-                # Recent cases for this user
-                cur.execute(
-                    """
-                    SELECT 
-                        cm.case_id,
-                        cm.case_type,
-                        cm.status,
-                        cm.creation_date,
-                        cm.short_dn,
-                        cm.long_dn
-                    FROM case_main cm
-                    INNER JOIN assignment a ON cm.case_id = a.case_id
-                    WHERE a.assigned_to = %s
-                    ORDER BY cm.creation_date DESC
-                    LIMIT 10
-                    """,
-                    (current_username,)
-                )
-                recent_cases = [
-                    {
-                        "case_id": row["case_id"],
-                        "case_type": row["case_type"],
-                        "status": row["status"],
-                        "creation_date": row["creation_date"].isoformat() if row["creation_date"] else None,
-                        "short_dn": row["short_dn"],
-                        "long_dn": row["long_dn"],
-                    }
-                    for row in cur.fetchall()
-                ]
+    try:
+        user = (current_username,)
+        results = await _run_queries(
+            executor,
+            # Overview metrics for user
+            total=_row(
+                """
+                SELECT COUNT(*) AS total
+                FROM case_main cm
+                INNER JOIN assignment a ON cm.case_id = a.case_id
+                WHERE a.assigned_to = %s
+                """,
+                user
+            ),
+            open=_row(
+                """
+                SELECT COUNT(*) AS open_count
+                FROM case_main cm
+                INNER JOIN assignment a ON cm.case_id = a.case_id
+                WHERE a.assigned_to = %s AND cm.status <> 'Closed'
+                """,
+                user
+            ),
+            closed=_row(
+                """
+                SELECT COUNT(*) AS closed_count
+                FROM case_main cm
+                INNER JOIN assignment a ON cm.case_id = a.case_id
+                WHERE a.assigned_to = %s AND cm.status = 'Closed'
+                """,
+                user
+            ),
+            # This month's created cases (assigned to user)
+            monthly_created=_row(
+                """
+                SELECT COUNT(*) AS monthly_created
+                FROM case_main cm
+                INNER JOIN assignment a ON cm.case_id = a.case_id
+                WHERE a.assigned_to = %s
+                  AND DATE_TRUNC('month', cm.creation_date) = DATE_TRUNC('month', CURRENT_DATE)
+                """,
+                user
+            ),
+            # Status distribution for user
+            status_distribution=_rows(
+                """
+                SELECT cm.status, COUNT(*) AS count
+                FROM case_main cm
+                INNER JOIN assignment a ON cm.case_id = a.case_id
+                WHERE a.assigned_to = %s
+                GROUP BY cm.status
+                """,
+                user
+            ),
+            # Daily activity (last 30 days) for user
+            daily_activity=_rows(
+                """
+                SELECT DATE(cm.creation_date) AS date, COUNT(*) AS count
+                FROM case_main cm
+                INNER JOIN assignment a ON cm.case_id = a.case_id
+                WHERE a.assigned_to = %s
+                  AND cm.creation_date >= (CURRENT_DATE - INTERVAL '30 days')
+                GROUP BY DATE(cm.creation_date)
+                ORDER BY DATE(cm.creation_date) DESC
+                """,
+                user
+            ),
+            # Average resolution time for user's closed cases
+            avg_days=_row(
+                """
+                SELECT AVG(EXTRACT(EPOCH FROM (cm.closing_date - cm.creation_date))/86400) AS avg_days
+                FROM case_main cm
+                INNER JOIN assignment a ON cm.case_id = a.case_id
+                WHERE a.assigned_to = %s AND cm.status = 'Closed' AND cm.closing_date IS NOT NULL
+                """,
+                user
+            ),
+            funds_saved=_funds_saved,
+            # Recent cases for this user
+            recent_cases=_rows(
+                """
+                SELECT 
+                    cm.case_id,
+                    cm.case_type,
+                    cm.status,
+                    cm.creation_date,
+                    cm.short_dn,
+                    cm.long_dn
+                FROM case_main cm
+                INNER JOIN assignment a ON cm.case_id = a.case_id
+                WHERE a.assigned_to = %s
+                ORDER BY cm.creation_date DESC
+                LIMIT 10
+                """,
+                user
+            ),
+        )
 
-                return {
-                    "success": True,
-                    "data": {
-                        "overview": {
-                            "total_cases": total_cases,
-                            "open_cases": open_cases,
-                            "closed_cases": closed_cases,
-                            "monthly_created": monthly_created,
-                            "average_resolution_days": round(avg_resolution_days, 1),
-                            "funds_saved_total": round(funds_saved_total, 2),
-                        },
-                        "status_distribution": status_distribution,
-                        "daily_activity": daily_activity,
-                        "recent_cases": recent_cases,
-                    },
-                }
+        status_distribution = {row["status"]: row["count"] for row in results["status_distribution"]}
+        daily_activity = [
+            {"date": row["date"].isoformat(), "count": row["count"]} for row in results["daily_activity"]
+        ]
+        avg_days_row = results["avg_days"]
+        avg_resolution_days = float(avg_days_row["avg_days"]) if avg_days_row and avg_days_row["avg_days"] else 0.0
+        recent_cases = [
+            {
+                "case_id": row["case_id"],
+                "case_type": row["case_type"],
+                "status": row["status"],
+                "creation_date": row["creation_date"].isoformat() if row["creation_date"] else None,
+                "short_dn": row["short_dn"],
+                "long_dn": row["long_dn"],
+            }
+            for row in results["recent_cases"]
+        ]
+
+        return {
+            "success": True,
+            "data": {
+                "overview": {
+                    "total_cases": results["total"]["total"],
+                    "open_cases": results["open"]["open_count"],
+                    "closed_cases": results["closed"]["closed_count"],
+                    "monthly_created": results["monthly_created"]["monthly_created"],
+                    "average_resolution_days": round(avg_resolution_days, 1),
+                    "funds_saved_total": round(results["funds_saved"], 2),
+                },
+                "status_distribution": status_distribution,
+                "daily_activity": daily_activity,
+                "recent_cases": recent_cases,
+            },
+        }
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch user analytics: {str(e)}")
 
@@ -696,7 +913,8 @@ async def get_user_analytics(
 @router.get("/api/user/activity-cases")
 async def get_user_activity_cases(
     current_username: Annotated[str, Depends(get_current_username)],
-    matcher: Annotated[CaseEntryMatcher, Depends(get_case_matcher_instance)]
+    matcher: Annotated[CaseEntryMatcher, Depends(get_case_matcher_instance)],
+    executor: Annotated[ThreadPoolExecutor, Depends(get_executor_dependency)]
 ) -> Dict[str, Any]:
     """Return cases the current user has touched and basic info for each.
 
@@ -711,128 +929,130 @@ async def get_user_activity_cases(
         except Exception:
             user_type = None
 
-        with psycopg2.connect(**DB_CONNECTION_PARAMS) as conn:
-            with conn.cursor(cursor_factory=RealDictCursor) as cur:
-                # For super_user: show ALL cases, not just touched ones
-                if user_type == 'super_user':
-                    # Get all cases from case_main
-                    cur.execute(
-                        """
-                        SELECT cm.case_id, cm.source_ack_no, cm.case_type, cm.status, 
-                               cm.creation_date, cm.creation_time
-                        FROM case_main cm
-                        ORDER BY cm.creation_date DESC, cm.creation_time DESC
-                        """
-                    )
-                    all_cases = cur.fetchall() or []
-                    
-                    # Build result for super_user
-                    result = []
-                    for case in all_cases:
-                        result.append({
-                            "case_id": case["case_id"],
-                            "source_ack_no": case.get("source_ack_no"),
-                            "case_type": case.get("case_type"),
-                            "status": case.get("status"),
-                            "last_touched_at": case.get("creation_date").isoformat() if case.get("creation_date") else None
-                        })
-                    
-                    return {"cases": result, "user_type": user_type}
-                
-                # For other users: show only cases they've touched
-                # 1) Cases where the user directly appears in logs
-                cur.execute(
-                    """
-                    SELECT DISTINCT cl.case_id
-                    FROM case_logs cl
-                    WHERE cl.user_name = %s
-                    """,
-                    (current_username,)
-                )
-                direct_rows = cur.fetchall() or []
-                case_ids = set([r["case_id"] for r in direct_rows])
-
-                # 2) For 'others' users: include cases where they were assigned/revoked (detected via details)
-                if user_type == 'others':
+        def _sync_activity_cases():
+            with get_db_connection(caller="dashboard") as conn:
+                with conn.cursor(cursor_factory=RealDictCursor) as cur:
+                    # For super_user: show ALL cases, not just touched ones
+                    if user_type == 'super_user':
+                        # Get all cases from case_main
+                        cur.execute(
+                            """
+                            SELECT cm.case_id, cm.source_ack_no, cm.case_type, cm.status, 
+                                   cm.creation_date, cm.creation_time
+                            FROM case_main cm
+                            ORDER BY cm.creation_date DESC, cm.creation_time DESC
+                            """
+                        )
+                        all_cases = cur.fetchall() or []
+
+                        # Build result for super_user
+                        result = []
+                        for case in all_cases:
+                            result.append({
+                                "case_id": case["case_id"],
+                                "source_ack_no": case.get("source_ack_no"),
+                                "case_type": case.get("case_type"),
+                                "status": case.get("status"),
+                                "last_touched_at": case.get("creation_date").isoformat() if case.get("creation_date") else None
+                            })
+
+                        return {"cases": result, "user_type": user_type}
+
+                    # For other users: show only cases they've touched
+                    # 1) Cases where the user directly appears in logs
                     cur.execute(
                         """
                         SELECT DISTINCT cl.case_id
                         FROM case_logs cl
-                        WHERE cl.action IN ('assign','revoke_assignment')
-                          AND cl.details ILIKE %s
+                        WHERE cl.user_name = %s
                         """,
-                        (f"%{current_username}%",)
+                        (current_username,)
                     )
-                    mention_rows = cur.fetchall() or []
-                    case_ids.update([r["case_id"] for r in mention_rows])
+                    direct_rows = cur.fetchall() or []
+                    case_ids = set([r["case_id"] for r in direct_rows])
+
+                    # 2) For 'others' users: include cases where they were assigned/revoked (detected via details)
+                    if user_type == 'others':
+                        cur.execute(
+                            """
+                            SELECT DISTINCT cl.case_id
+                            FROM case_logs cl
+                            WHERE cl.action IN ('assign','revoke_assignment')
+                              AND cl.details ILIKE %s
+                            """,
+                            (f"%{current_username}%",)
+                        )
+                        mention_rows = cur.fetchall() or []
+                        case_ids.update([r["case_id"] for r in mention_rows])
 
-                if not case_ids:
-                    return {"cases": []}
+                    if not case_ids:
+                        return {"cases": []}
 
-                # Fetch basic case info and last touched timestamp by this user (or mention if others)
-                case_ids_list = list(case_ids)
-                cur.execute(
-                    """
-                    SELECT cm.case_id, cm.source_ack_no, cm.case_type, cm.status
-                    FROM case_main cm
-                    WHERE cm.case_id = ANY(%s)
-                    """,
-                    (case_ids_list,)
-                )
-                case_info_map = {row["case_id"]: row for row in (cur.fetchall() or [])}
-
-                # Compute last touched timestamp for the user
-                last_touch_map: Dict[int, Optional[datetime]] = {}
-                # a) direct logs
-                cur.execute(
-                    """
-                    SELECT cl.case_id, MAX(cl.created_at) AS last_ts
-                    FROM case_logs cl
-                    WHERE cl.user_name = %s AND cl.case_id = ANY(%s)
-                    GROUP BY cl.case_id
-                    """,
-                    (current_username, case_ids_list)
-                )
-                for row in (cur.fetchall() or []):
-                    last_touch_map[row["case_id"]] = row["last_ts"]
+                    # Fetch basic case info and last touched timestamp by this user (or mention if others)
+                    case_ids_list = list(case_ids)
+                    cur.execute(
+                        """
+                        SELECT cm.case_id, cm.source_ack_no, cm.case_type, cm.status
+                        FROM case_main cm
+                        WHERE cm.case_id = ANY(%s)
+                        """,
+                        (case_ids_list,)
+                    )
+                    case_info_map = {row["case_id"]: row for row in (cur.fetchall() or [])}
 
-                # b) mentions (others only)
-                if user_type == 'others':
+                    # Compute last touched timestamp for the user
+                    last_touch_map: Dict[int, Optional[datetime]] = {}
+                    # a) direct logs
                     cur.execute(
                         """
                         SELECT cl.case_id, MAX(cl.created_at) AS last_ts
                         FROM case_logs cl
-                        WHERE cl.action IN ('assign','revoke_assignment')
-                          AND cl.details ILIKE %s
-                          AND cl.case_id = ANY(%s)
+                        WHERE cl.user_name = %s AND cl.case_id = ANY(%s)
                         GROUP BY cl.case_id
                         """,
-                        (f"%{current_username}%", case_ids_list)
+                        (current_username, case_ids_list)
                     )
                     for row in (cur.fetchall() or []):
-                        cid = row["case_id"]
-                        ts = row["last_ts"]
-                        prev = last_touch_map.get(cid)
-                        if prev is None or (ts and ts > prev):
-                            last_touch_map[cid] = ts
-
-                # Build response
-                result = []
-                for cid in case_ids_list:
-                    info = case_info_map.get(cid)
-                    if not info:
-                        continue
-                    result.append({
-                        "case_id": cid,
-                        "source_ack_no": info.get("source_ack_no"),
-                        "case_type": info.get("case_type"),
-                        "status": info.get("status"),
-                        "last_touched_at": last_touch_map.get(cid).isoformat() if last_touch_map.get(cid) else None
-                    })
-
-                # Sort by last_touched_at desc, then case_id desc
-                result.sort(key=lambda x: (x["last_touched_at"] or '', x["case_id"]), reverse=True)
-                return {"cases": result, "user_type": user_type}
+                        last_touch_map[row["case_id"]] = row["last_ts"]
+
+                    # b) mentions (others only)
+                    if user_type == 'others':
+                        cur.execute(
+                            """
+                            SELECT cl.case_id, MAX(cl.created_at) AS last_ts
+                            FROM case_logs cl
+                            WHERE cl.action IN ('assign','revoke_assignment')
+                              AND cl.details ILIKE %s
+                              AND cl.case_id = ANY(%s)
+                            GROUP BY cl.case_id
+                            """,
+                            (f"%{current_username}%", case_ids_list)
+                        )
+                        for row in (cur.fetchall() or []):
+                            cid = row["case_id"]
+                            ts = row["last_ts"]
+                            prev = last_touch_map.get(cid)
+                            if prev is None or (ts and ts > prev):
+                                last_touch_map[cid] = ts
+
+                    # Build response
+                    result = []
+                    for cid in case_ids_list:
+                        info = case_info_map.get(cid)
+                        if not info:
+                            continue
+                        result.append({
+                            "case_id": cid,
+                            "source_ack_no": info.get("source_ack_no"),
+                            "case_type": info.get("case_type"),
+                            "status": info.get("status"),
+                            "last_touched_at": last_touch_map.get(cid).isoformat() if last_touch_map.get(cid) else None
+                        })
+
+                    # Sort by last_touched_at desc, then case_id desc
+                    result.sort(key=lambda x: (x["last_touched_at"] or '', x["case_id"]), reverse=True)
+                    return {"cases": result, "user_type": user_type}
+        return await asyncio.get_running_loop().run_in_executor(executor, _sync_activity_cases)
     except Exception as e:
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=f"Failed to fetch user activity cases: {str(e)}")
@@ -840,78 +1060,81 @@ async def get_user_activity_cases(
 
 @router.get("/api/supervisor/pending-approvals")
 async def get_supervisor_pending_approvals(
-    current_username: Annotated[str, Depends(get_current_username)]
+    current_username: Annotated[str, Depends(get_current_username)],
+    executor: Annotated[ThreadPoolExecutor, Depends(get_executor_dependency)]
 ) -> Dict[str, Any]:
     """Return cases that have pending_approval items OR are sent back to supervisor in the supervisor's department."""
     try:
-        with psycopg2.connect(**DB_CONNECTION_PARAMS) as conn:
-            with conn.cursor(cursor_factory=RealDictCursor) as cur:
-                # Determine supervisor's department
-                cur.execute("SELECT dept, user_type FROM user_table WHERE user_name = %s", (current_username,))
-                row = cur.fetchone()
-                if not row or row.get('user_type') != 'supervisor':
-                    return {"cases": []}
-                dept = row.get('dept')
-
-                # Cases with pending action approvals in this department
-                cur.execute(
-                    """
-                    SELECT DISTINCT cad.case_id
-                    FROM case_action_details cad
-                    WHERE cad.status = 'pending_approval' AND cad.department = %s
-                    """,
-                    (dept,)
-                )
-                action_case_ids = {r['case_id'] for r in (cur.fetchall() or [])}
-
-                # Cases with pending document approvals in this department
-                cur.execute(
-                    """
-                    SELECT DISTINCT cd.case_id
-                    FROM case_documents cd
-                    WHERE cd.approval_status = 'pending_approval' AND cd.department = %s
-                    """,
-                    (dept,)
-                )
-                doc_case_ids = {r['case_id'] for r in (cur.fetchall() or [])}
-
-                # Cases sent back to supervisor in this department (from case_logs)
-                # BUT exclude cases that have been approved OR rejected (have 'approve_changes' or 'reject_changes' log after 'send_back_to_supervisor')
-                cur.execute(
-                    """
-                    SELECT DISTINCT cl.case_id
-                    FROM case_logs cl
-                    WHERE cl.action = 'send_back_to_supervisor' 
-                    AND cl.details LIKE %s
-                    AND cl.case_id NOT IN (
-                        SELECT DISTINCT cl2.case_id 
-                        FROM case_logs cl2 
-                        WHERE cl2.action IN ('approve_changes', 'reject_changes')
-                        AND cl2.details LIKE %s
-                        AND cl2.created_at > cl.created_at
+        def _sync_pending_approvals():
+            with get_db_connection(caller="dashboard") as conn:
+                with conn.cursor(cursor_factory=RealDictCursor) as cur:
+                    # Determine supervisor's department
+                    cur.execute("SELECT dept, user_type FROM user_table WHERE user_name = %s", (current_username,))
+                    row = cur.fetchone()
+                    if not row or row.get('user_type') != 'supervisor':
+                        return {"cases": []}
+                    dept = row.get('dept')
+
+                    # Cases with pending action approvals in this department
+                    cur.execute(
+                        """
+                        SELECT DISTINCT cad.case_id
+                        FROM case_action_details cad
+                        WHERE cad.status = 'pending_approval' AND cad.department = %s
+                        """,
+                        (dept,)
                     )
-                    """,
-                    (f'%Dept: {dept}%', f'%Dept: {dept}%')
-                )
-                sent_back_case_ids = {r['case_id'] for r in (cur.fetchall() or [])}
+                    action_case_ids = {r['case_id'] for r in (cur.fetchall() or [])}
+
+                    # Cases with pending document approvals in this department
+                    cur.execute(
+                        """
+                        SELECT DISTINCT cd.case_id
+                        FROM case_documents cd
+                        WHERE cd.approval_status = 'pending_approval' AND cd.department = %s
+                        """,
+                        (dept,)
+                    )
+                    doc_case_ids = {r['case_id'] for r in (cur.fetchall() or [])}
+
+                    # Cases sent back to supervisor in this department (from case_logs)
+                    # BUT exclude cases that have been approved OR rejected (have 'approve_changes' or 'reject_changes' log after 'send_back_to_supervisor')
+                    cur.execute(
+                        """
+                        SELECT DISTINCT cl.case_id
+                        FROM case_logs cl
+                        WHERE cl.action = 'send_back_to_supervisor' 
+                        AND cl.details LIKE %s
+                        AND cl.case_id NOT IN (
+                            SELECT DISTINCT cl2.case_id 
+                            FROM case_logs cl2 
+                            WHERE cl2.action IN ('approve_changes', 'reject_changes')
+                            AND cl2.details LIKE %s
+                            AND cl2.created_at > cl.created_at
+                        )
+                        """,
+                        (f'%Dept: {dept}%', f'%Dept: {dept}%')
+                    )
+                    sent_back_case_ids = {r['case_id'] for r in (cur.fetchall() or [])}
 
-                # Combine all case IDs
-                case_ids = list(action_case_ids.union(doc_case_ids).union(sent_back_case_ids))
-                if not case_ids:
-                    return {"cases": []}
+                    # Combine all case IDs
+                    case_ids = list(action_case_ids.union(doc_case_ids).union(sent_back_case_ids))
+                    if not case_ids:
+                        return {"cases": []}
 
-                # Fetch case summaries
-                cur.execute(
-                    """
-                    SELECT cm.case_id, cm.source_ack_no, cm.case_type, cm.status, cm.creation_date
-                    FROM case_main cm
-                    WHERE cm.case_id = ANY(%s)
-                    ORDER BY cm.creation_date DESC
-                    """,
-                    (case_ids,)
-                )
-                cases = cur.fetchall() or []
-                return {"cases": cases, "department": dept}
+                    # Fetch case summaries
+                    cur.execute(
+                        """
+                        SELECT cm.case_id, cm.source_ack_no, cm.case_type, cm.status, cm.creation_date
+                        FROM case_main cm
+                        WHERE cm.case_id = ANY(%s)
+                        ORDER BY cm.creation_date DESC
+                        """,
+                        (case_ids,)
+                    )
+                    cases = cur.fetchall() or []
+                    return {"cases": cases, "department": dept}
+        return await asyncio.get_running_loop().run_in_executor(executor, _sync_pending_approvals)
     except Exception as e:
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=f"Failed to fetch pending approvals: {str(e)}")
@@ -924,188 +1147,170 @@ async def get_advanced_analytics(
 ) -> Dict[str, Any]:
     """Get advanced analytics including department performance, workload distribution, and case aging"""
     try:
-        with psycopg2.connect(**DB_CONNECTION_PARAMS) as conn:
-            with conn.cursor(cursor_factory=RealDictCursor) as cur:
-                
-                # Department Performance Analysis
-                cur.execute("""
-                    SELECT 
-                        ut.dept,
-                        COUNT(DISTINCT cm.case_id) as total_cases,
-                        COUNT(CASE WHEN cm.status = 'Closed' THEN 1 END) as closed_cases,
-                        COUNT(CASE WHEN cm.status = 'New' THEN 1 END) as new_cases,
-                        COUNT(CASE WHEN cm.status = 'Assigned' THEN 1 END) as assigned_cases,
-                        CAST(
-                            COUNT(CASE WHEN cm.status = 'Closed' THEN 1 END)::numeric / 
-                            NULLIF(COUNT(DISTINCT cm.case_id), 0) * 100 AS DECIMAL(10,2)
-                        ) as closure_rate,
-                        CAST(
-                            AVG(CASE 
-                                WHEN cm.status = 'Closed' AND cm.closing_date IS NOT NULL 
-                                THEN EXTRACT(EPOCH FROM (cm.closing_date - cm.creation_date))/86400 
-                            END) AS DECIMAL(10,1)
-                        ) as avg_resolution_days
-                    FROM case_main cm
-                    LEFT JOIN assignment a ON cm.case_id = a.case_id
-                    LEFT JOIN user_table ut ON a.assigned_to = ut.user_name
-                    WHERE ut.dept IS NOT NULL
-                    GROUP BY ut.dept
-                    ORDER BY total_cases DESC
-                """)
-                department_performance = [dict(row) for row in cur.fetchall()]
-                
-                # User Workload Distribution
-                cur.execute("""
-                    SELECT 
-                        a.assigned_to,
-                        ut.dept,
-                        COUNT(cm.case_id) as total_cases,
-                        COUNT(CASE WHEN cm.status = 'Closed' THEN 1 END) as closed_cases,
-                        COUNT(CASE WHEN cm.status IN ('New', 'Assigned') THEN 1 END) as active_cases,
-                        CAST(
-                            COUNT(CASE WHEN cm.status = 'Closed' THEN 1 END)::numeric / 
-                            NULLIF(COUNT(cm.case_id), 0) * 100 AS DECIMAL(10,2)
-                        ) as success_rate,
-                        CAST(
-                            AVG(CASE 
-                                WHEN cm.status = 'Closed' AND cm.closing_date IS NOT NULL 
-                                THEN EXTRACT(EPOCH FROM (cm.closing_date - cm.creation_date))/86400 
-                            END) AS DECIMAL(10,1)
-                        ) as avg_resolution_days
-                    FROM assignment a
-                    LEFT JOIN case_main cm ON a.case_id = cm.case_id
-                    LEFT JOIN user_table ut ON a.assigned_to = ut.user_name
-                    WHERE a.assigned_to IS NOT NULL
-                    GROUP BY a.assigned_to, ut.dept
-                    HAVING COUNT(cm.case_id) > 0
-                    ORDER BY active_cases DESC, success_rate DESC
-                """)
-                workload_distribution = [dict(row) for row in cur.fetchall()]
-                
-                # Case Aging Analysis
-                cur.execute("""
-                    WITH age_buckets AS (
-                        SELECT 
-                            CASE 
-                                WHEN EXTRACT(EPOCH FROM (CURRENT_DATE - cm.creation_date))/86400 <= 1 THEN '0-1 days'
-                                WHEN EXTRACT(EPOCH FROM (CURRENT_DATE - cm.creation_date))/86400 <= 3 THEN '1-3 days'
-                                WHEN EXTRACT(EPOCH FROM (CURRENT_DATE - cm.creation_date))/86400 <= 7 THEN '3-7 days'
-                                WHEN EXTRACT(EPOCH FROM (CURRENT_DATE - cm.creation_date))/86400 <= 14 THEN '7-14 days'
-                                WHEN EXTRACT(EPOCH FROM (CURRENT_DATE - cm.creation_date))/86400 <= 30 THEN '14-30 days'
-                                ELSE '30+ days'
-                            END as age_bucket,
-                            CASE 
-                                WHEN EXTRACT(EPOCH FROM (CURRENT_DATE - cm.creation_date))/86400 <= 1 THEN 1
-                                WHEN EXTRACT(EPOCH FROM (CURRENT_DATE - cm.creation_date))/86400 <= 3 THEN 2
-                                WHEN EXTRACT(EPOCH FROM (CURRENT_DATE - cm.creation_date))/86400 <= 7 THEN 3
-                                WHEN EXTRACT(EPOCH FROM (CURRENT_DATE - cm.creation_date))/86400 <= 14 THEN 4
-                                WHEN EXTRACT(EPOCH FROM (CURRENT_DATE - cm.creation_date))/86400 <= 30 THEN 5
-                                ELSE 6
-                            END as sort_order,
-                            cm.status
-                        FROM case_main cm
-                        WHERE cm.status != 'Closed'
-                    )
-                    SELECT 
-                        age_bucket,
-                        COUNT(*) as case_count,
-                        COUNT(CASE WHEN status = 'Closed' THEN 1 END) as closed_count,
-                        CAST(
-                            COUNT(CASE WHEN status = 'Closed' THEN 1 END)::numeric / 
-                            NULLIF(COUNT(*), 0) * 100 AS DECIMAL(10,2)
-                        ) as closure_rate
-                    FROM age_buckets
-                    GROUP BY age_bucket, sort_order
-                    ORDER BY sort_order
-                """)
-                case_aging = [dict(row) for row in cur.fetchall()]
-                
-                # Case Type Performance Analysis
-                cur.execute("""
-                    SELECT 
-                        cm.case_type,
-                        COUNT(*) as total_cases,
-                        COUNT(CASE WHEN cm.status = 'Closed' THEN 1 END) as closed_cases,
-                        CAST(
-                            COUNT(CASE WHEN cm.status = 'Closed' THEN 1 END)::numeric / 
-                            NULLIF(COUNT(*), 0) * 100 AS DECIMAL(10,2)
-                        ) as closure_rate,
-                        CAST(
-                            AVG(CASE 
-                                WHEN cm.status = 'Closed' AND cm.closing_date IS NOT NULL 
-                                THEN EXTRACT(EPOCH FROM (cm.closing_date - cm.creation_date))/86400 
-                            END) AS DECIMAL(10,1)
-                        ) as avg_resolution_days,
-                        CAST(
-                            AVG(CASE 
-                                WHEN cm.disputed_amount IS NOT NULL 
-                                THEN cm.disputed_amount 
-                            END) AS DECIMAL(15,2)
-                        ) as avg_disputed_amount
-                    FROM case_main cm
-                    GROUP BY cm.case_type
-                    ORDER BY total_cases DESC
-                """)
-                case_type_performance = [dict(row) for row in cur.fetchall()]
-                
-                # Monthly Trends (last 12 months)
-                cur.execute("""
+        if rollups_ready():
+            return {"success": True, "data": await _run_queries(executor, **_advanced_analytics_rollup_queries())}
+
+        # The six sections are independent: run them concurrently
+        data = await _run_queries(
+            executor,
+            # Department Performance Analysis
+            department_performance=_rows("""
+                SELECT 
+                    ut.dept,
+                    COUNT(DISTINCT cm.case_id) as total_cases,
+                    COUNT(CASE WHEN cm.status = 'Closed' THEN 1 END) as closed_cases,
+                    COUNT(CASE WHEN cm.status = 'New' THEN 1 END) as new_cases,
+                    COUNT(CASE WHEN cm.status = 'Assigned' THEN 1 END) as assigned_cases,
+                    CAST(
+                        COUNT(CASE WHEN cm.status = 'Closed' THEN 1 END)::numeric / 
+                        NULLIF(COUNT(DISTINCT cm.case_id), 0) * 100 AS DECIMAL(10,2)
+                    ) as closure_rate,
+                    CAST(
+                        AVG(CASE 
+                            WHEN cm.status = 'Closed' AND cm.closing_date IS NOT NULL 
+                            THEN EXTRACT(EPOCH FROM (cm.closing_date - cm.creation_date))/86400 
+                        END) AS DECIMAL(10,1)
+                    ) as avg_resolution_days
+                FROM case_main cm
+                LEFT JOIN assignment a ON cm.case_id = a.case_id
+                LEFT JOIN user_table ut ON a.assigned_to = ut.user_name
+                WHERE ut.dept IS NOT NULL
+                GROUP BY ut.dept
+                ORDER BY total_cases DESC
+            """),
+            # User Workload Distribution
+            workload_distribution=_rows("""
+                SELECT 
+                    a.assigned_to,
+                    ut.dept,
+                    COUNT(cm.case_id) as total_cases,
+                    COUNT(CASE WHEN cm.status = 'Closed' THEN 1 END) as closed_cases,
+                    COUNT(CASE WHEN cm.status IN ('New', 'Assigned') THEN 1 END) as active_cases,
+                    CAST(
+                        COUNT(CASE WHEN cm.status = 'Closed' THEN 1 END)::numeric / 
+                        NULLIF(COUNT(cm.case_id), 0) * 100 AS DECIMAL(10,2)
+                    ) as success_rate,
+                    CAST(
+                        AVG(CASE 
+                            WHEN cm.status = 'Closed' AND cm.closing_date IS NOT NULL 
+                            THEN EXTRACT(EPOCH FROM (cm.closing_date - cm.creation_date))/86400 
+                        END) AS DECIMAL(10,1)
+                    ) as avg_resolution_days
+                FROM assignment a
+                LEFT JOIN case_main cm ON a.case_id = cm.case_id
+                LEFT JOIN user_table ut ON a.assigned_to = ut.user_name
+                WHERE a.assigned_to IS NOT NULL
+                GROUP BY a.assigned_to, ut.dept
+                HAVING COUNT(cm.case_id) > 0
+                ORDER BY active_cases DESC, success_rate DESC
+            """),
+            # Case Aging Analysis
+            case_aging=_rows("""
+                WITH age_buckets AS (
                     SELECT 
-                        DATE_TRUNC('month', cm.creation_date) as month,
-                        COUNT(*) as cases_created,
-                        COUNT(CASE WHEN cm.status = 'Closed' THEN 1 END) as cases_closed,
-                        CAST(
-                            COUNT(CASE WHEN cm.status = 'Closed' THEN 1 END)::numeric / 
-                            NULLIF(COUNT(*), 0) * 100 AS DECIMAL(10,2)
-                        ) as closure_rate
+                        CASE 
+                            WHEN EXTRACT(EPOCH FROM (CURRENT_DATE - cm.creation_date))/86400 <= 1 THEN '0-1 days'
+                            WHEN EXTRACT(EPOCH FROM (CURRENT_DATE - cm.creation_date))/86400 <= 3 THEN '1-3 days'
+                            WHEN EXTRACT(EPOCH FROM (CURRENT_DATE - cm.creation_date))/86400 <= 7 THEN '3-7 days'
+                            WHEN EXTRACT(EPOCH FROM (CURRENT_DATE - cm.creation_date))/86400 <= 14 THEN '7-14 days'
+                            WHEN EXTRACT(EPOCH FROM (CURRENT_DATE - cm.creation_date))/86400 <= 30 THEN '14-30 days'
+                            ELSE '30+ days'
+                        END as age_bucket,
+                        CASE 
+                            WHEN EXTRACT(EPOCH FROM (CURRENT_DATE - cm.creation_date))/86400 <= 1 THEN 1
+                            WHEN EXTRACT(EPOCH FROM (CURRENT_DATE - cm.creation_date))/86400 <= 3 THEN 2
+                            WHEN EXTRACT(EPOCH FROM (CURRENT_DATE - cm.creation_date))/86400 <= 7 THEN 3
+                            WHEN EXTRACT(EPOCH FROM (CURRENT_DATE - cm.creation_date))/86400 <= 14 THEN 4
+                            WHEN EXTRACT(EPOCH FROM (CURRENT_DATE - cm.creation_date))/86400 <= 30 THEN 5
+                            ELSE 6
+                        END as sort_order,
+                        cm.status
                     FROM case_main cm
-                    WHERE cm.creation_date >= CURRENT_DATE - INTERVAL '12 months'
-                    GROUP BY DATE_TRUNC('month', cm.creation_date)
-                    ORDER BY month DESC
-                """)
-                monthly_trends = [dict(row) for row in cur.fetchall()]
-                
-                # Top Performing Users (last 30 days)
-                cur.execute("""
-                    SELECT 
-                        a.assigned_to,
-                        ut.dept,
-                        COUNT(cm.case_id) as cases_handled,
-                        COUNT(CASE WHEN cm.status = 'Closed' THEN 1 END) as cases_closed,
-                        CAST(
-                            COUNT(CASE WHEN cm.status = 'Closed' THEN 1 END)::numeric / 
-                            NULLIF(COUNT(cm.case_id), 0) * 100 AS DECIMAL(10,2)
-                        ) as success_rate,
-                        CAST(
-                            AVG(CASE 
-                                WHEN cm.status = 'Closed' AND cm.closing_date IS NOT NULL 
-                                THEN EXTRACT(EPOCH FROM (cm.closing_date - cm.creation_date))/86400 
-                            END) AS DECIMAL(10,1)
-                        ) as avg_resolution_days
-                    FROM assignment a
-                    LEFT JOIN case_main cm ON a.case_id = cm.case_id
-                    LEFT JOIN user_table ut ON a.assigned_to = ut.user_name
-                    WHERE a.assigned_to IS NOT NULL 
-                    AND cm.creation_date >= CURRENT_DATE - INTERVAL '30 days'
-                    GROUP BY a.assigned_to, ut.dept
-                    HAVING COUNT(cm.case_id) > 0
-                    ORDER BY cases_closed DESC, success_rate DESC
-                    LIMIT 10
-                """)
-                top_performers = [dict(row) for row in cur.fetchall()]
-                
-                return {
-                    "success": True,
-                    "data": {
-                        "department_performance": department_performance,
-                        "workload_distribution": workload_distribution,
-                        "case_aging": case_aging,
-                        "case_type_performance": case_type_performance,
-                        "monthly_trends": monthly_trends,
-                        "top_performers": top_performers
-                    }
-                }
-                
+                    WHERE cm.status != 'Closed'
+                )
+                SELECT 
+                    age_bucket,
+                    COUNT(*) as case_count,
+                    COUNT(CASE WHEN status = 'Closed' THEN 1 END) as closed_count,
+                    CAST(
+                        COUNT(CASE WHEN status = 'Closed' THEN 1 END)::numeric / 
+                        NULLIF(COUNT(*), 0) * 100 AS DECIMAL(10,2)
+                    ) as closure_rate
+                FROM age_buckets
+                GROUP BY age_bucket, sort_order
+                ORDER BY sort_order
+            """),
+            # Case Type Performance Analysis
+            case_type_performance=_rows("""
+                SELECT 
+                    cm.case_type,
+                    COUNT(*) as total_cases,
+                    COUNT(CASE WHEN cm.status = 'Closed' THEN 1 END) as closed_cases,
+                    CAST(
+                        COUNT(CASE WHEN cm.status = 'Closed' THEN 1 END)::numeric / 
+                        NULLIF(COUNT(*), 0) * 100 AS DECIMAL(10,2)
+                    ) as closure_rate,
+                    CAST(
+                        AVG(CASE 
+                            WHEN cm.status = 'Closed' AND cm.closing_date IS NOT NULL 
+                            THEN EXTRACT(EPOCH FROM (cm.closing_date - cm.creation_date))/86400 
+                        END) AS DECIMAL(10,1)
+                    ) as avg_resolution_days,
+                    CAST(
+                        AVG(CASE 
+                            WHEN cm.disputed_amount IS NOT NULL 
+                            THEN cm.disputed_amount 
+                        END) AS DECIMAL(15,2)
+                    ) as avg_disputed_amount
+                FROM case_main cm
+                GROUP BY cm.case_type
+                ORDER BY total_cases DESC
+            """),
+            # Monthly Trends (last 12 months)
+            monthly_trends=_rows("""
+                SELECT 
+                    DATE_TRUNC('month', cm.creation_date) as month,
+                    COUNT(*) as cases_created,
+                    COUNT(CASE WHEN cm.status = 'Closed' THEN 1 END) as cases_closed,
+                    CAST(
+                        COUNT(CASE WHEN cm.status = 'Closed' THEN 1 END)::numeric / 
+                        NULLIF(COUNT(*), 0) * 100 AS DECIMAL(10,2)
+                    ) as closure_rate
+                FROM case_main cm
+                WHERE cm.creation_date >= CURRENT_DATE - INTERVAL '12 months'
+                GROUP BY DATE_TRUNC('month', cm.creation_date)
+                ORDER BY month DESC
+            """),
+            # Top Performing Users (last 30 days)
+            top_performers=_rows("""
+                SELECT 
+                    a.assigned_to,
+                    ut.dept,
+                    COUNT(cm.case_id) as cases_handled,
+                    COUNT(CASE WHEN cm.status = 'Closed' THEN 1 END) as cases_closed,
+                    CAST(
+                        COUNT(CASE WHEN cm.status = 'Closed' THEN 1 END)::numeric / 
+                        NULLIF(COUNT(cm.case_id), 0) * 100 AS DECIMAL(10,2)
+                    ) as success_rate,
+                    CAST(
+                        AVG(CASE 
+                            WHEN cm.status = 'Closed' AND cm.closing_date IS NOT NULL 
+                            THEN EXTRACT(EPOCH FROM (cm.closing_date - cm.creation_date))/86400 
+                        END) AS DECIMAL(10,1)
+                    ) as avg_resolution_days
+                FROM assignment a
+                LEFT JOIN case_main cm ON a.case_id = cm.case_id
+                LEFT JOIN user_table ut ON a.assigned_to = ut.user_name
+                WHERE a.assigned_to IS NOT NULL 
+                AND cm.creation_date >= CURRENT_DATE - INTERVAL '30 days'
+                GROUP BY a.assigned_to, ut.dept
+                HAVING COUNT(cm.case_id) > 0
+                ORDER BY cases_closed DESC, success_rate DESC
+                LIMIT 10
+            """),
+        )
+        return {"success": True, "data": data}
+
     except Exception as e:
         print(f"ERROR: Failed to fetch advanced analytics: {e}", flush=True)
         traceback.print_exc()
@@ -1119,60 +1324,54 @@ async def get_real_time_metrics(
 ) -> Dict[str, Any]:
     """Get real-time metrics for live dashboard updates"""
     try:
-        with psycopg2.connect(**DB_CONNECTION_PARAMS) as conn:
-            with conn.cursor(cursor_factory=RealDictCursor) as cur:
-                
+        queries = dict(
+            # Cases assigned in last hour
+            cases_assigned_last_hour=_row("""
+                SELECT COUNT(*) as cases_assigned_last_hour
+                FROM case_logs 
+                WHERE action = 'assign' 
+                AND created_at >= NOW() - INTERVAL '1 hour'
+            """),
+            # Recent activity (last 10 actions)
+            recent_activity=_rows("""
+                SELECT 
+                    cl.action,
+                    cl.user_name,
+                    cl.created_at,
+                    cm.case_id,
+                    cm.case_type,
+                    cm.status
+                FROM case_logs cl
+                LEFT JOIN case_main cm ON cl.case_id = cm.case_id
+                ORDER BY cl.created_at DESC
+                LIMIT 10
+            """),
+        )
+        # Case counts and workload from the rollups when they are built
+        if rollups_ready():
+            queries["rollup_counts"] = _real_time_counts_from_rollups
+        else:
+            queries.update(
                 # Cases created in last 24 hours
-                cur.execute("""
+                cases_last_24h=_row("""
                     SELECT COUNT(*) as cases_last_24h
                     FROM case_main 
                     WHERE creation_date >= CURRENT_DATE - INTERVAL '24 hours'
-                """)
-                cases_last_24h = cur.fetchone()['cases_last_24h']
-                
+                """),
                 # Cases closed in last 24 hours
-                cur.execute("""
+                cases_closed_last_24h=_row("""
                     SELECT COUNT(*) as cases_closed_last_24h
                     FROM case_main 
                     WHERE closing_date >= CURRENT_DATE - INTERVAL '24 hours'
-                """)
-                cases_closed_last_24h = cur.fetchone()['cases_closed_last_24h']
-                
+                """),
                 # Active cases (not closed)
-                cur.execute("""
+                active_cases=_row("""
                     SELECT COUNT(*) as active_cases
                     FROM case_main 
                     WHERE status != 'Closed'
-                """)
-                active_cases = cur.fetchone()['active_cases']
-                
-                # Cases assigned in last hour
-                cur.execute("""
-                    SELECT COUNT(*) as cases_assigned_last_hour
-                    FROM case_logs 
-                    WHERE action = 'assign' 
-                    AND created_at >= NOW() - INTERVAL '1 hour'
-                """)
-                cases_assigned_last_hour = cur.fetchone()['cases_assigned_last_hour']
-                
-                # Recent activity (last 10 actions)
-                cur.execute("""
-                    SELECT 
-                        cl.action,
-                        cl.user_name,
-                        cl.created_at,
-                        cm.case_id,
-                        cm.case_type,
-                        cm.status
-                    FROM case_logs cl
-                    LEFT JOIN case_main cm ON cl.case_id = cm.case_id
-                    ORDER BY cl.created_at DESC
-                    LIMIT 10
-                """)
-                recent_activity = [dict(row) for row in cur.fetchall()]
-                
+                """),
                 # Current workload by user
-                cur.execute("""
+                current_workload=_rows("""
                     SELECT 
                         a.assigned_to,
                         COUNT(cm.case_id) as active_cases,
@@ -1184,22 +1383,30 @@ async def get_real_time_metrics(
                     AND cm.status != 'Closed'
                     GROUP BY a.assigned_to
                     ORDER BY active_cases DESC
-                """)
-                current_workload = [dict(row) for row in cur.fetchall()]
-                
-                return {
-                    "success": True,
-                    "data": {
-                        "cases_last_24h": cases_last_24h,
-                        "cases_closed_last_24h": cases_closed_last_24h,
-                        "active_cases": active_cases,
-                        "cases_assigned_last_hour": cases_assigned_last_hour,
-                        "recent_activity": recent_activity,
-                        "current_workload": current_workload,
-                        "timestamp": datetime.now().isoformat()
-                    }
-                }
-                
+                """),
+            )
+        results = await _run_queries(executor, **queries)
+
+        counts = results.get("rollup_counts") or {
+            'cases_last_24h': results['cases_last_24h']['cases_last_24h'],
+            'cases_closed_last_24h': results['cases_closed_last_24h']['cases_closed_last_24h'],
+            'active_cases': results['active_cases']['active_cases'],
+            'current_workload': results['current_workload'],
+        }
+
+        return {
+            "success": True,
+            "data": {
+                "cases_last_24h": counts['cases_last_24h'],
+                "cases_closed_last_24h": counts['cases_closed_last_24h'],
+                "active_cases": counts['active_cases'],
+                "cases_assigned_last_hour": results['cases_assigned_last_hour']['cases_assigned_last_hour'],
+                "recent_activity": results['recent_activity'],
+                "current_workload": counts['current_workload'],
+                "timestamp": datetime.now().isoformat()
+            }
+        }
+
     except Exception as e:
         print(f"ERROR: Failed to fetch real-time metrics: {e}", flush=True)
         traceback.print_exc()
@@ -1213,124 +1420,118 @@ async def get_predictive_analytics(
 ) -> Dict[str, Any]:
     """Get predictive analytics for case resolution forecasting"""
     try:
-        with psycopg2.connect(**DB_CONNECTION_PARAMS) as conn:
-            with conn.cursor(cursor_factory=RealDictCursor) as cur:
-                
-                # Predict resolution time based on case type and age
-                cur.execute("""
-                    SELECT 
-                        cm.case_type,
-                        AVG(EXTRACT(EPOCH FROM (CURRENT_DATE - cm.creation_date))/86400) as avg_current_age_days,
-                        CASE 
-                            WHEN cm.case_type = 'VM' THEN 3
-                            WHEN cm.case_type = 'BM' THEN 5
-                            WHEN cm.case_type = 'PMA' THEN 7
-                            WHEN cm.case_type = 'PSA' THEN 4
-                            WHEN cm.case_type = 'NAB' THEN 6
-                            WHEN cm.case_type = 'ECBT' THEN 8
-                            WHEN cm.case_type = 'ECBNT' THEN 10
-                            ELSE 5
-                        END as predicted_resolution_days,
-                        COUNT(*) as case_count
-                    FROM case_main cm
-                    WHERE cm.status != 'Closed'
-                    GROUP BY cm.case_type
-                    ORDER BY case_count DESC
-                """)
-                resolution_predictions = [dict(row) for row in cur.fetchall()]
-                
-                # Workload forecast for next 30 days
-                cur.execute("""
-                    SELECT 
-                        DATE(cm.creation_date) as date,
-                        COUNT(*) as cases_created,
-                        AVG(COUNT(*)) OVER (ORDER BY DATE(cm.creation_date) ROWS BETWEEN 6 PRECEDING AND CURRENT ROW) as moving_avg
-                    FROM case_main cm
-                    WHERE cm.creation_date >= CURRENT_DATE - INTERVAL '30 days'
-                    GROUP BY DATE(cm.creation_date)
-                    ORDER BY date DESC
-                    LIMIT 30
-                """)
-                workload_trend = [dict(row) for row in cur.fetchall()]
-                
-                # Predict cases at risk of SLA breach
-                cur.execute("""
-                    SELECT 
-                        cm.case_id,
-                        cm.case_type,
-                        cm.creation_date,
-                        EXTRACT(EPOCH FROM (CURRENT_DATE - cm.creation_date))/86400 as age_days,
-                        a.assigned_to,
-                        CASE 
-                            WHEN cm.case_type = 'VM' AND EXTRACT(EPOCH FROM (CURRENT_DATE - cm.creation_date))/86400 > 2 THEN 'High'
-                            WHEN cm.case_type = 'BM' AND EXTRACT(EPOCH FROM (CURRENT_DATE - cm.creation_date))/86400 > 4 THEN 'High'
-                            WHEN cm.case_type = 'PMA' AND EXTRACT(EPOCH FROM (CURRENT_DATE - cm.creation_date))/86400 > 6 THEN 'High'
-                            WHEN EXTRACT(EPOCH FROM (CURRENT_DATE - cm.creation_date))/86400 > 5 THEN 'Medium'
-                            ELSE 'Low'
-                        END as risk_level
-                    FROM case_main cm
-                    LEFT JOIN assignment a ON cm.case_id = a.case_id
-                    WHERE cm.status != 'Closed'
-                    AND EXTRACT(EPOCH FROM (CURRENT_DATE - cm.creation_date))/86400 > 1
-                    ORDER BY age_days DESC
-                    LIMIT 20
-                """)
-                sla_risk_cases = [dict(row) for row in cur.fetchall()]
-                
-                # Department capacity analysis
-                cur.execute("""
-                    SELECT 
-                        ut.dept,
-                        COUNT(CASE WHEN cm.status != 'Closed' THEN 1 END) as active_cases,
-                        COUNT(DISTINCT a.assigned_to) as active_users,
-                        CAST(
-                            COUNT(CASE WHEN cm.status != 'Closed' THEN 1 END)::numeric / 
-                            NULLIF(COUNT(DISTINCT a.assigned_to), 0) AS DECIMAL(10,1)
-                        ) as cases_per_user,
-                        CASE 
-                            WHEN COUNT(CASE WHEN cm.status != 'Closed' THEN 1 END)::numeric / NULLIF(COUNT(DISTINCT a.assigned_to), 0) > 10 THEN 'Overloaded'
-                            WHEN COUNT(CASE WHEN cm.status != 'Closed' THEN 1 END)::numeric / NULLIF(COUNT(DISTINCT a.assigned_to), 0) > 5 THEN 'High Load'
-                            WHEN COUNT(CASE WHEN cm.status != 'Closed' THEN 1 END)::numeric / NULLIF(COUNT(DISTINCT a.assigned_to), 0) > 2 THEN 'Normal'
-                            ELSE 'Low Load'
-                        END as capacity_status
-                    FROM case_main cm
-                    LEFT JOIN assignment a ON cm.case_id = a.case_id
-                    LEFT JOIN user_table ut ON a.assigned_to = ut.user_name
-                    WHERE ut.dept IS NOT NULL
-                    GROUP BY ut.dept
-                    ORDER BY cases_per_user DESC
-                """)
-                capacity_analysis = [dict(row) for row in cur.fetchall()]
-                
-                # Generate forecast for next 7 days based on historical data
-                if workload_trend:
-                    recent_avg = sum(float(row['moving_avg'] or 0) for row in workload_trend[:7]) / min(7, len(workload_trend))
-                    forecast = []
-                    for i in range(7):
-                        forecast_date = datetime.now() + timedelta(days=i+1)
-                        # Add some randomness based on day of week
-                        weekday_multiplier = 1.2 if forecast_date.weekday() < 5 else 0.6  # Higher on weekdays
-                        predicted_cases = int(recent_avg * weekday_multiplier)
-                        forecast.append({
-                            'date': forecast_date.date().isoformat(),
-                            'predicted_cases': predicted_cases,
-                            'confidence': 85 if i < 3 else 70  # Higher confidence for near-term
-                        })
-                else:
-                    forecast = []
-                
-                return {
-                    "success": True,
-                    "data": {
-                        "resolution_predictions": resolution_predictions,
-                        "workload_trend": workload_trend,
-                        "sla_risk_cases": sla_risk_cases,
-                        "capacity_analysis": capacity_analysis,
-                        "forecast": forecast,
-                        "generated_at": datetime.now().isoformat()
-                    }
-                }
-                
+        results = await _run_queries(
+            executor,
+            # Predict resolution time based on case type and age
+            resolution_predictions=_rows("""
+                SELECT 
+                    cm.case_type,
+                    AVG(EXTRACT(EPOCH FROM (CURRENT_DATE - cm.creation_date))/86400) as avg_current_age_days,
+                    CASE 
+                        WHEN cm.case_type = 'VM' THEN 3
+                        WHEN cm.case_type = 'BM' THEN 5
+                        WHEN cm.case_type = 'PMA' THEN 7
+                        WHEN cm.case_type = 'PSA' THEN 4
+                        WHEN cm.case_type = 'NAB' THEN 6
+                        WHEN cm.case_type = 'ECBT' THEN 8
+                        WHEN cm.case_type = 'ECBNT' THEN 10
+                        ELSE 5
+                    END as predicted_resolution_days,
+                    COUNT(*) as case_count
+                FROM case_main cm
+                WHERE cm.status != 'Closed'
+                GROUP BY cm.case_type
+                ORDER BY case_count DESC
+            """),
+            # Workload forecast for next 30 days
+            workload_trend=_rows("""
+                SELECT 
+                    DATE(cm.creation_date) as date,
+                    COUNT(*) as cases_created,
+                    AVG(COUNT(*)) OVER (ORDER BY DATE(cm.creation_date) ROWS BETWEEN 6 PRECEDING AND CURRENT ROW) as moving_avg
+                FROM case_main cm
+                WHERE cm.creation_date >= CURRENT_DATE - INTERVAL '30 days'
+                GROUP BY DATE(cm.creation_date)
+                ORDER BY date DESC
+                LIMIT 30
+            """),
+            # Predict cases at risk of SLA breach
+            sla_risk_cases=_rows("""
+                SELECT 
+                    cm.case_id,
+                    cm.case_type,
+                    cm.creation_date,
+                    EXTRACT(EPOCH FROM (CURRENT_DATE - cm.creation_date))/86400 as age_days,
+                    a.assigned_to,
+                    CASE 
+                        WHEN cm.case_type = 'VM' AND EXTRACT(EPOCH FROM (CURRENT_DATE - cm.creation_date))/86400 > 2 THEN 'High'
+                        WHEN cm.case_type = 'BM' AND EXTRACT(EPOCH FROM (CURRENT_DATE - cm.creation_date))/86400 > 4 THEN 'High'
+                        WHEN cm.case_type = 'PMA' AND EXTRACT(EPOCH FROM (CURRENT_DATE - cm.creation_date))/86400 > 6 THEN 'High'
+                        WHEN EXTRACT(EPOCH FROM (CURRENT_DATE - cm.creation_date))/86400 > 5 THEN 'Medium'
+                        ELSE 'Low'
+                    END as risk_level
+                FROM case_main cm
+                LEFT JOIN assignment a ON cm.case_id = a.case_id
+                WHERE cm.status != 'Closed'
+                AND EXTRACT(EPOCH FROM (CURRENT_DATE - cm.creation_date))/86400 > 1
+                ORDER BY age_days DESC
+                LIMIT 20
+            """),
+            # Department capacity analysis
+            capacity_analysis=_rows("""
+                SELECT 
+                    ut.dept,
+                    COUNT(CASE WHEN cm.status != 'Closed' THEN 1 END) as active_cases,
+                    COUNT(DISTINCT a.assigned_to) as active_users,
+                    CAST(
+                        COUNT(CASE WHEN cm.status != 'Closed' THEN 1 END)::numeric / 
+                        NULLIF(COUNT(DISTINCT a.assigned_to), 0) AS DECIMAL(10,1)
+                    ) as cases_per_user,
+                    CASE 
+                        WHEN COUNT(CASE WHEN cm.status != 'Closed' THEN 1 END)::numeric / NULLIF(COUNT(DISTINCT a.assigned_to), 0) > 10 THEN 'Overloaded'
+                        WHEN COUNT(CASE WHEN cm.status != 'Closed' THEN 1 END)::numeric / NULLIF(COUNT(DISTINCT a.assigned_to), 0) > 5 THEN 'High Load'
+                        WHEN COUNT(CASE WHEN cm.status != 'Closed' THEN 1 END)::numeric / NULLIF(COUNT(DISTINCT a.assigned_to), 0) > 2 THEN 'Normal'
+                        ELSE 'Low Load'
+                    END as capacity_status
+                FROM case_main cm
+                LEFT JOIN assignment a ON cm.case_id = a.case_id
+                LEFT JOIN user_table ut ON a.assigned_to = ut.user_name
+                WHERE ut.dept IS NOT NULL
+                GROUP BY ut.dept
+                ORDER BY cases_per_user DESC
+            """),
+        )
+        workload_trend = results["workload_trend"]
+
+        # Generate forecast for next 7 days based on historical data
+        if workload_trend:
+            recent_avg = sum(float(row['moving_avg'] or 0) for row in workload_trend[:7]) / min(7, len(workload_trend))
+            forecast = []
+            for i in range(7):
+                forecast_date = datetime.now() + timedelta(days=i+1)
+                # Add some randomness based on day of week
+                weekday_multiplier = 1.2 if forecast_date.weekday() < 5 else 0.6  # Higher on weekdays
+                predicted_cases = int(recent_avg * weekday_multiplier)
+                forecast.append({
+                    'date': forecast_date.date().isoformat(),
+                    'predicted_cases': predicted_cases,
+                    'confidence': 85 if i < 3 else 70  # Higher confidence for near-term
+                })
+        else:
+            forecast = []
+
+        return {
+            "success": True,
+            "data": {
+                "resolution_predictions": results["resolution_predictions"],
+                "workload_trend": workload_trend,
+                "sla_risk_cases": results["sla_risk_cases"],
+                "capacity_analysis": results["capacity_analysis"],
+                "forecast": forecast,
+                "generated_at": datetime.now().isoformat()
+            }
+        }
+
     except Exception as e:
         print(f"ERROR: Failed to fetch predictive analytics: {e}", flush=True)
         traceback.print_exc()
@@ -1344,253 +1545,275 @@ async def get_network_data(
 ) -> Dict[str, Any]:
     """Get network visualization data for entity relationships and fraud patterns"""
     try:
-        with psycopg2.connect(**DB_CONNECTION_PARAMS) as conn:
-            with conn.cursor(cursor_factory=RealDictCursor) as cur:
-                
-                # Get cases with key entity information
-                cur.execute("""
+        results = await _run_queries(
+            executor,
+            # Get cases with key entity information
+            cases=_rows("""
+                SELECT 
+                    cm.case_id,
+                    cm.case_type,
+                    cm.status,
+                    cm.disputed_amount,
+                    cm.creation_date,
+                    cm.acc_num,
+                    cm.source_bene_accno,
+                    cm.cust_id,
+                    cm.short_dn,
+                    cm.long_dn,
+                    cm.location,
+                    cm.source_ack_no,
+                    a.assigned_to,
+                    ut.dept
+                FROM case_main cm
+                LEFT JOIN assignment a ON cm.case_id = a.case_id
+                LEFT JOIN user_table ut ON a.assigned_to = ut.user_name
+                WHERE cm.creation_date >= CURRENT_DATE - INTERVAL '90 days'
+                ORDER BY cm.creation_date DESC
+                LIMIT 500
+            """),
+            # Get fraud pattern statistics
+            fraud_patterns=_rows("""
+                SELECT 
+                    case_type,
+                    COUNT(*) as count,
+                    AVG(disputed_amount) as avg_amount,
+                    COUNT(CASE WHEN status = 'Closed' THEN 1 END) as closed_count
+                FROM case_main
+                WHERE creation_date >= CURRENT_DATE - INTERVAL '30 days'
+                GROUP BY case_type
+                ORDER BY count DESC
+            """),
+            # Get repeated entity statistics
+            repeated_entities=_rows("""
+                WITH entity_counts AS (
                     SELECT 
-                        cm.case_id,
-                        cm.case_type,
-                        cm.status,
-                        cm.disputed_amount,
-                        cm.creation_date,
-                        cm.acc_num,
-                        cm.source_bene_accno,
-                        cm.cust_id,
-                        cm.short_dn,
-                        cm.long_dn,
-                        cm.location,
-                        cm.source_ack_no,
-                        a.assigned_to,
-                        ut.dept
-                    FROM case_main cm
-                    LEFT JOIN assignment a ON cm.case_id = a.case_id
-                    LEFT JOIN user_table ut ON a.assigned_to = ut.user_name
-                    WHERE cm.creation_date >= CURRENT_DATE - INTERVAL '90 days'
-                    ORDER BY cm.creation_date DESC
-                    LIMIT 500
-                """)
-                cases = [dict(row) for row in cur.fetchall()]
-                
-                # Build nodes and edges for network visualization
-                nodes = {}
-                edges = []
-                node_connections = {}
-                
-                # Process each case to extract entities and relationships
-                for case in cases:
-                    case_id = case['case_id']
-                    case_node_id = f"case_{case_id}"
-                    
-                    # Add case node
-                    nodes[case_node_id] = {
-                        'id': case_node_id,
-                        'type': 'case',
-                        'label': f"Case {case_id}",
-                        'case_type': case['case_type'],
-                        'status': case['status'],
-                        'amount': float(case['disputed_amount']) if case['disputed_amount'] else 0,
-                        'creation_date': case['creation_date'].isoformat() if case['creation_date'] else None,
-                        'location': case['location'],
-                        'assigned_to': case['assigned_to'],
-                        'dept': case['dept']
-                    }
-                    
-                    # Process victim account (acc_num)
-                    if case['acc_num']:
-                        victim_account_id = f"account_{case['acc_num']}"
-                        if victim_account_id not in nodes:
-                            nodes[victim_account_id] = {
-                                'id': victim_account_id,
-                                'type': 'account',
-                                'label': case['acc_num'],
-                                'entity_type': 'victim_account',
-                                'cases': []
-                            }
-                        nodes[victim_account_id]['cases'].append(case_id)
-                        edges.append({
-                            'source': case_node_id,
-                            'target': victim_account_id,
-                            'type': 'victim_account',
-                            'strength': 1
-                        })
-                        
-                        if victim_account_id not in node_connections:
-                            node_connections[victim_account_id] = 0
-                        node_connections[victim_account_id] += 1
-                    
-                    # Process beneficiary account (source_bene_accno)
-                    if case['source_bene_accno']:
-                        beneficiary_account_id = f"account_{case['source_bene_accno']}"
-                        if beneficiary_account_id not in nodes:
-                            nodes[beneficiary_account_id] = {
-                                'id': beneficiary_account_id,
-                                'type': 'account',
-                                'label': case['source_bene_accno'],
-                                'entity_type': 'beneficiary_account',
-                                'cases': []
-                            }
-                        nodes[beneficiary_account_id]['cases'].append(case_id)
-                        edges.append({
-                            'source': case_node_id,
-                            'target': beneficiary_account_id,
-                            'type': 'beneficiary_account',
-                            'strength': 1
-                        })
-                        
-                        if beneficiary_account_id not in node_connections:
-                            node_connections[beneficiary_account_id] = 0
-                        node_connections[beneficiary_account_id] += 1
-                    
-                    # Process customer ID
-                    if case['cust_id']:
-                        customer_id = f"customer_{case['cust_id']}"
-                        if customer_id not in nodes:
-                            nodes[customer_id] = {
-                                'id': customer_id,
-                                'type': 'customer',
-                                'label': case['cust_id'],
-                                'entity_type': 'customer',
-                                'cases': []
-                            }
-                        nodes[customer_id]['cases'].append(case_id)
-                        edges.append({
-                            'source': case_node_id,
-                            'target': customer_id,
-                            'type': 'customer',
-                            'strength': 1
-                        })
-                        
-                        if customer_id not in node_connections:
-                            node_connections[customer_id] = 0
-                        node_connections[customer_id] += 1
-                    
-                    # Process source acknowledgment number
-                    if case['source_ack_no']:
-                        ack_id = f"ack_{case['source_ack_no']}"
-                        if ack_id not in nodes:
-                            nodes[ack_id] = {
-                                'id': ack_id,
-                                'type': 'ack_no',
-                                'label': case['source_ack_no'],
-                                'entity_type': 'source_ack',
-                                'cases': []
-                            }
-                        nodes[ack_id]['cases'].append(case_id)
-                        edges.append({
-                            'source': case_node_id,
-                            'target': ack_id,
-                            'type': 'source_ack',
-                            'strength': 1
-                        })
-                        
-                        if ack_id not in node_connections:
-                            node_connections[ack_id] = 0
-                        node_connections[ack_id] += 1
-                
-                # Add risk scores and connection counts to nodes
-                for node_id, node in nodes.items():
-                    connection_count = node_connections.get(node_id, 0)
-                    node['connections'] = connection_count
-                    
-                    # Assign risk level based on connections
-                    if connection_count >= 5:
-                        node['risk_level'] = 'high'
-                    elif connection_count >= 3:
-                        node['risk_level'] = 'medium'
-                    else:
-                        node['risk_level'] = 'low'
-                
-                # Get fraud pattern statistics
-                cur.execute("""
+                        acc_num as entity,
+                        'victim_account' as entity_type,
+                        COUNT(*) as case_count
+                    FROM case_main 
+                    WHERE acc_num IS NOT NULL 
+                    AND creation_date >= CURRENT_DATE - INTERVAL '30 days'
+                    GROUP BY acc_num
+
+                    UNION ALL
+
                     SELECT 
-                        case_type,
-                        COUNT(*) as count,
-                        AVG(disputed_amount) as avg_amount,
-                        COUNT(CASE WHEN status = 'Closed' THEN 1 END) as closed_count
-                    FROM case_main
-                    WHERE creation_date >= CURRENT_DATE - INTERVAL '30 days'
-                    GROUP BY case_type
-                    ORDER BY count DESC
-                """)
-                fraud_patterns = [dict(row) for row in cur.fetchall()]
-                
-                # Get repeated entity statistics
-                cur.execute("""
-                    WITH entity_counts AS (
-                        SELECT 
-                            acc_num as entity,
-                            'victim_account' as entity_type,
-                            COUNT(*) as case_count
-                        FROM case_main 
-                        WHERE acc_num IS NOT NULL 
-                        AND creation_date >= CURRENT_DATE - INTERVAL '30 days'
-                        GROUP BY acc_num
-                        
-                        UNION ALL
-                        
-                        SELECT 
-                            source_bene_accno as entity,
-                            'beneficiary_account' as entity_type,
-                            COUNT(*) as case_count
-                        FROM case_main 
-                        WHERE source_bene_accno IS NOT NULL 
-                        AND creation_date >= CURRENT_DATE - INTERVAL '30 days'
-                        GROUP BY source_bene_accno
-                        
-                        UNION ALL
-                        
-                        SELECT 
-                            cust_id as entity,
-                            'customer' as entity_type,
-                            COUNT(*) as case_count
-                        FROM case_main 
-                        WHERE cust_id IS NOT NULL 
-                        AND creation_date >= CURRENT_DATE - INTERVAL '30 days'
-                        GROUP BY cust_id
-                        
-                        UNION ALL
-                        
-                        SELECT 
-                            location as entity,
-                            'location' as entity_type,
-                            COUNT(*) as case_count
-                        FROM case_main 
-                        WHERE location IS NOT NULL 
-                        AND creation_date >= CURRENT_DATE - INTERVAL '30 days'
-                        GROUP BY location
-                    )
-                    SELECT entity, entity_type, case_count
-                    FROM entity_counts
-                    WHERE case_count > 1
-                    ORDER BY case_count DESC
-                    LIMIT 20
-                """)
-                repeated_entities = [dict(row) for row in cur.fetchall()]
-                
-                return {
-                    "success": True,
-                    "data": {
-                        "nodes": list(nodes.values()),
-                        "edges": edges,
-                        "fraud_patterns": fraud_patterns,
-                        "repeated_entities": repeated_entities,
-                        "stats": {
-                            "total_nodes": len(nodes),
-                            "total_edges": len(edges),
-                            "high_risk_nodes": len([n for n in nodes.values() if n.get('risk_level') == 'high']),
-                            "medium_risk_nodes": len([n for n in nodes.values() if n.get('risk_level') == 'medium'])
-                        },
-                        "generated_at": datetime.now().isoformat()
+                        source_bene_accno as entity,
+                        'beneficiary_account' as entity_type,
+                        COUNT(*) as case_count
+                    FROM case_main 
+                    WHERE source_bene_accno IS NOT NULL 
+                    AND creation_date >= CURRENT_DATE - INTERVAL '30 days'
+                    GROUP BY source_bene_accno
+
+                    UNION ALL
+
+                    SELECT 
+                        cust_id as entity,
+                        'customer' as entity_type,
+                        COUNT(*) as case_count
+                    FROM case_main 
+                    WHERE cust_id IS NOT NULL 
+                    AND creation_date >= CURRENT_DATE - INTERVAL '30 days'
+                    GROUP BY cust_id
+
+                    UNION ALL
+
+                    SELECT 
+                        location as entity,
+                        'location' as entity_type,
+                        COUNT(*) as case_count
+                    FROM case_main 
+                    WHERE location IS NOT NULL 
+                    AND creation_date >= CURRENT_DATE - INTERVAL '30 days'
+                    GROUP BY location
+                )
+                SELECT entity, entity_type, case_count
+                FROM entity_counts
+                WHERE case_count > 1
+                ORDER BY case_count DESC
+                LIMIT 20
+            """),
+        )
+        cases = results["cases"]
+
+        # Build nodes and edges for network visualization
+        nodes = {}
+        edges = []
+        node_connections = {}
+        
+        # Process each case to extract entities and relationships
+        for case in cases:
+            case_id = case['case_id']
+            case_node_id = f"case_{case_id}"
+            
+            # Add case node
+            nodes[case_node_id] = {
+                'id': case_node_id,
+                'type': 'case',
+                'label': f"Case {case_id}",
+                'case_type': case['case_type'],
+                'status': case['status'],
+                'amount': float(case['disputed_amount']) if case['disputed_amount'] else 0,
+                'creation_date': case['creation_date'].isoformat() if case['creation_date'] else None,
+                'location': case['location'],
+                'assigned_to': case['assigned_to'],
+                'dept': case['dept']
+            }
+            
+            # Process victim account (acc_num)
+            if case['acc_num']:
+                victim_account_id = f"account_{case['acc_num']}"
+                if victim_account_id not in nodes:
+                    nodes[victim_account_id] = {
+                        'id': victim_account_id,
+                        'type': 'account',
+                        'label': case['acc_num'],
+                        'entity_type': 'victim_account',
+                        'cases': []
                     }
-                }
-                
+                nodes[victim_account_id]['cases'].append(case_id)
+                edges.append({
+                    'source': case_node_id,
+                    'target': victim_account_id,
+                    'type': 'victim_account',
+                    'strength': 1
+                })
+                
+                if victim_account_id not in node_connections:
+                    node_connections[victim_account_id] = 0
+                node_connections[victim_account_id] += 1
+            
+            # Process beneficiary account (source_bene_accno)
+            if case['source_bene_accno']:
+                beneficiary_account_id = f"account_{case['source_bene_accno']}"
+                if beneficiary_account_id not in nodes:
+                    nodes[beneficiary_account_id] = {
+                        'id': beneficiary_account_id,
+                        'type': 'account',
+                        'label': case['source_bene_accno'],
+                        'entity_type': 'beneficiary_account',
+                        'cases': []
+                    }
+                nodes[beneficiary_account_id]['cases'].append(case_id)
+                edges.append({
+                    'source': case_node_id,
+                    'target': beneficiary_account_id,
+                    'type': 'beneficiary_account',
+                    'strength': 1
+                })
+                
+                if beneficiary_account_id not in node_connections:
+                    node_connections[beneficiary_account_id] = 0
+                node_connections[beneficiary_account_id] += 1
+            
+            # Process customer ID
+            if case['cust_id']:
+                customer_id = f"customer_{case['cust_id']}"
+                if customer_id not in nodes:
+                    nodes[customer_id] = {
+                        'id': customer_id,
+                        'type': 'customer',
+                        'label': case['cust_id'],
+                        'entity_type': 'customer',
+                        'cases': []
+                    }
+                nodes[customer_id]['cases'].append(case_id)
+                edges.append({
+                    'source': case_node_id,
+                    'target': customer_id,
+                    'type': 'customer',
+                    'strength': 1
+                })
+                
+                if customer_id not in node_connections:
+                    node_connections[customer_id] = 0
+                node_connections[customer_id] += 1
+            
+            # Process source acknowledgment number
+            if case['source_ack_no']:
+                ack_id = f"ack_{case['source_ack_no']}"
+                if ack_id not in nodes:
+                    nodes[ack_id] = {
+                        'id': ack_id,
+                        'type': 'ack_no',
+                        'label': case['source_ack_no'],
+                        'entity_type': 'source_ack',
+                        'cases': []
+                    }
+                nodes[ack_id]['cases'].append(case_id)
+                edges.append({
+                    'source': case_node_id,
+                    'target': ack_id,
+                    'type': 'source_ack',
+                    'strength': 1
+                })
+                
+                if ack_id not in node_connections:
+                    node_connections[ack_id] = 0
+                node_connections[ack_id] += 1
+        
+        # Add risk scores and connection counts to nodes
+        for node_id, node in nodes.items():
+            connection_count = node_connections.get(node_id, 0)
+            node['connections'] = connection_count
+            
+            # Assign risk level based on connections
+            if connection_count >= 5:
+                node['risk_level'] = 'high'
+            elif connection_count >= 3:
+                node['risk_level'] = 'medium'
+            else:
+                node['risk_level'] = 'low'
+
+        return {
+            "success": True,
+            "data": {
+                "nodes": list(nodes.values()),
+                "edges": edges,
+                "fraud_patterns": results["fraud_patterns"],
+                "repeated_entities": results["repeated_entities"],
+                "stats": {
+                    "total_nodes": len(nodes),
+                    "total_edges": len(edges),
+                    "high_risk_nodes": len([n for n in nodes.values() if n.get('risk_level') == 'high']),
+                    "medium_risk_nodes": len([n for n in nodes.values() if n.get('risk_level') == 'medium'])
+                },
+                "generated_at": datetime.now().isoformat()
+            }
+        }
+
     except Exception as e:
         print(f"ERROR: Failed to fetch network data: {e}", flush=True)
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=f"Failed to fetch network data: {str(e)}")
 
+@router.get("/api/dashboard/network-data/neighbourhood")
+async def get_network_neighbourhood(
+    current_username: Annotated[str, Depends(get_current_username)],
+    executor: Annotated[ThreadPoolExecutor, Depends(get_executor_dependency)],
+    node_type: str = Query(..., description="account, customer, mobile or case"),
+    node_id: str = Query(..., description="Account number, customer ID, mobile number or case ID"),
+    hops: int = Query(2, ge=1, le=ENTITY_GRAPH_MAX_HOPS, description="How many links to follow out from the node"),
+    max_degree: int = Query(25, ge=1, le=500, description="Links followed per node, heaviest first"),
+    max_nodes: int = Query(500, ge=1, le=ENTITY_GRAPH_MAX_NODES, description="Stop adding nodes after this many")
+) -> Dict[str, Any]:
+    """Expand the entity graph around one node (k-hop neighbourhood from the graph index)"""
+    if node_type not in GRAPH_NODE_TYPES:
+        raise HTTPException(status_code=400, detail=f"node_type must be one of: {', '.join(GRAPH_NODE_TYPES)}")
+    if not graph_ready():
+        raise HTTPException(status_code=503, detail="The entity graph index is not available yet (being built or catching up); try again shortly")
+    try:
+        data = await _run_query(
+            executor, lambda cur: neighbourhood(cur, node_type, node_id.strip(), hops, max_degree, max_nodes)
+        )
+        data["generated_at"] = datetime.now().isoformat()
+        return {"success": True, "data": data}
+    except Exception as e:
+        print(f"ERROR: Failed to expand network neighbourhood: {e}", flush=True)
+        traceback.print_exc()
+        raise HTTPException(status_code=500, detail=f"Failed to expand network neighbourhood: {str(e)}")
+
 @router.get("/api/dashboard/fraud-patterns")
 async def get_fraud_patterns(
     current_username: Annotated[str, Depends(get_current_username)],
@@ -1601,14 +1824,19 @@ async def get_fraud_patterns(
     """Get real fraud patterns from database analytics"""
     try:
         # Convert time range to days
-        days_map = {"24h": 1, "7d": 7, "30d": 30}
-        days = days_map.get(time_range, 1)
-        
-        with psycopg2.connect(**DB_CONNECTION_PARAMS) as conn:
-            with conn.cursor(cursor_factory=RealDictCursor) as cur:
-                
+        days = ALERT_WINDOW_DAYS.get(time_range, 1)
+
+        if alerts_ready():
+            # Fan-out, fan-in and shared-mobile alerts are precomputed per window
+            alert_queries = dict(
+                suspicious_accounts=_rows(*alert_query("account", days)),
+                suspicious_beneficiaries=_rows(*alert_query("beneficiary", days)),
+                mobile_patterns=_rows(*alert_query("mobile", days)),
+            )
+        else:
+            alert_queries = dict(
                 # Critical Alert 1: Account numbers appearing in multiple transactions with different beneficiaries
-                cur.execute("""
+                suspicious_accounts=_rows("""
                     WITH suspicious_accounts AS (
                         SELECT 
                             t.acct_num,
@@ -1628,11 +1856,9 @@ async def get_fraud_patterns(
                         LIMIT 5
                     )
                     SELECT * FROM suspicious_accounts
-                """, (days,))
-                suspicious_accounts = [dict(row) for row in cur.fetchall()]
-                
+                """, (days,)),
                 # Critical Alert 2: Beneficiary accounts receiving from multiple different source accounts
-                cur.execute("""
+                suspicious_beneficiaries=_rows("""
                     WITH suspicious_beneficiaries AS (
                         SELECT 
                             t.bene_acct_num,
@@ -1652,11 +1878,9 @@ async def get_fraud_patterns(
                         LIMIT 5
                     )
                     SELECT * FROM suspicious_beneficiaries
-                """, (days,))
-                suspicious_beneficiaries = [dict(row) for row in cur.fetchall()]
-                
+                """, (days,)),
                 # Critical Alert 3: Mobile numbers associated with high-value rapid transactions
-                cur.execute("""
+                mobile_patterns=_rows("""
                     WITH mobile_velocity AS (
                         SELECT 
                             c.mobile,
@@ -1680,187 +1904,193 @@ async def get_fraud_patterns(
                     )
                     SELECT * FROM mobile_velocity
                 """, (days,))
-                mobile_patterns = [dict(row) for row in cur.fetchall()]
-                
-                # Geographic clustering - locations with unusual transaction patterns
-                cur.execute("""
-                    WITH location_analysis AS (
-                        SELECT 
-                            c.country,
-                            COUNT(*) as transaction_count,
-                            COUNT(DISTINCT t.acct_num) as unique_accounts,
-                            COUNT(DISTINCT t.bene_acct_num) as unique_beneficiaries,
-                            SUM(t.amount) as total_amount,
-                            AVG(t.amount) as avg_amount
-                        FROM txn t
-                        JOIN account_customer ac ON t.acct_num = ac.acc_num
-                        JOIN customer c ON ac.cust_id = c.cust_id
-                        WHERE t.txn_date >= CURRENT_DATE - INTERVAL '%s days'
-                        AND t.txn_type = 'Debit'
-                        AND c.country IS NOT NULL
-                        GROUP BY c.country
-                        HAVING COUNT(*) >= 50
-                        ORDER BY transaction_count DESC
-                        LIMIT 10
-                    )
-                    SELECT * FROM location_analysis
-                """, (days,))
-                geographic_patterns = [dict(row) for row in cur.fetchall()]
-                
-                # Real-time stats
-                cur.execute("""
+            )
+
+        # The alert queries are independent: run them concurrently
+        results = await _run_queries(
+            executor,
+            **alert_queries,
+            # Geographic clustering - locations with unusual transaction patterns
+            geographic_patterns=_rows("""
+                WITH location_analysis AS (
                     SELECT 
-                        COUNT(DISTINCT t.acct_num) as active_accounts,
+                        c.country,
+                        COUNT(*) as transaction_count,
+                        COUNT(DISTINCT t.acct_num) as unique_accounts,
                         COUNT(DISTINCT t.bene_acct_num) as unique_beneficiaries,
-                        COUNT(*) as total_transactions,
                         SUM(t.amount) as total_amount,
-                        COUNT(CASE WHEN t.amount > 100000 THEN 1 END) as high_value_txns
+                        AVG(t.amount) as avg_amount
                     FROM txn t
+                    JOIN account_customer ac ON t.acct_num = ac.acc_num
+                    JOIN customer c ON ac.cust_id = c.cust_id
                     WHERE t.txn_date >= CURRENT_DATE - INTERVAL '%s days'
                     AND t.txn_type = 'Debit'
-                """, (days,))
-                real_time_stats = dict(cur.fetchone())
-                
-                # Repeated case patterns from actual case data
-                cur.execute("""
-                    WITH pattern_analysis AS (
-                        SELECT 
-                            cm.acc_num as entity_value,
-                            'victim_account' as entity_type,
-                            'Account Reuse' as pattern_type,
-                            COUNT(*) as case_count,
-                            SUM(cm.disputed_amount) as total_amount,
-                            MIN(cm.creation_date) as first_seen,
-                            MAX(cm.creation_date) as last_seen,
-                            array_agg(DISTINCT cm.location) as locations,
-                            array_agg(DISTINCT cm.case_id) as case_ids
-                        FROM case_main cm
-                        WHERE cm.creation_date >= CURRENT_DATE - INTERVAL '%s days'
-                        AND cm.acc_num IS NOT NULL
-                        GROUP BY cm.acc_num
-                        HAVING COUNT(*) > 1
-                        
-                        UNION ALL
-                        
-                        SELECT 
-                            cm.source_bene_accno as entity_value,
-                            'beneficiary_account' as entity_type,
-                            'Beneficiary Clustering' as pattern_type,
-                            COUNT(*) as case_count,
-                            SUM(cm.disputed_amount) as total_amount,
-                            MIN(cm.creation_date) as first_seen,
-                            MAX(cm.creation_date) as last_seen,
-                            array_agg(DISTINCT cm.location) as locations,
-                            array_agg(DISTINCT cm.case_id) as case_ids
-                        FROM case_main cm
-                        WHERE cm.creation_date >= CURRENT_DATE - INTERVAL '%s days'
-                        AND cm.source_bene_accno IS NOT NULL
-                        GROUP BY cm.source_bene_accno
-                        HAVING COUNT(*) > 1
-                    )
-                    SELECT * FROM pattern_analysis
-                    ORDER BY case_count DESC, total_amount DESC
+                    AND c.country IS NOT NULL
+                    GROUP BY c.country
+                    HAVING COUNT(*) >= 50
+                    ORDER BY transaction_count DESC
                     LIMIT 10
-                """, (days, days))
-                repeated_cases = [dict(row) for row in cur.fetchall()]
-                
-                # Build critical alerts from the analysis
-                critical_alerts = []
-                
-                # Process suspicious accounts
-                for acc in suspicious_accounts:
-                    critical_alerts.append({
-                        'id': f"acc_{acc['acct_num']}",
-                        'title': f"Suspicious Account Activity",
-                        'description': f"Account {acc['acct_num']} sent money to {acc['unique_beneficiaries']} different beneficiaries",
-                        'case_count': acc['total_transactions'],
-                        'total_amount': float(acc['total_amount']) if acc['total_amount'] else 0,
-                        'first_seen': acc['first_seen'],
-                        'risk_score': min(95, 70 + acc['unique_beneficiaries'] * 3),
-                        'entity_type': 'account',
-                        'entity_value': acc['acct_num']
-                    })
-                
-                # Process suspicious beneficiaries
-                for bene in suspicious_beneficiaries:
-                    critical_alerts.append({
-                        'id': f"bene_{bene['bene_acct_num']}",
-                        'title': f"Beneficiary Account Clustering",
-                        'description': f"Beneficiary {bene['bene_name']} received money from {bene['unique_sources']} different accounts",
-                        'case_count': bene['total_transactions'],
-                        'total_amount': float(bene['total_amount']) if bene['total_amount'] else 0,
-                        'first_seen': bene['first_seen'],
-                        'risk_score': min(98, 75 + bene['unique_sources'] * 2),
-                        'entity_type': 'beneficiary_account',
-                        'entity_value': bene['bene_acct_num']
-                    })
-                
-                # Process mobile patterns
-                for mobile in mobile_patterns:
-                    critical_alerts.append({
-                        'id': f"mobile_{mobile['mobile']}",
-                        'title': f"High-Velocity Mobile Pattern",
-                        'description': f"Mobile {mobile['mobile']} associated with {mobile['transaction_count']} high-value transactions",
-                        'case_count': mobile['transaction_count'],
-                        'total_amount': float(mobile['total_amount']) if mobile['total_amount'] else 0,
-                        'first_seen': mobile['first_seen'],
-                        'risk_score': min(92, 60 + mobile['transaction_count'] * 2),
-                        'entity_type': 'mobile',
-                        'entity_value': mobile['mobile']
-                    })
-                
-                # Sort alerts by risk score
-                critical_alerts.sort(key=lambda x: x['risk_score'], reverse=True)
-                
-                return {
-                    "success": True,
-                    "data": {
-                        "critical_alerts": critical_alerts[:5],  # Top 5 alerts
-                        "stats": {
-                            "suspicious_entities": len(suspicious_accounts) + len(suspicious_beneficiaries),
-                            "new_suspicious": len([a for a in critical_alerts if a['risk_score'] > 90]),
-                            "repeated_patterns": len(repeated_cases),
-                            "pattern_growth": 15,  # Could calculate actual growth
-                            "fraud_networks": len(suspicious_beneficiaries),
-                            "network_size": sum(b['unique_sources'] for b in suspicious_beneficiaries) // max(len(suspicious_beneficiaries), 1),
-                            "high_velocity": real_time_stats['high_value_txns'],
-                            "velocity_increase": 25
-                        },
-                        "repeated_cases": [
-                            {
-                                'pattern_id': f"p_{i}",
-                                'pattern_type': case['pattern_type'],
-                                'entity_type': case['entity_type'],
-                                'entity_value': case['entity_value'],
-                                'case_count': case['case_count'],
-                                'time_span': f"{(case['last_seen'] - case['first_seen']).days} days" if case['last_seen'] and case['first_seen'] else "N/A",
-                                'total_amount': float(case['total_amount']) if case['total_amount'] else 0,
-                                'risk_level': 'high' if case['case_count'] >= 5 else 'medium' if case['case_count'] >= 3 else 'low',
-                                'locations': [loc for loc in case['locations'] if loc] if case['locations'] else [],
-                                'case_ids': case['case_ids']
-                            }
-                            for i, case in enumerate(repeated_cases)
-                        ],
-                        "velocity_data": {
-                            "peak_hour": "14:00-15:00",
-                            "avg_per_hour": real_time_stats['total_transactions'] // (24 * days),
-                            "trend": "Increasing" if real_time_stats['high_value_txns'] > 10 else "Stable",
-                            "hourly_data": []  # Could add hourly breakdown
-                        },
-                        "geographic_patterns": [
-                            {
-                                'location': geo['country'],
-                                'case_count': geo['transaction_count'],
-                                'total_amount': float(geo['total_amount']) if geo['total_amount'] else 0,
-                                'risk_level': 'high' if geo['transaction_count'] > 100 else 'medium' if geo['transaction_count'] > 50 else 'low',
-                                'trend': 'Increasing'  # Could calculate actual trend
-                            }
-                            for geo in geographic_patterns
-                        ],
-                        "generated_at": datetime.now().isoformat()
+                )
+                SELECT * FROM location_analysis
+            """, (days,)),
+            # Real-time stats
+            real_time_stats=_row("""
+                SELECT 
+                    COUNT(DISTINCT t.acct_num) as active_accounts,
+                    COUNT(DISTINCT t.bene_acct_num) as unique_beneficiaries,
+                    COUNT(*) as total_transactions,
+                    SUM(t.amount) as total_amount,
+                    COUNT(CASE WHEN t.amount > 100000 THEN 1 END) as high_value_txns
+                FROM txn t
+                WHERE t.txn_date >= CURRENT_DATE - INTERVAL '%s days'
+                AND t.txn_type = 'Debit'
+            """, (days,)),
+            # Repeated case patterns from actual case data
+            repeated_cases=_rows("""
+                WITH pattern_analysis AS (
+                    SELECT 
+                        cm.acc_num as entity_value,
+                        'victim_account' as entity_type,
+                        'Account Reuse' as pattern_type,
+                        COUNT(*) as case_count,
+                        SUM(cm.disputed_amount) as total_amount,
+                        MIN(cm.creation_date) as first_seen,
+                        MAX(cm.creation_date) as last_seen,
+                        array_agg(DISTINCT cm.location) as locations,
+                        array_agg(DISTINCT cm.case_id) as case_ids
+                    FROM case_main cm
+                    WHERE cm.creation_date >= CURRENT_DATE - INTERVAL '%s days'
+                    AND cm.acc_num IS NOT NULL
+                    GROUP BY cm.acc_num
+                    HAVING COUNT(*) > 1
+
+                    UNION ALL
+
+                    SELECT 
+                        cm.source_bene_accno as entity_value,
+                        'beneficiary_account' as entity_type,
+                        'Beneficiary Clustering' as pattern_type,
+                        COUNT(*) as case_count,
+                        SUM(cm.disputed_amount) as total_amount,
+                        MIN(cm.creation_date) as first_seen,
+                        MAX(cm.creation_date) as last_seen,
+                        array_agg(DISTINCT cm.location) as locations,
+                        array_agg(DISTINCT cm.case_id) as case_ids
+                    FROM case_main cm
+                    WHERE cm.creation_date >= CURRENT_DATE - INTERVAL '%s days'
+                    AND cm.source_bene_accno IS NOT NULL
+                    GROUP BY cm.source_bene_accno
+                    HAVING COUNT(*) > 1
+                )
+                SELECT * FROM pattern_analysis
+                ORDER BY case_count DESC, total_amount DESC
+                LIMIT 10
+            """, (days, days)),
+        )
+        suspicious_accounts = results["suspicious_accounts"]
+        suspicious_beneficiaries = results["suspicious_beneficiaries"]
+        mobile_patterns = results["mobile_patterns"]
+        geographic_patterns = results["geographic_patterns"]
+        real_time_stats = results["real_time_stats"]
+        repeated_cases = results["repeated_cases"]
+
+        # Build critical alerts from the analysis
+        critical_alerts = []
+        
+        # Process suspicious accounts
+        for acc in suspicious_accounts:
+            critical_alerts.append({
+                'id': f"acc_{acc['acct_num']}",
+                'title': f"Suspicious Account Activity",
+                'description': f"Account {acc['acct_num']} sent money to {acc['unique_beneficiaries']} different beneficiaries",
+                'case_count': acc['total_transactions'],
+                'total_amount': float(acc['total_amount']) if acc['total_amount'] else 0,
+                'first_seen': acc['first_seen'],
+                'risk_score': min(95, 70 + acc['unique_beneficiaries'] * 3),
+                'entity_type': 'account',
+                'entity_value': acc['acct_num']
+            })
+        
+        # Process suspicious beneficiaries
+        for bene in suspicious_beneficiaries:
+            critical_alerts.append({
+                'id': f"bene_{bene['bene_acct_num']}",
+                'title': f"Beneficiary Account Clustering",
+                'description': f"Beneficiary {bene['bene_name']} received money from {bene['unique_sources']} different accounts",
+                'case_count': bene['total_transactions'],
+                'total_amount': float(bene['total_amount']) if bene['total_amount'] else 0,
+                'first_seen': bene['first_seen'],
+                'risk_score': min(98, 75 + bene['unique_sources'] * 2),
+                'entity_type': 'beneficiary_account',
+                'entity_value': bene['bene_acct_num']
+            })
+        
+        # Process mobile patterns
+        for mobile in mobile_patterns:
+            critical_alerts.append({
+                'id': f"mobile_{mobile['mobile']}",
+                'title': f"High-Velocity Mobile Pattern",
+                'description': f"Mobile {mobile['mobile']} associated with {mobile['transaction_count']} high-value transactions",
+                'case_count': mobile['transaction_count'],
+                'total_amount': float(mobile['total_amount']) if mobile['total_amount'] else 0,
+                'first_seen': mobile['first_seen'],
+                'risk_score': min(92, 60 + mobile['transaction_count'] * 2),
+                'entity_type': 'mobile',
+                'entity_value': mobile['mobile']
+            })
+        
+        # Sort alerts by risk score
+        critical_alerts.sort(key=lambda x: x['risk_score'], reverse=True)
+        
+        return {
+            "success": True,
+            "data": {
+                "critical_alerts": critical_alerts[:5],  # Top 5 alerts
+                "stats": {
+                    "suspicious_entities": len(suspicious_accounts) + len(suspicious_beneficiaries),
+                    "new_suspicious": len([a for a in critical_alerts if a['risk_score'] > 90]),
+                    "repeated_patterns": len(repeated_cases),
+                    "pattern_growth": 15,  # Could calculate actual growth
+                    "fraud_networks": len(suspicious_beneficiaries),
+                    "network_size": sum(b['unique_sources'] for b in suspicious_beneficiaries) // max(len(suspicious_beneficiaries), 1),
+                    "high_velocity": real_time_stats['high_value_txns'],
+                    "velocity_increase": 25
+                },
+                "repeated_cases": [
+                    {
+                        'pattern_id': f"p_{i}",
+                        'pattern_type': case['pattern_type'],
+                        'entity_type': case['entity_type'],
+                        'entity_value': case['entity_value'],
+                        'case_count': case['case_count'],
+                        'time_span': f"{(case['last_seen'] - case['first_seen']).days} days" if case['last_seen'] and case['first_seen'] else "N/A",
+                        'total_amount': float(case['total_amount']) if case['total_amount'] else 0,
+                        'risk_level': 'high' if case['case_count'] >= 5 else 'medium' if case['case_count'] >= 3 else 'low',
+                        'locations': [loc for loc in case['locations'] if loc] if case['locations'] else [],
+                        'case_ids': case['case_ids']
                     }
-                }
-                
+                    for i, case in enumerate(repeated_cases)
+                ],
+                "velocity_data": {
+                    "peak_hour": "14:00-15:00",
+                    "avg_per_hour": real_time_stats['total_transactions'] // (24 * days),
+                    "trend": "Increasing" if real_time_stats['high_value_txns'] > 10 else "Stable",
+                    "hourly_data": []  # Could add hourly breakdown
+                },
+                "geographic_patterns": [
+                    {
+                        'location': geo['country'],
+                        'case_count': geo['transaction_count'],
+                        'total_amount': float(geo['total_amount']) if geo['total_amount'] else 0,
+                        'risk_level': 'high' if geo['transaction_count'] > 100 else 'medium' if geo['transaction_count'] > 50 else 'low',
+                        'trend': 'Increasing'  # Could calculate actual trend
+                    }
+                    for geo in geographic_patterns
+                ],
+                "generated_at": datetime.now().isoformat()
+            }
+        }
+
     except Exception as e:
         print(f"ERROR: Failed to fetch fraud patterns: {e}", flush=True)
         traceback.print_exc()
@@ -1869,7 +2099,8 @@ async def get_fraud_patterns(
 @router.get("/api/super-user/all-case-logs")
 async def get_all_case_logs_for_super_user(
     current_username: Annotated[str, Depends(get_current_username)],
-    matcher: Annotated[CaseEntryMatcher, Depends(get_case_matcher_instance)]
+    matcher: Annotated[CaseEntryMatcher, Depends(get_case_matcher_instance)],
+    executor: Annotated[ThreadPoolExecutor, Depends(get_executor_dependency)]
 ) -> Dict[str, Any]:
     """
     Get logs for all cases in the system. Only accessible by super_user.
@@ -1884,47 +2115,49 @@ async def get_all_case_logs_for_super_user(
                 detail="Only super_user can access all case logs."
             )
         
-        with psycopg2.connect(**DB_CONNECTION_PARAMS) as conn:
-            with conn.cursor(cursor_factory=RealDictCursor) as cur:
-                # Get all case logs with case information
-                cur.execute(
-                    """
-                    SELECT 
-                        cl.id,
-                        cl.case_id,
-                        cl.user_name,
-                        cl.action,
-                        cl.details,
-                        cl.created_at,
-                        cm.source_ack_no,
-                        cm.case_type,
-                        cm.status
-                    FROM case_logs cl
-                    LEFT JOIN case_main cm ON cl.case_id = cm.case_id
-                    ORDER BY cl.created_at DESC
-                    LIMIT 1000
-                    """
-                )
-                
-                logs = []
-                for row in cur.fetchall():
-                    logs.append({
-                        "id": row["id"],
-                        "case_id": row["case_id"],
-                        "user_name": row["user_name"],
-                        "action": row["action"],
-                        "details": row["details"],
-                        "created_at": row["created_at"].isoformat() if row["created_at"] else None,
-                        "source_ack_no": row["source_ack_no"],
-                        "case_type": row["case_type"],
-                        "status": row["status"]
-                    })
-                
-                return {
-                    "success": True,
-                    "logs": logs,
-                    "total_count": len(logs)
-                }
+        def _sync_all_case_logs():
+            with get_db_connection(caller="dashboard") as conn:
+                with conn.cursor(cursor_factory=RealDictCursor) as cur:
+                    # Get all case logs with case information
+                    cur.execute(
+                        """
+                        SELECT 
+                            cl.id,
+                            cl.case_id,
+                            cl.user_name,
+                            cl.action,
+                            cl.details,
+                            cl.created_at,
+                            cm.source_ack_no,
+                            cm.case_type,
+                            cm.status
+                        FROM case_logs cl
+                        LEFT JOIN case_main cm ON cl.case_id = cm.case_id
+                        ORDER BY cl.created_at DESC
+                        LIMIT 1000
+                        """
+                    )
+
+                    logs = []
+                    for row in cur.fetchall():
+                        logs.append({
+                            "id": row["id"],
+                            "case_id": row["case_id"],
+                            "user_name": row["user_name"],
+                            "action": row["action"],
+                            "details": row["details"],
+                            "created_at": row["created_at"].isoformat() if row["created_at"] else None,
+                            "source_ack_no": row["source_ack_no"],
+                            "case_type": row["case_type"],
+                            "status": row["status"]
+                        })
+
+                    return {
+                        "success": True,
+                        "logs": logs,
+                        "total_count": len(logs)
+                    }
+        return await asyncio.get_running_loop().run_in_executor(executor, _sync_all_case_logs)
                 
     except HTTPException:
         raise
@@ -1936,92 +2169,95 @@ async def get_all_case_logs_for_super_user(
 
 @router.get("/api/super-user/delayed-cases")
 async def get_risk_officer_delayed_cases(
-    current_username: Annotated[str, Depends(get_current_username)]
+    current_username: Annotated[str, Depends(get_current_username)],
+    executor: Annotated[ThreadPoolExecutor, Depends(get_executor_dependency)]
 ) -> Dict[str, Any]:
     """Return cases assigned to risk officers that haven't been acted upon for X days. Only accessible by super_user."""
     try:
-        with psycopg2.connect(**DB_CONNECTION_PARAMS) as conn:
-            with conn.cursor(cursor_factory=RealDictCursor) as cur:
-                # Check if user is super_user
-                cur.execute("SELECT user_type FROM user_table WHERE user_name = %s", (current_username,))
-                user_row = cur.fetchone()
-                if not user_row or user_row.get('user_type') != 'super_user':
-                    raise HTTPException(status_code=403, detail="Only super users can access risk officer delayed cases.")
-                
-                # Get delayed cases assigned to risk officers (no action for X days)
-                # Use subquery to get the most recent active assignment to avoid duplicates
-                cur.execute(
-                    """
-                    SELECT 
-                        cm.case_id,
-                        cm.source_ack_no,
-                        cm.case_type,
-                        cm.status,
-                        cm.creation_date,
-                        latest_assignment.assigned_to as current_assigned_to,
-                        latest_assignment.assigned_by as assigned_by,
-                        latest_assignment.assign_date,
-                        latest_assignment.assign_time,
-                        EXTRACT(EPOCH FROM (CURRENT_TIMESTAMP - COALESCE(latest_assignment.assign_date, cm.creation_date))) / 86400 AS days_old,
-                        cl.last_action_date
-                    FROM case_main cm
-                    LEFT JOIN (
-                        SELECT DISTINCT ON (case_id)
-                            case_id,
-                            assigned_to,
-                            assigned_by,
-                            assign_date,
-                            assign_time
-                        FROM assignment 
-                        WHERE is_active = TRUE
-                        ORDER BY case_id, assign_date DESC
-                    ) latest_assignment ON cm.case_id = latest_assignment.case_id
-                    LEFT JOIN (
+        def _sync_risk_officer_delayed_cases():
+            with get_db_connection(caller="dashboard") as conn:
+                with conn.cursor(cursor_factory=RealDictCursor) as cur:
+                    # Check if user is super_user
+                    cur.execute("SELECT user_type FROM user_table WHERE user_name = %s", (current_username,))
+                    user_row = cur.fetchone()
+                    if not user_row or user_row.get('user_type') != 'super_user':
+                        raise HTTPException(status_code=403, detail="Only super users can access risk officer delayed cases.")
+
+                    # Get delayed cases assigned to risk officers (no action for X days)
+                    # Use subquery to get the most recent active assignment to avoid duplicates
+                    cur.execute(
+                        """
                         SELECT 
-                            case_id,
-                            MAX(created_at) as last_action_date
-                        FROM case_logs 
-                        GROUP BY case_id
-                    ) cl ON cm.case_id = cl.case_id
-                    WHERE latest_assignment.assigned_to IN (
-                        SELECT user_name FROM user_table WHERE user_type = 'risk_officer'
-                    )
-                    AND LOWER(cm.status) != 'closed'
-                    AND EXTRACT(EPOCH FROM (CURRENT_TIMESTAMP - COALESCE(latest_assignment.assign_date, cm.creation_date))) / 86400 >= %s
-                    AND (
-                        cl.last_action_date IS NULL 
-                        OR cl.last_action_date < CURRENT_TIMESTAMP - INTERVAL '%s days'
+                            cm.case_id,
+                            cm.source_ack_no,
+                            cm.case_type,
+                            cm.status,
+                            cm.creation_date,
+                            latest_assignment.assigned_to as current_assigned_to,
+                            latest_assignment.assigned_by as assigned_by,
+                            latest_assignment.assign_date,
+                            latest_assignment.assign_time,
+                            EXTRACT(EPOCH FROM (CURRENT_TIMESTAMP - COALESCE(latest_assignment.assign_date, cm.creation_date))) / 86400 AS days_old,
+                            cl.last_action_date
+                        FROM case_main cm
+                        LEFT JOIN (
+                            SELECT DISTINCT ON (case_id)
+                                case_id,
+                                assigned_to,
+                                assigned_by,
+                                assign_date,
+                                assign_time
+                            FROM assignment 
+                            WHERE is_active = TRUE
+                            ORDER BY case_id, assign_date DESC
+                        ) latest_assignment ON cm.case_id = latest_assignment.case_id
+                        LEFT JOIN (
+                            SELECT 
+                                case_id,
+                                MAX(created_at) as last_action_date
+                            FROM case_logs 
+                            GROUP BY case_id
+                        ) cl ON cm.case_id = cl.case_id
+                        WHERE latest_assignment.assigned_to IN (
+                            SELECT user_name FROM user_table WHERE user_type = 'risk_officer'
+                        )
+                        AND LOWER(cm.status) != 'closed'
+                        AND EXTRACT(EPOCH FROM (CURRENT_TIMESTAMP - COALESCE(latest_assignment.assign_date, cm.creation_date))) / 86400 >= %s
+                        AND (
+                            cl.last_action_date IS NULL 
+                            OR cl.last_action_date < CURRENT_TIMESTAMP - INTERVAL '%s days'
+                        )
+                        ORDER BY COALESCE(latest_assignment.assign_date, cm.creation_date) ASC
+                        """,
+                        (RISK_OFFICER_DELAY_THRESHOLD_DAYS, RISK_OFFICER_DELAY_THRESHOLD_DAYS)
                     )
-                    ORDER BY COALESCE(latest_assignment.assign_date, cm.creation_date) ASC
-                    """,
-                    (RISK_OFFICER_DELAY_THRESHOLD_DAYS, RISK_OFFICER_DELAY_THRESHOLD_DAYS)
-                )
-                
-                delayed_cases = cur.fetchall() or []
-                
-                # Convert to list of dictionaries and format the data
-                result = []
-                for case in delayed_cases:
-                    result.append({
-                        "case_id": case['case_id'],
-                        "source_ack_no": case['source_ack_no'],
-                        "case_type": case['case_type'],
-                        "status": case['status'],
-                        "creation_date": case['creation_date'].isoformat() if case['creation_date'] else None,
-                        "days_old": round(float(case['days_old'])),
-                        "current_assigned_to": case['current_assigned_to'],
-                        "assigned_by": case['assigned_by'],
-                        "assign_date": case['assign_date'].isoformat() if case['assign_date'] else None,
-                        "assign_time": case['assign_time'].isoformat() if case['assign_time'] else None,
-                        "last_action_date": case['last_action_date'].isoformat() if case['last_action_date'] else None
-                    })
-                
-                return {
-                    "delayed_cases": result,
-                    "threshold_days": RISK_OFFICER_DELAY_THRESHOLD_DAYS,
-                    "total_count": len(result),
-                    "case_type": "risk_officer"
-                }
+
+                    delayed_cases = cur.fetchall() or []
+
+                    # Convert to list of dictionaries and format the data
+                    result = []
+                    for case in delayed_cases:
+                        result.append({
+                            "case_id": case['case_id'],
+                            "source_ack_no": case['source_ack_no'],
+                            "case_type": case['case_type'],
+                            "status": case['status'],
+                            "creation_date": case['creation_date'].isoformat() if case['creation_date'] else None,
+                            "days_old": round(float(case['days_old'])),
+                            "current_assigned_to": case['current_assigned_to'],
+                            "assigned_by": case['assigned_by'],
+                            "assign_date": case['assign_date'].isoformat() if case['assign_date'] else None,
+                            "assign_time": case['assign_time'].isoformat() if case['assign_time'] else None,
+                            "last_action_date": case['last_action_date'].isoformat() if case['last_action_date'] else None
+                        })
+
+                    return {
+                        "delayed_cases": result,
+                        "threshold_days": RISK_OFFICER_DELAY_THRESHOLD_DAYS,
+                        "total_count": len(result),
+                        "case_type": "risk_officer"
+                    }
+        return await asyncio.get_running_loop().run_in_executor(executor, _sync_risk_officer_delayed_cases)
                 
     except HTTPException:
         raise
@@ -2033,102 +2269,105 @@ async def get_risk_officer_delayed_cases(
 
 @router.get("/api/supervisor/delayed-cases")
 async def get_department_delayed_cases(
-    current_username: Annotated[str, Depends(get_current_username)]
+    current_username: Annotated[str, Depends(get_current_username)],
+    executor: Annotated[ThreadPoolExecutor, Depends(get_executor_dependency)]
 ) -> Dict[str, Any]:
     """Return cases assigned to the supervisor's department that haven't been acted upon for X days. Only accessible by supervisors."""
     try:
-        with psycopg2.connect(**DB_CONNECTION_PARAMS) as conn:
-            with conn.cursor(cursor_factory=RealDictCursor) as cur:
-                # Check if user is supervisor and get their department
-                cur.execute("SELECT user_type, dept FROM user_table WHERE user_name = %s", (current_username,))
-                user_row = cur.fetchone()
-                if not user_row or user_row.get('user_type') != 'supervisor':
-                    raise HTTPException(status_code=403, detail="Only supervisors can access department delayed cases.")
-                
-                supervisor_dept = user_row.get('dept')
-                if not supervisor_dept:
-                    raise HTTPException(status_code=400, detail="Supervisor department not found.")
-                
-                # Use generic threshold for all departments (no hardcoded department names)
-                # All departments use the same default threshold, making it scalable for any new departments
-                threshold_days = 3  # Default threshold for all departments
-                
-                # Get delayed cases assigned to this department (no action for X days)
-                # Use subquery to get the most recent active assignment to avoid duplicates
-                cur.execute(
-                    """
-                    SELECT 
-                        cm.case_id,
-                        cm.source_ack_no,
-                        cm.case_type,
-                        cm.status,
-                        cm.creation_date,
-                        latest_assignment.assigned_to as current_assigned_to,
-                        latest_assignment.assigned_by as assigned_by,
-                        latest_assignment.assign_date,
-                        latest_assignment.assign_time,
-                        EXTRACT(EPOCH FROM (CURRENT_TIMESTAMP - COALESCE(latest_assignment.assign_date, cm.creation_date))) / 86400 AS days_old,
-                        cl.last_action_date,
-                        ut.dept as assigned_dept
-                    FROM case_main cm
-                    LEFT JOIN (
-                        SELECT DISTINCT ON (case_id)
-                            case_id,
-                            assigned_to,
-                            assigned_by,
-                            assign_date,
-                            assign_time
-                        FROM assignment 
-                        WHERE is_active = TRUE
-                        ORDER BY case_id, assign_date DESC
-                    ) latest_assignment ON cm.case_id = latest_assignment.case_id
-                    LEFT JOIN user_table ut ON latest_assignment.assigned_to = ut.user_name
-                    LEFT JOIN (
+        def _sync_department_delayed_cases():
+            with get_db_connection(caller="dashboard") as conn:
+                with conn.cursor(cursor_factory=RealDictCursor) as cur:
+                    # Check if user is supervisor and get their department
+                    cur.execute("SELECT user_type, dept FROM user_table WHERE user_name = %s", (current_username,))
+                    user_row = cur.fetchone()
+                    if not user_row or user_row.get('user_type') != 'supervisor':
+                        raise HTTPException(status_code=403, detail="Only supervisors can access department delayed cases.")
+
+                    supervisor_dept = user_row.get('dept')
+                    if not supervisor_dept:
+                        raise HTTPException(status_code=400, detail="Supervisor department not found.")
+
+                    # Use generic threshold for all departments (no hardcoded department names)
+                    # All departments use the same default threshold, making it scalable for any new departments
+                    threshold_days = 3  # Default threshold for all departments
+
+                    # Get delayed cases assigned to this department (no action for X days)
+                    # Use subquery to get the most recent active assignment to avoid duplicates
+                    cur.execute(
+                        """
                         SELECT 
-                            case_id,
-                            MAX(created_at) as last_action_date
-                        FROM case_logs 
-                        GROUP BY case_id
-                    ) cl ON cm.case_id = cl.case_id
-                    WHERE ut.dept = %s
-                    AND LOWER(cm.status) != 'closed'
-                    AND EXTRACT(EPOCH FROM (CURRENT_TIMESTAMP - COALESCE(latest_assignment.assign_date, cm.creation_date))) / 86400 >= %s
-                    AND (
-                        cl.last_action_date IS NULL 
-                        OR cl.last_action_date < CURRENT_TIMESTAMP - INTERVAL '%s days'
+                            cm.case_id,
+                            cm.source_ack_no,
+                            cm.case_type,
+                            cm.status,
+                            cm.creation_date,
+                            latest_assignment.assigned_to as current_assigned_to,
+                            latest_assignment.assigned_by as assigned_by,
+                            latest_assignment.assign_date,
+                            latest_assignment.assign_time,
+                            EXTRACT(EPOCH FROM (CURRENT_TIMESTAMP - COALESCE(latest_assignment.assign_date, cm.creation_date))) / 86400 AS days_old,
+                            cl.last_action_date,
+                            ut.dept as assigned_dept
+                        FROM case_main cm
+                        LEFT JOIN (
+                            SELECT DISTINCT ON (case_id)
+                                case_id,
+                                assigned_to,
+                                assigned_by,
+                                assign_date,
+                                assign_time
+                            FROM assignment 
+                            WHERE is_active = TRUE
+                            ORDER BY case_id, assign_date DESC
+                        ) latest_assignment ON cm.case_id = latest_assignment.case_id
+                        LEFT JOIN user_table ut ON latest_assignment.assigned_to = ut.user_name
+                        LEFT JOIN (
+                            SELECT 
+                                case_id,
+                                MAX(created_at) as last_action_date
+                            FROM case_logs 
+                            GROUP BY case_id
+                        ) cl ON cm.case_id = cl.case_id
+                        WHERE ut.dept = %s
+                        AND LOWER(cm.status) != 'closed'
+                        AND EXTRACT(EPOCH FROM (CURRENT_TIMESTAMP - COALESCE(latest_assignment.assign_date, cm.creation_date))) / 86400 >= %s
+                        AND (
+                            cl.last_action_date IS NULL 
+                            OR cl.last_action_date < CURRENT_TIMESTAMP - INTERVAL '%s days'
+                        )
+                        ORDER BY COALESCE(latest_assignment.assign_date, cm.creation_date) ASC
+                        """,
+                        (supervisor_dept, threshold_days, threshold_days)
                     )
-                    ORDER BY COALESCE(latest_assignment.assign_date, cm.creation_date) ASC
-                    """,
-                    (supervisor_dept, threshold_days, threshold_days)
-                )
-                
-                delayed_cases = cur.fetchall() or []
-                
-                # Convert to list of dictionaries and format the data
-                result = []
-                for case in delayed_cases:
-                    result.append({
-                        "case_id": case['case_id'],
-                        "source_ack_no": case['source_ack_no'],
-                        "case_type": case['case_type'],
-                        "status": case['status'],
-                        "creation_date": case['creation_date'].isoformat() if case['creation_date'] else None,
-                        "days_old": round(float(case['days_old'])),
-                        "current_assigned_to": case['current_assigned_to'],
-                        "assigned_by": case['assigned_by'],
-                        "assign_date": case['assign_date'].isoformat() if case['assign_date'] else None,
-                        "assign_time": case['assign_time'].isoformat() if case['assign_time'] else None,
-                        "last_action_date": case['last_action_date'].isoformat() if case['last_action_date'] else None,
-                        "assigned_dept": case['assigned_dept']
-                    })
-                
-                return {
-                    "delayed_cases": result,
-                    "threshold_days": threshold_days,
-                    "total_count": len(result),
-                    "case_type": "department",
-                    "department": supervisor_dept
-                }
+
+                    delayed_cases = cur.fetchall() or []
+
+                    # Convert to list of dictionaries and format the data
+                    result = []
+                    for case in delayed_cases:
+                        result.append({
+                            "case_id": case['case_id'],
+                            "source_ack_no": case['source_ack_no'],
+                            "case_type": case['case_type'],
+                            "status": case['status'],
+                            "creation_date": case['creation_date'].isoformat() if case['creation_date'] else None,
+                            "days_old": round(float(case['days_old'])),
+                            "current_assigned_to": case['current_assigned_to'],
+                            "assigned_by": case['assigned_by'],
+                            "assign_date": case['assign_date'].isoformat() if case['assign_date'] else None,
+                            "assign_time": case['assign_time'].isoformat() if case['assign_time'] else None,
+                            "last_action_date": case['last_action_date'].isoformat() if case['last_action_date'] else None,
+                            "assigned_dept": case['assigned_dept']
+                        })
+
+                    return {
+                        "delayed_cases": result,
+                        "threshold_days": threshold_days,
+                        "total_count": len(result),
+                        "case_type": "department",
+                        "department": supervisor_dept
+                    }
+        return await asyncio.get_running_loop().run_in_executor(executor, _sync_department_delayed_cases)
                 
     except HTTPException:
         raise
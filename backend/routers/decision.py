@@ -33,11 +33,8 @@ async def _perform_transaction_classification(
     detector: AnomalyDetector
 ) -> Dict[str, Any]:
     try:
-        classification_result = await asyncio.get_running_loop().run_in_executor(
-            executor,
-            detector.classify_transaction,
-            transaction_input_for_model
-        )
+        # Scored in-process, batched with other concurrent classifications
+        classification_result = await detector.classify(transaction_input_for_model, executor)
         if "error" in classification_result:
             raise ValueError(f"Model returned an error: {classification_result['error']}")
         return classification_result
@@ -1,18 +1,31 @@
 # routers/email_ingest.py
 import os
 import json
+import asyncio
 import base64
+import functools
 import time
 import traceback
 from datetime import datetime, timedelta, timezone
 from typing import Any, Dict, List, Optional
 
-import httpx
 from fastapi import APIRouter, BackgroundTasks, Body, HTTPException, Request, Query, Depends
 from concurrent.futures import ThreadPoolExecutor
 from starlette.responses import PlainTextResponse, JSONResponse
 
+from config import EMAIL_BATCH_CREATE_CONCURRENCY, EMAIL_BATCH_MAX_EMAILS, EMAIL_BATCH_PARSE_CONCURRENCY
+from db.unit_of_work import open_unit_of_work
 from services.email_parser import EmailParser
+from services.http_client import get_http_client
+from services.email_jobs import (
+    enqueue_gmail_history,
+    enqueue_graph_message,
+    get_checkpoint,
+    get_job,
+    record_gmail_history,
+    run_email_worker,
+    save_checkpoint,
+)
 from db.matcher import CaseEntryMatcher
 from models.base_models import CaseEntryData, ECBCaseData
 from dotenv import load_dotenv
@@ -31,7 +44,8 @@ async def gmail_webhook_get_probe():
     # Helpful for Pub/Sub endpoint validation during setup
     return PlainTextResponse("OK")
 
-# In-memory state; replace with DB in production
+# In-memory mailbox registrations (tokens, Graph clientState). History checkpoints
+# and webhook work are durable: see services/email_jobs.py
 STATE = {
     "google": {},
     "microsoft": {"_last_token": {"token": None}}
@@ -43,7 +57,7 @@ DEV_GOOGLE_EMAIL = os.getenv("DEV_GOOGLE_EMAIL") or None
 DEV_MS_TOKEN = os.getenv("DEV_MS_ACCESS_TOKEN") or None
 
 if DEV_GOOGLE_TOKEN and DEV_GOOGLE_EMAIL:
-    STATE["google"][DEV_GOOGLE_EMAIL] = {"token": DEV_GOOGLE_TOKEN, "last_history_id": None}
+    STATE["google"][DEV_GOOGLE_EMAIL] = {"token": DEV_GOOGLE_TOKEN}
 
 if DEV_MS_TOKEN:
     STATE["microsoft"]["_last_token"]["token"] = DEV_MS_TOKEN
@@ -83,14 +97,11 @@ async def register_google_email(payload: Dict[str, Any] = Body(...)):
     token = payload.get("access_token") or DEV_GOOGLE_TOKEN
     if not token:
         raise HTTPException(400, "Provide access_token or set DEV_GOOGLE_ACCESS_TOKEN in .env")
-    STATE["google"][email] = {
-        "token": token,
-        "last_history_id": STATE["google"].get(email, {}).get("last_history_id")
-    }
+    STATE["google"][email] = {"token": token}
     return {"ok": True, "email": email}
 
 @router.post("/email/google/watch")
-async def google_watch(payload: Dict[str, Any] = Body(...)):
+async def google_watch(request: Request, payload: Dict[str, Any] = Body(...)):
     email = payload.get("email") or DEV_GOOGLE_EMAIL
     if not email:
         raise HTTPException(400, "Provide email or set DEV_GOOGLE_EMAIL in .env")
@@ -101,29 +112,33 @@ async def google_watch(payload: Dict[str, Any] = Body(...)):
         token = DEV_GOOGLE_TOKEN
         if not token:
             raise HTTPException(400, "No token found. Register or set DEV_GOOGLE_ACCESS_TOKEN.")
-        STATE["google"][email] = {"token": token, "last_history_id": None}
+        STATE["google"][email] = {"token": token}
         entry = STATE["google"][email]
     token = entry["token"]
     body_json = {"topicName": topic, "labelIds": labels, "labelFilterBehavior": "INCLUDE"}
-    async with httpx.AsyncClient() as client:
-        r = await client.post(
-            "https://gmail.googleapis.com/gmail/v1/users/me/watch",
-            headers={"Authorization": f"Bearer {token}"},
-            json=body_json, timeout=30
+    client = get_http_client()
+    r = await client.post(
+        "https://gmail.googleapis.com/gmail/v1/users/me/watch",
+        headers={"Authorization": f"Bearer {token}"},
+        json=body_json, timeout=30
+    )
+    r.raise_for_status()
+    data = r.json()
+    if data.get("historyId"):
+        await asyncio.get_running_loop().run_in_executor(
+            request.app.state.executor, save_checkpoint, "google", email, str(data["historyId"])
         )
-        r.raise_for_status()
-        data = r.json()
-    STATE["google"][email]["last_history_id"] = data.get("historyId")
     return {"ok": True, "email": email, "historyId": data.get("historyId"), "expiration": data.get("expiration")}
 
-# Pub/Sub push: process history and RETURN JSON with extracted details
+# Pub/Sub push: queue the notification and ack with 202; the history walk and the
+# message parsing run in the email ingest workers
 @router.post("/webhooks/google")
 async def gmail_webhook(req: Request):
     envelope = await req.json()
     msg = envelope.get("message") or {}
     data_b64 = msg.get("data")
     if not data_b64:
-        return {"ok": True, "processed": 0, "results": []}
+        return {"ok": True, "queued": 0}
     try:
         notif = json.loads(_b64url_decode(data_b64).decode("utf-8"))
     except Exception:
@@ -132,46 +147,88 @@ async def gmail_webhook(req: Request):
     email = notif.get("emailAddress") or DEV_GOOGLE_EMAIL
     hist_id = notif.get("historyId")
     if not email or not hist_id:
-        return {"ok": True, "processed": 0, "results": []}
+        return {"ok": True, "queued": 0}
 
     entry = STATE["google"].get(email)
     if not entry:
-        return {"ok": True, "processed": 0, "results": []}
-    token = entry["token"]
-    start = entry.get("last_history_id") or str(hist_id)
+        return {"ok": True, "queued": 0}
+    try:
+        job_id, created = await asyncio.get_running_loop().run_in_executor(
+            req.app.state.executor, enqueue_gmail_history, email, str(hist_id), entry["token"]
+        )
+    except Exception as e:
+        # Non-2xx makes Pub/Sub redeliver the notification later
+        print(f"[email-ingest] Could not queue Gmail notification for {email}: {e}", flush=True)
+        return JSONResponse({"ok": False, "error": "Could not queue notification"}, status_code=503)
+    return JSONResponse({"ok": True, "queued": int(created), "job_id": job_id}, status_code=202)
 
-    results: List[Dict[str, Any]] = []
-    async with httpx.AsyncClient() as client:
-        page_token = None
-        while True:
-            params = {"startHistoryId": start}
-            if page_token:
-                params["pageToken"] = page_token
-            r = await client.get(
-                "https://gmail.googleapis.com/gmail/v1/users/me/history",
-                headers={"Authorization": f"Bearer {token}"},
-                params=params, timeout=30
-            )
-            if r.status_code == 404:
-                # Old/invalid anchor; create a fresh users.watch to obtain a new start point per Gmail docs
-                break
-            r.raise_for_status()
-            data = r.json()
-            for h in data.get("history", []) or []:
-                for added in h.get("messagesAdded", []) or []:
-                    msg_id = added["message"]["id"]
-                    try:
-                        res = await PARSER.process_gmail_message(token, msg_id)
-                        results.append(res)
-                    except Exception:
-                        traceback.print_exc()
-            page_token = data.get("nextPageToken")
-            if not page_token:
-                break
-    STATE["google"][email]["last_history_id"] = str(hist_id)
-    # If you switch to background processing, return 202 and minimal JSON:
-    # return JSONResponse({"ok": True}, status_code=202)
-    return {"ok": True, "processed": len(results), "results": results}
+
+async def _process_gmail_history(executor: ThreadPoolExecutor, job: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Walk the mailbox history from its durable checkpoint up to the notification and
+    queue one job per added message, advancing the checkpoint in the same transaction.
+    """
+    loop = asyncio.get_running_loop()
+    email, hist_id, token = job["mailbox"], job["history_id"], job["access_token"]
+    start = await loop.run_in_executor(executor, get_checkpoint, "google", email) or hist_id
+
+    message_ids: List[str] = []
+    client = get_http_client()
+    page_token = None
+    while True:
+        params = {"startHistoryId": start}
+        if page_token:
+            params["pageToken"] = page_token
+        r = await client.get(
+            "https://gmail.googleapis.com/gmail/v1/users/me/history",
+            headers={"Authorization": f"Bearer {token}"},
+            params=params, timeout=30
+        )
+        if r.status_code == 404:
+            # Old/invalid anchor; create a fresh users.watch to obtain a new start point per Gmail docs
+            break
+        r.raise_for_status()
+        data = r.json()
+        for h in data.get("history", []) or []:
+            for added in h.get("messagesAdded", []) or []:
+                message_ids.append(added["message"]["id"])
+        page_token = data.get("nextPageToken")
+        if not page_token:
+            break
+
+    queued = await loop.run_in_executor(executor, record_gmail_history, email, hist_id, message_ids, token)
+    return {"start_history_id": start, "history_id": hist_id, "messages_seen": len(message_ids), "messages_queued": queued}
+
+
+async def _process_email_job(executor: ThreadPoolExecutor, job: Dict[str, Any]) -> Dict[str, Any]:
+    kind = job["kind"]
+    if kind == "gmail_history":
+        return await _process_gmail_history(executor, job)
+    if kind == "gmail_message":
+        result = await PARSER.process_gmail_message(job["access_token"], job["message_id"])
+    elif kind == "graph_message":
+        result = await PARSER.process_graph_message(job["access_token"], job["message_id"])
+    else:
+        raise ValueError(f"Unknown email ingest job kind: {kind}")
+    return {"id": result["id"], "provider": result["provider"], "fields": result["fields"]}
+
+
+def start_email_ingest_worker(executor) -> asyncio.Task:
+    """Start this process's background workers for queued webhook notifications."""
+    return asyncio.create_task(run_email_worker(executor, functools.partial(_process_email_job, executor)))
+
+
+@router.get("/email/ingest/jobs/{job_id}")
+async def get_email_ingest_job_status(job_id: int, request: Request) -> Dict[str, Any]:
+    """Status of a queued webhook notification or message (result holds the extracted fields)."""
+    try:
+        job = await asyncio.get_running_loop().run_in_executor(request.app.state.executor, get_job, job_id)
+    except Exception as e:
+        print(f"[email-ingest] Error fetching job {job_id}: {e}", flush=True)
+        raise HTTPException(status_code=500, detail=f"Failed to fetch job status: {str(e)}")
+    if not job:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    return job
 
 # -------------------------
 # Microsoft: subscribe/hook (optional in dev)
@@ -201,14 +258,14 @@ async def ms_subscribe(payload: Dict[str, Any] = Body(...)):
         "expirationDateTime": (datetime.now(timezone.utc) + timedelta(minutes=minutes)).isoformat(),
         "clientState": client_state
     }
-    async with httpx.AsyncClient() as client:
-        r = await client.post(
-            "https://graph.microsoft.com/v1.0/subscriptions",
-            headers={"Authorization": f"Bearer {access_token}"},
-            json=body_json, timeout=30
-        )
-        r.raise_for_status()
-        sub = r.json()
+    client = get_http_client()
+    r = await client.post(
+        "https://graph.microsoft.com/v1.0/subscriptions",
+        headers={"Authorization": f"Bearer {access_token}"},
+        json=body_json, timeout=30
+    )
+    r.raise_for_status()
+    sub = r.json()
     sub_id = sub["id"]
     STATE["microsoft"][sub_id] = {
         "token": access_token,
@@ -222,10 +279,11 @@ async def ms_subscribe(payload: Dict[str, Any] = Body(...)):
 async def ms_validate(validationToken: Optional[str] = None):
     return PlainTextResponse(content=validationToken or "")
 
-# Notifications POST: process immediately and RETURN JSON with details
+# Notifications POST: queue each new message and ack with 202 (Graph expects a reply within seconds)
 @router.post("/webhooks/microsoft")
-async def ms_notifications(payload: Dict[str, Any] = Body(...)):
-    results: List[Dict[str, Any]] = []
+async def ms_notifications(request: Request, payload: Dict[str, Any] = Body(...)):
+    loop = asyncio.get_running_loop()
+    job_ids: List[int] = []
     for n in (payload.get("value") or []):
         sub_id = n.get("subscriptionId")
         meta = STATE["microsoft"].get(sub_id)
@@ -237,11 +295,16 @@ async def ms_notifications(payload: Dict[str, Any] = Body(...)):
             msg_id = (n.get("resourceData") or {}).get("id")
             if msg_id:
                 try:
-                    res = await PARSER.process_graph_message(meta["token"], msg_id)
-                    results.append(res)
-                except Exception:
-                    traceback.print_exc()
-    return {"ok": True, "processed": len(results), "results": results}
+                    job_id, created = await loop.run_in_executor(
+                        request.app.state.executor, enqueue_graph_message, sub_id, msg_id, meta["token"]
+                    )
+                except Exception as e:
+                    # Non-2xx makes Graph retry the notification
+                    print(f"[email-ingest] Could not queue Graph message {msg_id}: {e}", flush=True)
+                    return JSONResponse({"ok": False, "error": "Could not queue notification"}, status_code=503)
+                if created:
+                    job_ids.append(job_id)
+    return JSONResponse({"ok": True, "queued": len(job_ids), "job_ids": job_ids}, status_code=202)
 
 # ----------------------
 # Dev helpers: list + preview using env tokens
@@ -252,50 +315,49 @@ async def dev_google_messages(q: str = Query("newer_than:7d"), max_results: int
     token = _token_for_google(None)
     if not token:
         raise HTTPException(400, "Set DEV_GOOGLE_ACCESS_TOKEN in .env or pass access_token")
-    async with httpx.AsyncClient() as client:
-        r = await client.get(
-            "https://gmail.googleapis.com/gmail/v1/users/me/messages",
-            params={"q": q, "maxResults": max_results},
-            headers={"Authorization": f"Bearer {token}"},
-            timeout=30,
-        )
-        r.raise_for_status()
-        return r.json()
+    client = get_http_client()
+    r = await client.get(
+        "https://gmail.googleapis.com/gmail/v1/users/me/messages",
+        params={"q": q, "maxResults": max_results},
+        headers={"Authorization": f"Bearer {token}"},
+        timeout=30,
+    )
+    r.raise_for_status()
+    return r.json()
 
 @router.get("/dev/microsoft/messages")
 async def dev_ms_messages(top: int = Query(10, ge=1, le=50)):
     token = _token_for_ms(None)
     if not token:
         raise HTTPException(400, "Set DEV_MS_ACCESS_TOKEN in .env or pass access_token")
-    async with httpx.AsyncClient() as client:
-        r = await client.get(
-            "https://graph.microsoft.com/v1.0/me/messages",
-            params={"$top": top, "$select": "id,subject,hasAttachments,receivedDateTime"},
-            headers={"Authorization": f"Bearer {token}"},
-            timeout=30
-        )
-        r.raise_for_status()
-        return r.json()
+    client = get_http_client()
+    r = await client.get(
+        "https://graph.microsoft.com/v1.0/me/messages",
+        params={"$top": top, "$select": "id,subject,hasAttachments,receivedDateTime"},
+        headers={"Authorization": f"Bearer {token}"},
+        timeout=30
+    )
+    r.raise_for_status()
+    return r.json()
 
-@router.post("/email/parse/preview")
-async def preview_fields(payload: dict = Body(...)):
-    provider = payload.get("provider")
-    msg_id = payload.get("message_id")
-    token = payload.get("access_token")
+async def _parse_email(provider: Optional[str], msg_id: Optional[str], token: Optional[str]) -> Dict[str, Any]:
     if not provider or not msg_id:
         raise HTTPException(400, "provider and message_id are required")
     if provider == "google":
         token = _token_for_google(token)
         if not token:
             raise HTTPException(400, "No Google token available; set DEV_GOOGLE_ACCESS_TOKEN or pass access_token")
-        result = await PARSER.process_gmail_message(token, msg_id)
-    elif provider == "microsoft":
+        return await PARSER.process_gmail_message(token, msg_id)
+    if provider == "microsoft":
         token = _token_for_ms(token)
         if not token:
             raise HTTPException(400, "No Microsoft token available; set DEV_MS_ACCESS_TOKEN or pass access_token")
-        result = await PARSER.process_graph_message(token, msg_id)
-    else:
-        raise HTTPException(400, "Unsupported provider")
+        return await PARSER.process_graph_message(token, msg_id)
+    raise HTTPException(400, "Unsupported provider")
+
+@router.post("/email/parse/preview")
+async def preview_fields(payload: dict = Body(...)):
+    result = await _parse_email(payload.get("provider"), payload.get("message_id"), payload.get("access_token"))
     return {
         "id": result["id"],
         "provider": result["provider"],
@@ -343,25 +405,7 @@ async def parse_email_and_create_cases(
     """
     try:
         # Step 1: Parse the email (reuse existing logic)
-        provider = payload.get("provider")
-        msg_id = payload.get("message_id")
-        token = payload.get("access_token")
-        
-        if not provider or not msg_id:
-            raise HTTPException(400, "provider and message_id are required")
-        
-        if provider == "google":
-            token = _token_for_google(token)
-            if not token:
-                raise HTTPException(400, "No Google token available; set DEV_GOOGLE_ACCESS_TOKEN or pass access_token")
-            parsed_result = await PARSER.process_gmail_message(token, msg_id)
-        elif provider == "microsoft":
-            token = _token_for_ms(token)
-            if not token:
-                raise HTTPException(400, "No Microsoft token available; set DEV_MS_ACCESS_TOKEN or pass access_token")
-            parsed_result = await PARSER.process_graph_message(token, msg_id)
-        else:
-            raise HTTPException(400, "Unsupported provider")
+        parsed_result = await _parse_email(payload.get("provider"), payload.get("message_id"), payload.get("access_token"))
         
         # Step 2: Create cases based on parsed data
         case_matcher = CaseEntryMatcher(executor)
@@ -380,6 +424,191 @@ async def parse_email_and_create_cases(
         traceback.print_exc()
         raise HTTPException(500, f"Internal server error: {str(e)}")
 
+def _error_text(e: Exception) -> str:
+    return e.detail if isinstance(e, HTTPException) else str(e)
+
+@router.post("/api/email/parse/create-cases/batch")
+async def parse_emails_and_create_cases_batch(
+    payload: dict = Body(...),
+    executor: ThreadPoolExecutor = Depends(get_executor_dependency)
+):
+    """
+    Batch variant of /api/email/parse/create-cases, e.g. to replay the backlog after an outage.
+
+    Body: {"emails": [{"provider", "message_id", "access_token"?}, ...], "access_token"?,
+    "include_evidence"?}. Emails are fetched and parsed in parallel; beneficiary
+    customers, the customers who added those beneficiaries and their transactions are
+    resolved for the whole batch with one query each, and the ECB cases of the batch
+    are created on one connection with multi-row inserts. Every email gets its own
+    entry in `results` (same shape as the single endpoint, or an `error`); emails
+    repeating an earlier message or ackNo are reported as duplicates instead of
+    creating the cases twice.
+    """
+    emails = payload.get("emails")
+    if not isinstance(emails, list) or not emails:
+        raise HTTPException(400, "emails must be a non-empty list")
+    if len(emails) > EMAIL_BATCH_MAX_EMAILS:
+        raise HTTPException(400, f"At most {EMAIL_BATCH_MAX_EMAILS} emails per batch")
+    default_token = payload.get("access_token")
+    include_evidence = bool(payload.get("include_evidence"))
+    t0 = time.perf_counter()
+
+    # Step 1: Parse every email in parallel; the same message listed twice is parsed once
+    parse_slots = asyncio.Semaphore(max(1, EMAIL_BATCH_PARSE_CONCURRENCY))
+    parse_tasks: Dict[tuple, asyncio.Task] = {}
+
+    async def _parse_bounded(provider, msg_id, token):
+        async with parse_slots:
+            return await _parse_email(provider, msg_id, token)
+
+    for email in emails:
+        email = email if isinstance(email, dict) else {}
+        key = (email.get("provider"), email.get("message_id"))
+        if key not in parse_tasks:
+            parse_tasks[key] = asyncio.ensure_future(
+                _parse_bounded(key[0], key[1], email.get("access_token") or default_token)
+            )
+    await asyncio.gather(*parse_tasks.values(), return_exceptions=True)
+
+    results: List[Dict[str, Any]] = []
+    to_create: List[tuple] = []  # (result entry, fields, ack_no)
+    seen_messages: Dict[tuple, int] = {}
+    seen_acks: Dict[str, int] = {}
+    for index, email in enumerate(emails):
+        email = email if isinstance(email, dict) else {}
+        key = (email.get("provider"), email.get("message_id"))
+        entry: Dict[str, Any] = {"index": index, "provider": key[0], "message_id": key[1]}
+        results.append(entry)
+        if key in seen_messages:
+            # Same message listed again: without an ackNo it would get a fresh EMAIL_ ack below
+            entry["duplicate_of"] = seen_messages[key]
+            entry["case_creation_results"] = None
+            continue
+        seen_messages[key] = index
+        task = parse_tasks[key]
+        if task.exception() is not None:
+            entry["error"] = f"Parsing failed: {_error_text(task.exception())}"
+            continue
+        parsed_result = task.result()
+        fields = parsed_result["fields"]
+        entry.update({"id": parsed_result["id"], "parsed_fields": fields})
+        if include_evidence:
+            entry["evidence"] = parsed_result["evidence"]
+
+        ack_no = fields.get("ackNo")
+        if ack_no and ack_no in seen_acks:
+            entry["duplicate_of"] = seen_acks[ack_no]
+            entry["case_creation_results"] = None
+            continue
+        if ack_no:
+            seen_acks[ack_no] = index
+        else:
+            ack_no = f"EMAIL_{int(time.time())}_{index}"
+        to_create.append((entry, fields, ack_no))
+
+    # Step 2: Resolve customers for the whole batch (deduplicated account numbers)
+    case_matcher = CaseEntryMatcher(executor)
+    account_customers = await case_matcher.bulk_process_account_lookups([fields for _, fields, _ in to_create])
+    bm_accounts = sorted({str(fields["toAccount"]) for _, fields, _ in to_create
+                          if fields.get("toAccount") and str(fields["toAccount"]) in account_customers})
+    bene_customers = await case_matcher.bulk_find_beneficiary_customers(bm_accounts)
+    pairs = sorted({(c["customer_account"], bene) for bene, custs in bene_customers.items() for c in custs})
+    pairs_with_txn = await case_matcher.bulk_check_customer_beneficiary_transactions(pairs)
+
+    # Step 3: BM (and VM/ECB via match_data) cases, a few emails at a time
+    create_slots = asyncio.Semaphore(max(1, EMAIL_BATCH_CREATE_CONCURRENCY))
+
+    async def _create_bm(entry, fields, ack_no):
+        case_results = {"bm_case": None, "ecb_cases": [], "errors": [], "summary": ""}
+        entry["case_creation_results"] = case_results
+        bene_account = fields.get("toAccount")
+        if not bene_account:
+            case_results["errors"].append("No beneficiary account (toAccount) found in parsed email data")
+            return
+        bm_cust_id = account_customers.get(str(bene_account))
+        if not bm_cust_id:
+            case_results["summary"] = f"No customer match found for beneficiary account {bene_account}. No cases created."
+            return
+        try:
+            async with create_slots:
+                bm_case_data = _create_case_entry_data_from_fields({**fields, "ackNo": ack_no}, bm_cust_id, "BM")
+                bm_result = await case_matcher.match_data(bm_case_data, created_by_user="EmailSystem")
+            case_results["bm_case"] = {"account_number": bene_account, "customer_id": bm_cust_id, "case_result": bm_result}
+        except Exception as e:
+            case_results["errors"].append(f"Error creating cases: {str(e)}")
+
+    await asyncio.gather(*(_create_bm(entry, fields, ack_no) for entry, fields, ack_no in to_create))
+
+    # Step 4: ECBT/ECBNT cases for every customer who added a matched beneficiary,
+    # on one connection: one multi-row insert and one commit per email
+    ecb_total = 0
+    async with open_unit_of_work(executor, "email_batch_ecb") as uow:
+        for entry, fields, ack_no in to_create:
+            case_results = entry["case_creation_results"]
+            if not case_results["bm_case"]:
+                continue
+            bene_account = str(fields["toAccount"])
+            ecb_cases = []
+            for customer in bene_customers.get(bene_account, []):
+                cust_id = customer["cust_id"]
+                customer_account = customer["customer_account"]
+                has_transactions = (customer_account, bene_account) in pairs_with_txn
+                case_type = "ECBT" if has_transactions else "ECBNT"
+                ecb_cases.append({
+                    "customer_id": cust_id,
+                    "customer_account": customer_account,
+                    "beneficiary_account": bene_account,
+                    "case_type": case_type,
+                    "has_transactions": has_transactions,
+                    "case_data": ECBCaseData(
+                        sourceAckNo=f"{case_type}_{ack_no}_{cust_id}_{int(time.time())}",
+                        customerId=cust_id,
+                        customerAccountNumber=customer_account,
+                        beneficiaryAccountNumber=bene_account,
+                        beneficiaryMobile=fields.get("phoneNumber"),
+                        beneficiaryEmail=fields.get("toUpiId"),
+                        beneficiaryPAN=fields.get("panCard"),
+                        beneficiaryAadhar=fields.get("aadhaarNumber"),
+                        hasTransaction=has_transactions,
+                        remarks=f"ECB case created from email parsing. Customer {cust_id} (Account: {customer_account}) has {'transactions' if has_transactions else 'no transactions'} with beneficiary {bene_account}",
+                        location=fields.get("state"),
+                        disputedAmount=fields.get("disputedAmount")
+                    )
+                })
+            try:
+                ecb_results = await uow.create_ecb_cases(
+                    [case.pop("case_data") for case in ecb_cases], created_by_user="EmailSystem"
+                )
+                await uow.commit()
+                for case, ecb_result in zip(ecb_cases, ecb_results):
+                    case["case_result"] = ecb_result
+            except Exception as e:
+                # This email's ECB cases are dropped; the ones committed for earlier emails stay
+                await uow.rollback()
+                ecb_cases = []
+                case_results["errors"].append(f"Error creating ECB cases: {str(e)}")
+                traceback.print_exc()
+            case_results["ecb_cases"] = ecb_cases
+            ecb_total += len(ecb_cases)
+            case_results["summary"] = f"Created BM case for beneficiary account {bene_account}. Found {len(ecb_cases)} ECB cases."
+
+    failed = sum(1 for entry in results if "error" in entry)
+    duplicates = sum(1 for entry in results if "duplicate_of" in entry)
+    bm_created = sum(1 for entry in results if (entry.get("case_creation_results") or {}).get("bm_case"))
+    print(f"[email-batch] {len(emails)} emails: {failed} failed to parse, {duplicates} duplicates, "
+          f"{bm_created} BM cases, {ecb_total} ECB cases in {time.perf_counter() - t0:.1f}s", flush=True)
+    return {
+        "summary": {
+            "emails": len(emails),
+            "parse_failures": failed,
+            "duplicates": duplicates,
+            "bm_cases": bm_created,
+            "ecb_cases": ecb_total,
+            "unique_beneficiary_accounts": len(bm_accounts),
+        },
+        "results": results,
+    }
+
 async def _create_cases_from_parsed_data(matcher: CaseEntryMatcher, fields: dict) -> dict:
     """
     Create fraud cases based on parsed email data.
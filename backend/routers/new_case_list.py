@@ -13,13 +13,14 @@ from keycloak.keycloak_openid import KeycloakOpenID
 from concurrent.futures import ThreadPoolExecutor
 
 from db.matcher import CaseEntryMatcher, log_case_action # CaseEntryMatcher is where fetch_new_cases_list resides
+from db.pagination import InvalidCursorError
 from fastapi import UploadFile
 from models.base_models import CaseActionDataSaveRequest, CaseActionDataResponse
 import os
 import json
 # --- File Upload Configuration ---
 UPLOAD_DIR = "./fraud_uploads"  # Local development path
-from config import DB_CONNECTION_PARAMS
+from db.connection import get_db_connection
 
 router = APIRouter()
 
@@ -62,11 +63,16 @@ async def get_new_case_list(
     page_size: int = Query(15, description="Number of cases per page"),
     search: Optional[str] = Query(None, description="Search across all fields"),
     sort_column: Optional[str] = Query(None, description="Column to sort by"),
-    sort_direction: Optional[str] = Query("asc", description="Sort direction: asc or desc")
+    sort_direction: Optional[str] = Query("asc", description="Sort direction: asc or desc"),
+    pagination: str = Query("offset", description="offset (page numbers) or keyset (continuation cursor)"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous keyset page")
 ) -> Dict[str, Any]:
     """
     Fetches a paginated list of cases from the new case management system,
     with server-side search, sorting, and pagination.
+
+    With pagination=keyset (or a cursor) pages are newest-first and continue from
+    `cursor`; total_count is then an estimate until the exact count is cached.
     """
     user_type = None
     if logged_in_username:
@@ -74,6 +80,35 @@ async def get_new_case_list(
         if user_type is None:
             print(f"WARNING: User '{logged_in_username}' not found in user_table. No role-based filtering applied.", flush=True)
 
+    if pagination == "keyset" or cursor:
+        if sort_column:
+            raise HTTPException(status_code=400, detail="Keyset pagination only supports the default newest-first ordering.")
+        try:
+            result = await matcher.fetch_new_cases_list_keyset(
+                limit=page_size,
+                cursor=cursor,
+                search=search,
+                current_logged_in_username=logged_in_username,
+                current_logged_in_user_type=user_type
+            )
+        except InvalidCursorError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        except Exception as e:
+            print(f"UNEXPECTED ERROR in /api/new-case-list (keyset): {e}", flush=True)
+            traceback.print_exc()
+            raise HTTPException(status_code=500, detail="Failed to retrieve new case list due to an internal server error.")
+        return {
+            "cases": result["cases"],
+            "next_cursor": result["next_cursor"],
+            "has_more": result["has_more"],
+            "total_count": result["total_count"],
+            "total_count_is_estimate": result["total_count_is_estimate"],
+            "total_pages": (result["total_count"] + page_size - 1) // page_size,
+            "page_size": page_size,
+            "logged_in_user_type": user_type,
+            "logged_in_username": logged_in_username
+        }
+
     try:
         # Calculate skip from page and page_size
         skip = (page - 1) * page_size
@@ -165,9 +200,8 @@ async def submit_case(
 
         # Add case closure log entry
         import psycopg2
-        from config import DB_CONNECTION_PARAMS
 
-        with psycopg2.connect(**DB_CONNECTION_PARAMS) as conn:
+        with get_db_connection(caller="new_case_list") as conn:
             with conn.cursor() as cur:
                 cur.execute(
                     """
@@ -245,7 +279,7 @@ async def download_document(
     import os
     
     try:
-        with psycopg2.connect(**DB_CONNECTION_PARAMS) as conn:
+        with get_db_connection(caller="new_case_list") as conn:
             with conn.cursor(cursor_factory=RealDictCursor) as cur:
                 cur.execute(
                     "SELECT file_location, original_filename FROM case_documents WHERE id = %s",
@@ -289,7 +323,7 @@ async def save_case_action(
     user_department = None
     user_type = None
     try:
-        with psycopg2.connect(**DB_CONNECTION_PARAMS) as conn:
+        with get_db_connection(caller="new_case_list") as conn:
             with conn.cursor(cursor_factory=RealDictCursor) as cur:
                 # Single query to get both dept and user_type
                 cur.execute("SELECT dept, user_type FROM user_table WHERE user_name = %s", (logged_in_username,))
@@ -328,7 +362,7 @@ async def save_case_action(
             # Note: Assuming approval columns already exist (remove ALTER TABLE for performance)
             # Insert into case_documents
             try:
-                with psycopg2.connect(**DB_CONNECTION_PARAMS) as conn:
+                with get_db_connection(caller="new_case_list") as conn:
                     with conn.cursor(cursor_factory=RealDictCursor) as cur:
                         # Derive comment from action_data 'dataUploads' per displayName
                         derived_comment = file_comment_map.get(str(upload.filename))
@@ -357,7 +391,7 @@ async def save_case_action(
     try:
         funds_saved_val = action_data_dict.get('fundsSaved')
         if funds_saved_val is not None and str(funds_saved_val) != '':
-            with psycopg2.connect(**DB_CONNECTION_PARAMS) as conn:
+            with get_db_connection(caller="new_case_list") as conn:
                 with conn.cursor(cursor_factory=RealDictCursor) as cur:
                     cur.execute(
                         """
@@ -383,7 +417,7 @@ async def save_case_action(
 
     # --- Insert into case_action_details ---
     try:
-        with psycopg2.connect(**DB_CONNECTION_PARAMS) as conn:
+        with get_db_connection(caller="new_case_list") as conn:
             with conn.cursor(cursor_factory=RealDictCursor) as cur:
                 # Note: Assuming approval columns already exist (removed ALTER TABLE for performance)
                 cur.execute(
@@ -420,7 +454,7 @@ async def get_latest_case_action(
     from psycopg2.extras import RealDictCursor
     import psycopg2
     try:
-        with psycopg2.connect(**DB_CONNECTION_PARAMS) as conn:
+        with get_db_connection(caller="new_case_list") as conn:
             with conn.cursor(cursor_factory=RealDictCursor) as cur:
                 # Determine user type
                 user_type = None
@@ -661,11 +695,29 @@ async def get_assigned_cases(
     skip: int = Query(0),
     limit: int = Query(25),
     search_source_ack_no: Optional[str] = Query(None, description="Search by Source Acknowledgement Number"),
-    status_filter: Optional[str] = Query(None, description="Filter by case status")
+    status_filter: Optional[str] = Query(None, description="Filter by case status"),
+    pagination: str = Query("offset", description="offset (skip/limit) or keyset (continuation cursor)"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous keyset page")
 ) -> Dict[str, Any]:
     """
     Get cases that have been assigned by the current user (for review purposes)
     """
+    if pagination == "keyset" or cursor:
+        try:
+            return await matcher.fetch_assigned_cases_keyset(
+                limit=limit,
+                cursor=cursor,
+                search_source_ack_no=search_source_ack_no,
+                status_filter=status_filter,
+                assigned_by_username=logged_in_username
+            )
+        except InvalidCursorError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        except Exception as e:
+            print(f"[DEBUG] Error in get_assigned_cases (keyset): {e}", flush=True)
+            traceback.print_exc()
+            raise HTTPException(status_code=500, detail=f"Failed to fetch assigned cases. Error: {e}")
+
     try:
         cases_data = await matcher.fetch_assigned_cases(
             skip=skip,
@@ -10,7 +10,7 @@ from fastapi import APIRouter, HTTPException, Depends, Body, Request
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt, JWTError
 from keycloak.keycloak_openid import KeycloakOpenID
-from config import DB_CONNECTION_PARAMS
+from db.connection import get_db_connection
 import traceback
 
 router = APIRouter()
@@ -45,7 +45,7 @@ async def get_user_department(
     Get the current user's department information
     """
     try:
-        with psycopg2.connect(**DB_CONNECTION_PARAMS) as conn:
+        with get_db_connection(caller="supervisor_router") as conn:
             with conn.cursor() as cur:
                 # Get user type and department
                 cur.execute("SELECT user_type, dept FROM user_table WHERE user_name = %s", (current_username,))
@@ -81,7 +81,7 @@ async def get_supervisor_template_responses(
     This is completely separate from existing functionality
     """
     try:
-        with psycopg2.connect(**DB_CONNECTION_PARAMS) as conn:
+        with get_db_connection(caller="supervisor_router") as conn:
             with conn.cursor() as cur:
                 # Get user type and department
                 cur.execute("SELECT user_type, dept FROM user_table WHERE user_name = %s", (current_username,))
@@ -167,7 +167,7 @@ async def supervisor_approve_template_response(
     NEW endpoint for supervisors to approve template responses
     """
     try:
-        with psycopg2.connect(**DB_CONNECTION_PARAMS) as conn:
+        with get_db_connection(caller="supervisor_router") as conn:
             with conn.cursor() as cur:
                 # Check if user is supervisor
                 cur.execute("SELECT user_type, dept FROM user_table WHERE user_name = %s", (current_username,))
@@ -228,7 +228,7 @@ async def supervisor_reject_template_response(
     try:
         rejection_reason = rejection_data.get("rejection_reason", "")
         
-        with psycopg2.connect(**DB_CONNECTION_PARAMS) as conn:
+        with get_db_connection(caller="supervisor_router") as conn:
             with conn.cursor() as cur:
                 # Check if user is supervisor
                 cur.execute("SELECT user_type, dept FROM user_table WHERE user_name = %s", (current_username,))
@@ -12,7 +12,7 @@ from fastapi.security import OAuth2PasswordBearer
 import traceback
 from jose import JWTError
 import psycopg2
-from config import DB_CONNECTION_PARAMS
+from db.connection import get_db_connection
 import json
 
 router = APIRouter()
@@ -54,7 +54,7 @@ async def get_all_templates(
     Get all active templates
     """
     try:
-        with psycopg2.connect(**DB_CONNECTION_PARAMS) as conn:
+        with get_db_connection(caller="template_router") as conn:
             with conn.cursor() as cur:
                 # Ensure templates table exists
                 cur.execute("""
@@ -68,6 +68,7 @@ async def get_all_templates(
                         updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
                     )
                 """)
+                conn.commit()  # keep the table; the pool rolls back on return
                 
                 cur.execute("SELECT id, name, description, questions FROM templates WHERE is_active = TRUE")
                 rows = cur.fetchall()
@@ -99,7 +100,7 @@ async def get_template_by_id(
     Get a specific template by ID
     """
     try:
-        with psycopg2.connect(**DB_CONNECTION_PARAMS) as conn:
+        with get_db_connection(caller="template_router") as conn:
             with conn.cursor() as cur:
                 cur.execute("SELECT id, name, description, questions FROM templates WHERE id = %s AND is_active = TRUE", (template_id,))
                 row = cur.fetchone()
@@ -139,7 +140,7 @@ async def create_template(
         if not name or not questions:
             raise HTTPException(status_code=400, detail="Name and questions are required")
         
-        with psycopg2.connect(**DB_CONNECTION_PARAMS) as conn:
+        with get_db_connection(caller="template_router") as conn:
             with conn.cursor() as cur:
                 # Ensure templates table exists
                 cur.execute("""
@@ -192,7 +193,7 @@ async def create_template_response(
         if not case_id or not template_id or not responses:
             raise HTTPException(status_code=400, detail="Case ID, template ID, and responses are required")
         
-        with psycopg2.connect(**DB_CONNECTION_PARAMS) as conn:
+        with get_db_connection(caller="template_router") as conn:
             with conn.cursor() as cur:
                 # Ensure template_responses table exists
                 cur.execute("""
@@ -242,7 +243,7 @@ async def get_case_template_responses(
     Get template responses for a specific case based on user role and department
     """
     try:
-        with psycopg2.connect(**DB_CONNECTION_PARAMS) as conn:
+        with get_db_connection(caller="template_router") as conn:
             with conn.cursor() as cur:
                 # Get user type and department
                 cur.execute("SELECT user_type, dept FROM user_table WHERE user_name = %s", (current_username,))
@@ -270,6 +271,7 @@ async def get_case_template_responses(
                         updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
                     )
                 """)
+                conn.commit()  # keep the table; the pool rolls back on return
                 
                 # Build query based on user role
                 if user_type == 'supervisor':
@@ -370,7 +372,7 @@ async def approve_template_response(
     Approve a template response (supervisor only)
     """
     try:
-        with psycopg2.connect(**DB_CONNECTION_PARAMS) as conn:
+        with get_db_connection(caller="template_router") as conn:
             with conn.cursor() as cur:
                 # Check if user is supervisor
                 cur.execute("SELECT user_type, dept FROM user_table WHERE user_name = %s", (current_username,))
@@ -418,7 +420,7 @@ async def reject_template_response(
     try:
         rejection_reason = rejection_data.get("rejection_reason", "")
         
-        with psycopg2.connect(**DB_CONNECTION_PARAMS) as conn:
+        with get_db_connection(caller="template_router") as conn:
             with conn.cursor() as cur:
                 # Check if user is supervisor
                 cur.execute("SELECT user_type, dept FROM user_table WHERE user_name = %s", (current_username,))
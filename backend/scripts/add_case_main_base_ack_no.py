@@ -0,0 +1,75 @@
+"""
+Migration: add case_main.base_ack_no, the normalized case_entry_form join key.
+
+base_ack_no is source_ack_no without its case type suffix (SPLIT_PART on '_'),
+so the case list, detail and count queries join case_entry_form with a single
+indexed equality instead of three OR'ed expressions. New cases get it from
+insert_case_main_row / bulk_insert_cases; this script adds the column, backfills
+existing rows in batches (short transactions, no long table lock) and builds
+the index concurrently. Safe to re-run.
+
+Run it before deploying the code that reads the column.
+
+Usage: python backend/scripts/add_case_main_base_ack_no.py [batch_size]
+"""
+
+import psycopg2
+import sys
+import os
+
+# Add backend directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from config import DB_CONNECTION_PARAMS
+
+DEFAULT_BATCH_SIZE = 5000
+
+
+def add_base_ack_no(batch_size: int = DEFAULT_BATCH_SIZE):
+    """Add, backfill and index case_main.base_ack_no"""
+
+    try:
+        conn = psycopg2.connect(
+            host=DB_CONNECTION_PARAMS["host"],
+            port=DB_CONNECTION_PARAMS["port"],
+            dbname=DB_CONNECTION_PARAMS["database"],
+            user=DB_CONNECTION_PARAMS["user"],
+            password=DB_CONNECTION_PARAMS["password"]
+        )
+        # Each batch commits on its own; CREATE INDEX CONCURRENTLY needs autocommit
+        conn.autocommit = True
+        cur = conn.cursor()
+
+        # Nullable, no default: a catalog-only change
+        cur.execute("ALTER TABLE public.case_main ADD COLUMN IF NOT EXISTS base_ack_no VARCHAR(50)")
+
+        total = 0
+        while True:
+            cur.execute("""
+                UPDATE public.case_main
+                SET base_ack_no = SPLIT_PART(source_ack_no, '_', 1)
+                WHERE case_id IN (
+                    SELECT case_id FROM public.case_main
+                    WHERE base_ack_no IS NULL AND source_ack_no IS NOT NULL
+                    LIMIT %s
+                    FOR UPDATE SKIP LOCKED
+                )
+            """, (batch_size,))
+            if cur.rowcount == 0:
+                break
+            total += cur.rowcount
+            print(f"  backfilled {total} rows...", flush=True)
+
+        cur.execute("CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_case_main_base_ack_no ON public.case_main (base_ack_no)")
+        cur.execute("ANALYZE public.case_main")
+
+        print(f"✅ case_main.base_ack_no ready ({total} rows backfilled)")
+
+        cur.close()
+        conn.close()
+
+    except Exception as e:
+        print(f"❌ Failed to add case_main.base_ack_no: {e}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    add_base_ack_no(int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_BATCH_SIZE)
@@ -0,0 +1,118 @@
+"""
+Benchmark: bulk_insert_cases and bulk_check_transactions, per-row vs set-based.
+
+For each size (default 1000 and 10000) it times
+  - case_main inserts: one INSERT ... RETURNING per case (the old loop) against
+    one multi-row insert_case_main_rows call;
+  - transaction checks: one COUNT(*) per VM/BM pair (the old loop) against one
+    BULK_TXN_CHECK_SQL query. Pairs are taken from public.txn (so roughly half
+    match) plus made-up accounts that don't.
+and prints rows/s for each. Every run is rolled back, so no cases are left
+behind (case_main's sequence still advances).
+
+Needs the database from config.DB_CONNECTION_PARAMS.
+
+Usage: python backend/scripts/bench_bulk_cases.py [size ...]
+       (default sizes: 1000 10000)
+"""
+
+import os
+import sys
+import time
+from datetime import date, timedelta
+
+import psycopg2
+from psycopg2.extras import RealDictCursor
+
+# Add backend directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from config import DB_CONNECTION_PARAMS
+from db.matcher import BULK_TXN_CHECK_SQL, bulk_txn_check_params
+from db.unit_of_work import insert_case_main_row, insert_case_main_rows
+
+
+def make_cases(size: int):
+    return [{
+        'case_type': 'BENCH', 'source_ack_no': f"BENCH{i:08d}_BENCH", 'cust_id': f"BC{i:08d}",
+        'acc_num': f"BA{i:010d}", 'source_bene_accno': f"BB{i:010d}", 'is_operational': True,
+        'status': 'New', 'location': 'bench', 'disputed_amount': float(i % 5000), 'created_by': 'bench',
+    } for i in range(size)]
+
+
+def make_pairs(cur, size: int):
+    to_date = date.today()
+    from_date = to_date - timedelta(days=365)
+    cur.execute("SELECT DISTINCT acct_num, bene_acct_num FROM public.txn LIMIT %s", (size // 2,))
+    known = [(row['acct_num'], row['bene_acct_num']) for row in cur.fetchall()]
+    unknown = [(f"BA{i:010d}", f"BB{i:010d}") for i in range(size - len(known))]
+    return [{'vm_acc': vm, 'bm_acc': bm, 'from_date': from_date, 'to_date': to_date}
+            for vm, bm in known + unknown]
+
+
+def timed(conn, func):
+    """Seconds for func(cur), rolled back afterwards"""
+    with conn.cursor(cursor_factory=RealDictCursor) as cur:
+        start = time.perf_counter()
+        func(cur)
+        elapsed = time.perf_counter() - start
+    conn.rollback()
+    return elapsed
+
+
+def insert_per_row(cur, cases):
+    for case in cases:
+        insert_case_main_row(cur, **case)
+
+
+def check_per_pair(cur, pairs):
+    results = {}
+    for pair in pairs:
+        cur.execute("""
+            SELECT COUNT(*) FROM public.txn
+            WHERE acct_num = %s AND bene_acct_num = %s
+              AND txn_date BETWEEN %s AND %s;
+        """, (pair['vm_acc'], pair['bm_acc'], pair['from_date'], pair['to_date']))
+        results[f"{pair['vm_acc']}_{pair['bm_acc']}"] = cur.fetchone()['count'] > 0
+    return results
+
+
+def check_bulk(cur, pairs):
+    cur.execute(BULK_TXN_CHECK_SQL, bulk_txn_check_params(pairs))
+    return {f"{row['vm_acc']}_{row['bm_acc']}": row['has_txn'] for row in cur.fetchall()}
+
+
+def main(sizes):
+    conn = psycopg2.connect(
+        host=DB_CONNECTION_PARAMS["host"],
+        port=DB_CONNECTION_PARAMS["port"],
+        dbname=DB_CONNECTION_PARAMS["database"],
+        user=DB_CONNECTION_PARAMS["user"],
+        password=DB_CONNECTION_PARAMS["password"]
+    )
+    try:
+        print(f"{'operation':<28} {'rows':>7} {'per-row s':>10} {'bulk s':>8} {'per-row/s':>10} {'bulk/s':>10}")
+        for size in sizes:
+            cases = make_cases(size)
+            with conn.cursor(cursor_factory=RealDictCursor) as cur:
+                pairs = make_pairs(cur, size)
+            conn.rollback()
+
+            slow = timed(conn, lambda cur: insert_per_row(cur, cases))
+            fast = timed(conn, lambda cur: insert_case_main_rows(cur, cases))
+            print(f"{'insert case_main':<28} {size:>7} {slow:>10.3f} {fast:>8.3f} "
+                  f"{size / slow:>10.0f} {size / fast:>10.0f}")
+
+            checked = {}
+            slow = timed(conn, lambda cur: checked.setdefault('per_pair', check_per_pair(cur, pairs)))
+            fast = timed(conn, lambda cur: checked.setdefault('bulk', check_bulk(cur, pairs)))
+            if checked['per_pair'] != checked['bulk']:
+                print("❌ bulk transaction check disagrees with the per-pair check", flush=True)
+            print(f"{'check transactions':<28} {len(pairs):>7} {slow:>10.3f} {fast:>8.3f} "
+                  f"{len(pairs) / slow:>10.0f} {len(pairs) / fast:>10.0f}")
+    finally:
+        conn.rollback()
+        conn.close()
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [1000, 10000])
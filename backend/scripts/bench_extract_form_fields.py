@@ -0,0 +1,56 @@
+"""
+Micro-benchmark: extract_form_fields() throughput on the sample emails.
+
+Runs the extractor over sample_fraud_email.txt and perfect_test_email.txt from the
+repository root, each on its own and concatenated N times (a stand-in for a long
+multi-page OCR dump), and prints the time per call and the throughput in MB/s.
+
+Usage: python backend/scripts/bench_extract_form_fields.py [repeat ...]
+       (default repeats: 1 20 100)
+"""
+
+import os
+import sys
+import time
+
+# Add backend directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from services.email_parser import extract_form_fields
+
+REPO_ROOT = os.path.join(os.path.dirname(__file__), '..', '..')
+SAMPLES = ["sample_fraud_email.txt", "perfect_test_email.txt"]
+MIN_SECONDS = 1.0
+
+
+def bench(text: str):
+    """(seconds per call, MB/s), timing calls until at least MIN_SECONDS have passed"""
+    extract_form_fields(text)  # warm up compiled patterns
+    calls = 0
+    start = time.perf_counter()
+    while True:
+        extract_form_fields(text)
+        calls += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= MIN_SECONDS:
+            break
+    per_call = elapsed / calls
+    return per_call, len(text.encode("utf-8")) / per_call / 1e6
+
+
+def main(repeats):
+    texts = {}
+    for name in SAMPLES:
+        with open(os.path.join(REPO_ROOT, name), encoding="utf-8") as f:
+            texts[name] = f.read()
+    combined = "\n\n".join(texts.values())
+
+    print(f"{'input':<40} {'bytes':>10} {'ms/call':>10} {'MB/s':>8}")
+    cases = [(name, text) for name, text in texts.items()]
+    cases += [(f"both samples x{n}", "\n\n".join([combined] * n)) for n in repeats]
+    for label, text in cases:
+        per_call, mb_s = bench(text)
+        print(f"{label:<40} {len(text.encode('utf-8')):>10} {per_call * 1000:>10.2f} {mb_s:>8.2f}")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [1, 20, 100])
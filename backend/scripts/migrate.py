@@ -0,0 +1,133 @@
+"""
+Versioned migrations for the trigger-maintained tables.
+
+Installs the tables, views, trigger functions and triggers behind the dashboard
+rollups (services/dashboard_rollups.py), the fraud-pattern alerts
+(services/fraud_alerts.py) and the entity graph (services/entity_graph.py) once per
+database, instead of every uvicorn worker doing it at startup. CREATE/DROP TRIGGER locks the table it is attached to,
+so each migration runs in its own transaction with a short lock_timeout: on a busy
+table it fails fast (re-run it later) instead of queueing live traffic behind its
+lock. Applied versions are recorded in schema_migrations and re-running applies
+only the missing ones. Running workers pick an installed migration up on their
+next maintenance pass.
+
+--drop removes one migration's triggers and queued work, e.g. before turning the
+feature off with its *_ENABLED setting, and forgets the version so that a later
+run installs it again.
+
+Usage: python backend/scripts/migrate.py                apply pending migrations
+       python backend/scripts/migrate.py --status       list migrations
+       python backend/scripts/migrate.py --drop NAME    e.g. --drop dashboard_rollups
+"""
+
+import psycopg2
+import sys
+import os
+
+# Add backend directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from config import DB_CONNECTION_PARAMS
+from db.schema import applied_migrations, ensure_migrations_table, forget_migration, record_migration
+from services.dashboard_rollups import install_rollups, uninstall_rollups
+from services.entity_graph import install_entity_graph, uninstall_entity_graph
+from services.fraud_alerts import install_fraud_alerts, uninstall_fraud_alerts
+
+LOCK_TIMEOUT = "5s"
+
+# (version, install, uninstall); versions are applied in this order and never edited
+# once shipped: change a trigger by adding a new version.
+MIGRATIONS = [
+    ("0001_dashboard_rollups", install_rollups, uninstall_rollups),
+    ("0002_fraud_alerts", install_fraud_alerts, uninstall_fraud_alerts),
+    ("0003_entity_graph", install_entity_graph, uninstall_entity_graph),
+]
+
+
+def _name(version: str) -> str:
+    return version.split("_", 1)[1]
+
+
+def _connect():
+    return psycopg2.connect(
+        host=DB_CONNECTION_PARAMS["host"],
+        port=DB_CONNECTION_PARAMS["port"],
+        dbname=DB_CONNECTION_PARAMS["database"],
+        user=DB_CONNECTION_PARAMS["user"],
+        password=DB_CONNECTION_PARAMS["password"]
+    )
+
+
+def _begin(cur):
+    """Start a migration transaction: one runner at a time, fail fast on a busy table."""
+    cur.execute("SELECT pg_advisory_xact_lock(hashtext('schema_migrations'))")
+    cur.execute("SET LOCAL lock_timeout = %s", (LOCK_TIMEOUT,))
+    ensure_migrations_table(cur)
+
+
+def migrate(conn):
+    with conn.cursor() as cur:
+        applied = applied_migrations(cur)
+    conn.commit()
+    pending = [m for m in MIGRATIONS if m[0] not in applied]
+    if not pending:
+        print("✅ Schema is up to date")
+        return
+    for version, install, _ in pending:
+        with conn.cursor() as cur:
+            _begin(cur)
+            if version in applied_migrations(cur):  # applied by a concurrent run meanwhile
+                conn.commit()
+                continue
+            install(cur)
+            record_migration(cur, version)
+        conn.commit()
+        print(f"✅ Applied {version}")
+
+
+def drop(conn, name: str):
+    matches = [m for m in MIGRATIONS if _name(m[0]) == name]
+    if not matches:
+        print(f"❌ Unknown migration '{name}' (one of: {', '.join(_name(m[0]) for m in MIGRATIONS)})")
+        sys.exit(1)
+    version, _, uninstall = matches[0]
+    with conn.cursor() as cur:
+        _begin(cur)
+        uninstall(cur)
+        forget_migration(cur, version)
+    conn.commit()
+    print(f"✅ Dropped {version}")
+
+
+def status(conn):
+    with conn.cursor() as cur:
+        applied = applied_migrations(cur)
+    for version, _, _ in MIGRATIONS:
+        print(f"  [{'x' if version in applied else ' '}] {version}")
+
+
+def main(args):
+    conn = _connect()
+    try:
+        if args[:1] == ["--status"]:
+            status(conn)
+        elif args[:1] == ["--drop"] and len(args) == 2:
+            drop(conn, args[1])
+        elif not args:
+            migrate(conn)
+        else:
+            print(__doc__)
+            sys.exit(2)
+    except psycopg2.errors.LockNotAvailable as e:
+        conn.rollback()
+        print(f"❌ A table was busy for longer than {LOCK_TIMEOUT}, the migration in progress was rolled back; re-run later: {e}")
+        sys.exit(1)
+    except Exception as e:
+        conn.rollback()
+        print(f"❌ Migration failed: {e}")
+        sys.exit(1)
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -1,22 +1,63 @@
 # services/anomaly.py
-# Import necessary libraries here if your actual model requires them
-# import json
-# import requests 
+"""
+In-process transaction classification with the IsolationForest trained by train.py.
+
+The detector is created once on app startup and loads the model artifacts through
+services/fraud_model.py (memory-mapped, see FRAUD_MODEL_MMAP), so classifying a
+transaction no longer needs a call to the separate model_api service.
+
+Requests are scored in micro-batches: classify() queues the transaction and the
+first one to arrive schedules a flush after FRAUD_MICROBATCH_MAX_WAIT_MS (or as soon
+as FRAUD_MICROBATCH_MAX_SIZE are waiting). The whole batch then goes through one
+vectorized decision_function call on the executor, and every caller gets its own
+result. Each transaction is scored on its own: fields it does not carry (date, time,
+fee, channel, ...) take neutral defaults, and it is not compared with the others
+in its batch.
+
+If the artifacts are not deployed (or fail to load) the detector falls back to the
+amount/description rules it used before the model was wired in, and says so in
+the reason.
+"""
+import asyncio
+from concurrent.futures import Executor
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+
+from config import FRAUD_MICROBATCH_MAX_SIZE, FRAUD_MICROBATCH_MAX_WAIT_MS
+from services.fraud_model import FraudScoringEngine, get_scoring_engine
+
 
 class AnomalyDetector:
     def __init__(self):
-        # This is a placeholder for your actual model loading logic.
-        # For example:
-        # self.model = load_your_ml_model_here()
-        print("✅ AnomalyDetector initialized. (Placeholder for model loading).")
+        self.engine: Optional[FraudScoringEngine] = None
+        try:
+            engine = get_scoring_engine()
+            if engine.iso_forest is not None:
+                self.engine = engine
+            else:
+                print("WARNING: AnomalyDetector has no Isolation Forest artifacts; using rule-based fallback.", flush=True)
+        except Exception as e:
+            print(f"WARNING: AnomalyDetector could not load the fraud model ({e}); using rule-based fallback.", flush=True)
+        self._pending: List[tuple] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._batches: set = set()
+        mode = "Isolation Forest" if self.engine else "rule-based fallback"
+        print(f"✅ AnomalyDetector initialized ({mode}).", flush=True)
 
-    def classify_transaction(self, transaction_data: dict) -> dict:
-        """
-        Placeholder for your actual transaction classification logic.
-        This method should take a transaction dictionary and return a dict
-        with 'classification' (e.g., "Anomaly", "Normal") and 'reason'.
-        """
-        # Example placeholder logic:
+    # --- scoring (blocking; runs on the executor) ---
+
+    @staticmethod
+    def _model_row(transaction: Dict[str, Any], now: datetime) -> Dict[str, Any]:
+        row = dict(transaction)
+        row.setdefault('txn_date', now.strftime('%Y-%m-%d'))
+        row.setdefault('txn_time', now.strftime('%H:%M:%S'))
+        row.setdefault('fee', 0.0)
+        return row
+
+    @staticmethod
+    def _rule_based(transaction_data: Dict[str, Any]) -> Dict[str, Any]:
         amount = transaction_data.get('amount', 0)
         if isinstance(amount, str):
             try:
@@ -24,15 +65,79 @@ class AnomalyDetector:
             except ValueError:
                 amount = 0 # Default to 0 if amount is not a valid number
 
-        if amount > 50000: # Example threshold
+        if amount > 50000:
             classification = "Anomaly"
-            reason = "Transaction amount exceeds high-value threshold (example rule)."
-        elif transaction_data.get('descr', '').lower() == 'suspicious activity': # Example rule
+            reason = "Transaction amount exceeds high-value threshold (rule-based fallback, model not loaded)."
+        elif (transaction_data.get('descr') or '').lower() == 'suspicious activity':
             classification = "Anomaly"
-            reason = "Description contains suspicious keywords (example rule)."
+            reason = "Description contains suspicious keywords (rule-based fallback, model not loaded)."
         else:
             classification = "Normal"
-            reason = "Transaction within typical parameters (example rule)."
-
-        # This is the format expected by db/matcher.py insert_case_decisions
+            reason = "Transaction within typical parameters (rule-based fallback, model not loaded)."
         return {"classification": classification, "reason": reason}
+
+    def classify_batch(self, transactions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Results for `transactions`, in order, from one vectorized pass through the model."""
+        if self.engine is None:
+            return [self._rule_based(t) for t in transactions]
+        now = datetime.now()
+        frame = pd.DataFrame([self._model_row(t, now) for t in transactions])
+        # Score every transaction on its own: a distinct key per row, so no time gap
+        # is computed between unrelated requests that share a batch
+        frame['acct_num'] = range(len(frame))
+        scored = self.engine.transaction_features(frame).sort_index()
+        results = []
+        for score, label in zip(scored['anomaly_score_if'], scored['anomaly_label_if']):
+            if label:
+                classification = "Anomaly"
+                reason = f"Isolation Forest flags the transaction as anomalous (score {score:.3f}; below 0 is anomalous)."
+            else:
+                classification = "Normal"
+                reason = f"Isolation Forest finds the transaction within typical parameters (score {score:.3f})."
+            # This is the format expected by db/matcher.py insert_case_decisions
+            results.append({"classification": classification, "reason": reason, "anomaly_score": float(score)})
+        return results
+
+    def classify_transaction(self, transaction_data: dict) -> dict:
+        """
+        Classifies one transaction dictionary, returning 'classification'
+        ("Anomaly" / "Normal"), 'reason' and, with the model, 'anomaly_score'.
+        """
+        return self.classify_batch([transaction_data])[0]
+
+    # --- micro-batching (event loop side) ---
+
+    async def classify(self, transaction_data: Dict[str, Any], executor: Executor) -> Dict[str, Any]:
+        """classify_transaction, batched with the other requests arriving within the flush window."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((transaction_data, future))
+        if len(self._pending) >= FRAUD_MICROBATCH_MAX_SIZE:
+            self._flush(executor)
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(FRAUD_MICROBATCH_MAX_WAIT_MS / 1000, self._flush, executor)
+        return await future
+
+    def _flush(self, executor: Executor) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.get_running_loop().create_task(self._run_batch(batch, executor))
+            self._batches.add(task)
+            task.add_done_callback(self._batches.discard)
+
+    async def _run_batch(self, batch: List[tuple], executor: Executor) -> None:
+        try:
+            results = await asyncio.get_running_loop().run_in_executor(
+                executor, self.classify_batch, [transaction for transaction, _ in batch]
+            )
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
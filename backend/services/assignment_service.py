@@ -3,6 +3,8 @@ from models import SessionLocal
 from sqlalchemy.orm import Session
 from typing import List, Optional
 
+from db.cache import notify_dashboard_change
+
 class AssignmentService:
     def __init__(self, db_session: Optional[Session] = None):
         self.db = db_session or SessionLocal()
@@ -14,6 +16,7 @@ class AssignmentService:
             assigned_by=assigned_by
         )
         self.db.add(assignment)
+        self._notify_dashboard_change()
         self.db.commit()
         self.db.refresh(assignment)
         return assignment
@@ -24,6 +27,11 @@ class AssignmentService:
     def get_assignment_by_id(self, assignment_id: int) -> Optional[Assignment]:
         return self.db.query(Assignment).filter(Assignment.id == assignment_id).first()
 
+    def _notify_dashboard_change(self):
+        # Queued on the session's own DB-API connection, so it is sent when the session commits
+        with self.db.connection().connection.cursor() as cur:
+            notify_dashboard_change(cur, "assignment")
+
     def update_assignment(self, assignment_id: int, **kwargs) -> Optional[Assignment]:
         assignment = self.get_assignment_by_id(assignment_id)
         if not assignment:
@@ -31,6 +39,7 @@ class AssignmentService:
         for key, value in kwargs.items():
             if hasattr(assignment, key):
                 setattr(assignment, key, value)
+        self._notify_dashboard_change()
         self.db.commit()
         self.db.refresh(assignment)
         return assignment
@@ -40,5 +49,6 @@ class AssignmentService:
         if not assignment:
             return False
         self.db.delete(assignment)
+        self._notify_dashboard_change()
         self.db.commit()
         return True
\ No newline at end of file
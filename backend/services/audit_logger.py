@@ -6,7 +6,7 @@ Stores failed/invalid requests for audit purposes
 import psycopg2
 import psycopg2.extras
 from typing import Dict, Any, Optional
-from config import DB_CONNECTION_PARAMS
+from db.connection import get_db_connection
 
 
 def store_failed_request(
@@ -27,30 +27,21 @@ def store_failed_request(
         error_details: Additional error details as dict
     """
     try:
-        conn = psycopg2.connect(
-            host=DB_CONNECTION_PARAMS["host"],
-            port=DB_CONNECTION_PARAMS["port"],
-            dbname=DB_CONNECTION_PARAMS["database"],
-            user=DB_CONNECTION_PARAMS["user"],
-            password=DB_CONNECTION_PARAMS["password"]
-        )
-        cur = conn.cursor()
-        
-        cur.execute("""
-            INSERT INTO banks_v2_failed_requests 
-            (acknowledgement_no, raw_request_body, failure_reason, failure_type, error_details)
-            VALUES (%s, %s, %s, %s, %s)
-        """, (
-            ack_no or "Unknown",
-            psycopg2.extras.Json(raw_body),
-            failure_reason,
-            failure_type,
-            psycopg2.extras.Json(error_details) if error_details else None
-        ))
-        
-        conn.commit()
-        cur.close()
-        conn.close()
+        with get_db_connection(caller="audit_logger") as conn:
+            with conn.cursor() as cur:
+                cur.execute("""
+                    INSERT INTO banks_v2_failed_requests 
+                    (acknowledgement_no, raw_request_body, failure_reason, failure_type, error_details)
+                    VALUES (%s, %s, %s, %s, %s)
+                """, (
+                    ack_no or "Unknown",
+                    psycopg2.extras.Json(raw_body),
+                    failure_reason,
+                    failure_type,
+                    psycopg2.extras.Json(error_details) if error_details else None
+                ))
+
+                conn.commit()
         
         print(f"[AUDIT] Stored failed request: ack={ack_no}, type={failure_type}, reason={failure_reason}", flush=True)
     except Exception as e:
@@ -86,26 +77,17 @@ def extract_ack_from_request(body_bytes: bytes) -> tuple[str, dict]:
 def get_all_failed_requests() -> list:
     """Get all failed requests from audit table"""
     try:
-        conn = psycopg2.connect(
-            host=DB_CONNECTION_PARAMS["host"],
-            port=DB_CONNECTION_PARAMS["port"],
-            dbname=DB_CONNECTION_PARAMS["database"],
-            user=DB_CONNECTION_PARAMS["user"],
-            password=DB_CONNECTION_PARAMS["password"]
-        )
-        cur = conn.cursor()
-        
-        cur.execute("""
-            SELECT 
-                id, acknowledgement_no, failure_type, failure_reason,
-                error_details, created_at
-            FROM banks_v2_failed_requests 
-            ORDER BY created_at DESC
-        """)
-        
-        records = cur.fetchall()
-        cur.close()
-        conn.close()
+        with get_db_connection(caller="audit_logger") as conn:
+            with conn.cursor() as cur:
+                cur.execute("""
+                    SELECT 
+                        id, acknowledgement_no, failure_type, failure_reason,
+                        error_details, created_at
+                    FROM banks_v2_failed_requests 
+                    ORDER BY created_at DESC
+                """)
+
+                records = cur.fetchall()
         
         return records
     except Exception as e:
@@ -116,27 +98,18 @@ def get_all_failed_requests() -> list:
 def get_failed_requests_by_ack(ack_no: str) -> list:
     """Get failed requests by acknowledgement number"""
     try:
-        conn = psycopg2.connect(
-            host=DB_CONNECTION_PARAMS["host"],
-            port=DB_CONNECTION_PARAMS["port"],
-            dbname=DB_CONNECTION_PARAMS["database"],
-            user=DB_CONNECTION_PARAMS["user"],
-            password=DB_CONNECTION_PARAMS["password"]
-        )
-        cur = conn.cursor()
-        
-        cur.execute("""
-            SELECT 
-                id, acknowledgement_no, failure_type, failure_reason,
-                error_details, raw_request_body, created_at
-            FROM banks_v2_failed_requests 
-            WHERE acknowledgement_no = %s
-            ORDER BY created_at DESC
-        """, (ack_no,))
-        
-        records = cur.fetchall()
-        cur.close()
-        conn.close()
+        with get_db_connection(caller="audit_logger") as conn:
+            with conn.cursor() as cur:
+                cur.execute("""
+                    SELECT 
+                        id, acknowledgement_no, failure_type, failure_reason,
+                        error_details, raw_request_body, created_at
+                    FROM banks_v2_failed_requests 
+                    WHERE acknowledgement_no = %s
+                    ORDER BY created_at DESC
+                """, (ack_no,))
+
+                records = cur.fetchall()
         
         return records
     except Exception as e:
@@ -147,27 +120,18 @@ def get_failed_requests_by_ack(ack_no: str) -> list:
 def mark_request_resolved(record_id: int, resolved_by: str, notes: str = None) -> bool:
     """Mark a failed request as resolved"""
     try:
-        conn = psycopg2.connect(
-            host=DB_CONNECTION_PARAMS["host"],
-            port=DB_CONNECTION_PARAMS["port"],
-            dbname=DB_CONNECTION_PARAMS["database"],
-            user=DB_CONNECTION_PARAMS["user"],
-            password=DB_CONNECTION_PARAMS["password"]
-        )
-        cur = conn.cursor()
-        
-        cur.execute("""
-            UPDATE banks_v2_failed_requests
-            SET resolved = true,
-                resolved_at = NOW(),
-                resolved_by = %s,
-                notes = %s
-            WHERE id = %s
-        """, (resolved_by, notes, record_id))
-        
-        conn.commit()
-        cur.close()
-        conn.close()
+        with get_db_connection(caller="audit_logger") as conn:
+            with conn.cursor() as cur:
+                cur.execute("""
+                    UPDATE banks_v2_failed_requests
+                    SET resolved = true,
+                        resolved_at = NOW(),
+                        resolved_by = %s,
+                        notes = %s
+                    WHERE id = %s
+                """, (resolved_by, notes, record_id))
+
+                conn.commit()
         
         print(f"[AUDIT] Marked request {record_id} as resolved", flush=True)
         return True
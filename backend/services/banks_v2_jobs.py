@@ -0,0 +1,225 @@
+"""
+Durable job queue for Banks v2 case entry (async mode).
+
+/api/v2/banks/case-entry?mode=async finishes Phase 1 (envelope upsert, VM case,
+incident validation) inside the request, then stores everything Phase 2 needs
+(deferred PSA/ECBT/ECBNT actions, transactions, validations) as a row in
+banks_v2_jobs and returns the ack with its job_id. A background worker claims
+queued rows with FOR UPDATE SKIP LOCKED, so several uvicorn workers can share the
+queue, and checkpoints progress after every action so a job that was interrupted
+(crash, redeploy) is picked up again and resumes where it stopped.
+"""
+
+import asyncio
+import json
+import socket
+import os
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+import psycopg2.extras
+
+from config import (
+    BANKS_V2_JOB_MAX_ATTEMPTS,
+    BANKS_V2_JOB_POLL_SECONDS,
+    BANKS_V2_JOB_STALE_SECONDS,
+)
+from db.connection import get_db_connection
+
+_WORKER_ID = f"{socket.gethostname()}:{os.getpid()}"
+_table_ready = False
+_job_enqueued: Optional[asyncio.Event] = None
+_worker_loop: Optional[asyncio.AbstractEventLoop] = None  # loop that owns _job_enqueued
+
+
+def _json(value: Any) -> psycopg2.extras.Json:
+    # Case payloads carry dates/decimals from the txn table; store them as strings
+    return psycopg2.extras.Json(value, dumps=lambda v: json.dumps(v, default=str))
+
+
+def ensure_jobs_table() -> None:
+    """Create banks_v2_jobs if needed (once per process)."""
+    global _table_ready
+    if _table_ready:
+        return
+    with get_db_connection(caller="banks_v2_jobs") as conn:
+        with conn.cursor() as cur:
+            cur.execute("""
+                CREATE TABLE IF NOT EXISTS banks_v2_jobs (
+                    job_id VARCHAR(64) PRIMARY KEY,
+                    acknowledgement_no VARCHAR(50) NOT NULL,
+                    status VARCHAR(20) NOT NULL DEFAULT 'queued',
+                    envelope JSONB NOT NULL,
+                    checkpoint JSONB,
+                    result JSONB,
+                    error TEXT,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    actions_total INTEGER NOT NULL DEFAULT 0,
+                    actions_done INTEGER NOT NULL DEFAULT 0,
+                    locked_by VARCHAR(100),
+                    locked_at TIMESTAMP,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    started_at TIMESTAMP,
+                    completed_at TIMESTAMP,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+            cur.execute("CREATE INDEX IF NOT EXISTS idx_banks_v2_jobs_status_created ON banks_v2_jobs (status, created_at)")
+            cur.execute("CREATE INDEX IF NOT EXISTS idx_banks_v2_jobs_ack_no ON banks_v2_jobs (acknowledgement_no)")
+            conn.commit()
+    _table_ready = True
+
+
+def enqueue_job(job_id: str, ack_no: str, envelope: Dict[str, Any], actions_total: int) -> None:
+    """Persist a Phase 2 envelope as a queued job."""
+    ensure_jobs_table()
+    with get_db_connection(caller="banks_v2_jobs") as conn:
+        with conn.cursor() as cur:
+            cur.execute("""
+                INSERT INTO banks_v2_jobs (job_id, acknowledgement_no, status, envelope, actions_total)
+                VALUES (%s, %s, 'queued', %s, %s)
+            """, (job_id, ack_no, _json(envelope), actions_total))
+            conn.commit()
+    _wake_worker()
+
+
+def _wake_worker() -> None:
+    """Wake this process's job worker. Called from executor threads, so the Event is
+    set on the worker's own loop (asyncio.Event is not thread-safe)."""
+    if _job_enqueued is None or _worker_loop is None:
+        return
+    try:
+        _worker_loop.call_soon_threadsafe(_job_enqueued.set)
+    except RuntimeError:  # loop already closed during shutdown
+        pass
+
+
+def claim_next_job() -> Optional[Dict[str, Any]]:
+    """
+    Claim the oldest queued job, or a 'processing' job whose worker stopped
+    heartbeating, for this worker. Returns None when the queue is empty.
+    """
+    ensure_jobs_table()
+    with get_db_connection(caller="banks_v2_jobs") as conn:
+        with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cur:
+            cur.execute("""
+                UPDATE banks_v2_jobs j
+                SET status = 'processing',
+                    attempts = j.attempts + 1,
+                    locked_by = %s,
+                    locked_at = NOW(),
+                    started_at = COALESCE(j.started_at, NOW()),
+                    updated_at = NOW()
+                WHERE j.job_id = (
+                    SELECT job_id FROM banks_v2_jobs
+                    WHERE status = 'queued'
+                       OR (status = 'processing' AND locked_at < NOW() - make_interval(secs => %s))
+                    ORDER BY created_at
+                    FOR UPDATE SKIP LOCKED
+                    LIMIT 1
+                )
+                RETURNING j.job_id, j.acknowledgement_no, j.envelope, j.checkpoint, j.attempts
+            """, (_WORKER_ID, BANKS_V2_JOB_STALE_SECONDS))
+            job = cur.fetchone()
+            conn.commit()
+    return dict(job) if job else None
+
+
+def save_checkpoint(cur, job_id: str, checkpoint: Dict[str, Any], actions_done: int) -> None:
+    """
+    Record progress after an action and refresh the job's lock. Runs on the caller's
+    cursor without committing, so the checkpoint lands in the same transaction as the
+    cases it records. Raises if another worker has reclaimed the job meanwhile, which
+    makes the caller roll those cases back instead of creating them twice.
+    """
+    cur.execute("""
+        UPDATE banks_v2_jobs
+        SET checkpoint = %s, actions_done = %s, locked_at = NOW(), updated_at = NOW()
+        WHERE job_id = %s AND locked_by = %s
+    """, (_json(checkpoint), actions_done, job_id, _WORKER_ID))
+    if cur.rowcount == 0:
+        raise RuntimeError(f"Job {job_id} is no longer locked by {_WORKER_ID}")
+
+
+def complete_job(job_id: str, result: Dict[str, Any]) -> None:
+    with get_db_connection(caller="banks_v2_jobs") as conn:
+        with conn.cursor() as cur:
+            cur.execute("""
+                UPDATE banks_v2_jobs
+                SET status = 'completed', result = %s, error = NULL, actions_done = actions_total,
+                    locked_by = NULL, locked_at = NULL, completed_at = NOW(), updated_at = NOW()
+                WHERE job_id = %s
+            """, (_json(result), job_id))
+            conn.commit()
+
+
+def fail_job(job_id: str, error: str, attempts: int) -> None:
+    """Requeue the job, or mark it failed once it has used up its attempts."""
+    status = "failed" if attempts >= BANKS_V2_JOB_MAX_ATTEMPTS else "queued"
+    with get_db_connection(caller="banks_v2_jobs") as conn:
+        with conn.cursor() as cur:
+            cur.execute("""
+                UPDATE banks_v2_jobs
+                SET status = %s, error = %s, locked_by = NULL, locked_at = NULL,
+                    completed_at = CASE WHEN %s = 'failed' THEN NOW() ELSE NULL END,
+                    updated_at = NOW()
+                WHERE job_id = %s
+            """, (status, error, status, job_id))
+            conn.commit()
+
+
+def get_job(job_id: str) -> Optional[Dict[str, Any]]:
+    ensure_jobs_table()
+    with get_db_connection(caller="banks_v2_jobs") as conn:
+        with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cur:
+            cur.execute("""
+                SELECT job_id, acknowledgement_no, status, result, error, attempts,
+                       actions_total, actions_done, created_at, started_at, completed_at, updated_at
+                FROM banks_v2_jobs WHERE job_id = %s
+            """, (job_id,))
+            row = cur.fetchone()
+    return dict(row) if row else None
+
+
+async def run_job_worker(executor, handler: Callable[[Dict[str, Any]], Awaitable[Dict[str, Any]]]) -> None:
+    """
+    Background loop (one per uvicorn worker): claim jobs and run `handler` on them
+    until cancelled. Sleeps BANKS_V2_JOB_POLL_SECONDS when idle, or less if a job
+    is enqueued from this process.
+    """
+    global _job_enqueued, _worker_loop
+    _job_enqueued = asyncio.Event()
+    loop = _worker_loop = asyncio.get_running_loop()
+    print(f"[v2-jobs] Worker {_WORKER_ID} started", flush=True)
+    while True:
+        # Cleared before claiming, so an enqueue that lands during the claim still wakes us
+        _job_enqueued.clear()
+        try:
+            job = await loop.run_in_executor(executor, claim_next_job)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"[v2-jobs] Could not claim job: {e}", flush=True)
+            job = None
+
+        if job is None:
+            try:
+                await asyncio.wait_for(_job_enqueued.wait(), timeout=BANKS_V2_JOB_POLL_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+            continue
+
+        job_id = job["job_id"]
+        print(f"[v2-jobs] Processing job {job_id} ack={job['acknowledgement_no']} attempt={job['attempts']}", flush=True)
+        try:
+            result = await handler(job)
+            await loop.run_in_executor(executor, complete_job, job_id, result)
+            print(f"[v2-jobs] Job {job_id} completed", flush=True)
+        except asyncio.CancelledError:
+            # Shutdown: leave the row 'processing'; it is reclaimed once its lock goes stale
+            raise
+        except Exception as e:
+            print(f"[v2-jobs] Job {job_id} failed (attempt {job['attempts']}): {e}", flush=True)
+            try:
+                await loop.run_in_executor(executor, fail_job, job_id, str(e), job["attempts"])
+            except Exception as mark_err:
+                print(f"[v2-jobs] Could not record failure for job {job_id}: {mark_err}", flush=True)
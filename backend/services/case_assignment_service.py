@@ -5,9 +5,9 @@ This service handles automatic assignment of new cases to risk officers.
 All cases are assigned to a general risk officer queue without complex rules.
 """
 
-import psycopg2
 from typing import Dict, List, Optional
-from config import DB_CONNECTION_PARAMS
+from db.connection import get_db_connection
+from db.cache import notify_dashboard_change
 from concurrent.futures import ThreadPoolExecutor
 
 
@@ -22,7 +22,7 @@ class CaseAssignmentService:
     
     def _get_risk_officers(self) -> List[Dict[str, str]]:
         """Get all active risk officers from user_table"""
-        with psycopg2.connect(**DB_CONNECTION_PARAMS) as conn:
+        with get_db_connection(caller="case_assignment") as conn:
             with conn.cursor() as cur:
                 cur.execute("""
                     SELECT user_name, dept 
@@ -167,7 +167,7 @@ class CaseAssignmentService:
                     return None
                 
                 # Create assignment record
-                with psycopg2.connect(**DB_CONNECTION_PARAMS) as conn:
+                with get_db_connection(caller="case_assignment") as conn:
                     with conn.cursor() as cur:
                         # Ensure columns exist
                         cur.execute("ALTER TABLE assignment ADD COLUMN IF NOT EXISTS is_active BOOLEAN DEFAULT TRUE")
@@ -178,6 +178,7 @@ class CaseAssignmentService:
                             INSERT INTO assignment (case_id, assigned_to, assigned_by, comment, is_active, assignment_type)
                             VALUES (%s, %s, %s, %s, TRUE, 'auto')
                         """, (case_id, assigned_user, assigned_by, f"Auto-assigned {case_type} case to general queue"))
+                        notify_dashboard_change(cur, "assignment")
                         
                         conn.commit()
                         print(f"✅ Case {case_id} successfully assigned to general queue: {assigned_user}", flush=True)
@@ -196,7 +197,7 @@ class CaseAssignmentService:
                 risk_officers = self._get_risk_officers()
                 
                 # Get actual case counts from database
-                with psycopg2.connect(**DB_CONNECTION_PARAMS) as conn:
+                with get_db_connection(caller="case_assignment") as conn:
                     with conn.cursor() as cur:
                         cur.execute("""
                             SELECT assigned_to, COUNT(*) as case_count
@@ -0,0 +1,510 @@
+"""
+Incrementally maintained rollups behind the dashboard aggregates.
+
+The advanced-analytics, real-time-metrics and performance endpoints used to GROUP BY
+all of case_main (joined to assignment/user_table) on every call. They now read two
+small rollup tables instead:
+
+- dashboard_case_rollup: case counts, resolution-day sums and disputed-amount sums
+  per (creation_date, closing_date, case_type, status, assigned_to).
+- dashboard_assignment_rollup: the same per assignment row, keyed by
+  (assigned_to, creation_date, status); departments are joined from user_table at
+  read time, so a user's department change shows up immediately.
+
+Row triggers on case_main and assignment append +1/-1 deltas to
+dashboard_rollup_deltas (insert-only, so concurrent writers never contend on a
+rollup row). The *_live views add the pending deltas to the rollups, so reads are
+exact at any time. A background job (one per uvicorn worker, serialized through an
+advisory lock) folds the deltas into the rollups every DASHBOARD_ROLLUP_FOLD_SECONDS
+and rebuilds them from the base tables every DASHBOARD_ROLLUP_RECONCILE_SECONDS,
+logging any drift it corrects. Until the first rebuild has run the endpoints keep
+querying case_main directly (rollups_ready()).
+
+The tables, views and triggers are installed by scripts/migrate.py
+(install_rollups) and removed by its --drop (uninstall_rollups); workers only
+check at startup that the triggers are there.
+
+Key columns are stored NOT NULL with sentinels ('-infinity' dates, '' text) so the
+rollups can be upserted on a primary key; the views turn them back into NULLs.
+"""
+
+import asyncio
+from typing import Dict, List, Tuple
+
+from psycopg2.errors import SerializationFailure
+
+from config import (
+    DASHBOARD_ROLLUP_FOLD_SECONDS,
+    DASHBOARD_ROLLUP_RECONCILE_SECONDS,
+    DASHBOARD_ROLLUPS_ENABLED,
+)
+from db.cache import notify_dashboard_change
+from db.connection import get_db_connection
+from db.schema import missing_triggers
+
+_NO_DATE = "'-infinity'::date"
+_NO_TEXT = "''"
+
+# rollup name -> table, key columns (name, type, sentinel) and measure columns (name, type).
+# The first measure is the row count; in dashboard_rollup_deltas it is row_count.
+_ROLLUPS: Dict[str, Dict] = {
+    "case": {
+        "table": "dashboard_case_rollup",
+        "keys": [
+            ("creation_date", "DATE", _NO_DATE),
+            ("closing_date", "DATE", _NO_DATE),
+            ("case_type", "TEXT", _NO_TEXT),
+            ("status", "TEXT", _NO_TEXT),
+            ("assigned_to", "TEXT", _NO_TEXT),
+        ],
+        "measures": [
+            ("case_count", "BIGINT"),
+            ("resolved_count", "BIGINT"),
+            ("resolution_days_sum", "NUMERIC"),
+            ("disputed_amount_count", "BIGINT"),
+            ("disputed_amount_sum", "NUMERIC"),
+        ],
+    },
+    "assignment": {
+        "table": "dashboard_assignment_rollup",
+        "keys": [
+            ("assigned_to", "TEXT", _NO_TEXT),
+            ("creation_date", "DATE", _NO_DATE),
+            ("status", "TEXT", _NO_TEXT),
+        ],
+        "measures": [
+            ("assignment_count", "BIGINT"),
+            ("resolved_count", "BIGINT"),
+            ("resolution_days_sum", "NUMERIC"),
+        ],
+    },
+}
+
+_ready = False
+_missing_reported = False
+
+
+def rollups_ready() -> bool:
+    """True once the rollups have been built and are being maintained."""
+    return _ready
+
+
+# --- SQL builders ---
+
+def _key_names(spec) -> List[str]:
+    return [name for name, _, _ in spec["keys"]]
+
+
+def _measure_names(spec) -> List[str]:
+    return [name for name, _ in spec["measures"]]
+
+
+def _delta_measures(spec) -> List[str]:
+    return ["row_count"] + _measure_names(spec)[1:]
+
+
+def _coalesced_keys(spec, alias: str = "") -> List[str]:
+    return [f"COALESCE({alias}{name}, {sentinel})" for name, _, sentinel in spec["keys"]]
+
+
+def _create_table_sql(spec) -> str:
+    keys = ",\n".join(f"    {name} {sql_type} NOT NULL" for name, sql_type, _ in spec["keys"])
+    measures = ",\n".join(f"    {name} {sql_type} NOT NULL DEFAULT 0" for name, sql_type in spec["measures"])
+    return (f"CREATE TABLE IF NOT EXISTS {spec['table']} (\n{keys},\n{measures},\n"
+            f"    PRIMARY KEY ({', '.join(_key_names(spec))})\n)")
+
+
+def _live_view_sql(name: str, spec) -> str:
+    keys = _key_names(spec)
+    measures = _measure_names(spec)
+    outer_keys = [f"NULLIF({key}, {sentinel}) AS {key}" for key, _, sentinel in spec["keys"]]
+    outer_measures = [
+        f"SUM({m})::{sql_type} AS {m}" for m, sql_type in spec["measures"]
+    ]
+    delta_cols = [f"{expr} AS {key}" for expr, key in zip(_coalesced_keys(spec), keys)]
+    delta_cols += [f"{d} AS {m}" for d, m in zip(_delta_measures(spec), measures)]
+    return f"""
+        CREATE OR REPLACE VIEW {spec['table']}_live AS
+        SELECT {', '.join(outer_keys)}, {', '.join(outer_measures)}
+        FROM (
+            SELECT {', '.join(keys + measures)} FROM {spec['table']}
+            UNION ALL
+            SELECT {', '.join(delta_cols)} FROM dashboard_rollup_deltas WHERE rollup = '{name}'
+        ) r
+        GROUP BY {', '.join(keys)}
+        HAVING SUM({measures[0]}) <> 0
+    """
+
+
+def _fold_sql(spec) -> str:
+    keys = _key_names(spec)
+    measures = _measure_names(spec)
+    sums = [f"SUM({d})" for d in _delta_measures(spec)]
+    updates = [f"{m} = r.{m} + EXCLUDED.{m}" for m in measures]
+    return f"""
+        WITH pending AS (
+            DELETE FROM dashboard_rollup_deltas WHERE rollup = %s
+            RETURNING {', '.join(keys + _delta_measures(spec))}
+        )
+        INSERT INTO {spec['table']} AS r ({', '.join(keys + measures)})
+        SELECT {', '.join(_coalesced_keys(spec) + sums)}
+        FROM pending
+        GROUP BY {', '.join(str(i + 1) for i in range(len(keys)))}
+        ON CONFLICT ({', '.join(keys)}) DO UPDATE SET {', '.join(updates)}
+    """
+
+
+def _base_aggregate_sql(name: str, assignee_column: str) -> str:
+    """What the rollup should contain, computed from case_main/assignment."""
+    resolved = "(cm.status = 'Closed' AND cm.closing_date IS NOT NULL AND cm.creation_date IS NOT NULL)"
+    days = "(cm.closing_date::date - cm.creation_date::date)"
+    if name == "case":
+        return f"""
+            SELECT COALESCE(cm.creation_date, {_NO_DATE}) AS creation_date,
+                   COALESCE(cm.closing_date, {_NO_DATE}) AS closing_date,
+                   COALESCE(cm.case_type, {_NO_TEXT}) AS case_type,
+                   COALESCE(cm.status, {_NO_TEXT}) AS status,
+                   COALESCE({assignee_column}, {_NO_TEXT}) AS assigned_to,
+                   COUNT(*)::bigint AS case_count,
+                   COUNT(*) FILTER (WHERE {resolved})::bigint AS resolved_count,
+                   COALESCE(SUM({days}) FILTER (WHERE {resolved}), 0)::numeric AS resolution_days_sum,
+                   COUNT(cm.disputed_amount)::bigint AS disputed_amount_count,
+                   COALESCE(SUM(cm.disputed_amount), 0)::numeric AS disputed_amount_sum
+            FROM public.case_main cm
+            GROUP BY 1, 2, 3, 4, 5
+        """
+    return f"""
+        SELECT COALESCE(a.assigned_to, {_NO_TEXT}) AS assigned_to,
+               COALESCE(cm.creation_date, {_NO_DATE}) AS creation_date,
+               COALESCE(cm.status, {_NO_TEXT}) AS status,
+               COUNT(*)::bigint AS assignment_count,
+               COUNT(*) FILTER (WHERE {resolved})::bigint AS resolved_count,
+               COALESCE(SUM({days}) FILTER (WHERE {resolved}), 0)::numeric AS resolution_days_sum
+        FROM public.assignment a
+        JOIN public.case_main cm ON cm.case_id = a.case_id
+        WHERE a.assigned_to IS NOT NULL
+        GROUP BY 1, 2, 3
+    """
+
+
+def _reconcile_sql(name: str, spec, assignee_column: str) -> List[str]:
+    """
+    Rebuild one rollup from the base tables. The statements run in order in the
+    maintenance pass's REPEATABLE READ transaction, so they share one snapshot:
+    deltas for changes already visible in it are dropped with the rebuild, later ones
+    stay queued. The second statement returns how many groups had drifted and empties
+    the rollup; the third refills it.
+    """
+    keys = _key_names(spec)
+    measures = _measure_names(spec)
+    fresh = f"dashboard_rollup_fresh_{name}"
+    pending_cols = [f"{expr} AS {key}" for expr, key in zip(_coalesced_keys(spec), keys)]
+    pending_cols += [f"{d} AS {m}" for d, m in zip(_delta_measures(spec), measures)]
+    maintained_sums = [f"SUM({m})::{sql_type} AS {m}" for m, sql_type in spec["measures"]]
+    return [
+        f"""
+        CREATE TEMP TABLE {fresh} ON COMMIT DROP AS
+        {_base_aggregate_sql(name, assignee_column)}
+        """,
+        f"""
+        WITH pending AS (
+            DELETE FROM dashboard_rollup_deltas WHERE rollup = %s
+            RETURNING {', '.join(pending_cols)}
+        ),
+        previous AS (
+            DELETE FROM {spec['table']}
+            RETURNING {', '.join(keys + measures)}
+        ),
+        maintained AS (
+            SELECT {', '.join(keys + maintained_sums)}
+            FROM (SELECT * FROM previous UNION ALL SELECT * FROM pending) u
+            GROUP BY {', '.join(keys)}
+            HAVING SUM({measures[0]}) <> 0
+        )
+        SELECT COUNT(*) FROM (
+            (SELECT * FROM {fresh} EXCEPT SELECT * FROM maintained)
+            UNION ALL
+            (SELECT * FROM maintained EXCEPT SELECT * FROM {fresh})
+        ) d
+        """,
+        f"INSERT INTO {spec['table']} ({', '.join(keys + measures)}) SELECT * FROM {fresh}",
+    ]
+
+
+def _trigger_functions_sql(assignee: str) -> List[str]:
+    """`assignee` is a format string for case_main's assignee column, e.g. '{row}.assigned_to'."""
+    c_assignee = assignee.format(row="c")
+    old_assignee = assignee.format(row="OLD")
+    new_assignee = assignee.format(row="NEW")
+    resolved = "c.status = 'Closed' AND c.closing_date IS NOT NULL AND c.creation_date IS NOT NULL"
+    return [
+        f"""
+        CREATE OR REPLACE FUNCTION dashboard_rollup_emit_case(c public.case_main, delta INTEGER)
+        RETURNS VOID AS $$
+        DECLARE
+            resolved BOOLEAN := {resolved};
+        BEGIN
+            INSERT INTO dashboard_rollup_deltas (
+                rollup, creation_date, closing_date, case_type, status, assigned_to,
+                row_count, resolved_count, resolution_days_sum, disputed_amount_count, disputed_amount_sum
+            ) VALUES (
+                'case', c.creation_date, c.closing_date, c.case_type, c.status, {c_assignee},
+                delta,
+                CASE WHEN resolved THEN delta ELSE 0 END,
+                CASE WHEN resolved THEN delta * (c.closing_date::date - c.creation_date::date) ELSE 0 END,
+                CASE WHEN c.disputed_amount IS NOT NULL THEN delta ELSE 0 END,
+                COALESCE(c.disputed_amount, 0) * delta
+            );
+        END;
+        $$ LANGUAGE plpgsql
+        """,
+        f"""
+        CREATE OR REPLACE FUNCTION dashboard_rollup_emit_assignment(c public.case_main, assignee TEXT, delta INTEGER)
+        RETURNS VOID AS $$
+        DECLARE
+            resolved BOOLEAN := {resolved};
+        BEGIN
+            INSERT INTO dashboard_rollup_deltas (
+                rollup, creation_date, status, assigned_to,
+                row_count, resolved_count, resolution_days_sum, disputed_amount_count, disputed_amount_sum
+            ) VALUES (
+                'assignment', c.creation_date, c.status, assignee,
+                delta,
+                CASE WHEN resolved THEN delta ELSE 0 END,
+                CASE WHEN resolved THEN delta * (c.closing_date::date - c.creation_date::date) ELSE 0 END,
+                0, 0
+            );
+        END;
+        $$ LANGUAGE plpgsql
+        """,
+        f"""
+        CREATE OR REPLACE FUNCTION dashboard_rollup_case_trigger()
+        RETURNS TRIGGER AS $$
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                PERFORM dashboard_rollup_emit_case(NEW, 1);
+                PERFORM dashboard_rollup_emit_assignment(NEW, a.assigned_to, 1)
+                FROM public.assignment a WHERE a.case_id = NEW.case_id AND a.assigned_to IS NOT NULL;
+                RETURN NULL;
+            END IF;
+            IF TG_OP = 'DELETE' THEN
+                -- Runs BEFORE DELETE, while the assignment rows the FK cascade removes still exist
+                PERFORM dashboard_rollup_emit_case(OLD, -1);
+                PERFORM dashboard_rollup_emit_assignment(OLD, a.assigned_to, -1)
+                FROM public.assignment a WHERE a.case_id = OLD.case_id AND a.assigned_to IS NOT NULL;
+                RETURN OLD;
+            END IF;
+            IF (OLD.creation_date, OLD.closing_date, OLD.case_type, OLD.status, OLD.disputed_amount, {old_assignee})
+               IS DISTINCT FROM
+               (NEW.creation_date, NEW.closing_date, NEW.case_type, NEW.status, NEW.disputed_amount, {new_assignee}) THEN
+                PERFORM dashboard_rollup_emit_case(OLD, -1);
+                PERFORM dashboard_rollup_emit_case(NEW, 1);
+            END IF;
+            IF (OLD.case_id, OLD.creation_date, OLD.closing_date, OLD.status)
+               IS DISTINCT FROM (NEW.case_id, NEW.creation_date, NEW.closing_date, NEW.status) THEN
+                PERFORM dashboard_rollup_emit_assignment(OLD, a.assigned_to, -1)
+                FROM public.assignment a WHERE a.case_id = OLD.case_id AND a.assigned_to IS NOT NULL;
+                PERFORM dashboard_rollup_emit_assignment(NEW, a.assigned_to, 1)
+                FROM public.assignment a WHERE a.case_id = NEW.case_id AND a.assigned_to IS NOT NULL;
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """,
+        """
+        CREATE OR REPLACE FUNCTION dashboard_rollup_assignment_trigger()
+        RETURNS TRIGGER AS $$
+        BEGIN
+            IF TG_OP = 'UPDATE' THEN
+                IF (OLD.case_id, OLD.assigned_to) IS NOT DISTINCT FROM (NEW.case_id, NEW.assigned_to) THEN
+                    RETURN NULL;
+                END IF;
+            END IF;
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                IF OLD.assigned_to IS NOT NULL THEN
+                    PERFORM dashboard_rollup_emit_assignment(c, OLD.assigned_to, -1)
+                    FROM public.case_main c WHERE c.case_id = OLD.case_id;
+                END IF;
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                IF NEW.assigned_to IS NOT NULL THEN
+                    PERFORM dashboard_rollup_emit_assignment(c, NEW.assigned_to, 1)
+                    FROM public.case_main c WHERE c.case_id = NEW.case_id;
+                END IF;
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """,
+    ]
+
+
+_TRIGGERS = [
+    ("dashboard_rollup_case_write", "public.case_main", "AFTER INSERT OR UPDATE", "dashboard_rollup_case_trigger"),
+    ("dashboard_rollup_case_delete", "public.case_main", "BEFORE DELETE", "dashboard_rollup_case_trigger"),
+    ("dashboard_rollup_assignment_write", "public.assignment", "AFTER INSERT OR UPDATE OR DELETE", "dashboard_rollup_assignment_trigger"),
+]
+
+
+# --- Schema / lifecycle ---
+
+def _case_main_has_assignee(cur) -> bool:
+    # case_main.assigned_to is a legacy column that not every database has
+    cur.execute("""
+        SELECT 1 FROM information_schema.columns
+        WHERE table_schema = 'public' AND table_name = 'case_main' AND column_name = 'assigned_to'
+    """)
+    return cur.fetchone() is not None
+
+
+def rollup_triggers() -> List[Tuple[str, str]]:
+    """(trigger, table) pairs install_rollups creates."""
+    return [(trigger, table) for trigger, table, _, _ in _TRIGGERS]
+
+
+def install_rollups(cur) -> None:
+    """Create the rollup tables, views, trigger functions and triggers (scripts/migrate.py)."""
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS dashboard_rollup_deltas (
+            id BIGSERIAL PRIMARY KEY,
+            rollup VARCHAR(20) NOT NULL,
+            creation_date DATE,
+            closing_date DATE,
+            case_type TEXT,
+            status TEXT,
+            assigned_to TEXT,
+            row_count INTEGER NOT NULL,
+            resolved_count INTEGER NOT NULL DEFAULT 0,
+            resolution_days_sum NUMERIC NOT NULL DEFAULT 0,
+            disputed_amount_count INTEGER NOT NULL DEFAULT 0,
+            disputed_amount_sum NUMERIC NOT NULL DEFAULT 0
+        )
+    """)
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS dashboard_rollup_state (
+            rollup VARCHAR(20) PRIMARY KEY,
+            reconciled_at TIMESTAMP,
+            groups INTEGER,
+            drifted_groups INTEGER
+        )
+    """)
+    for name, spec in _ROLLUPS.items():
+        cur.execute(_create_table_sql(spec))
+        cur.execute(_live_view_sql(name, spec))
+
+    assignee = "{row}.assigned_to" if _case_main_has_assignee(cur) else "NULL::text"
+    for statement in _trigger_functions_sql(assignee):
+        cur.execute(statement)
+    for trigger, table, timing, function in _TRIGGERS:
+        cur.execute(f"DROP TRIGGER IF EXISTS {trigger} ON {table}")
+        cur.execute(f"CREATE TRIGGER {trigger} {timing} ON {table} FOR EACH ROW EXECUTE PROCEDURE {function}()")
+
+
+def uninstall_rollups(cur) -> None:
+    """Drop the triggers and queued deltas (scripts/migrate.py --drop); a reinstall rebuilds from scratch."""
+    for trigger, table, _, _ in _TRIGGERS:
+        cur.execute(f"DROP TRIGGER IF EXISTS {trigger} ON {table}")
+    cur.execute("SELECT to_regclass('dashboard_rollup_state')")
+    if cur.fetchone()[0] is not None:
+        cur.execute("TRUNCATE dashboard_rollup_deltas")
+        cur.execute("DELETE FROM dashboard_rollup_state")
+
+
+def _check_triggers() -> List[str]:
+    with get_db_connection(caller="dashboard_rollups") as conn:
+        with conn.cursor() as cur:
+            return missing_triggers(cur, rollup_triggers())
+
+
+def _reconcile(cur, name: str, assignee_column: str) -> Tuple[int, int]:
+    create_fresh, diff, refill = _reconcile_sql(name, _ROLLUPS[name], assignee_column)
+    cur.execute(create_fresh)
+    cur.execute(diff, (name,))
+    drifted = cur.fetchone()[0]
+    cur.execute(refill)
+    groups = cur.rowcount
+    cur.execute("""
+        INSERT INTO dashboard_rollup_state (rollup, reconciled_at, groups, drifted_groups)
+        VALUES (%s, NOW(), %s, %s)
+        ON CONFLICT (rollup) DO UPDATE
+        SET reconciled_at = EXCLUDED.reconciled_at, groups = EXCLUDED.groups, drifted_groups = EXCLUDED.drifted_groups
+    """, (name, groups, drifted))
+    return groups, drifted
+
+
+def maintain_rollups() -> None:
+    """
+    One maintenance pass: fold queued deltas into the rollups, or rebuild a rollup
+    that has never been built or whose last rebuild is older than
+    DASHBOARD_ROLLUP_RECONCILE_SECONDS. Only one worker does this at a time.
+    """
+    global _ready, _missing_reported
+    with get_db_connection(caller="dashboard_rollups") as conn:
+        with conn.cursor() as cur:
+            # One snapshot for the whole pass (see _reconcile_sql)
+            cur.execute("SET TRANSACTION ISOLATION LEVEL REPEATABLE READ")
+            missing = missing_triggers(cur, rollup_triggers())
+            if missing:
+                # Not installed yet, or removed by migrate.py --drop: the endpoints use live queries
+                _ready = False
+                if not _missing_reported:
+                    print(f"WARNING: Dashboard rollup triggers missing ({', '.join(missing)}), using live queries; "
+                          "install them with: python backend/scripts/migrate.py", flush=True)
+                    _missing_reported = True
+                return
+            _missing_reported = False
+            cur.execute("SELECT pg_try_advisory_xact_lock(hashtext('dashboard_rollups:maintain'))")
+            if cur.fetchone()[0]:
+                cur.execute("""
+                    SELECT rollup FROM dashboard_rollup_state
+                    WHERE reconciled_at >= NOW() - make_interval(secs => %s)
+                """, (DASHBOARD_ROLLUP_RECONCILE_SECONDS,))
+                current = {row[0] for row in cur.fetchall()}
+                assignee_column = "cm.assigned_to" if _case_main_has_assignee(cur) else "NULL::text"
+                for name, spec in _ROLLUPS.items():
+                    if name in current:
+                        cur.execute(_fold_sql(spec), (name,))
+                        continue
+                    groups, drifted = _reconcile(cur, name, assignee_column)
+                    if drifted:
+                        print(f"[dashboard-rollups] Reconciled {name} rollup: corrected {drifted} of {groups} groups", flush=True)
+                        notify_dashboard_change(cur, "rollup_reconcile")
+                    else:
+                        print(f"[dashboard-rollups] Reconciled {name} rollup ({groups} groups, no drift)", flush=True)
+            conn.commit()
+
+            cur.execute("SELECT COUNT(*) FROM dashboard_rollup_state WHERE reconciled_at IS NOT NULL AND rollup = ANY(%s)",
+                        (list(_ROLLUPS),))
+            _ready = cur.fetchone()[0] == len(_ROLLUPS)
+            conn.commit()
+
+
+async def run_rollup_worker(executor) -> None:
+    """Background loop (one per uvicorn worker) keeping the rollups current until cancelled."""
+    loop = asyncio.get_running_loop()
+    if not DASHBOARD_ROLLUPS_ENABLED:
+        try:
+            missing = await loop.run_in_executor(executor, _check_triggers)
+        except Exception as e:
+            print(f"WARNING: Could not check dashboard rollup triggers: {e}", flush=True)
+            return
+        if len(missing) < len(_TRIGGERS):
+            print("WARNING: Dashboard rollups are disabled but their triggers are still installed and queue "
+                  "deltas; remove them with: python backend/scripts/migrate.py --drop dashboard_rollups", flush=True)
+        return
+    print("[dashboard-rollups] Worker started", flush=True)
+    while True:
+        try:
+            await loop.run_in_executor(executor, maintain_rollups)
+        except asyncio.CancelledError:
+            raise
+        except SerializationFailure:
+            pass  # another worker's pass committed after our snapshot was taken; the next pass catches up
+        except Exception as e:
+            print(f"[dashboard-rollups] Maintenance pass failed: {e}", flush=True)
+        await asyncio.sleep(DASHBOARD_ROLLUP_FOLD_SECONDS)
+
+
+def start_rollup_worker(executor) -> asyncio.Task:
+    """Start this process's rollup worker (it only checks the triggers when rollups are disabled)."""
+    return asyncio.create_task(run_rollup_worker(executor))
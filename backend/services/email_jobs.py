@@ -0,0 +1,363 @@
+"""
+Durable queue for Gmail / Microsoft Graph webhook notifications.
+
+The webhooks only record what arrived and return 202: a Gmail Pub/Sub push becomes
+a 'gmail_history' job, a Graph change notification a 'graph_message' job. Workers
+in every uvicorn process claim jobs with FOR UPDATE SKIP LOCKED (several run
+concurrently per process) and retry failures up to EMAIL_INGEST_MAX_ATTEMPTS.
+While a job runs its worker refreshes locked_at (a heartbeat); a job whose lock
+goes stale for EMAIL_INGEST_STALE_SECONDS is reclaimed, or marked failed if its
+worker died on the last allowed attempt.
+
+Dedupe: every job has a unique dedupe_key, so a Pub/Sub redelivery of the same
+notification, or a message that shows up in two overlapping history walks, is
+queued once. A 'gmail_history' job walks the mailbox history from the mailbox's
+durable checkpoint (email_ingest_checkpoints, replacing the in-memory
+last_history_id), and queues one 'gmail_message' job per new message in the same
+transaction that advances the checkpoint.
+
+The access token a job needs is stored on its row and cleared once the job is
+finished, since the workers share nothing else.
+"""
+
+import asyncio
+import json
+import os
+import socket
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import psycopg2.extras
+
+from config import (
+    EMAIL_INGEST_MAX_ATTEMPTS,
+    EMAIL_INGEST_POLL_SECONDS,
+    EMAIL_INGEST_STALE_SECONDS,
+    EMAIL_INGEST_WORKERS,
+)
+from db.connection import get_db_connection
+
+_WORKER_ID = f"{socket.gethostname()}:{os.getpid()}"
+_tables_ready = False
+_job_enqueued: Optional[asyncio.Event] = None
+_event_loop: Optional[asyncio.AbstractEventLoop] = None  # loop that owns _job_enqueued
+_HEARTBEAT_SECONDS = max(1.0, EMAIL_INGEST_STALE_SECONDS / 3)
+
+
+def _json(value: Any) -> psycopg2.extras.Json:
+    return psycopg2.extras.Json(value, dumps=lambda v: json.dumps(v, default=str))
+
+
+def ensure_email_tables() -> None:
+    """Create the queue and checkpoint tables if needed (once per process)."""
+    global _tables_ready
+    if _tables_ready:
+        return
+    with get_db_connection(caller="email_jobs") as conn:
+        with conn.cursor() as cur:
+            cur.execute("""
+                CREATE TABLE IF NOT EXISTS email_ingest_jobs (
+                    job_id BIGSERIAL PRIMARY KEY,
+                    dedupe_key VARCHAR(300) NOT NULL UNIQUE,
+                    kind VARCHAR(30) NOT NULL,
+                    provider VARCHAR(20) NOT NULL,
+                    mailbox VARCHAR(255),
+                    message_id VARCHAR(255),
+                    history_id NUMERIC(20),
+                    access_token TEXT,
+                    status VARCHAR(20) NOT NULL DEFAULT 'queued',
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    result JSONB,
+                    error TEXT,
+                    locked_by VARCHAR(100),
+                    locked_at TIMESTAMP,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    completed_at TIMESTAMP,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+            cur.execute("CREATE INDEX IF NOT EXISTS idx_email_ingest_jobs_status_created ON email_ingest_jobs (status, created_at)")
+            cur.execute("""
+                CREATE TABLE IF NOT EXISTS email_ingest_checkpoints (
+                    provider VARCHAR(20) NOT NULL,
+                    mailbox VARCHAR(255) NOT NULL,
+                    last_history_id NUMERIC(20) NOT NULL,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    PRIMARY KEY (provider, mailbox)
+                )
+            """)
+            conn.commit()
+    _tables_ready = True
+
+
+def _insert_job(cur, dedupe_key: str, kind: str, provider: str, mailbox: Optional[str],
+                message_id: Optional[str] = None, history_id: Optional[str] = None,
+                access_token: Optional[str] = None) -> Optional[int]:
+    cur.execute("""
+        INSERT INTO email_ingest_jobs (dedupe_key, kind, provider, mailbox, message_id, history_id, access_token)
+        VALUES (%s, %s, %s, %s, %s, %s, %s)
+        ON CONFLICT (dedupe_key) DO NOTHING
+        RETURNING job_id
+    """, (dedupe_key, kind, provider, mailbox, message_id, history_id, access_token))
+    row = cur.fetchone()
+    return row[0] if row else None
+
+
+def _notify_workers() -> None:
+    """Wake this process's workers. Called from executor threads, so the Event is set
+    on the workers' own loop (asyncio.Event is not thread-safe)."""
+    if _job_enqueued is None or _event_loop is None:
+        return
+    try:
+        _event_loop.call_soon_threadsafe(_job_enqueued.set)
+    except RuntimeError:  # loop already closed during shutdown
+        pass
+
+
+def enqueue_gmail_history(mailbox: str, history_id: str, access_token: str) -> Tuple[Optional[int], bool]:
+    """Queue a Gmail notification; (job_id, False) if the same notification was already queued."""
+    ensure_email_tables()
+    with get_db_connection(caller="email_jobs") as conn:
+        with conn.cursor() as cur:
+            job_id = _insert_job(cur, f"google:history:{mailbox}:{history_id}", "gmail_history", "google",
+                                 mailbox, history_id=history_id, access_token=access_token)
+            conn.commit()
+    if job_id is not None:
+        _notify_workers()
+    return job_id, job_id is not None
+
+
+def enqueue_graph_message(subscription_id: str, message_id: str, access_token: str) -> Tuple[Optional[int], bool]:
+    """Queue a Graph 'created' notification, once per message id."""
+    ensure_email_tables()
+    with get_db_connection(caller="email_jobs") as conn:
+        with conn.cursor() as cur:
+            job_id = _insert_job(cur, f"microsoft:message:{message_id}", "graph_message", "microsoft",
+                                 subscription_id, message_id=message_id, access_token=access_token)
+            conn.commit()
+    if job_id is not None:
+        _notify_workers()
+    return job_id, job_id is not None
+
+
+def get_checkpoint(provider: str, mailbox: str) -> Optional[str]:
+    ensure_email_tables()
+    with get_db_connection(caller="email_jobs") as conn:
+        with conn.cursor() as cur:
+            cur.execute("""
+                SELECT last_history_id FROM email_ingest_checkpoints WHERE provider = %s AND mailbox = %s
+            """, (provider, mailbox))
+            row = cur.fetchone()
+    return str(row[0]) if row else None
+
+
+def _advance_checkpoint(cur, provider: str, mailbox: str, history_id: str) -> None:
+    # Never moves backwards when notifications are processed out of order
+    cur.execute("""
+        INSERT INTO email_ingest_checkpoints (provider, mailbox, last_history_id)
+        VALUES (%s, %s, %s)
+        ON CONFLICT (provider, mailbox) DO UPDATE
+        SET last_history_id = GREATEST(email_ingest_checkpoints.last_history_id, EXCLUDED.last_history_id),
+            updated_at = CURRENT_TIMESTAMP
+    """, (provider, mailbox, history_id))
+
+
+def save_checkpoint(provider: str, mailbox: str, history_id: str) -> None:
+    ensure_email_tables()
+    with get_db_connection(caller="email_jobs") as conn:
+        with conn.cursor() as cur:
+            _advance_checkpoint(cur, provider, mailbox, history_id)
+            conn.commit()
+
+
+def record_gmail_history(mailbox: str, history_id: str, message_ids: List[str], access_token: str) -> int:
+    """
+    Queue 'gmail_message' jobs for the messages a history walk found and advance the
+    mailbox checkpoint to `history_id`, in one transaction. Returns how many
+    messages were new.
+    """
+    queued = 0
+    with get_db_connection(caller="email_jobs") as conn:
+        with conn.cursor() as cur:
+            for message_id in dict.fromkeys(message_ids):
+                if _insert_job(cur, f"google:message:{mailbox}:{message_id}", "gmail_message", "google",
+                               mailbox, message_id=message_id, access_token=access_token) is not None:
+                    queued += 1
+            _advance_checkpoint(cur, "google", mailbox, history_id)
+            conn.commit()
+    if queued:
+        _notify_workers()
+    return queued
+
+
+def claim_next_job() -> Optional[Dict[str, Any]]:
+    """
+    Claim the oldest queued job, or one whose worker stopped heartbeating. Stale jobs
+    that already used their last attempt (their worker keeps dying on them) are
+    marked failed instead of being retried forever.
+    """
+    ensure_email_tables()
+    with get_db_connection(caller="email_jobs") as conn:
+        with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cur:
+            cur.execute("""
+                UPDATE email_ingest_jobs
+                SET status = 'failed',
+                    error = 'Worker stopped heartbeating on attempt ' || attempts
+                            || COALESCE('; last error: ' || error, ''),
+                    access_token = NULL, locked_by = NULL, locked_at = NULL,
+                    completed_at = NOW(), updated_at = NOW()
+                WHERE status = 'processing' AND locked_at < NOW() - make_interval(secs => %s)
+                  AND attempts >= %s
+                RETURNING job_id
+            """, (EMAIL_INGEST_STALE_SECONDS, EMAIL_INGEST_MAX_ATTEMPTS))
+            abandoned = [row["job_id"] for row in cur.fetchall()]
+            if abandoned:
+                print(f"[email-jobs] Marked jobs {abandoned} failed: worker stopped heartbeating "
+                      f"on their last attempt", flush=True)
+            cur.execute("""
+                UPDATE email_ingest_jobs j
+                SET status = 'processing',
+                    attempts = j.attempts + 1,
+                    locked_by = %s,
+                    locked_at = NOW(),
+                    updated_at = NOW()
+                WHERE j.job_id = (
+                    SELECT job_id FROM email_ingest_jobs
+                    WHERE status = 'queued'
+                       OR (status = 'processing' AND locked_at < NOW() - make_interval(secs => %s)
+                           AND attempts < %s)
+                    ORDER BY created_at
+                    FOR UPDATE SKIP LOCKED
+                    LIMIT 1
+                )
+                RETURNING j.job_id, j.kind, j.provider, j.mailbox, j.message_id, j.history_id,
+                          j.access_token, j.attempts
+            """, (_WORKER_ID, EMAIL_INGEST_STALE_SECONDS, EMAIL_INGEST_MAX_ATTEMPTS))
+            job = cur.fetchone()
+            conn.commit()
+    if not job:
+        return None
+    job = dict(job)
+    if job["history_id"] is not None:
+        job["history_id"] = str(job["history_id"])
+    return job
+
+
+def heartbeat_job(job_id: int) -> bool:
+    """Refresh the lock on a running job; False if another worker has reclaimed it."""
+    with get_db_connection(caller="email_jobs") as conn:
+        with conn.cursor() as cur:
+            cur.execute("""
+                UPDATE email_ingest_jobs SET locked_at = NOW(), updated_at = NOW()
+                WHERE job_id = %s AND status = 'processing' AND locked_by = %s
+            """, (job_id, _WORKER_ID))
+            alive = cur.rowcount > 0
+            conn.commit()
+    return alive
+
+
+def complete_job(job_id: int, result: Dict[str, Any]) -> None:
+    with get_db_connection(caller="email_jobs") as conn:
+        with conn.cursor() as cur:
+            cur.execute("""
+                UPDATE email_ingest_jobs
+                SET status = 'completed', result = %s, error = NULL, access_token = NULL,
+                    locked_by = NULL, locked_at = NULL, completed_at = NOW(), updated_at = NOW()
+                WHERE job_id = %s
+            """, (_json(result), job_id))
+            conn.commit()
+
+
+def fail_job(job_id: int, error: str, attempts: int) -> None:
+    """Requeue the job, or mark it failed once it has used up its attempts."""
+    status = "failed" if attempts >= EMAIL_INGEST_MAX_ATTEMPTS else "queued"
+    with get_db_connection(caller="email_jobs") as conn:
+        with conn.cursor() as cur:
+            cur.execute("""
+                UPDATE email_ingest_jobs
+                SET status = %s, error = %s, locked_by = NULL, locked_at = NULL,
+                    access_token = CASE WHEN %s = 'failed' THEN NULL ELSE access_token END,
+                    completed_at = CASE WHEN %s = 'failed' THEN NOW() ELSE NULL END,
+                    updated_at = NOW()
+                WHERE job_id = %s
+            """, (status, error, status, status, job_id))
+            conn.commit()
+
+
+def get_job(job_id: int) -> Optional[Dict[str, Any]]:
+    ensure_email_tables()
+    with get_db_connection(caller="email_jobs") as conn:
+        with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cur:
+            cur.execute("""
+                SELECT job_id, kind, provider, mailbox, message_id, history_id, status, attempts,
+                       result, error, created_at, completed_at, updated_at
+                FROM email_ingest_jobs WHERE job_id = %s
+            """, (job_id,))
+            row = cur.fetchone()
+    return dict(row) if row else None
+
+
+async def _heartbeat(executor, job_id: int, slot: int) -> None:
+    """Keep a running job's lock fresh until cancelled (when the job finishes)."""
+    loop = asyncio.get_running_loop()
+    while True:
+        await asyncio.sleep(_HEARTBEAT_SECONDS)
+        try:
+            if not await loop.run_in_executor(executor, heartbeat_job, job_id):
+                print(f"[email-jobs:{slot}] Job {job_id} was reclaimed by another worker", flush=True)
+                return
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"[email-jobs:{slot}] Heartbeat for job {job_id} failed: {e}", flush=True)
+
+
+async def _worker_loop(executor, handler: Callable[[Dict[str, Any]], Awaitable[Dict[str, Any]]], slot: int) -> None:
+    loop = asyncio.get_running_loop()
+    while True:
+        # Cleared before claiming, so an enqueue that lands during the claim still wakes us
+        _job_enqueued.clear()
+        try:
+            job = await loop.run_in_executor(executor, claim_next_job)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"[email-jobs] Could not claim job: {e}", flush=True)
+            job = None
+
+        if job is None:
+            try:
+                await asyncio.wait_for(_job_enqueued.wait(), timeout=EMAIL_INGEST_POLL_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+            continue
+
+        job_id = job["job_id"]
+        print(f"[email-jobs:{slot}] Processing job {job_id} kind={job['kind']} attempt={job['attempts']}", flush=True)
+        heartbeat = asyncio.create_task(_heartbeat(executor, job_id, slot))
+        try:
+            try:
+                result = await handler(job)
+            finally:
+                heartbeat.cancel()
+            await loop.run_in_executor(executor, complete_job, job_id, result)
+        except asyncio.CancelledError:
+            # Shutdown: the row stays 'processing' and is reclaimed once its lock goes stale
+            raise
+        except Exception as e:
+            print(f"[email-jobs:{slot}] Job {job_id} failed (attempt {job['attempts']}): {e}", flush=True)
+            try:
+                await loop.run_in_executor(executor, fail_job, job_id, str(e), job["attempts"])
+            except Exception as mark_err:
+                print(f"[email-jobs:{slot}] Could not record failure for job {job_id}: {mark_err}", flush=True)
+
+
+async def run_email_worker(executor, handler: Callable[[Dict[str, Any]], Awaitable[Dict[str, Any]]]) -> None:
+    """
+    Background workers for this process: EMAIL_INGEST_WORKERS loops claiming and
+    running jobs concurrently until cancelled.
+    """
+    global _job_enqueued, _event_loop
+    _job_enqueued = asyncio.Event()
+    _event_loop = asyncio.get_running_loop()
+    print(f"[email-jobs] {EMAIL_INGEST_WORKERS} workers started on {_WORKER_ID}", flush=True)
+    await asyncio.gather(*(_worker_loop(executor, handler, slot) for slot in range(max(1, EMAIL_INGEST_WORKERS))))
@@ -1,7 +1,11 @@
 # services/email_parser.py
 import re
+import asyncio
 import base64
+import bisect
 import io
+import json
+import threading
 from typing import Any, Dict, List, Optional, Tuple
 from datetime import datetime
 
@@ -9,10 +13,32 @@ import httpx
 from PIL import Image
 import numpy as np
 import fitz  # PyMuPDF
-import easyocr  # EasyOCR
 
-# Initialize EasyOCR reader once (CPU)
-EASYOCR_READER = easyocr.Reader(['en'], gpu=False)
+from config import (
+    EMAIL_ATTACHMENT_CONCURRENCY,
+    EMAIL_ATTACHMENT_MAX_BYTES,
+    EMAIL_REQUIRED_FIELDS,
+    OCR_PDF_MAX_PAGES,
+    OCR_PDF_TEXT_LAYER_FIRST,
+)
+from services.http_client import get_http_client
+from services.ocr_pool import ocr_attachments, pdf_text_layers, text_layer_usable
+
+# EasyOCR (torch + model weights) is loaded on first use, not at import: importing
+# this module from routers.email_ingest must not cost every API worker the model.
+# EmailParser itself OCRs in the services/ocr_pool.py processes; this in-process
+# reader only serves the synchronous helpers below.
+_easyocr_reader = None
+_easyocr_lock = threading.Lock()
+
+def get_easyocr_reader():
+    global _easyocr_reader
+    if _easyocr_reader is None:
+        with _easyocr_lock:
+            if _easyocr_reader is None:
+                import easyocr  # EasyOCR
+                _easyocr_reader = easyocr.Reader(['en'], gpu=False)
+    return _easyocr_reader
 
 # ----------------------------
 # Constants and enumerations
@@ -103,6 +129,41 @@ RE_DL = re.compile(
     r')\b'
 )
 
+# Identity documents are collected with every occurrence (candidate arrays), so they
+# are found in one sweep: each pattern is an optional lookahead tried at every
+# position where one of them can start, and a position only matches if at least
+# one of them did. _scan_ids() turns this back into per-pattern finditer() results.
+_ID_PATTERNS = [
+    ("pan", RE_PAN), ("aadhaar", RE_AADHAAR), ("phone", RE_PHONE_IN),
+    ("passport", RE_PASSPORT), ("voter", RE_VOTER), ("dl", RE_DL),
+]
+_ANY_ID_MATCHED = '(?!)'
+for _name, _ in reversed(_ID_PATTERNS):
+    _ANY_ID_MATCHED = f'(?({_name})|{_ANY_ID_MATCHED})'
+RE_ID_SWEEP = re.compile(
+    r'(?=[A-Z0-9+])'
+    + ''.join(f'(?:(?=(?P<{name}>{rx.pattern}))|)' for name, rx in _ID_PATTERNS)
+    + _ANY_ID_MATCHED
+)
+_ID_GROUPS = [(name, RE_ID_SWEEP.groupindex[name]) for name, _ in _ID_PATTERNS]
+
+RE_AADHAAR_DIGITS = re.compile(r'[2-9]\d{11}')
+RE_PHONE_DIGITS = re.compile(r'[6-9]\d{9}')
+
+# Leftmost state name in the (lowercased) text; longest first so no name shadows a longer one
+RE_STATE = re.compile('|'.join(re.escape(st.lower()) for st in sorted(INDIA_STATES, key=len, reverse=True)))
+STATE_BY_LOWER = {st.lower(): st for st in INDIA_STATES}
+
+RE_POLICE_STATION = [
+    re.compile(rf'{lab}\s*[:\-]?\s*([A-Za-z\s\.\'\-]{{3,100}})', re.I)
+    for lab in ["police station", "ps", "thana", "outpost", "chowki"]
+]
+RE_CUSTOMER_NAME = re.compile(r'(?:customer\s*name)\s*[:\-]?\s*([A-Za-z\s\.\'\-]{2,100})', re.I)
+RE_DEAR = re.compile(r'\bDear\s+([A-Za-z\s\.\'\-]{2,100})\b')
+
+# Line breaks exactly as str.splitlines() sees them
+RE_LINE_BREAK = re.compile(r'\r\n|[\n\r\v\f\x1c\x1d\x1e\x85\u2028\u2029]')
+
 # --------------------------------
 # Base64url helper
 # --------------------------------
@@ -116,18 +177,27 @@ def b64url_decode(s: str) -> bytes:
 
 # --------------------------------
 # OCR helpers (EasyOCR + PyMuPDF)
+# Synchronous, in-process; EmailParser uses the process pool in services/ocr_pool.py.
 # --------------------------------
 
 def ocr_image_bytes_easy(image_bytes: bytes) -> str:
     img = Image.open(io.BytesIO(image_bytes)).convert("RGB")
     arr = np.array(img)
-    lines = EASYOCR_READER.readtext(arr, detail=0, paragraph=True)
+    lines = get_easyocr_reader().readtext(arr, detail=0, paragraph=True)
     return "\n".join(lines)
 
-def ocr_pdf_bytes_easy(pdf_bytes: bytes, dpi: int = 200) -> str:
+def ocr_pdf_bytes_easy(pdf_bytes: bytes, dpi: int = 200, text_layer_first: bool = OCR_PDF_TEXT_LAYER_FIRST,
+                       max_pages: int = OCR_PDF_MAX_PAGES) -> str:
     doc = fitz.open(stream=pdf_bytes, filetype="pdf")
+    layers = pdf_text_layers(pdf_bytes, max_pages) if text_layer_first else []
     out: List[str] = []
-    for page in doc:
+    for index, page in enumerate(doc):
+        if index >= max_pages:
+            break
+        # Pages with a usable embedded text layer need no rasterizing
+        if index < len(layers) and text_layer_usable(layers[index]):
+            out.append(layers[index])
+            continue
         pix = page.get_pixmap(dpi=dpi)
         png_bytes = pix.tobytes("png")
         out.append(ocr_image_bytes_easy(png_bytes))
@@ -157,16 +227,57 @@ async def gmail_get_message(client: httpx.AsyncClient, token: str, msg_id: str)
     r.raise_for_status()
     return r.json()
 
-async def gmail_get_attachment(client: httpx.AsyncClient, token: str, msg_id: str, attach_id: str) -> bytes:
-    r = await client.get(
+class AttachmentTooLarge(Exception):
+    pass
+
+async def _read_bounded(response: httpx.Response, limit: int) -> bytes:
+    # Stream the body and give up as soon as it passes `limit`, instead of buffering all of it
+    buf = bytearray()
+    async for chunk in response.aiter_bytes():
+        buf += chunk
+        if len(buf) > limit:
+            raise AttachmentTooLarge(f"response larger than {limit} bytes")
+    return bytes(buf)
+
+async def gmail_get_attachment(client: httpx.AsyncClient, token: str, msg_id: str, attach_id: str,
+                               max_bytes: int = EMAIL_ATTACHMENT_MAX_BYTES) -> bytes:
+    async with client.stream(
+        "GET",
         f"https://gmail.googleapis.com/gmail/v1/users/me/messages/{msg_id}/attachments/{attach_id}",
         headers={"Authorization": f"Bearer {token}"},
         timeout=30,
-    )
-    r.raise_for_status()
-    js = r.json()
+    ) as r:
+        r.raise_for_status()
+        # The bytes arrive base64url-encoded inside JSON: 4/3 of the decoded size plus a little framing
+        body = await _read_bounded(r, max_bytes * 4 // 3 + 1024)
+    js = json.loads(body)
     return b64url_decode(js.get("data", ""))
 
+async def gmail_fetch_attachments(client: httpx.AsyncClient, token: str, msg_id: str,
+                                  attachments: List[Dict[str, Any]],
+                                  concurrency: int = EMAIL_ATTACHMENT_CONCURRENCY) -> List[Optional[Tuple[bytes, str, str]]]:
+    """
+    Download a message's attachments concurrently (at most `concurrency` at a time)
+    as (data, mime, filename), in input order. Attachments over
+    EMAIL_ATTACHMENT_MAX_BYTES are skipped and come back as None.
+    """
+    slots = asyncio.Semaphore(max(1, concurrency))
+
+    async def fetch(att: Dict[str, Any]) -> Optional[Tuple[bytes, str, str]]:
+        filename = att.get("filename") or ""
+        if (att.get("size") or 0) > EMAIL_ATTACHMENT_MAX_BYTES:
+            print(f"WARNING: Skipping attachment '{filename}' ({att.get('size')} bytes, over EMAIL_ATTACHMENT_MAX_BYTES)", flush=True)
+            return None
+        async with slots:
+            try:
+                data = await gmail_get_attachment(client, token, msg_id, att["attachmentId"])
+            except AttachmentTooLarge as e:
+                print(f"WARNING: Skipping attachment '{filename}': {e}", flush=True)
+                return None
+        return data, att.get("mimeType") or "application/octet-stream", filename
+
+    return list(await asyncio.gather(*(fetch(att) for att in attachments)))
+
 async def gmail_extract_full_text_and_attachments(
     client: httpx.AsyncClient,
     token: str,
@@ -176,7 +287,8 @@ async def gmail_extract_full_text_and_attachments(
     headers = {h.get("name","").lower(): h.get("value","") for h in (payload.get("headers") or [])}
     subject = headers.get("subject", "")
     attachments: List[Dict[str, Any]] = []
-    body_texts: List[str] = []
+    body_texts: List[Optional[str]] = []
+    text_parts: List[Tuple[int, str]] = []  # (slot in body_texts, attachmentId) of large text parts
 
     async def walk_async(part: Dict[str, Any]):
         mime = part.get("mimeType") or ""
@@ -190,13 +302,11 @@ async def gmail_extract_full_text_and_attachments(
                     "filename": filename,
                     "mimeType": mime or "application/octet-stream",
                     "attachmentId": body["attachmentId"],
+                    "size": body.get("size"),
                 })
             if mime.startswith("text/") and not body.get("data"):
-                data = await gmail_get_attachment(client, token, msg_id, body["attachmentId"])
-                try:
-                    body_texts.append(data.decode("utf-8", errors="ignore"))
-                except Exception:
-                    pass
+                text_parts.append((len(body_texts), body["attachmentId"]))
+                body_texts.append(None)
 
         # Inline text bodies
         if mime.startswith("text/") and body.get("data"):
@@ -210,7 +320,15 @@ async def gmail_extract_full_text_and_attachments(
 
     if payload:
         await walk_async(payload)
-    return subject + "\n" + "\n".join(body_texts), attachments
+    if text_parts:
+        # Large text bodies are fetched concurrently and put back in their place
+        fetched = await gmail_fetch_attachments(
+            client, token, msg_id, [{"attachmentId": attach_id, "filename": "body"} for _, attach_id in text_parts]
+        )
+        for (slot, _), part in zip(text_parts, fetched):
+            if part is not None:
+                body_texts[slot] = part[0].decode("utf-8", errors="ignore")
+    return subject + "\n" + "\n".join(t for t in body_texts if t), attachments
 
 async def graph_get_message(client: httpx.AsyncClient, token: str, msg_id: str) -> Dict[str, Any]:
     r = await client.get(
@@ -353,10 +471,8 @@ def _pick_action(text: str) -> Optional[str]:
     return None
 
 def _find_state(text: str) -> Optional[str]:
-    for s in INDIA_STATES:
-        if s.lower() in text.lower():
-            return s
-    return None
+    m = RE_STATE.search(text.lower())
+    return STATE_BY_LOWER[m.group(0)] if m else None
 
 def _norm_aadhaar(s: str) -> str:
     return re.sub(r'[\s-]+', '', s).strip()
@@ -373,6 +489,40 @@ def _norm_phone_in(s: str) -> str:
 def _norm_upper_nospace(s: str) -> str:
     return re.sub(r'[\s-]+', '', s).upper().strip()
 
+def _scan_ids(text: str) -> Dict[str, List[Tuple[int, int]]]:
+    """Spans of every PAN/Aadhaar/phone/passport/voter/DL match, per kind, as finditer() would return them."""
+    found: Dict[str, List[Tuple[int, int]]] = {name: [] for name, _ in _ID_PATTERNS}
+    ends = dict.fromkeys(found, 0)
+    for m in RE_ID_SWEEP.finditer(text):
+        for name, group in _ID_GROUPS:
+            start = m.start(group)
+            # Same kind does not overlap itself (finditer resumes after the previous match)
+            if start >= ends[name]:
+                ends[name] = m.end(group)
+                found[name].append((start, ends[name]))
+    return found
+
+class _LineIndex:
+    """Line lookup by character offset (bisect over line starts) for candidate context windows."""
+
+    def __init__(self, text: str):
+        self.lines = text.splitlines()
+        self.starts = [0] + [m.end() for m in RE_LINE_BREAK.finditer(text)]
+        self._contexts: Dict[int, Dict[str, Any]] = {}
+
+    def context(self, pos: int, radius: int = 2) -> Dict[str, Any]:
+        line_idx = min(bisect.bisect_right(self.starts, pos) - 1, max(0, len(self.lines) - 1))
+        ctx = self._contexts.get(line_idx)
+        if ctx is None:
+            left = max(0, line_idx - radius)
+            right = min(len(self.lines), line_idx + radius + 1)
+            text = "\n".join(self.lines[left:right])
+            low = text.lower()
+            role = "beneficiary" if ("beneficiary" in low or "to a/c" in low or "to account" in low) else (
+                "victim" if ("victim" in low or "from a/c" in low or "from account" in low) else None)
+            ctx = self._contexts[line_idx] = {"lineIndex": line_idx, "role": role, "text": text}
+        return dict(ctx)
+
 # ---------------------------------
 # The form field extraction function
 # ---------------------------------
@@ -511,8 +661,8 @@ def extract_form_fields(text: str) -> Dict[str, Any]:
         setf("state", st, st, 0.6)
 
     ps = None
-    for lab in ["police station", "ps", "thana", "outpost", "chowki"]:
-        m = re.search(rf'{lab}\s*[:\-]?\s*([A-Za-z\s\.\'\-]{{3,100}})', t, re.I)
+    for rx in RE_POLICE_STATION:
+        m = rx.search(t)
         if m:
             ps = m.group(1).strip()
             break
@@ -520,182 +670,103 @@ def extract_form_fields(text: str) -> Dict[str, Any]:
         setf("policestation", ps, ps, 0.6)
 
     # customer name
-    m = re.search(r'(?:customer\s*name)\s*[:\-]?\s*([A-Za-z\s\.\'\-]{2,100})', t, re.I)
+    m = RE_CUSTOMER_NAME.search(t)
     if not m:
-        m = re.search(r'\bDear\s+([A-Za-z\s\.\'\-]{2,100})\b', t)
+        m = RE_DEAR.search(t)
     if m:
         setf("customerName", m.group(1).strip(), m.group(0), 0.6)
 
+    # Identity documents: one sweep finds every candidate; the first match of each
+    # kind is the primary value, as a search() would return it
+    ids = _scan_ids(t)
+
+    def first(kind: str) -> Optional[str]:
+        spans = ids[kind]
+        return t[spans[0][0]:spans[0][1]] if spans else None
+
     # PAN
-    m = RE_PAN.search(t)
-    if m:
-        val = _norm_upper_nospace(m.group(0))
-        setf("panCard", val, m.group(0), 0.95)
+    raw = first("pan")
+    if raw:
+        setf("panCard", _norm_upper_nospace(raw), raw, 0.95)
 
     # Aadhaar
-    m = RE_AADHAAR.search(t)
-    if m:
-        raw = m.group(0)
+    raw = first("aadhaar")
+    if raw:
         val = _norm_aadhaar(raw)
-        if re.fullmatch(r'[2-9]\d{11}', val):
-            setf("aadhaarNumber", val, m.group(0), 0.95)
-        else:
-            setf("aadhaarNumber", val, m.group(0), 0.6)
+        setf("aadhaarNumber", val, raw, 0.95 if RE_AADHAAR_DIGITS.fullmatch(val) else 0.6)
 
     # Indian phone
-    m = RE_PHONE_IN.search(t)
-    if m:
-        local10 = _norm_phone_in(m.group(0))
-        if re.fullmatch(r'[6-9]\d{9}', local10):
-            setf("phoneNumber", local10, m.group(0), 0.9)
-
-    # NEW: Passport
-    m = RE_PASSPORT.search(t)
-    if m:
-        val = _norm_upper_nospace(m.group(0))
-        setf("passportNumber", val, m.group(0), 0.95)
-
-    # NEW: Voter ID (EPIC)
-    m = RE_VOTER.search(t)
-    if m:
-        val = _norm_upper_nospace(m.group(0))
-        setf("voterIdNumber", val, m.group(0), 0.95)
-
-    # NEW: Driving License
-    m = RE_DL.search(t)
-    if m:
-        val = _norm_upper_nospace(m.group(0))
-        setf("drivingLicenseNumber", val, m.group(0), 0.9)
-
-    # Drop this block into services/email_parser.py inside extract_form_fields(), AFTER the existing single-value setters.
-    # It adds arrays (e.g., phoneNumbers) and preserves primary fields (e.g., phoneNumber).
-
-        # -----------------------------
-        # Collect ALL matches with context windows (arrays)
-        # -----------------------------
-        def _unique(seq):
-            seen = set()
-            out = []
-            for x in seq:
-                k = x if isinstance(x, str) else x.get("value")
-                if k not in seen:
-                    seen.add(k)
-                    out.append(x)
-            return out
-
-        # Build line index to create small context windows
-        lines = (t or "").splitlines()
-        idx_offsets = []
-        off = 0
-        for ln in lines:
-            idx_offsets.append((off, off + len(ln)))
-            off += len(ln) + 1  # include newline
-
-        def _context_for_span(span: tuple, radius: int = 2) -> Dict[str, Any]:
-            start, end = span
-            line_idx = 0
-            for i, (a, b) in enumerate(idx_offsets):
-                if a <= start <= b:
-                    line_idx = i
-                    break
-            left = max(0, line_idx - radius)
-            right = min(len(lines), line_idx + radius + 1)
-            ctx = "\n".join(lines[left:right])
-            ctx_low = ctx.lower()
-            role = "beneficiary" if ("beneficiary" in ctx_low or "to a/c" in ctx_low or "to account" in ctx_low) else (
-                "victim" if ("victim" in ctx_low or "from a/c" in ctx_low or "from account" in ctx_low) else None)
-            return {"lineIndex": line_idx, "role": role, "text": ctx}
-
-        # PAN candidates
-        pan_candidates = []
-        for m in RE_PAN.finditer(t):
-            val = _norm_upper_nospace(m.group(0))
-            pan_candidates.append({"value": val, "evidence": m.group(0), "context": _context_for_span(m.span())})
-        pan_candidates = _unique(pan_candidates)
-
-        # Aadhaar candidates
-        aadhaar_candidates = []
-        for m in RE_AADHAAR.finditer(t):
-            raw = m.group(0)
-            val = _norm_aadhaar(raw)
-            if re.fullmatch(r'[2-9]\d{11}', val):
-                aadhaar_candidates.append({"value": val, "evidence": m.group(0), "context": _context_for_span(m.span())})
-        aadhaar_candidates = _unique(aadhaar_candidates)
-
-        # Phone candidates
-        phone_candidates = []
-        for m in RE_PHONE_IN.finditer(t):
-            local10 = _norm_phone_in(m.group(0))
-            if re.fullmatch(r'[6-9]\d{9}', local10):
-                phone_candidates.append({"value": local10, "evidence": m.group(0), "context": _context_for_span(m.span())})
-        phone_candidates = _unique(phone_candidates)
-
-        # Passport candidates
-        passport_candidates = []
-        for m in RE_PASSPORT.finditer(t):
-            val = _norm_upper_nospace(m.group(0))
-            passport_candidates.append({"value": val, "evidence": m.group(0), "context": _context_for_span(m.span())})
-        passport_candidates = _unique(passport_candidates)
-
-        # Voter ID candidates
-        voter_candidates = []
-        for m in RE_VOTER.finditer(t):
-            val = _norm_upper_nospace(m.group(0))
-            voter_candidates.append({"value": val, "evidence": m.group(0), "context": _context_for_span(m.span())})
-        voter_candidates = _unique(voter_candidates)
-
-        # DL candidates
-        dl_candidates = []
-        for m in RE_DL.finditer(t):
-            val = _norm_upper_nospace(m.group(0))
-            dl_candidates.append({"value": val, "evidence": m.group(0), "context": _context_for_span(m.span())})
-        dl_candidates = _unique(dl_candidates)
-
+    raw = first("phone")
+    if raw:
+        local10 = _norm_phone_in(raw)
+        if RE_PHONE_DIGITS.fullmatch(local10):
+            setf("phoneNumber", local10, raw, 0.9)
+
+    # Passport, Voter ID (EPIC), Driving License
+    for key, kind, conf in [("passportNumber", "passport", 0.95), ("voterIdNumber", "voter", 0.95),
+                            ("drivingLicenseNumber", "dl", 0.9)]:
+        raw = first(kind)
+        if raw:
+            setf(key, _norm_upper_nospace(raw), raw, conf)
+
+    # -----------------------------
+    # Collect ALL matches with context windows (arrays)
+    # -----------------------------
+    line_index = _LineIndex(t)
+    normalize = {
+        "pan": _norm_upper_nospace, "aadhaar": _norm_aadhaar, "phone": _norm_phone_in,
+        "passport": _norm_upper_nospace, "voter": _norm_upper_nospace, "dl": _norm_upper_nospace,
+    }
+    valid = {"aadhaar": RE_AADHAAR_DIGITS.fullmatch, "phone": RE_PHONE_DIGITS.fullmatch}
+    candidates: Dict[str, List[Dict[str, Any]]] = {}
+    for kind, spans in ids.items():
+        seen = set()
+        cands = []
+        for start, end in spans:
+            raw = t[start:end]
+            val = normalize[kind](raw)
+            if kind in valid and not valid[kind](val):
+                continue
+            # First occurrence of each value only, so context is built once per value
+            if val in seen:
+                continue
+            seen.add(val)
+            cands.append({"value": val, "evidence": raw, "context": line_index.context(start)})
+        candidates[kind] = cands
+
+    # Prefer candidate by role if a primary field is still empty
+    def _prefer_role(cands, want):
+        for c in cands:
+            if c["context"]["role"] == want:
+                return c["value"]
+        return cands[0]["value"] if cands else None
+
+    for kind, key, array_key, evidence_key in [
+        ("pan", "panCard", "panCards", "panCard_candidates"),
+        ("aadhaar", "aadhaarNumber", "aadhaarNumbers", "aadhaar_candidates"),
+        ("phone", "phoneNumber", "phoneNumbers", "phone_candidates"),
+        ("passport", "passportNumber", "passportNumbers", "passport_candidates"),
+        ("voter", "voterIdNumber", "voterIdNumbers", "voter_candidates"),
+        ("dl", "drivingLicenseNumber", "drivingLicenseNumbers", "dl_candidates"),
+    ]:
+        cands = candidates[kind]
         # Attach arrays to fields (backward compatible: keep single fields too)
-        fields["panCards"] = [c["value"] for c in pan_candidates]
-        fields["aadhaarNumbers"] = [c["value"] for c in aadhaar_candidates]
-        fields["phoneNumbers"] = [c["value"] for c in phone_candidates]
-        fields["passportNumbers"] = [c["value"] for c in passport_candidates]
-        fields["voterIdNumbers"] = [c["value"] for c in voter_candidates]
-        fields["drivingLicenseNumbers"] = [c["value"] for c in dl_candidates]
-
-        # Prefer candidate by role if a primary field is still empty
-        def _prefer_role(cands, want):
-            for c in cands:
-                if c["context"]["role"] == want:
-                    return c["value"]
-            return cands[0]["value"] if cands else None
-
-        if not fields.get("panCard") and pan_candidates:
-            fields["panCard"] = _prefer_role(pan_candidates, "beneficiary")
-            evidence["panCard"] = {"match": pan_candidates[0]["evidence"], "confidence": 0.9}
-        if not fields.get("aadhaarNumber") and aadhaar_candidates:
-            fields["aadhaarNumber"] = _prefer_role(aadhaar_candidates, "beneficiary")
-            evidence["aadhaarNumber"] = {"match": aadhaar_candidates[0]["evidence"], "confidence": 0.9}
-        if not fields.get("phoneNumber") and phone_candidates:
-            fields["phoneNumber"] = _prefer_role(phone_candidates, "beneficiary")
-            evidence["phoneNumber"] = {"match": phone_candidates[0]["evidence"], "confidence": 0.9}
-        if not fields.get("passportNumber") and passport_candidates:
-            fields["passportNumber"] = _prefer_role(passport_candidates, "beneficiary")
-            evidence["passportNumber"] = {"match": passport_candidates[0]["evidence"], "confidence": 0.9}
-        if not fields.get("voterIdNumber") and voter_candidates:
-            fields["voterIdNumber"] = _prefer_role(voter_candidates, "beneficiary")
-            evidence["voterIdNumber"] = {"match": voter_candidates[0]["evidence"], "confidence": 0.9}
-        if not fields.get("drivingLicenseNumber") and dl_candidates:
-            fields["drivingLicenseNumber"] = _prefer_role(dl_candidates, "beneficiary")
-            evidence["drivingLicenseNumber"] = {"match": dl_candidates[0]["evidence"], "confidence": 0.9}
-
+        fields[array_key] = [c["value"] for c in cands]
+        if not fields.get(key) and cands:
+            fields[key] = _prefer_role(cands, "beneficiary")
+            evidence[key] = {"match": cands[0]["evidence"], "confidence": 0.9}
         # Store candidate evidence for UI/debug
-        evidence["panCard_candidates"] = pan_candidates
-        evidence["aadhaar_candidates"] = aadhaar_candidates
-        evidence["phone_candidates"] = phone_candidates
-        evidence["passport_candidates"] = passport_candidates
-        evidence["voter_candidates"] = voter_candidates
-        evidence["dl_candidates"] = dl_candidates
-
-    
+        evidence[evidence_key] = cands
+
     return {"fields": fields, "evidence": evidence}
 
+def has_required_fields(text: str, required: List[str] = EMAIL_REQUIRED_FIELDS) -> bool:
+    """True once extract_form_fields(text) has every `required` key; lets OCR stop early."""
+    if not required:
+        return False
+    fields = extract_form_fields(text)["fields"]
+    return all(fields.get(key) not in (None, "") for key in required)
+
 # --------------------------------------
 # EmailParser: combine body + OCR, then map
 # --------------------------------------
@@ -705,53 +776,62 @@ class EmailParser:
         self.on_result_cb = on_result_cb
 
     async def process_gmail_message(self, token: str, msg_id: str) -> Dict[str, Any]:
-        async with httpx.AsyncClient() as client:
-            msg = await gmail_get_message(client, token, msg_id)
-            payload = msg.get("payload") or {}
-            body_text, attachments = await gmail_extract_full_text_and_attachments(client, token, payload, msg["id"])
-
-            ocr_texts = []
-            for att in attachments:
-                data = await gmail_get_attachment(client, token, msg["id"], att["attachmentId"])
-                ocr_texts.append(ocr_bytes(data, att.get("mimeType") or "application/octet-stream", att.get("filename") or ""))
-
-            combined = "\n\n".join([body_text] + ocr_texts)
-            extracted = extract_form_fields(combined)
-            result = {
-                "id": msg.get("id"),
-                "provider": "google",
-                "fields": extracted["fields"],
-                "evidence": extracted["evidence"],
-            }
-            if self.on_result_cb:
-                await self.on_result_cb("google", msg.get("id"), result)
-            return result
+        client = get_http_client()
+        msg = await gmail_get_message(client, token, msg_id)
+        payload = msg.get("payload") or {}
+        body_text, attachments = await gmail_extract_full_text_and_attachments(client, token, payload, msg["id"])
+
+        fetched = await gmail_fetch_attachments(client, token, msg["id"], attachments)
+        files = [f for f in fetched if f is not None]
+        # OCR runs in the process pool; attachments and PDF pages in parallel
+        ocr_texts = await ocr_attachments(
+            files, is_complete=lambda texts: has_required_fields("\n\n".join([body_text] + texts))
+        )
+
+        combined = "\n\n".join([body_text] + ocr_texts)
+        extracted = extract_form_fields(combined)
+        result = {
+            "id": msg.get("id"),
+            "provider": "google",
+            "fields": extracted["fields"],
+            "evidence": extracted["evidence"],
+        }
+        if self.on_result_cb:
+            await self.on_result_cb("google", msg.get("id"), result)
+        return result
 
     async def process_graph_message(self, token: str, msg_id: str) -> Dict[str, Any]:
-        async with httpx.AsyncClient() as client:
-            msg = await graph_get_message(client, token, msg_id)
-            subject = msg.get("subject") or ""
-            body_preview = msg.get("bodyPreview") or ""
-            body_html = (msg.get("body") or {}).get("content") or ""
-            base_text = "\n".join([subject, body_preview, body_html])
-
-            ocr_texts = []
-            if msg.get("hasAttachments"):
-                atts = await graph_list_attachments(client, token, msg["id"])
-                for att in atts:
-                    parsed = graph_attachment_to_bytes(att)
-                    if parsed:
-                        data, name, mime = parsed
-                        ocr_texts.append(ocr_bytes(data, mime, name))
-
-            combined = "\n\n".join([base_text] + ocr_texts)
-            extracted = extract_form_fields(combined)
-            result = {
-                "id": msg.get("id"),
-                "provider": "microsoft",
-                "fields": extracted["fields"],
-                "evidence": extracted["evidence"],
-            }
-            if self.on_result_cb:
-                await self.on_result_cb("microsoft", msg.get("id"), result)
-            return result
+        client = get_http_client()
+        msg = await graph_get_message(client, token, msg_id)
+        subject = msg.get("subject") or ""
+        body_preview = msg.get("bodyPreview") or ""
+        body_html = (msg.get("body") or {}).get("content") or ""
+        base_text = "\n".join([subject, body_preview, body_html])
+
+        ocr_texts = []
+        if msg.get("hasAttachments"):
+            atts = await graph_list_attachments(client, token, msg["id"])
+            files = []
+            for att in atts:
+                if (att.get("size") or 0) > EMAIL_ATTACHMENT_MAX_BYTES:
+                    print(f"WARNING: Skipping attachment '{att.get('name')}' ({att.get('size')} bytes, over EMAIL_ATTACHMENT_MAX_BYTES)", flush=True)
+                    continue
+                parsed = graph_attachment_to_bytes(att)
+                if parsed:
+                    data, name, mime = parsed
+                    files.append((data, mime, name))
+            ocr_texts = await ocr_attachments(
+                files, is_complete=lambda texts: has_required_fields("\n\n".join([base_text] + texts))
+            )
+
+        combined = "\n\n".join([base_text] + ocr_texts)
+        extracted = extract_form_fields(combined)
+        result = {
+            "id": msg.get("id"),
+            "provider": "microsoft",
+            "fields": extracted["fields"],
+            "evidence": extracted["evidence"],
+        }
+        if self.on_result_cb:
+            await self.on_result_cb("microsoft", msg.get("id"), result)
+        return result
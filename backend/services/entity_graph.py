@@ -0,0 +1,538 @@
+# services/entity_graph.py
+"""
+Persistent entity-graph index behind the /api/dashboard/network-data endpoints.
+
+/api/dashboard/network-data draws a fixed snapshot of the latest 500 cases. To let
+investigators expand a ring around any account, the links between customers,
+accounts, mobiles and cases are kept as adjacency lists in entity_graph_edge, one
+row per (node, relation, neighbour) and direction, so the neighbours of a node are
+a single index range scan:
+
+    relation          from                      to         source table
+    paid              account (payer)           account    txn (weight = transactions)
+    payee             account                   account    acc_bene (registered beneficiary)
+    owns              customer                  account    account_customer
+    mobile            customer                  mobile     customer.mobile
+    case_victim       case                      account    case_main.acc_num
+    case_beneficiary  case                      account    case_main.source_bene_accno
+    case_customer     case                      customer   case_main.cust_id
+
+Beneficiaries are account nodes: a mule account that receives and then pays on is
+one node, which is what lets a traversal follow the chain.
+
+Statement-level triggers on the source tables queue the owning key of every row a
+write touched (payer account, customer, case ...). A background job (one per uvicorn
+worker, serialized through an advisory lock) rebuilds the edges of just those keys
+every ENTITY_GRAPH_REFRESH_SECONDS, and rebuilds the whole index every
+ENTITY_GRAPH_RECONCILE_SECONDS (or when more than ENTITY_GRAPH_MAX_INCREMENTAL_KEYS
+keys are queued at once), logging any drift. A full rebuild fills a new table and
+swaps it in at the end, so the live index is only locked for the swap and the old
+edges go away with the old table rather than as a whole-table DELETE.
+neighbourhood() answers k-hop queries with one query per hop; graph_ready() is False
+until the first build has run, and after _MAX_FAILED_PASSES maintenance passes in a
+row have failed.
+
+The tables, trigger functions and triggers are installed by scripts/migrate.py
+(install_entity_graph) and removed by its --drop (uninstall_entity_graph); workers
+only check that the triggers are there.
+"""
+
+import asyncio
+from collections import defaultdict
+from typing import Any, Dict, List, Tuple
+
+from config import (
+    ENTITY_GRAPH_ENABLED,
+    ENTITY_GRAPH_MAX_INCREMENTAL_KEYS,
+    ENTITY_GRAPH_RECONCILE_SECONDS,
+    ENTITY_GRAPH_REFRESH_SECONDS,
+)
+from db.connection import get_db_connection
+from db.schema import missing_triggers
+
+NODE_TYPES = ("account", "customer", "mobile", "case")
+
+# source -> base table and the column whose value owns the source's edges
+_SOURCES: Dict[str, Tuple[str, str]] = {
+    "txn": ("txn", "acct_num"),
+    "acc_bene": ("acc_bene", "cust_acct_num"),
+    "account_customer": ("account_customer", "cust_id"),
+    "customer": ("customer", "cust_id"),
+    "case_main": ("public.case_main", "case_id"),
+}
+
+# relation -> source, owner node type, neighbour node type and the (owner_id,
+# neighbour_id, weight) pairs; {scope} limits them to the owners being rebuilt.
+_RELATIONS: Dict[str, Dict] = {
+    "paid": {
+        "source": "txn", "owner": "account", "neighbour": "account",
+        "pairs": """
+            SELECT t.acct_num::text, t.bene_acct_num::text, COUNT(*)
+            FROM txn t
+            WHERE t.acct_num IS NOT NULL AND t.bene_acct_num IS NOT NULL AND {scope}
+            GROUP BY 1, 2
+        """,
+        "scope": "t.acct_num = ANY(%(keys)s)",
+    },
+    "payee": {
+        "source": "acc_bene", "owner": "account", "neighbour": "account",
+        "pairs": """
+            SELECT ab.cust_acct_num::text, ab.bene_acct_num::text, COUNT(*)
+            FROM acc_bene ab
+            WHERE ab.cust_acct_num IS NOT NULL AND ab.bene_acct_num IS NOT NULL AND {scope}
+            GROUP BY 1, 2
+        """,
+        "scope": "ab.cust_acct_num = ANY(%(keys)s)",
+    },
+    "owns": {
+        "source": "account_customer", "owner": "customer", "neighbour": "account",
+        "pairs": """
+            SELECT ac.cust_id::text, ac.acc_num::text, COUNT(*)
+            FROM account_customer ac
+            WHERE ac.cust_id IS NOT NULL AND ac.acc_num IS NOT NULL AND {scope}
+            GROUP BY 1, 2
+        """,
+        "scope": "ac.cust_id = ANY(%(keys)s)",
+    },
+    "mobile": {
+        "source": "customer", "owner": "customer", "neighbour": "mobile",
+        "pairs": """
+            SELECT c.cust_id::text, c.mobile::text, COUNT(*)
+            FROM customer c
+            WHERE c.cust_id IS NOT NULL AND c.mobile IS NOT NULL AND {scope}
+            GROUP BY 1, 2
+        """,
+        "scope": "c.cust_id = ANY(%(keys)s)",
+    },
+    "case_victim": {
+        "source": "case_main", "owner": "case", "neighbour": "account",
+        "pairs": """
+            SELECT cm.case_id::text, cm.acc_num::text, COUNT(*)
+            FROM public.case_main cm
+            WHERE cm.acc_num IS NOT NULL AND {scope}
+            GROUP BY 1, 2
+        """,
+        "scope": "cm.case_id = ANY(%(keys)s::int[])",
+    },
+    "case_beneficiary": {
+        "source": "case_main", "owner": "case", "neighbour": "account",
+        "pairs": """
+            SELECT cm.case_id::text, cm.source_bene_accno::text, COUNT(*)
+            FROM public.case_main cm
+            WHERE cm.source_bene_accno IS NOT NULL AND {scope}
+            GROUP BY 1, 2
+        """,
+        "scope": "cm.case_id = ANY(%(keys)s::int[])",
+    },
+    "case_customer": {
+        "source": "case_main", "owner": "case", "neighbour": "customer",
+        "pairs": """
+            SELECT cm.case_id::text, cm.cust_id::text, COUNT(*)
+            FROM public.case_main cm
+            WHERE cm.cust_id IS NOT NULL AND {scope}
+            GROUP BY 1, 2
+        """,
+        "scope": "cm.case_id = ANY(%(keys)s::int[])",
+    },
+}
+
+_EDGE_COLUMNS = "node_type, node_id, relation, outgoing, neighbor_type, neighbor_id, weight"
+_EDGE_KEY = "node_type, node_id, relation, outgoing, neighbor_type, neighbor_id"
+
+# index -> columns, on the live table and on the table a full rebuild fills
+_EDGE_INDEXES = {
+    # Traversal: a node's strongest links first
+    "idx_entity_graph_adjacency": "node_type, node_id, weight DESC",
+    # Incremental rebuilds remove the reverse rows of an owner's edges
+    "idx_entity_graph_reverse": "neighbor_type, neighbor_id, relation",
+}
+
+# A full rebuild fills this table, then swaps it in for entity_graph_edge
+_BUILD_TABLE = "entity_graph_edge_build"
+# How long the swap may wait for traversals still reading the old table
+_SWAP_LOCK_TIMEOUT = "5s"
+
+_TABLES_SQL = [
+    f"""
+    CREATE TABLE IF NOT EXISTS entity_graph_edge (
+        node_type VARCHAR(10) NOT NULL,
+        node_id TEXT NOT NULL,
+        relation VARCHAR(20) NOT NULL,
+        outgoing BOOLEAN NOT NULL,
+        neighbor_type VARCHAR(10) NOT NULL,
+        neighbor_id TEXT NOT NULL,
+        weight BIGINT NOT NULL,
+        PRIMARY KEY ({_EDGE_KEY})
+    )
+    """,
+    *(f"CREATE INDEX IF NOT EXISTS {index} ON entity_graph_edge ({columns})" for index, columns in _EDGE_INDEXES.items()),
+    """
+    CREATE TABLE IF NOT EXISTS entity_graph_dirty (
+        id BIGSERIAL PRIMARY KEY,
+        source VARCHAR(20) NOT NULL,
+        key TEXT NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS entity_graph_state (
+        id BOOLEAN PRIMARY KEY DEFAULT TRUE CHECK (id),
+        built_at TIMESTAMP,
+        edges BIGINT,
+        drifted_edges BIGINT
+    )
+    """,
+]
+
+
+def _trigger_function_sql(source: str, key: str) -> str:
+    return f"""
+    CREATE OR REPLACE FUNCTION entity_graph_{source}_trigger()
+    RETURNS TRIGGER AS $$
+    BEGIN
+        IF TG_OP IN ('UPDATE', 'DELETE') THEN
+            INSERT INTO entity_graph_dirty (source, key)
+            SELECT DISTINCT '{source}', {key}::text FROM old_rows WHERE {key} IS NOT NULL;
+        END IF;
+        IF TG_OP IN ('INSERT', 'UPDATE') THEN
+            INSERT INTO entity_graph_dirty (source, key)
+            SELECT DISTINCT '{source}', {key}::text FROM new_rows WHERE {key} IS NOT NULL;
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """
+
+
+def _triggers() -> List[Tuple[str, str, str, str, str]]:
+    # Transition tables are only allowed on single-event triggers, hence three per table
+    triggers = []
+    for source, (table, _) in _SOURCES.items():
+        function = f"entity_graph_{source}_trigger"
+        triggers += [
+            (f"entity_graph_{source}_insert", table, "AFTER INSERT",
+             "REFERENCING NEW TABLE AS new_rows FOR EACH STATEMENT", function),
+            (f"entity_graph_{source}_update", table, "AFTER UPDATE",
+             "REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows FOR EACH STATEMENT", function),
+            (f"entity_graph_{source}_delete", table, "AFTER DELETE",
+             "REFERENCING OLD TABLE AS old_rows FOR EACH STATEMENT", function),
+        ]
+    return triggers
+
+
+# Consecutive failed maintenance passes after which the index counts as stale
+_MAX_FAILED_PASSES = 3
+
+_ready = False
+_missing_reported = False
+
+
+def graph_ready() -> bool:
+    """True once the graph index has been built and is being maintained."""
+    return _ready
+
+
+# --- Schema / lifecycle ---
+
+def graph_triggers() -> List[Tuple[str, str]]:
+    """(trigger, table) pairs install_entity_graph creates."""
+    return [(trigger, table) for trigger, table, _, _, _ in _triggers()]
+
+
+def install_entity_graph(cur) -> None:
+    """Create the graph tables, trigger functions and triggers (scripts/migrate.py)."""
+    for statement in _TABLES_SQL:
+        cur.execute(statement)
+    for source, (_, key) in _SOURCES.items():
+        cur.execute(_trigger_function_sql(source, key))
+    for trigger, table, timing, level, function in _triggers():
+        cur.execute(f"DROP TRIGGER IF EXISTS {trigger} ON {table}")
+        cur.execute(f"CREATE TRIGGER {trigger} {timing} ON {table} {level} EXECUTE PROCEDURE {function}()")
+
+
+def uninstall_entity_graph(cur) -> None:
+    """Drop the triggers and queued keys (scripts/migrate.py --drop); a reinstall rebuilds the index from scratch."""
+    for trigger, table, _, _, _ in _triggers():
+        cur.execute(f"DROP TRIGGER IF EXISTS {trigger} ON {table}")
+    cur.execute("SELECT to_regclass('entity_graph_state')")
+    if cur.fetchone()[0] is not None:
+        cur.execute("TRUNCATE entity_graph_dirty")
+        cur.execute("DELETE FROM entity_graph_state")
+
+
+def _check_triggers() -> List[str]:
+    with get_db_connection(caller="entity_graph") as conn:
+        with conn.cursor() as cur:
+            return missing_triggers(cur, graph_triggers())
+
+
+def _edges_sql(name: str, scope: str) -> str:
+    """Both directions of one relation's edges, as entity_graph_edge rows."""
+    spec = _RELATIONS[name]
+    return f"""
+        WITH pairs (owner_id, neighbour_id, weight) AS ({spec['pairs'].format(scope=scope)})
+        SELECT '{spec['owner']}', owner_id, '{name}', TRUE, '{spec['neighbour']}', neighbour_id, weight FROM pairs
+        UNION ALL
+        SELECT '{spec['neighbour']}', neighbour_id, '{name}', FALSE, '{spec['owner']}', owner_id, weight FROM pairs
+    """
+
+
+def _rebuild_edges(cur, source: str, keys: List[str]) -> None:
+    """Replace the edges owned by `keys` with what the source table says now."""
+    for name, spec in _RELATIONS.items():
+        if spec["source"] != source:
+            continue
+        params = {"relation": name, "owner": spec["owner"], "keys": keys}
+        cur.execute("""
+            DELETE FROM entity_graph_edge
+            WHERE node_type = %(owner)s AND node_id = ANY(%(keys)s) AND relation = %(relation)s AND outgoing
+        """, params)
+        cur.execute("""
+            DELETE FROM entity_graph_edge
+            WHERE neighbor_type = %(owner)s AND neighbor_id = ANY(%(keys)s) AND relation = %(relation)s AND NOT outgoing
+        """, params)
+        cur.execute(f"INSERT INTO entity_graph_edge ({_EDGE_COLUMNS}) {_edges_sql(name, spec['scope'])}", params)
+
+
+def _rebuild(cur) -> Tuple[int, int]:
+    """
+    Rebuild the whole index into _BUILD_TABLE and swap it in; returns (edges, edge
+    rows that differed from the maintained index). Until the swap, traversals keep
+    reading the old table.
+    """
+    everything = "\nUNION ALL\n".join(f"({_edges_sql(name, 'TRUE')})" for name in _RELATIONS)
+    cur.execute(f"DROP TABLE IF EXISTS {_BUILD_TABLE}")
+    cur.execute(f"CREATE TABLE {_BUILD_TABLE} (LIKE entity_graph_edge INCLUDING DEFAULTS)")
+    cur.execute(f"INSERT INTO {_BUILD_TABLE} ({_EDGE_COLUMNS}) {everything}")
+    edges = cur.rowcount
+    # Indexes after the load: one sort each instead of maintaining them row by row
+    cur.execute(f"ALTER TABLE {_BUILD_TABLE} ADD CONSTRAINT {_BUILD_TABLE}_pkey PRIMARY KEY ({_EDGE_KEY})")
+    for index, columns in _EDGE_INDEXES.items():
+        cur.execute(f"CREATE INDEX {index}_build ON {_BUILD_TABLE} ({columns})")
+    cur.execute(f"""
+        SELECT COUNT(*) FROM (
+            (SELECT {_EDGE_COLUMNS} FROM {_BUILD_TABLE} EXCEPT SELECT {_EDGE_COLUMNS} FROM entity_graph_edge)
+            UNION ALL
+            (SELECT {_EDGE_COLUMNS} FROM entity_graph_edge EXCEPT SELECT {_EDGE_COLUMNS} FROM {_BUILD_TABLE})
+        ) d
+    """)
+    drifted = cur.fetchone()[0]
+
+    # Swap: fail the pass (and keep the old index) rather than queue traversals behind the lock
+    cur.execute("SET LOCAL lock_timeout = %s", (_SWAP_LOCK_TIMEOUT,))
+    cur.execute("DROP TABLE entity_graph_edge")
+    cur.execute(f"ALTER TABLE {_BUILD_TABLE} RENAME TO entity_graph_edge")
+    cur.execute(f"ALTER TABLE entity_graph_edge RENAME CONSTRAINT {_BUILD_TABLE}_pkey TO entity_graph_edge_pkey")
+    for index in _EDGE_INDEXES:
+        cur.execute(f"ALTER INDEX {index}_build RENAME TO {index}")
+    return edges, drifted
+
+
+def maintain_graph() -> None:
+    """
+    One maintenance pass: rebuild the edges of the queued keys, or the whole index
+    when it has never been built, its last full build is older than
+    ENTITY_GRAPH_RECONCILE_SECONDS or too many keys are queued. Only one worker does
+    this at a time.
+    """
+    global _ready, _missing_reported
+    with get_db_connection(caller="entity_graph") as conn:
+        with conn.cursor() as cur:
+            missing = missing_triggers(cur, graph_triggers())
+            if missing:
+                # Not installed yet, or removed by migrate.py --drop: the endpoint reports the index as not ready
+                _ready = False
+                if not _missing_reported:
+                    print(f"WARNING: Entity graph triggers missing ({', '.join(missing)}); "
+                          "install them with: python backend/scripts/migrate.py", flush=True)
+                    _missing_reported = True
+                return
+            _missing_reported = False
+            cur.execute("SELECT pg_try_advisory_xact_lock(hashtext('entity_graph:maintain'))")
+            if cur.fetchone()[0]:
+                cur.execute("""
+                    SELECT built_at >= NOW() - make_interval(secs => %s) FROM entity_graph_state
+                """, (ENTITY_GRAPH_RECONCILE_SECONDS,))
+                state = cur.fetchone()
+                current = bool(state and state[0])
+                # Drain before reading the source tables: anything committed after this stays queued
+                cur.execute("DELETE FROM entity_graph_dirty RETURNING source, key")
+                queued = defaultdict(set)
+                for source, key in cur.fetchall():
+                    queued[source].add(key)
+                queued_keys = sum(len(keys) for keys in queued.values())
+
+                if not current or queued_keys > ENTITY_GRAPH_MAX_INCREMENTAL_KEYS:
+                    edges, drifted = _rebuild(cur)
+                    cur.execute("""
+                        INSERT INTO entity_graph_state (id, built_at, edges, drifted_edges)
+                        VALUES (TRUE, NOW(), %s, %s)
+                        ON CONFLICT (id) DO UPDATE
+                        SET built_at = EXCLUDED.built_at, edges = EXCLUDED.edges, drifted_edges = EXCLUDED.drifted_edges
+                    """, (edges, drifted))
+                    if state is None:
+                        print(f"[entity-graph] Built graph index ({edges} edge rows)", flush=True)
+                    elif current:
+                        print(f"[entity-graph] Rebuilt graph index for {queued_keys} queued keys ({edges} edge rows)", flush=True)
+                    elif drifted:
+                        print(f"[entity-graph] Reconciled graph index: corrected {drifted} of {edges} edge rows", flush=True)
+                    else:
+                        print(f"[entity-graph] Reconciled graph index ({edges} edge rows, no drift)", flush=True)
+                else:
+                    for source, keys in queued.items():
+                        _rebuild_edges(cur, source, list(keys))
+            conn.commit()
+
+            cur.execute("SELECT COUNT(*) FROM entity_graph_state WHERE built_at IS NOT NULL")
+            _ready = cur.fetchone()[0] > 0
+            conn.commit()
+
+
+async def run_graph_worker(executor) -> None:
+    """Background loop (one per uvicorn worker) keeping the graph index current until cancelled."""
+    global _ready
+    loop = asyncio.get_running_loop()
+    if not ENTITY_GRAPH_ENABLED:
+        try:
+            missing = await loop.run_in_executor(executor, _check_triggers)
+        except Exception as e:
+            print(f"WARNING: Could not check entity graph triggers: {e}", flush=True)
+            return
+        if len(missing) < len(_triggers()):
+            print("WARNING: The entity graph is disabled but its triggers are still installed and queue "
+                  "keys; remove them with: python backend/scripts/migrate.py --drop entity_graph", flush=True)
+        return
+    print("[entity-graph] Worker started", flush=True)
+    failed_passes = 0
+    while True:
+        try:
+            await loop.run_in_executor(executor, maintain_graph)
+            failed_passes = 0
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            failed_passes += 1
+            print(f"[entity-graph] Maintenance pass failed: {e}", flush=True)
+            if failed_passes == _MAX_FAILED_PASSES and _ready:
+                # Queued keys are piling up unapplied: stop answering from a stale index until a pass succeeds
+                _ready = False
+                print(f"WARNING: {failed_passes} entity graph maintenance passes failed in a row, "
+                      "index marked as not ready", flush=True)
+        await asyncio.sleep(ENTITY_GRAPH_REFRESH_SECONDS)
+
+
+def start_graph_worker(executor) -> asyncio.Task:
+    """Start this process's graph worker (it only checks the triggers when the graph is disabled)."""
+    return asyncio.create_task(run_graph_worker(executor))
+
+
+# --- Traversal ---
+
+_NEIGHBOURS_SQL = """
+    SELECT f.node_type, f.node_id, e.relation, e.outgoing, e.neighbor_type, e.neighbor_id, e.weight
+    FROM unnest(%s::text[], %s::text[]) AS f(node_type, node_id)
+    CROSS JOIN LATERAL (
+        SELECT relation, outgoing, neighbor_type, neighbor_id, weight
+        FROM entity_graph_edge g
+        WHERE g.node_type = f.node_type AND g.node_id = f.node_id
+        ORDER BY g.weight DESC
+        LIMIT %s
+    ) e
+"""
+
+
+def _node_key(node_type: str, node_id: str) -> str:
+    return f"{node_type}_{node_id}"
+
+
+def neighbourhood(cur, node_type: str, node_id: str, hops: int, max_degree: int, max_nodes: int) -> Dict[str, Any]:
+    """
+    Nodes and edges within `hops` of (node_type, node_id), one query per hop. Each node
+    contributes at most `max_degree` links (heaviest first) and the result stops growing
+    at `max_nodes`; nodes whose links were cut are marked `truncated`. `cur` must be a
+    RealDictCursor.
+    """
+    start = (node_type, str(node_id))
+    nodes: Dict[Tuple[str, str], Dict[str, Any]] = {start: {"hop": 0, "truncated": False}}
+    edges: Dict[Tuple, int] = {}
+    frontier = [start]
+    node_limit_hit = False
+
+    for hop in range(1, hops + 1):
+        if not frontier:
+            break
+        cur.execute(_NEIGHBOURS_SQL, ([t for t, _ in frontier], [i for _, i in frontier], max_degree + 1))
+        links = defaultdict(list)
+        for row in cur.fetchall():
+            links[(row["node_type"], row["node_id"])].append(row)
+
+        next_frontier = []
+        for node in frontier:
+            found = links.get(node, [])
+            if len(found) > max_degree:
+                nodes[node]["truncated"] = True
+                found = found[:max_degree]
+            for row in found:
+                other = (row["neighbor_type"], row["neighbor_id"])
+                if other not in nodes:
+                    if len(nodes) >= max_nodes:
+                        node_limit_hit = True
+                        continue
+                    nodes[other] = {"hop": hop, "truncated": False}
+                    next_frontier.append(other)
+                source, target = (node, other) if row["outgoing"] else (other, node)
+                edges[(source, row["relation"], target)] = row["weight"]
+        frontier = next_frontier
+
+    # Case nodes carry their case details, like the network-data snapshot
+    case_ids = [int(node_id) for node_type, node_id in nodes if node_type == "case" and node_id.isdigit()]
+    cases = {}
+    if case_ids:
+        cur.execute("""
+            SELECT case_id, case_type, status, disputed_amount, creation_date, location
+            FROM case_main WHERE case_id = ANY(%s)
+        """, (case_ids,))
+        cases = {str(row["case_id"]): row for row in cur.fetchall()}
+
+    connections = defaultdict(int)
+    for source, _, target in edges:
+        connections[source] += 1
+        connections[target] += 1
+
+    node_list = []
+    for (kind, value), info in nodes.items():
+        count = connections[(kind, value)]
+        node = {
+            "id": _node_key(kind, value),
+            "type": kind,
+            "label": f"Case {value}" if kind == "case" else value,
+            "hop": info["hop"],
+            "truncated": info["truncated"],
+            "connections": count,
+            "risk_level": "high" if count >= 5 else "medium" if count >= 3 else "low",
+        }
+        case = cases.get(value) if kind == "case" else None
+        if case:
+            node.update({
+                "case_type": case["case_type"],
+                "status": case["status"],
+                "amount": float(case["disputed_amount"]) if case["disputed_amount"] else 0,
+                "creation_date": case["creation_date"].isoformat() if case["creation_date"] else None,
+                "location": case["location"],
+            })
+        node_list.append(node)
+
+    edge_list = [
+        {"source": _node_key(*source), "target": _node_key(*target), "type": relation, "strength": weight}
+        for (source, relation, target), weight in edges.items()
+    ]
+    return {
+        "root": _node_key(*start),
+        "nodes": node_list,
+        "edges": edge_list,
+        "stats": {
+            "total_nodes": len(node_list),
+            "total_edges": len(edge_list),
+            "truncated_nodes": sum(1 for info in nodes.values() if info["truncated"]),
+            "node_limit_reached": node_limit_hit,
+        },
+    }
@@ -6,25 +6,19 @@ from typing import Dict, Any, Optional, List
 import asyncio # Needed for asyncio.get_running_loop()
 from concurrent.futures import ThreadPoolExecutor # Needed for type hinting executor
 
-# Assuming DB_CONNECTION_PARAMS is accessible. Will import from config.
-from config import DB_CONNECTION_PARAMS 
+from db.connection import get_db_connection
 
 def _sync_get_error_details_from_db(error_code_str: str) -> Optional[Dict[str, Any]]:
     """Synchronously fetches error details from error_master table."""
-    conn = None
-    cur = None
     try:
-        conn = psycopg2.connect(**DB_CONNECTION_PARAMS)
-        cur = conn.cursor(cursor_factory=RealDictCursor)
-        cur.execute("SELECT errorcode, errordesc, errormessage FROM public.error_master WHERE errorcode = %s", (error_code_str,))
-        error_details = cur.fetchone()
-        return error_details
+        with get_db_connection(caller="error_handler") as conn:
+            with conn.cursor(cursor_factory=RealDictCursor) as cur:
+                cur.execute("SELECT errorcode, errordesc, errormessage FROM public.error_master WHERE errorcode = %s", (error_code_str,))
+                error_details = cur.fetchone()
+                return error_details
     except Exception as e:
         print(f"ERROR: Failed to fetch error details for code '{error_code_str}' from DB: {e}", flush=True)
         return None
-    finally:
-        if cur: cur.close()
-        if conn: conn.close()
 
 class ErrorHelper: # This is the class injected into routers
     def __init__(self, executor: ThreadPoolExecutor):
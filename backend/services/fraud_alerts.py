@@ -0,0 +1,498 @@
+# services/fraud_alerts.py
+"""
+Precomputed fraud-pattern alerts behind /api/dashboard/fraud-patterns.
+
+The endpoint used to aggregate every debit in txn for the selected window (joined to
+account_customer/customer) on each request. The three txn-wide alerts are now kept
+in small tables, one row per (window, entity) that crosses the alert threshold:
+
+- fraud_alert_account: per-account fan-out (distinct beneficiaries paid, >= 5).
+- fraud_alert_beneficiary: per-beneficiary fan-in (distinct source accounts, >= 8).
+- fraud_alert_mobile: shared-mobile clusters, i.e. high-value debits (> 50000) of all
+  accounts whose customers share a mobile number (>= 10).
+
+Each is kept for the 24h/7d/30d windows of the dashboard, with the same day-based
+semantics as the queries they replace (txn_date >= CURRENT_DATE - days), so the
+endpoint reads its top-K with an index scan.
+
+Statement-level triggers on txn queue the accounts and beneficiaries a write touched
+(one INSERT ... SELECT per statement, so bulk loads stay cheap); row triggers on
+customer and account_customer queue the mobiles and accounts whose links changed.
+A background job (one per uvicorn worker, serialized through an advisory lock)
+recomputes just the queued keys every FRAUD_ALERT_REFRESH_SECONDS. When the date
+changes only rows already in the tables can drop below a threshold, so those keys
+are recomputed then. Every FRAUD_ALERT_RECONCILE_SECONDS, or when more than
+FRAUD_ALERT_MAX_INCREMENTAL_KEYS keys are queued, the tables are rebuilt from txn
+and any drift is logged. Until the first rebuild has run, and after
+_MAX_FAILED_PASSES maintenance passes in a row have failed, the endpoint queries txn
+directly (alerts_ready()) rather than serve alerts that are no longer maintained.
+
+The tables, trigger functions and triggers are installed by scripts/migrate.py
+(install_fraud_alerts) and removed by its --drop (uninstall_fraud_alerts); workers
+only check that the triggers are there.
+"""
+
+import asyncio
+from typing import Dict, List, Set, Tuple
+
+from config import (
+    FRAUD_ALERT_MAX_INCREMENTAL_KEYS,
+    FRAUD_ALERT_RECONCILE_SECONDS,
+    FRAUD_ALERT_REFRESH_SECONDS,
+    FRAUD_ALERTS_ENABLED,
+)
+from db.connection import get_db_connection
+from db.schema import missing_triggers
+
+# Dashboard time_range -> window in days
+WINDOW_DAYS: Dict[str, int] = {"24h": 1, "7d": 7, "30d": 30}
+_MAX_DAYS = max(WINDOW_DAYS.values())
+
+# alert name -> table, entity key, stored columns (after window_days), top-K order and
+# the aggregate over txn. {scope} limits the aggregate to the keys being recomputed.
+_ALERTS: Dict[str, Dict] = {
+    "account": {
+        "table": "fraud_alert_account",
+        "key": "acct_num",
+        "columns": ["acct_num", "unique_beneficiaries", "total_transactions", "total_amount",
+                    "first_seen", "mobile_numbers"],
+        "order": "unique_beneficiaries DESC, total_amount DESC",
+        "aggregate": """
+            SELECT w.days, t.acct_num::text,
+                   COUNT(DISTINCT t.bene_acct_num),
+                   COUNT(*),
+                   SUM(t.amount),
+                   MIN(t.txn_date)::date,
+                   array_agg(DISTINCT c.mobile::text)
+            FROM txn t
+            JOIN unnest(%(windows)s::int[]) AS w(days) ON t.txn_date >= CURRENT_DATE - w.days
+            LEFT JOIN account_customer ac ON t.acct_num = ac.acc_num
+            LEFT JOIN customer c ON ac.cust_id = c.cust_id
+            WHERE t.txn_date >= CURRENT_DATE - %(max_days)s
+            AND t.txn_type = 'Debit'
+            AND {scope}
+            GROUP BY w.days, t.acct_num
+            HAVING COUNT(DISTINCT t.bene_acct_num) >= 5
+        """,
+        "scope": "t.acct_num = ANY(%(keys)s)",
+    },
+    "beneficiary": {
+        "table": "fraud_alert_beneficiary",
+        "key": "bene_acct_num",
+        "columns": ["bene_acct_num", "bene_name", "unique_sources", "total_transactions", "total_amount",
+                    "first_seen", "source_accounts"],
+        "order": "unique_sources DESC, total_amount DESC",
+        "aggregate": """
+            SELECT w.days, t.bene_acct_num::text, t.bene_name::text,
+                   COUNT(DISTINCT t.acct_num),
+                   COUNT(*),
+                   SUM(t.amount),
+                   MIN(t.txn_date)::date,
+                   array_agg(DISTINCT t.acct_num::text)
+            FROM txn t
+            JOIN unnest(%(windows)s::int[]) AS w(days) ON t.txn_date >= CURRENT_DATE - w.days
+            WHERE t.txn_date >= CURRENT_DATE - %(max_days)s
+            AND t.txn_type = 'Debit'
+            AND t.bene_acct_num IS NOT NULL
+            AND {scope}
+            GROUP BY w.days, t.bene_acct_num, t.bene_name
+            HAVING COUNT(DISTINCT t.acct_num) >= 8
+        """,
+        "scope": "t.bene_acct_num = ANY(%(keys)s)",
+    },
+    "mobile": {
+        "table": "fraud_alert_mobile",
+        "key": "mobile",
+        "columns": ["mobile", "transaction_count", "total_amount", "avg_amount", "unique_beneficiaries",
+                    "first_seen", "last_seen"],
+        "order": "transaction_count DESC, total_amount DESC",
+        "aggregate": """
+            SELECT w.days, c.mobile::text,
+                   COUNT(*),
+                   SUM(t.amount),
+                   AVG(t.amount),
+                   COUNT(DISTINCT t.bene_acct_num),
+                   MIN(t.txn_date)::date,
+                   MAX(t.txn_date)::date
+            FROM txn t
+            JOIN unnest(%(windows)s::int[]) AS w(days) ON t.txn_date >= CURRENT_DATE - w.days
+            JOIN account_customer ac ON t.acct_num = ac.acc_num
+            JOIN customer c ON ac.cust_id = c.cust_id
+            WHERE t.txn_date >= CURRENT_DATE - %(max_days)s
+            AND t.txn_type = 'Debit'
+            AND c.mobile IS NOT NULL
+            AND t.amount > 50000
+            AND {scope}
+            GROUP BY w.days, c.mobile
+            HAVING COUNT(*) >= 10
+        """,
+        "scope": "c.mobile = ANY(%(keys)s)",
+    },
+}
+
+_TABLES_SQL = [
+    """
+    CREATE TABLE IF NOT EXISTS fraud_alert_account (
+        window_days SMALLINT NOT NULL,
+        acct_num TEXT NOT NULL,
+        unique_beneficiaries BIGINT NOT NULL,
+        total_transactions BIGINT NOT NULL,
+        total_amount NUMERIC,
+        first_seen DATE,
+        mobile_numbers TEXT[],
+        PRIMARY KEY (window_days, acct_num)
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_fraud_alert_account_top ON fraud_alert_account (window_days, unique_beneficiaries DESC, total_amount DESC)",
+    "CREATE INDEX IF NOT EXISTS idx_fraud_alert_account_key ON fraud_alert_account (acct_num)",
+    # No primary key: like the query it replaces, a beneficiary can appear once per bene_name (NULL included)
+    """
+    CREATE TABLE IF NOT EXISTS fraud_alert_beneficiary (
+        window_days SMALLINT NOT NULL,
+        bene_acct_num TEXT NOT NULL,
+        bene_name TEXT,
+        unique_sources BIGINT NOT NULL,
+        total_transactions BIGINT NOT NULL,
+        total_amount NUMERIC,
+        first_seen DATE,
+        source_accounts TEXT[]
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_fraud_alert_beneficiary_top ON fraud_alert_beneficiary (window_days, unique_sources DESC, total_amount DESC)",
+    "CREATE INDEX IF NOT EXISTS idx_fraud_alert_beneficiary_key ON fraud_alert_beneficiary (bene_acct_num)",
+    """
+    CREATE TABLE IF NOT EXISTS fraud_alert_mobile (
+        window_days SMALLINT NOT NULL,
+        mobile TEXT NOT NULL,
+        transaction_count BIGINT NOT NULL,
+        total_amount NUMERIC,
+        avg_amount NUMERIC,
+        unique_beneficiaries BIGINT NOT NULL,
+        first_seen DATE,
+        last_seen DATE,
+        PRIMARY KEY (window_days, mobile)
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_fraud_alert_mobile_top ON fraud_alert_mobile (window_days, transaction_count DESC, total_amount DESC)",
+    "CREATE INDEX IF NOT EXISTS idx_fraud_alert_mobile_key ON fraud_alert_mobile (mobile)",
+    """
+    CREATE TABLE IF NOT EXISTS fraud_alert_dirty (
+        id BIGSERIAL PRIMARY KEY,
+        acct_num TEXT,
+        bene_acct_num TEXT,
+        mobile TEXT
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS fraud_alert_state (
+        id BOOLEAN PRIMARY KEY DEFAULT TRUE CHECK (id),
+        computed_for DATE,
+        reconciled_at TIMESTAMP,
+        alert_rows INTEGER,
+        drifted_rows INTEGER
+    )
+    """,
+]
+
+_TRIGGER_FUNCTIONS_SQL = [
+    f"""
+    CREATE OR REPLACE FUNCTION fraud_alert_txn_trigger()
+    RETURNS TRIGGER AS $$
+    BEGIN
+        -- Debits older than the widest window cannot change any alert
+        IF TG_OP IN ('UPDATE', 'DELETE') THEN
+            INSERT INTO fraud_alert_dirty (acct_num, bene_acct_num)
+            SELECT DISTINCT acct_num, bene_acct_num FROM old_rows
+            WHERE txn_type = 'Debit' AND txn_date >= CURRENT_DATE - {_MAX_DAYS};
+        END IF;
+        IF TG_OP IN ('INSERT', 'UPDATE') THEN
+            INSERT INTO fraud_alert_dirty (acct_num, bene_acct_num)
+            SELECT DISTINCT acct_num, bene_acct_num FROM new_rows
+            WHERE txn_type = 'Debit' AND txn_date >= CURRENT_DATE - {_MAX_DAYS};
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE OR REPLACE FUNCTION fraud_alert_customer_trigger()
+    RETURNS TRIGGER AS $$
+    BEGIN
+        -- The customer's accounts (mobile_numbers) and its old/new mobile cluster
+        IF TG_OP = 'UPDATE' THEN
+            IF (OLD.cust_id, OLD.mobile) IS NOT DISTINCT FROM (NEW.cust_id, NEW.mobile) THEN
+                RETURN NULL;
+            END IF;
+        END IF;
+        IF TG_OP IN ('UPDATE', 'DELETE') THEN
+            INSERT INTO fraud_alert_dirty (acct_num, mobile)
+            SELECT ac.acc_num, OLD.mobile FROM account_customer ac WHERE ac.cust_id = OLD.cust_id;
+        END IF;
+        IF TG_OP IN ('INSERT', 'UPDATE') THEN
+            INSERT INTO fraud_alert_dirty (acct_num, mobile)
+            SELECT ac.acc_num, NEW.mobile FROM account_customer ac WHERE ac.cust_id = NEW.cust_id;
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE OR REPLACE FUNCTION fraud_alert_account_customer_trigger()
+    RETURNS TRIGGER AS $$
+    BEGIN
+        IF TG_OP = 'UPDATE' THEN
+            IF (OLD.cust_id, OLD.acc_num) IS NOT DISTINCT FROM (NEW.cust_id, NEW.acc_num) THEN
+                RETURN NULL;
+            END IF;
+        END IF;
+        IF TG_OP IN ('UPDATE', 'DELETE') THEN
+            INSERT INTO fraud_alert_dirty (acct_num, mobile)
+            VALUES (OLD.acc_num, (SELECT c.mobile FROM customer c WHERE c.cust_id = OLD.cust_id LIMIT 1));
+        END IF;
+        IF TG_OP IN ('INSERT', 'UPDATE') THEN
+            INSERT INTO fraud_alert_dirty (acct_num, mobile)
+            VALUES (NEW.acc_num, (SELECT c.mobile FROM customer c WHERE c.cust_id = NEW.cust_id LIMIT 1));
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+]
+
+# Transition tables are only allowed on single-event triggers, hence three on txn
+_TRIGGERS = [
+    ("fraud_alert_txn_insert", "txn", "AFTER INSERT", "REFERENCING NEW TABLE AS new_rows FOR EACH STATEMENT",
+     "fraud_alert_txn_trigger"),
+    ("fraud_alert_txn_update", "txn", "AFTER UPDATE",
+     "REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows FOR EACH STATEMENT", "fraud_alert_txn_trigger"),
+    ("fraud_alert_txn_delete", "txn", "AFTER DELETE", "REFERENCING OLD TABLE AS old_rows FOR EACH STATEMENT",
+     "fraud_alert_txn_trigger"),
+    ("fraud_alert_customer_write", "customer", "AFTER INSERT OR DELETE OR UPDATE OF cust_id, mobile", "FOR EACH ROW",
+     "fraud_alert_customer_trigger"),
+    ("fraud_alert_account_customer_write", "account_customer", "AFTER INSERT OR UPDATE OR DELETE", "FOR EACH ROW",
+     "fraud_alert_account_customer_trigger"),
+]
+
+# Consecutive failed maintenance passes after which the alerts count as stale
+_MAX_FAILED_PASSES = 3
+
+_ready = False
+_missing_reported = False
+
+
+def alerts_ready() -> bool:
+    """True once the alert tables have been built and are current for today."""
+    return _ready
+
+
+def alert_query(name: str, days: int, limit: int = 5) -> Tuple[str, tuple]:
+    """(sql, params) for the top `limit` rows of one alert, as the dashboard queries returned them."""
+    spec = _ALERTS[name]
+    return (
+        f"SELECT {', '.join(spec['columns'])} FROM {spec['table']} "
+        f"WHERE window_days = %s ORDER BY {spec['order']} LIMIT %s",
+        (days, limit),
+    )
+
+
+# --- Schema / lifecycle ---
+
+def alert_triggers() -> List[Tuple[str, str]]:
+    """(trigger, table) pairs install_fraud_alerts creates."""
+    return [(trigger, table) for trigger, table, _, _, _ in _TRIGGERS]
+
+
+def install_fraud_alerts(cur) -> None:
+    """Create the alert tables, trigger functions and triggers (scripts/migrate.py)."""
+    for statement in _TABLES_SQL + _TRIGGER_FUNCTIONS_SQL:
+        cur.execute(statement)
+    for trigger, table, timing, level, function in _TRIGGERS:
+        cur.execute(f"DROP TRIGGER IF EXISTS {trigger} ON {table}")
+        cur.execute(f"CREATE TRIGGER {trigger} {timing} ON {table} {level} EXECUTE PROCEDURE {function}()")
+
+
+def uninstall_fraud_alerts(cur) -> None:
+    """Drop the triggers and queued keys (scripts/migrate.py --drop); a reinstall rebuilds the tables from scratch."""
+    for trigger, table, _, _, _ in _TRIGGERS:
+        cur.execute(f"DROP TRIGGER IF EXISTS {trigger} ON {table}")
+    cur.execute("SELECT to_regclass('fraud_alert_state')")
+    if cur.fetchone()[0] is not None:
+        cur.execute("TRUNCATE fraud_alert_dirty")
+        cur.execute("DELETE FROM fraud_alert_state")
+
+
+def _check_triggers() -> List[str]:
+    with get_db_connection(caller="fraud_alerts") as conn:
+        with conn.cursor() as cur:
+            return missing_triggers(cur, alert_triggers())
+
+
+def _params(keys=None) -> Dict:
+    return {"windows": sorted(set(WINDOW_DAYS.values())), "max_days": _MAX_DAYS, "keys": keys}
+
+
+def _insert_sql(spec, scope: str) -> str:
+    return (f"INSERT INTO {spec['table']} (window_days, {', '.join(spec['columns'])})\n"
+            + spec["aggregate"].format(scope=scope))
+
+
+def _recompute(cur, name: str, keys: List[str]) -> None:
+    """Replace the alert rows of `keys` with what txn says now."""
+    spec = _ALERTS[name]
+    cur.execute(f"DELETE FROM {spec['table']} WHERE {spec['key']} = ANY(%s)", (keys,))
+    cur.execute(_insert_sql(spec, spec["scope"]), _params(keys))
+
+
+def _rebuild(cur) -> Tuple[int, int]:
+    """Rebuild every alert table from txn; returns (rows, rows that differed from the maintained tables)."""
+    total = drifted = 0
+    for name, spec in _ALERTS.items():
+        columns = ", ".join(["window_days"] + spec["columns"])
+        cur.execute(f"CREATE TEMP TABLE fraud_alert_fresh ({columns}) ON COMMIT DROP AS "
+                    f"{spec['aggregate'].format(scope='TRUE')}", _params())
+        cur.execute(f"""
+            SELECT (SELECT COUNT(*) FROM fraud_alert_fresh),
+                   (SELECT COUNT(*) FROM (
+                       (SELECT * FROM fraud_alert_fresh EXCEPT ALL SELECT {columns} FROM {spec['table']})
+                       UNION ALL
+                       (SELECT {columns} FROM {spec['table']} EXCEPT ALL SELECT * FROM fraud_alert_fresh)
+                   ) d)
+        """)
+        rows, changed = cur.fetchone()
+        total += rows
+        drifted += changed
+        cur.execute(f"DELETE FROM {spec['table']}")
+        cur.execute(f"INSERT INTO {spec['table']} ({columns}) SELECT * FROM fraud_alert_fresh")
+        cur.execute("DROP TABLE fraud_alert_fresh")
+    return total, drifted
+
+
+def _drain_queue(cur) -> Tuple[Set[str], Set[str], Set[str]]:
+    """Take every queued key; accounts also queue the mobiles of their customers."""
+    cur.execute("DELETE FROM fraud_alert_dirty RETURNING acct_num, bene_acct_num, mobile")
+    accounts, beneficiaries, mobiles = set(), set(), set()
+    for acct_num, bene_acct_num, mobile in cur.fetchall():
+        if acct_num is not None:
+            accounts.add(acct_num)
+        if bene_acct_num is not None:
+            beneficiaries.add(bene_acct_num)
+        if mobile is not None:
+            mobiles.add(mobile)
+    if accounts:
+        cur.execute("""
+            SELECT DISTINCT c.mobile::text FROM account_customer ac
+            JOIN customer c ON ac.cust_id = c.cust_id
+            WHERE ac.acc_num = ANY(%s) AND c.mobile IS NOT NULL
+        """, (list(accounts),))
+        mobiles.update(row[0] for row in cur.fetchall())
+    return accounts, beneficiaries, mobiles
+
+
+def maintain_alerts() -> None:
+    """
+    One maintenance pass: recompute the queued keys (plus the keys already alerting
+    when the date has changed), or rebuild everything when the last rebuild is older
+    than FRAUD_ALERT_RECONCILE_SECONDS or too many keys are queued. Only one worker
+    does this at a time.
+    """
+    global _ready, _missing_reported
+    with get_db_connection(caller="fraud_alerts") as conn:
+        with conn.cursor() as cur:
+            missing = missing_triggers(cur, alert_triggers())
+            if missing:
+                # Not installed yet, or removed by migrate.py --drop: the endpoint uses live queries
+                _ready = False
+                if not _missing_reported:
+                    print(f"WARNING: Fraud alert triggers missing ({', '.join(missing)}), using live queries; "
+                          "install them with: python backend/scripts/migrate.py", flush=True)
+                    _missing_reported = True
+                return
+            _missing_reported = False
+            cur.execute("SELECT pg_try_advisory_xact_lock(hashtext('fraud_alerts:maintain'))")
+            if cur.fetchone()[0]:
+                cur.execute("""
+                    SELECT computed_for < CURRENT_DATE,
+                           reconciled_at >= NOW() - make_interval(secs => %s)
+                    FROM fraud_alert_state
+                """, (FRAUD_ALERT_RECONCILE_SECONDS,))
+                state = cur.fetchone()
+                rolled_over, current = state if state else (True, False)
+                # Drain before reading txn: anything committed after this stays queued
+                accounts, beneficiaries, mobiles = _drain_queue(cur)
+                queued = len(accounts) + len(beneficiaries) + len(mobiles)
+
+                if not current or queued > FRAUD_ALERT_MAX_INCREMENTAL_KEYS:
+                    rows, drifted = _rebuild(cur)
+                    cur.execute("""
+                        INSERT INTO fraud_alert_state (id, computed_for, reconciled_at, alert_rows, drifted_rows)
+                        VALUES (TRUE, CURRENT_DATE, NOW(), %s, %s)
+                        ON CONFLICT (id) DO UPDATE
+                        SET computed_for = EXCLUDED.computed_for, reconciled_at = EXCLUDED.reconciled_at,
+                            alert_rows = EXCLUDED.alert_rows, drifted_rows = EXCLUDED.drifted_rows
+                    """, (rows, drifted))
+                    if state is None:
+                        print(f"[fraud-alerts] Built alert tables ({rows} alert rows)", flush=True)
+                    elif current:
+                        print(f"[fraud-alerts] Rebuilt alert tables for {queued} queued keys ({rows} alert rows)", flush=True)
+                    elif drifted:
+                        print(f"[fraud-alerts] Reconciled alert tables: corrected {drifted} of {rows} rows", flush=True)
+                    else:
+                        print(f"[fraud-alerts] Reconciled alert tables ({rows} alert rows, no drift)", flush=True)
+                else:
+                    if rolled_over:
+                        # Windows moved on: rows can only drop out, so only current alerts can change
+                        cur.execute("SELECT acct_num FROM fraud_alert_account")
+                        accounts.update(row[0] for row in cur.fetchall())
+                        cur.execute("SELECT bene_acct_num FROM fraud_alert_beneficiary")
+                        beneficiaries.update(row[0] for row in cur.fetchall())
+                        cur.execute("SELECT mobile FROM fraud_alert_mobile")
+                        mobiles.update(row[0] for row in cur.fetchall())
+                    for name, keys in (("account", accounts), ("beneficiary", beneficiaries), ("mobile", mobiles)):
+                        if keys:
+                            _recompute(cur, name, list(keys))
+                    if rolled_over:
+                        cur.execute("UPDATE fraud_alert_state SET computed_for = CURRENT_DATE")
+            conn.commit()
+
+            cur.execute("SELECT computed_for = CURRENT_DATE FROM fraud_alert_state")
+            state = cur.fetchone()
+            _ready = bool(state and state[0])
+            conn.commit()
+
+
+async def run_alert_worker(executor) -> None:
+    """Background loop (one per uvicorn worker) keeping the alert tables current until cancelled."""
+    global _ready
+    loop = asyncio.get_running_loop()
+    if not FRAUD_ALERTS_ENABLED:
+        try:
+            missing = await loop.run_in_executor(executor, _check_triggers)
+        except Exception as e:
+            print(f"WARNING: Could not check fraud alert triggers: {e}", flush=True)
+            return
+        if len(missing) < len(_TRIGGERS):
+            print("WARNING: Fraud alerts are disabled but their triggers are still installed and queue "
+                  "keys; remove them with: python backend/scripts/migrate.py --drop fraud_alerts", flush=True)
+        return
+    print("[fraud-alerts] Worker started", flush=True)
+    failed_passes = 0
+    while True:
+        try:
+            await loop.run_in_executor(executor, maintain_alerts)
+            failed_passes = 0
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            failed_passes += 1
+            print(f"[fraud-alerts] Maintenance pass failed: {e}", flush=True)
+            if failed_passes == _MAX_FAILED_PASSES and _ready:
+                # Queued keys are piling up unapplied: serve live queries until a pass succeeds
+                _ready = False
+                print(f"WARNING: {failed_passes} fraud alert maintenance passes failed in a row, "
+                      "using live queries", flush=True)
+        await asyncio.sleep(FRAUD_ALERT_REFRESH_SECONDS)
+
+
+def start_alert_worker(executor) -> asyncio.Task:
+    """Start this process's alert worker (it only checks the triggers when alerts are disabled)."""
+    return asyncio.create_task(run_alert_worker(executor))
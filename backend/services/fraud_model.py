@@ -0,0 +1,236 @@
+# services/fraud_model.py
+"""
+Vectorized scoring with the account classifier trained by train.py.
+
+The artifacts (random_forest_model, scaler, feature_columns, label_encoder and,
+when train.py saved them, isolation_forest_model / isolation_forest_features) are
+loaded once per process from FRAUD_MODEL_DIR. Scoring takes any number of customers
+plus their transactions as DataFrames and repeats train.py's feature engineering
+column-wise over all of them at once:
+
+    transactions -> time features, log amount, gap to the previous txn per account
+                 -> IsolationForest anomaly flag (one predict() call for every txn)
+                 -> one groupby per account (count / sum / mean / max ...)
+    customers    -> left join the aggregates, one-hot the categoricals, reindex to
+                    feature_columns (categories unseen in a batch become 0 columns)
+                 -> scaler.transform + predict_proba on the whole matrix
+
+so 15k customers cost one pass through each model rather than 15k HTTP requests
+that each rebuild frames and dummies for a single row.
+
+If the IsolationForest artifacts are missing (models trained before train.py saved
+them), anomaly_label_if_sum and percentage_anomalous_txns are scored as 0 and a
+warning is printed once at load time.
+
+With FRAUD_MODEL_MMAP the artifacts are opened with joblib's mmap_mode='r': their
+numpy arrays stay backed by the .joblib files in the OS page cache, which every API
+worker on the host shares, instead of each worker reading the files into private
+memory. (scikit-learn copies tree node arrays into its own buffers when unpickling,
+so the gain there is mainly a faster load; plain arrays like the scaler's and the
+feature lists stay mapped.)
+"""
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from config import FRAUD_MODEL_DIR, FRAUD_MODEL_MMAP
+
+# Same column handling as train.py
+TXN_DROP_COLUMNS = ['descr', 'exch_rate', 'pay_ref', 'auth_code']
+TXN_CATEGORICAL_COLUMNS = ['txn_type', 'currency', 'channel', 'pay_method']
+CUSTOMER_DATE_COLUMNS = ['customer_joining_date', 'last_txn_date', 'dob']
+ID_COLUMNS = ['cust_id', 'acct_num']
+AGGREGATE_COLUMNS = [
+    'total_transactions', 'amount_sum', 'amount_mean', 'amount_max', 'anomaly_label_if_sum',
+    'time_since_last_txn_seconds_mean', 'time_since_last_txn_seconds_min',
+    'time_since_last_txn_seconds_max', 'percentage_anomalous_txns',
+]
+
+
+class FraudScoringEngine:
+    def __init__(self, model_dir: str = FRAUD_MODEL_DIR, mmap: bool = FRAUD_MODEL_MMAP):
+        self.model_dir = model_dir
+        self.mmap_mode = 'r' if mmap else None
+        self.model = None
+        self.scaler = None
+        self.label_encoder = None
+        self.feature_columns: List[str] = []
+        self.iso_forest = None
+        self.iso_features: List[str] = []
+        self.loaded_at: Optional[float] = None
+
+    def _artifact(self, name: str) -> str:
+        return os.path.join(self.model_dir, name)
+
+    def _load(self, name: str):
+        return joblib.load(self._artifact(name), mmap_mode=self.mmap_mode)
+
+    def _load_optional(self, name: str):
+        return self._load(name) if os.path.exists(self._artifact(name)) else None
+
+    def load(self) -> "FraudScoringEngine":
+        start = time.perf_counter()
+        self.model = self._load('random_forest_model.joblib')
+        self.scaler = self._load('scaler.joblib')
+        self.feature_columns = list(self._load('feature_columns.joblib'))
+        self.label_encoder = self._load_optional('label_encoder.joblib')
+        self.iso_forest = self._load_optional('isolation_forest_model.joblib')
+        self.iso_features = list(self._load_optional('isolation_forest_features.joblib') or [])
+        if self.iso_forest is None or not self.iso_features:
+            self.iso_forest = None
+            print("WARNING: isolation_forest_model.joblib not found; transaction anomaly features are scored as 0. "
+                  "Re-run train.py to save it.", flush=True)
+        self.loaded_at = time.time()
+        print(f"Fraud scoring model loaded from {self.model_dir} ({len(self.feature_columns)} features, "
+              f"mmap={self.mmap_mode is not None}) in {time.perf_counter() - start:.2f}s.", flush=True)
+        return self
+
+    @property
+    def classes(self) -> List[str]:
+        if self.label_encoder is not None:
+            return [str(c) for c in self.label_encoder.classes_]
+        return [str(c) for c in self.model.classes_]
+
+    # --- feature engineering ---
+
+    def transaction_features(self, transactions: pd.DataFrame) -> pd.DataFrame:
+        """
+        Per-transaction features for all accounts at once, plus the IsolationForest's
+        `anomaly_score_if` (decision_function; below 0 is anomalous) and the 0/1
+        `anomaly_label_if` derived from it, as predict() would. Rows come back sorted
+        by account and time; the input index is kept.
+        """
+        txns = transactions.drop(columns=TXN_DROP_COLUMNS, errors='ignore').copy()
+        txns['acct_num'] = pd.to_numeric(txns['acct_num'], errors='coerce')
+        txns['amount'] = pd.to_numeric(txns['amount'], errors='coerce').fillna(0.0)
+        txns['fee'] = pd.to_numeric(txns['fee'], errors='coerce').fillna(0.0) if 'fee' in txns else 0.0
+        txns['txn_datetime'] = pd.to_datetime(
+            txns['txn_date'].astype(str) + ' ' + txns['txn_time'].astype(str), errors='coerce'
+        )
+        txns = txns.sort_values(['acct_num', 'txn_datetime'], kind='mergesort')
+        stamp = txns['txn_datetime'].dt
+        txns['txn_hour'] = stamp.hour
+        txns['txn_dayofweek'] = stamp.dayofweek
+        txns['log_amount'] = np.log1p(txns['amount'])
+        txns['time_since_last_txn_seconds'] = (
+            txns.groupby('acct_num', sort=False)['txn_datetime'].diff().dt.total_seconds().fillna(0.0)
+        )
+
+        if self.iso_forest is None or txns.empty:
+            txns['anomaly_score_if'] = np.nan
+            txns['anomaly_label_if'] = 0
+            return txns
+        present = [c for c in TXN_CATEGORICAL_COLUMNS if c in txns]
+        if present:
+            txns_encoded = pd.concat([txns, pd.get_dummies(txns[present], columns=present, prefix=present)], axis=1)
+        else:
+            txns_encoded = txns
+        X_if = txns_encoded.reindex(columns=self.iso_features, fill_value=0)
+        X_if = X_if.astype(float).fillna(0.0)
+        txns['anomaly_score_if'] = self.iso_forest.decision_function(X_if)
+        txns['anomaly_label_if'] = (txns['anomaly_score_if'] < 0).astype(int)
+        return txns
+
+    def aggregate_transactions(self, txns: pd.DataFrame) -> pd.DataFrame:
+        """One row per acct_num with the aggregates train.py joins onto the customer table."""
+        if txns.empty:
+            return pd.DataFrame(columns=['acct_num'] + AGGREGATE_COLUMNS)
+        grouped = txns.groupby('acct_num').agg(
+            total_transactions=('txn_datetime', 'count'),
+            amount_sum=('amount', 'sum'),
+            amount_mean=('amount', 'mean'),
+            amount_max=('amount', 'max'),
+            anomaly_label_if_sum=('anomaly_label_if', 'sum'),
+            time_since_last_txn_seconds_mean=('time_since_last_txn_seconds', 'mean'),
+            time_since_last_txn_seconds_min=('time_since_last_txn_seconds', 'min'),
+            time_since_last_txn_seconds_max=('time_since_last_txn_seconds', 'max'),
+        )
+        total = grouped['total_transactions'].replace(0, np.nan)
+        grouped['percentage_anomalous_txns'] = (grouped['anomaly_label_if_sum'] / total * 100).fillna(0.0)
+        return grouped.reset_index()
+
+    def build_features(self, customers: pd.DataFrame, transactions: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+        """
+        Feature matrix (rows in `customers` order, columns = feature_columns, float).
+        `customers` uses the customer table's columns (acc_num or acct_num);
+        `transactions` the transaction table's, linked by acct_num.
+        """
+        frame = customers.rename(columns={'acc_num': 'acct_num'}).reset_index(drop=True)
+        frame['acct_num'] = pd.to_numeric(frame['acct_num'], errors='coerce')
+        frame = frame.drop(columns=CUSTOMER_DATE_COLUMNS + [c for c in AGGREGATE_COLUMNS if c in frame], errors='ignore')
+
+        if transactions is not None and not transactions.empty:
+            aggregated = self.aggregate_transactions(self.transaction_features(transactions))
+            frame = frame.merge(aggregated, on='acct_num', how='left')
+        else:
+            frame = frame.assign(**{c: np.nan for c in AGGREGATE_COLUMNS})
+        frame[AGGREGATE_COLUMNS] = frame[AGGREGATE_COLUMNS].fillna(0)
+
+        # Columns that were numeric at training time are kept numeric even when a batch
+        # sends them as strings or all-None; everything else is one-hot encoded.
+        known = set(self.feature_columns)
+        numeric = [c for c in frame.columns if c in known and c not in ID_COLUMNS]
+        frame[numeric] = frame[numeric].apply(pd.to_numeric, errors='coerce')
+        categorical = [c for c in frame.columns if c not in known and c not in ID_COLUMNS]
+        encoded = pd.get_dummies(frame[categorical].astype(object), columns=categorical) if categorical else None
+
+        X = frame[numeric]
+        if encoded is not None:
+            X = pd.concat([X, encoded], axis=1)
+        return X.reindex(columns=self.feature_columns, fill_value=0).astype(float).fillna(0.0)
+
+    # --- scoring ---
+
+    def score_frame(self, customers: pd.DataFrame, transactions: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+        """cust_id, acct_num, prediction and one probability_<class> column per class, in `customers` order."""
+        if customers.empty:
+            return pd.DataFrame(columns=['cust_id', 'acct_num', 'prediction']
+                                + [f"probability_{c}" for c in self.classes])
+        X = self.build_features(customers, transactions)
+        probabilities = self.model.predict_proba(self.scaler.transform(X))
+        classes = np.asarray(self.classes)
+        ids = customers.rename(columns={'acc_num': 'acct_num'}).reset_index(drop=True)
+        result = pd.DataFrame({
+            'cust_id': ids['cust_id'] if 'cust_id' in ids else None,
+            'acct_num': ids['acct_num'],
+            'prediction': classes[probabilities.argmax(axis=1)],
+        })
+        for index, name in enumerate(classes):
+            result[f"probability_{name}"] = probabilities[:, index]
+        return result
+
+    def score(self, customers: List[Dict[str, Any]], transactions: Optional[List[Dict[str, Any]]] = None) -> List[Dict[str, Any]]:
+        """score_frame for JSON rows: [{cust_id, acct_num, prediction, probabilities: {class: p}}]."""
+        scored = self.score_frame(pd.DataFrame(customers), pd.DataFrame(transactions or []))
+        classes = self.classes
+        probabilities = scored[[f"probability_{c}" for c in classes]].to_numpy()
+        return [
+            {
+                'cust_id': cust_id,
+                'acct_num': None if pd.isna(acct_num) else int(acct_num),
+                'prediction': prediction,
+                'probabilities': {c: float(p) for c, p in zip(classes, row)},
+            }
+            for cust_id, acct_num, prediction, row in zip(
+                scored['cust_id'], scored['acct_num'], scored['prediction'], probabilities
+            )
+        ]
+
+
+_engine: Optional[FraudScoringEngine] = None
+_engine_lock = threading.Lock()
+
+
+def get_scoring_engine() -> FraudScoringEngine:
+    """The process-wide engine, loading the artifacts on first use."""
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                _engine = FraudScoringEngine().load()
+    return _engine
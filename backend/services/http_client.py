@@ -0,0 +1,59 @@
+# services/http_client.py
+"""
+Process-wide pooled httpx client for outbound calls (Gmail, Microsoft Graph).
+
+One AsyncClient per API worker, opened on app startup and closed on shutdown, so
+TLS sessions and connections to googleapis.com / graph.microsoft.com are reused
+across messages instead of being set up for every webhook. HTTP/2 is used when the
+`h2` package is installed (httpx[http2]); requests to the same host are then
+multiplexed over one connection. Without it the client falls back to pooled
+HTTP/1.1 keep-alive connections.
+
+Code paths that run outside the app (scripts) get the same client lazily on first
+use.
+"""
+from typing import Optional
+
+import httpx
+
+from config import (
+    HTTP_CLIENT_HTTP2,
+    HTTP_CLIENT_MAX_CONNECTIONS,
+    HTTP_CLIENT_MAX_KEEPALIVE,
+    HTTP_CLIENT_TIMEOUT_SECONDS,
+)
+
+try:
+    import h2  # noqa: F401  (httpx needs it for http2=True)
+    _HTTP2_AVAILABLE = True
+except ImportError:
+    _HTTP2_AVAILABLE = False
+
+_client: Optional[httpx.AsyncClient] = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """The shared client; created on first use if startup did not open it."""
+    global _client
+    if _client is None or _client.is_closed:
+        http2 = HTTP_CLIENT_HTTP2 and _HTTP2_AVAILABLE
+        _client = httpx.AsyncClient(
+            http2=http2,
+            timeout=httpx.Timeout(HTTP_CLIENT_TIMEOUT_SECONDS, connect=10.0),
+            limits=httpx.Limits(
+                max_connections=HTTP_CLIENT_MAX_CONNECTIONS,
+                max_keepalive_connections=HTTP_CLIENT_MAX_KEEPALIVE,
+                keepalive_expiry=60.0,
+            ),
+        )
+        if HTTP_CLIENT_HTTP2 and not _HTTP2_AVAILABLE:
+            print("WARNING: h2 is not installed; shared HTTP client is using HTTP/1.1", flush=True)
+        print(f"Shared HTTP client opened (http2={http2}, max_connections={HTTP_CLIENT_MAX_CONNECTIONS}).", flush=True)
+    return _client
+
+
+async def close_http_client() -> None:
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
@@ -0,0 +1,159 @@
+# services/ocr_cache.py
+"""
+Disk-backed, content-addressed cache of OCR results.
+
+The same I4C PDFs and screenshots are forwarded again and again across threads and
+mailboxes. services/ocr_pool.py looks every OCR unit (an image, or one page of a
+PDF) up here before OCRing it: the key is the SHA-256 of the attachment's bytes plus
+the unit and everything that changes the output (PDF DPI, EasyOCR version,
+languages, OCR_CACHE_FORMAT), so upgrading the engine or the extraction simply
+misses instead of serving stale text.
+
+Entries are plain text files under OCR_CACHE_DIR/<first two hex chars>/, written
+atomically, so every uvicorn worker on the host shares them. A hit refreshes the
+file's mtime; when the cache grows past OCR_CACHE_MAX_BYTES the least recently used
+files are deleted until it is back under 90% of the limit. Hit/miss counters are
+per worker (see stats()).
+"""
+import hashlib
+import os
+import tempfile
+import threading
+from importlib import metadata
+from typing import Any, Dict, List, Optional, Tuple
+
+from config import OCR_CACHE_DIR, OCR_CACHE_ENABLED, OCR_CACHE_MAX_BYTES, OCR_PDF_DPI
+
+# Bump when the text produced for the same bytes changes (e.g. a new extraction mode)
+OCR_CACHE_FORMAT = 2
+
+try:
+    _ENGINE_VERSION = metadata.version("easyocr")
+except metadata.PackageNotFoundError:
+    _ENGINE_VERSION = "unknown"
+
+_lock = threading.Lock()
+_total_bytes: Optional[int] = None  # scanned lazily, then kept up to date by this worker
+_stats = {"hits": 0, "misses": 0, "writes": 0, "evictions": 0, "errors": 0}
+
+
+def content_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def cache_key(digest: str, unit: str) -> str:
+    """Key for one OCR unit of the attachment with content hash `digest` ('image' or 'page-<n>')."""
+    dpi = OCR_PDF_DPI if unit.startswith("page-") else 0
+    return hashlib.sha256(
+        f"{digest}|{unit}|dpi={dpi}|easyocr={_ENGINE_VERSION}|en|v{OCR_CACHE_FORMAT}".encode()
+    ).hexdigest()
+
+
+def _path(key: str) -> str:
+    return os.path.join(OCR_CACHE_DIR, key[:2], f"{key}.txt")
+
+
+def _scan() -> Tuple[int, list]:
+    total, files = 0, []
+    for root, _, names in os.walk(OCR_CACHE_DIR):
+        for name in names:
+            if not name.endswith(".txt"):
+                continue
+            path = os.path.join(root, name)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            total += st.st_size
+            files.append((st.st_mtime, st.st_size, path))
+    return total, files
+
+
+def _evict_if_needed(added: int) -> None:
+    global _total_bytes
+    with _lock:
+        if _total_bytes is None:
+            _total_bytes = _scan()[0]
+        else:
+            _total_bytes += added
+        if _total_bytes <= OCR_CACHE_MAX_BYTES:
+            return
+        # Other workers write here too: rescan for the real size and ages
+        total, files = _scan()
+        target = int(OCR_CACHE_MAX_BYTES * 0.9)
+        for _, size, path in sorted(files):
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+                total -= size
+                _stats["evictions"] += 1
+            except OSError:
+                pass
+        _total_bytes = total
+
+
+def _read(key: str) -> Tuple[bool, Optional[str]]:
+    path = _path(key)
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            text = f.read()
+        os.utime(path)  # LRU: eviction removes the oldest mtimes first
+    except FileNotFoundError:
+        _stats["misses"] += 1
+        return False, None
+    except OSError:
+        _stats["errors"] += 1
+        _stats["misses"] += 1
+        return False, None
+    _stats["hits"] += 1
+    return True, text
+
+
+def _write(key: str, text: str) -> None:
+    path = _path(key)
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(text)
+            os.replace(tmp, path)
+        except OSError:
+            os.unlink(tmp)
+            raise
+        _stats["writes"] += 1
+        _evict_if_needed(os.path.getsize(path))
+    except OSError as e:
+        _stats["errors"] += 1
+        print(f"WARNING: Could not write OCR cache entry {key[:12]}: {e}", flush=True)
+
+
+def get_many(keys: List[str]) -> Dict[str, str]:
+    """Cached texts for the keys that are present (blocking; call it off the event loop)."""
+    found = {}
+    if OCR_CACHE_ENABLED:
+        for key in keys:
+            hit, text = _read(key)
+            if hit:
+                found[key] = text
+    return found
+
+
+def put_sync(key: str, text: str) -> None:
+    """Store a unit's text (blocking; call it off the event loop)."""
+    if OCR_CACHE_ENABLED:
+        _write(key, text)
+
+
+def stats() -> Dict[str, Any]:
+    lookups = _stats["hits"] + _stats["misses"]
+    return {
+        "enabled": OCR_CACHE_ENABLED,
+        "directory": OCR_CACHE_DIR,
+        "max_bytes": OCR_CACHE_MAX_BYTES,
+        "bytes": _total_bytes,
+        "engine_version": _ENGINE_VERSION,
+        **_stats,
+        "hit_rate": round(_stats["hits"] / lookups, 4) if lookups else None,
+    }
@@ -0,0 +1,267 @@
+# services/ocr_pool.py
+"""
+EasyOCR in a process pool, off the event loop.
+
+EasyOCR is CPU-bound and holds the GIL for most of a readtext() call, so running it
+inside an async handler (or even the shared ThreadPoolExecutor) stalls every other
+request in the worker. Attachments are OCRed here instead: a ProcessPoolExecutor
+whose processes each load the EasyOCR model once (pool initializer) and then serve
+image and single-PDF-page tasks, so the pages of one PDF and the attachments of
+one message are recognised in parallel.
+
+PDFs are read text-layer first: pages whose embedded text is usable never reach
+EasyOCR, only the first OCR_PDF_MAX_PAGES pages are read, and a caller can stop
+OCR early once it has what it needs (ocr_attachments' is_complete).
+
+At most OCR_POOL_MAX_PENDING tasks are queued or running per API worker; callers
+wait for a slot beyond that. Each attachment gets OCR_ATTACHMENT_TIMEOUT_SECONDS;
+pages not read by then contribute no text. The pool is created on first use, so
+API workers that never OCR anything never start it.
+"""
+import asyncio
+import io
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from config import (
+    OCR_ATTACHMENT_TIMEOUT_SECONDS,
+    OCR_PDF_DPI,
+    OCR_PDF_MAX_PAGES,
+    OCR_PDF_TEXT_LAYER_FIRST,
+    OCR_POOL_MAX_PENDING,
+    OCR_POOL_WORKERS,
+    OCR_TEXT_LAYER_MIN_CHARS,
+)
+from services import ocr_cache
+
+
+# --- OCR process side ---
+
+_reader = None
+
+
+def _init_worker(torch_threads: int) -> None:
+    """Pool initializer: runs once per OCR process."""
+    global _reader
+    try:
+        import torch
+        # Share the cores between the pool's processes instead of each taking all of them
+        torch.set_num_threads(torch_threads)
+    except Exception:
+        pass
+    import easyocr
+    _reader = easyocr.Reader(['en'], gpu=False)
+
+
+def _ocr_array(arr) -> str:
+    lines = _reader.readtext(arr, detail=0, paragraph=True)
+    return "\n".join(lines)
+
+
+def ocr_image_task(image_bytes: bytes) -> str:
+    import numpy as np
+    from PIL import Image
+    img = Image.open(io.BytesIO(image_bytes)).convert("RGB")
+    return _ocr_array(np.array(img))
+
+
+def pdf_page_count_task(pdf_bytes: bytes) -> int:
+    import fitz  # PyMuPDF
+    with fitz.open(stream=pdf_bytes, filetype="pdf") as doc:
+        return doc.page_count
+
+
+def ocr_pdf_page_task(pdf_bytes: bytes, page_index: int, dpi: int) -> str:
+    import fitz  # PyMuPDF
+    import numpy as np
+    with fitz.open(stream=pdf_bytes, filetype="pdf") as doc:
+        pix = doc[page_index].get_pixmap(dpi=dpi)
+    # RGB samples straight into an array; no PNG encode/decode round trip
+    arr = np.frombuffer(pix.samples, dtype=np.uint8).reshape(pix.height, pix.width, pix.n)
+    return _ocr_array(arr)
+
+
+# --- API process side ---
+
+_pool: Optional[ProcessPoolExecutor] = None
+_slots: Optional[asyncio.Semaphore] = None
+_inflight: Dict[str, asyncio.Future] = {}  # cache key -> OCR of the same unit already running
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        workers = max(1, OCR_POOL_WORKERS)
+        # spawn, not fork: the API process has threads (executor, DB pools) that a forked child would inherit mid-state
+        _pool = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(max(1, (os.cpu_count() or 1) // workers),),
+        )
+        print(f"OCR process pool started ({workers} processes).", flush=True)
+    return _pool
+
+
+def _reset_pool() -> None:
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+
+async def _submit(func, *args):
+    """Run func(*args) in the pool once a slot is free; the slot is held until the task really ends."""
+    global _slots
+    if _slots is None:
+        _slots = asyncio.Semaphore(max(1, OCR_POOL_MAX_PENDING))
+    slots = _slots
+    await slots.acquire()
+    loop = asyncio.get_running_loop()
+
+    def _release(_):
+        try:
+            loop.call_soon_threadsafe(slots.release)
+        except RuntimeError:
+            pass  # loop already closed (shutdown)
+
+    try:
+        future = _get_pool().submit(func, *args)
+    except BaseException:
+        slots.release()
+        raise
+    future.add_done_callback(_release)
+    try:
+        return await asyncio.wrap_future(future)
+    except BrokenProcessPool:
+        # An OCR process died (e.g. out of memory on a huge page); start over on the next task
+        _reset_pool()
+        raise
+
+
+def is_pdf(mime: str, filename: str = "") -> bool:
+    return "pdf" in (mime or "").lower() or (filename or "").lower().endswith(".pdf")
+
+
+def text_layer_usable(text: str) -> bool:
+    """True if a page's embedded text is long enough and not mostly glyph garbage."""
+    stripped = (text or "").strip()
+    if len(stripped) < OCR_TEXT_LAYER_MIN_CHARS:
+        return False
+    readable = sum(1 for ch in stripped if ch.isalnum() or ch.isspace() or ch in ".,:;-/@()&'\"#%+*_=₹")
+    return readable / len(stripped) >= 0.85
+
+
+def pdf_text_layers(pdf_bytes: bytes, max_pages: int = OCR_PDF_MAX_PAGES) -> List[str]:
+    """Embedded text of the first `max_pages` pages (no rasterizing, no OCR)."""
+    import fitz  # PyMuPDF
+    with fitz.open(stream=pdf_bytes, filetype="pdf") as doc:
+        return [doc[index].get_text("text") for index in range(min(doc.page_count, max_pages))]
+
+
+def _plan_attachment(data: bytes, mime: str, filename: str) -> List[list]:
+    """
+    Split an attachment into units, in reading order: [text, ocr_task, args, cache_key].
+    PDF pages with a usable text layer are filled in straight away; the other units
+    get their text from the OCR cache, if present, or stay None until OCRed.
+    Blocking (PyMuPDF, hashing, file reads): runs in a thread.
+    """
+    digest = ocr_cache.content_hash(data)
+    if not is_pdf(mime, filename):
+        units = [[None, ocr_image_task, (data,), ocr_cache.cache_key(digest, "image")]]
+    else:
+        try:
+            if OCR_PDF_TEXT_LAYER_FIRST:
+                layers = pdf_text_layers(data)
+            else:
+                layers = [""] * min(pdf_page_count_task(data), OCR_PDF_MAX_PAGES)
+        except Exception as e:
+            print(f"WARNING: Could not open PDF attachment '{filename}': {e}", flush=True)
+            return []
+        units = []
+        for index, layer in enumerate(layers):
+            if text_layer_usable(layer):
+                units.append([layer, None, None, None])
+            else:
+                units.append([None, ocr_pdf_page_task, (data, index, OCR_PDF_DPI), ocr_cache.cache_key(digest, f"page-{index}")])
+
+    cached = ocr_cache.get_many([unit[3] for unit in units if unit[3] is not None])
+    for unit in units:
+        if unit[3] in cached:
+            unit[0] = cached[unit[3]]
+    return units
+
+
+async def _ocr_unit(unit: list, filename: str, deadline: float) -> None:
+    """OCR one unit before `deadline` (loop time) and cache the text; on failure it stays empty."""
+    _, task, args, key = unit
+    pending = _inflight.get(key)
+    if pending is not None:
+        unit[0] = await asyncio.shield(pending)
+        return
+
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
+    _inflight[key] = future
+    text = ""
+    try:
+        text = await asyncio.wait_for(_submit(task, *args), timeout=max(0.0, deadline - loop.time()))
+        # Failures and timeouts are not cached, so a later copy gets another try
+        await loop.run_in_executor(None, ocr_cache.put_sync, key, text)
+    except asyncio.TimeoutError:
+        print(f"WARNING: OCR of attachment '{filename}' timed out", flush=True)
+    except Exception as e:
+        print(f"WARNING: OCR of attachment '{filename}' failed: {e}", flush=True)
+    finally:
+        del _inflight[key]
+        if not future.done():
+            future.set_result(text)
+        unit[0] = text
+
+
+async def ocr_attachments(attachments: Sequence[Tuple[bytes, str, str]],
+                          is_complete: Optional[Callable[[List[str]], bool]] = None,
+                          timeout: float = OCR_ATTACHMENT_TIMEOUT_SECONDS) -> List[str]:
+    """
+    Text of (data, mime, filename) attachments, in input order.
+
+    PDF text layers and cached results are used first. The remaining images and
+    pages are OCRed in parallel; each attachment has `timeout` seconds overall and
+    contributes whatever was read by then. If `is_complete(texts)` is given, OCR
+    runs in rounds of one page per OCR process and stops as soon as it returns True.
+    """
+    loop = asyncio.get_running_loop()
+    plans = await asyncio.gather(*(
+        loop.run_in_executor(None, _plan_attachment, data, mime, name) for data, mime, name in attachments
+    ))
+
+    def texts() -> List[str]:
+        return ["\n".join(unit[0] for unit in units if unit[0]) for units in plans]
+
+    todo = [(unit, attachments[i][2]) for i, units in enumerate(plans) for unit in units if unit[0] is None]
+    if not todo or (is_complete and is_complete(texts())):
+        return texts()
+
+    deadline = loop.time() + timeout
+    batch_size = max(1, OCR_POOL_WORKERS) if is_complete else len(todo)
+    for start in range(0, len(todo), batch_size):
+        await asyncio.gather(*(_ocr_unit(unit, name, deadline) for unit, name in todo[start:start + batch_size]))
+        if is_complete and is_complete(texts()):
+            skipped = len(todo) - start - batch_size
+            if skipped > 0:
+                print(f"OCR: required fields found, skipped {skipped} remaining page(s)/image(s)", flush=True)
+            break
+    return texts()
+
+
+async def ocr_attachment(data: bytes, mime: str, filename: str = "",
+                         timeout: float = OCR_ATTACHMENT_TIMEOUT_SECONDS) -> str:
+    """Text of a single attachment (see ocr_attachments)."""
+    return (await ocr_attachments([(data, mime, filename)], timeout=timeout))[0]
+
+
+def shutdown_ocr_pool() -> None:
+    _reset_pool()
@@ -49,7 +49,7 @@ transactions_df['log_amount'] = np.log1p(transactions_df['amount'])
 # Time since last transaction feature
 transactions_df.sort_values(['acct_num', 'txn_datetime'], inplace=True)
 transactions_df['time_since_last_txn_seconds'] = transactions_df.groupby('acct_num')['txn_datetime'].diff().dt.total_seconds()
-transactions_df['time_since_last_txn_seconds'].fillna(0, inplace=True)
+transactions_df['time_since_last_txn_seconds'] = transactions_df['time_since_last_txn_seconds'].fillna(0)
 
 # One-hot encode categorical features for the anomaly model
 categorical_cols_txn = ['txn_type', 'currency', 'channel', 'pay_method']
@@ -99,14 +99,14 @@ customer_aggregated_txn_df.rename(columns={'txn_datetime_count': 'total_transact
 # Calculate percentage of anomalous transactions
 customer_aggregated_txn_df['percentage_anomalous_txns'] = \
     (customer_aggregated_txn_df['anomaly_label_if_sum'] / customer_aggregated_txn_df['total_transactions']) * 100
-customer_aggregated_txn_df['percentage_anomalous_txns'].fillna(0, inplace=True)
+customer_aggregated_txn_df['percentage_anomalous_txns'] = customer_aggregated_txn_df['percentage_anomalous_txns'].fillna(0)
 
 # Merge aggregated data with original customer data
 final_df = pd.merge(customer_df, customer_aggregated_txn_df, on='acct_num', how='left')
 # Fill NaNs for customers with no transactions
 for col in customer_aggregated_txn_df.columns:
     if pd.api.types.is_numeric_dtype(final_df[col]):
-        final_df[col].fillna(0, inplace=True)
+        final_df[col] = final_df[col].fillna(0)
 
 # ==============================================================================
 # 5. APPLY RULE-BASED LABELS FOR TRAINING
@@ -151,7 +151,7 @@ y = final_df_encoded[target_column]
 
 # Handle potential missing columns if a category is not present during prediction
 # This is handled by saving the feature_columns list
-X.fillna(0, inplace=True)
+X = X.fillna(0)
 
 # Encode Target Variable
 le = LabelEncoder()
@@ -174,6 +174,9 @@ joblib.dump(model_rf, 'random_forest_model.joblib')
 joblib.dump(scaler, 'scaler.joblib')
 joblib.dump(le, 'label_encoder.joblib')
 joblib.dump(feature_columns, 'feature_columns.joblib') # Saves the exact column order
+# The classifier's anomaly features come from the Isolation Forest, so scoring needs it too
+joblib.dump(model_iso_forest, 'isolation_forest_model.joblib')
+joblib.dump(feature_cols_if, 'isolation_forest_features.joblib')
 
 print("--- All artifacts saved successfully. ---")
 print("You can now move the .joblib files to your server.")
\ No newline at end of file
@@ -3,8 +3,14 @@
 
 -- Index for case_main queries (most important for dashboard and case loading)
 CREATE INDEX IF NOT EXISTS idx_case_main_creation_date_desc ON public.case_main (creation_date DESC, creation_time DESC);
+-- Keyset pagination of the case lists (/api/new-case-list, /api/assigned-cases with a cursor)
+-- (same COALESCE expressions as db/pagination.KEYSET_ORDER, so NULL dates/times stay on the index)
+CREATE INDEX IF NOT EXISTS idx_case_main_keyset_coalesced ON public.case_main ((COALESCE(creation_date, 'infinity'::date)) DESC, (COALESCE(creation_time, '24:00:00'::time)) DESC, case_id DESC);
+CREATE INDEX IF NOT EXISTS idx_assignment_case_latest ON public.assignment (case_id, assign_date DESC, assign_time DESC);
 CREATE INDEX IF NOT EXISTS idx_case_main_status ON public.case_main (status);
 CREATE INDEX IF NOT EXISTS idx_case_main_source_ack_no ON public.case_main (source_ack_no);
+-- case_entry_form join key (column added/backfilled by backend/scripts/add_case_main_base_ack_no.py)
+CREATE INDEX IF NOT EXISTS idx_case_main_base_ack_no ON public.case_main (base_ack_no);
 CREATE INDEX IF NOT EXISTS idx_case_main_cust_id ON public.case_main (cust_id);
 CREATE INDEX IF NOT EXISTS idx_case_main_acc_num ON public.case_main (acc_num);
 
@@ -50,6 +56,15 @@ CREATE INDEX IF NOT EXISTS idx_account_customer_cust_id ON account_customer (cus
 CREATE INDEX IF NOT EXISTS idx_acc_bene_cust_acct_num ON acc_bene (cust_acct_num);
 CREATE INDEX IF NOT EXISTS idx_acc_bene_bene_acct_num ON acc_bene (bene_acct_num);
 
+-- RRN lookups for banks v2 case-entry (batched = ANY(...) duplicate check and txn match)
+CREATE INDEX IF NOT EXISTS idx_case_incidents_rrn ON public.case_incidents (rrn);
+CREATE INDEX IF NOT EXISTS idx_txn_rrn ON txn (rrn);
+
+-- Fraud-pattern alert tables (backend/services/fraud_alerts.py): per-mobile recompute
+-- and the window scan of the periodic rebuild
+CREATE INDEX IF NOT EXISTS idx_customer_mobile ON customer (mobile);
+CREATE INDEX IF NOT EXISTS idx_txn_date ON txn (txn_date);
+
 -- Analyze tables after creating indexes to update statistics
 ANALYZE public.case_main;
 ANALYZE public.assignment;
@@ -62,6 +77,7 @@ ANALYZE public.case_documents;
 ANALYZE case_entry_form;
 ANALYZE account_customer;
 ANALYZE acc_bene;
+ANALYZE public.case_incidents;
 
 -- Optional: Create partial indexes for active cases only (if most queries are for active cases)
 -- CREATE INDEX IF NOT EXISTS idx_case_main_active_status ON public.case_main (creation_date DESC, creation_time DESC) 